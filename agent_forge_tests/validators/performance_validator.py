@@ -144,6 +144,52 @@ class PerformanceValidator:
             if str(self.agent_forge_path) in sys.path:
                 sys.path.remove(str(self.agent_forge_path))
 
+        # Profile MCP server cold start in a fresh interpreter
+        try:
+            sys.path.insert(0, str(self.agent_forge_path))
+
+            try:
+                from startup_profile import profile_imports
+            except ImportError:
+                self._add_result(True, "ℹ️ Startup import profiling not available in this installation")
+                return
+
+            report = profile_imports("mcp_server", [str(self.agent_forge_path)], top_n=5)
+            details = {
+                "total_import_seconds": report["total_import_seconds"],
+                "slowest_cumulative": report["slowest_cumulative"],
+                "heavy_modules_loaded": report["heavy_modules_loaded"],
+            }
+
+            if not report["success"]:
+                self._add_result(
+                    False,
+                    f"⚠️ MCP server cold start failed: {report['error']}",
+                    details=details,
+                    severity="warning"
+                )
+            elif report["heavy_modules_loaded"]:
+                heavy = sorted({m.split('.')[0] for m in report["heavy_modules_loaded"]})
+                self._add_result(
+                    False,
+                    f"⚠️ MCP server imports agent dependencies at startup: {', '.join(heavy)}",
+                    details=details,
+                    severity="warning"
+                )
+            else:
+                self._add_result(
+                    True,
+                    f"✅ MCP server cold start: {report['total_import_seconds']:.2f}s "
+                    f"({report['modules_imported']} modules, agents load on first call)",
+                    details=details
+                )
+
+        except Exception as e:
+            self._add_result(False, f"❌ Startup import profiling failed: {e}", severity="error")
+        finally:
+            if str(self.agent_forge_path) in sys.path:
+                sys.path.remove(str(self.agent_forge_path))
+
 
 def main():
     """Command-line interface for performance validation."""
@@ -6,6 +6,7 @@ This module provides metrics tracking capabilities for the Agent Forge API inclu
 - Response time metrics
 - Error rate tracking
 - Token usage metrics
+- Cache hit rates for the in-process caches (database query caches included)
 
 It is designed to work alongside the structured logging system and can output metrics
 to Google Cloud Monitoring (when deployed) or locally for development.
@@ -296,6 +297,30 @@ def stop_db_timer(timer_id: str, operation: str) -> float:
     )
 
 
+# Cache metrics
+def track_cache_stats():
+    """Record hit rate, hit/miss counts and size of every named in-process cache.
+
+    Reads ``core.shared.cache.get_cache_stats()``, which includes the
+    events-by-date and speaker query caches. Values are gauges, refreshed
+    each time metrics are read or exported.
+    """
+    try:
+        from core.shared.cache import get_cache_stats
+    except ImportError:
+        logger.debug("core.shared.cache not available, skipping cache metrics")
+        return
+
+    for name, stats in get_cache_stats().items():
+        labels = {"cache": name}
+        metrics_store.set_value("cache_hit_rate", stats["hit_rate"], labels)
+        metrics_store.set_value("cache_hits", stats["hits"], labels)
+        metrics_store.set_value("cache_misses", stats["misses"], labels)
+        metrics_store.set_value("cache_coalesced", stats["coalesced"], labels)
+        metrics_store.set_value("cache_entries", stats["entries"], labels)
+        metrics_store.set_value("cache_evictions", stats["evictions"], labels)
+
+
 # User metrics
 def track_unique_user(user_id: str):
     """Track a unique user.
@@ -351,6 +376,7 @@ def get_metrics_json() -> str:
     """
     try:
         # Get metrics from store
+        track_cache_stats()
         metrics = metrics_store.get_metrics()
 
         # Custom JSON encoder to handle special types
@@ -405,6 +431,7 @@ def export_metrics_to_gcp():
         from google.protobuf import timestamp_pb2
 
         # Get metrics from store
+        track_cache_stats()
         metrics = metrics_store.get_metrics()
 
         # Setup client
@@ -12,11 +12,23 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Union,
+)
 
 import aiohttp
 from playwright.async_api import BrowserContext, Page
 
+from core.shared.rate_limit import GCRARateLimiter, domain_key
+
 if TYPE_CHECKING:
     from .region_manager import RegionManager
 
@@ -108,33 +120,25 @@ class PerformanceMonitor:
 
 
 class RateLimiter:
-    """Rate limiting for agent operations"""
-
-    def __init__(self, max_requests_per_minute: int = 60):
-        self.max_requests = max_requests_per_minute
-        self.request_times = []
+    """Rate limiting for agent operations
 
-    async def wait_if_needed(self):
-        """Wait if rate limit would be exceeded"""
-        current_time = time.time()
-
-        # Remove requests older than 1 minute
-        self.request_times = [t for t in self.request_times if current_time - t < 60]
+    Backed by the shared GCRA limiter: O(1) per key, sleeps exactly until the
+    next token, and can use a shared backend so several workers share a budget.
+    """
 
-        if len(self.request_times) >= self.max_requests:
-            # Wait until the oldest request is outside the window
-            wait_time = 60 - (current_time - self.request_times[0])
-            if wait_time > 0:
-                logger.info(f"Rate limit reached, waiting {wait_time:.2f} seconds")
-                await asyncio.sleep(wait_time)
+    def __init__(self, max_requests_per_minute: int = 60, backend=None):
+        self.max_requests = max_requests_per_minute
+        self._limiter = GCRARateLimiter(max_requests_per_minute, 60, backend=backend)
 
-        self.request_times.append(current_time)
+    async def wait_if_needed(self, key: str = "default"):
+        """Wait if rate limit would be exceeded for the given key (e.g. a domain)"""
+        wait_time = await self._limiter.acquire(key)
+        if wait_time > 0:
+            logger.info(f"Rate limit reached for {key}, waited {wait_time:.2f} seconds")
 
-    def get_remaining_quota(self) -> int:
-        """Get remaining requests for current minute"""
-        current_time = time.time()
-        recent_requests = [t for t in self.request_times if current_time - t < 60]
-        return max(0, self.max_requests - len(recent_requests))
+    def get_remaining_quota(self, key: str = "default") -> int:
+        """Get requests that can be made right now for the given key"""
+        return self._limiter.get_remaining(key)
 
 
 class BaseAgent(ABC):
@@ -148,6 +152,10 @@ class BaseAgent(ABC):
     - Anti-detection pattern integration
     """
 
+    # Key in next_task_data whose list is streamed item by item when a
+    # subclass does not override _stream_core_logic
+    stream_items_key: Optional[str] = None
+
     def __init__(self, region_manager: "RegionManager"):
         self.region_manager = region_manager
         self.performance_monitor = PerformanceMonitor()
@@ -176,8 +184,8 @@ class BaseAgent(ABC):
             # Get regional session
             session = await self.region_manager.get_regional_session(optimal_region)
 
-            # Apply rate limiting
-            await self.rate_limiter.wait_if_needed()
+            # Apply per-domain rate limiting
+            await self.rate_limiter.wait_if_needed(domain_key(task.target_url))
 
             # Execute core agent logic
             result = await self._execute_core_logic(task, session)
@@ -213,6 +221,86 @@ class BaseAgent(ABC):
                     error_message=str(e),
                 )
 
+    async def execute_stream(self, task: AgentTask) -> AsyncIterator[Any]:
+        """
+        Execute task in streaming mode, yielding per-item results as they are produced
+
+        Uses the same regional selection, session management and rate limiting
+        as execute_with_rotation, but hands items downstream immediately instead
+        of collecting the whole batch in AgentResult.data. Because items may
+        already have been consumed, a failed stream is not retried.
+
+        Args:
+            task: The task to execute
+
+        Yields:
+            Individual result items (e.g. one extracted event per item)
+        """
+        operation_id = f"{task.task_id}_{task.task_type.value}_stream"
+        self.performance_monitor.start_operation(operation_id)
+        items_streamed = 0
+        success = False
+        region = task.region_preference or "unknown"
+
+        try:
+            region = await self.region_manager.get_optimal_region(task)
+            logger.info(f"Streaming {task.task_type.value} in region {region}")
+
+            session = await self.region_manager.get_regional_session(region)
+            await self.rate_limiter.wait_if_needed(domain_key(task.target_url))
+
+            async for item in self._stream_core_logic(task, session):
+                items_streamed += 1
+                yield item
+
+            success = True
+        finally:
+            execution_time = self.performance_monitor.end_operation(operation_id)
+            summary = AgentResult(
+                task_id=task.task_id,
+                success=success,
+                data={"items_streamed": items_streamed},
+                performance_metrics=self.performance_monitor.get_metrics(),
+                region_used=region,
+                execution_time=execution_time,
+            )
+            try:
+                await self._update_regional_metrics(region, summary)
+            except Exception as e:
+                logger.debug(f"Could not update regional metrics for stream: {e}")
+            logger.info(
+                f"Task {task.task_id} streamed {items_streamed} items in {execution_time:.2f}s"
+            )
+
+    async def _stream_core_logic(
+        self, task: AgentTask, session: RegionalSession
+    ) -> AsyncIterator[Any]:
+        """
+        Streaming core logic; override in agents that can produce items incrementally
+
+        The default adapter runs _execute_core_logic and yields the list stored
+        under stream_items_key, or the whole AgentResult when no key is set.
+
+        Args:
+            task: The task to execute
+            session: Regional session with browser context and HTTP session
+
+        Yields:
+            Individual result items
+        """
+        result = await self._execute_core_logic(task, session)
+        if not result.success:
+            raise RuntimeError(result.error_message or f"Task {task.task_id} failed")
+
+        payload = result.next_task_data or result.data or {}
+        items = payload.get(self.stream_items_key) if self.stream_items_key else None
+        if items is None:
+            yield result
+            return
+
+        for item in items:
+            yield item
+
     @abstractmethod
     async def _execute_core_logic(
         self, task: AgentTask, session: RegionalSession
@@ -293,6 +381,150 @@ class BaseAgent(ABC):
         }
 
 
+StageHandler = Callable[[Any], Awaitable[Optional[Any]]]
+
+# Marks the end of the stream in inter-stage queues
+_END_OF_STREAM = object()
+
+
+class AgentPipeline:
+    """
+    Chains a streaming source agent through downstream stages with bounded queues
+
+    Each stage runs as its own task, so extraction, validation and persistence
+    overlap, and a full queue blocks the upstream stage instead of letting
+    items pile up in memory. A stage is either an object with a process_item
+    coroutine (such as an agent) or a plain async callable; returning None
+    drops the item.
+    """
+
+    def __init__(
+        self,
+        source: BaseAgent,
+        stages: List[Union[Any, StageHandler]],
+        queue_size: int = 100,
+    ):
+        """
+        Initialize the pipeline
+
+        Args:
+            source: Agent whose execute_stream produces the items
+            stages: Downstream stages applied in order
+            queue_size: Maximum items buffered between two stages
+
+        Raises:
+            TypeError: If a stage has no process_item coroutine and is not callable
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+
+        self.source = source
+        self.stages = stages
+        # Resolved up front so a bad stage fails here, not on its first item
+        self._handlers = [self._stage_handler(stage) for stage in stages]
+        self.queue_size = queue_size
+        self.stage_stats: List[Dict[str, Any]] = [
+            {"stage": self._stage_name(stage), "processed": 0, "dropped": 0, "errors": 0}
+            for stage in stages
+        ]
+
+    @staticmethod
+    def _stage_name(stage: Any) -> str:
+        if hasattr(stage, "process_item"):
+            return stage.__class__.__name__
+        return getattr(stage, "__name__", repr(stage))
+
+    @staticmethod
+    def _stage_handler(stage: Any) -> StageHandler:
+        if hasattr(stage, "process_item"):
+            return stage.process_item
+        if isinstance(stage, BaseAgent):
+            raise TypeError(
+                f"{stage.__class__.__name__} does not implement process_item "
+                "and cannot be used as a pipeline stage"
+            )
+        if callable(stage):
+            return stage
+        raise TypeError(f"Pipeline stage {stage!r} is not callable")
+
+    async def stream(self, task: AgentTask) -> AsyncIterator[Any]:
+        """
+        Run the pipeline and yield items leaving the final stage
+
+        Args:
+            task: Task for the source agent
+
+        Yields:
+            Items that passed every stage
+        """
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+
+        async def produce():
+            # No sentinel on cancellation: the stages are cancelled too, and a
+            # put() into a full queue nobody reads would never return
+            try:
+                async for item in self.source.execute_stream(task):
+                    await queues[0].put(item)
+            except Exception:
+                await queues[0].put(_END_OF_STREAM)
+                raise
+            await queues[0].put(_END_OF_STREAM)
+
+        async def run_stage(index: int, handler: StageHandler):
+            inbox, outbox = queues[index], queues[index + 1]
+            stats = self.stage_stats[index]
+            while True:
+                item = await inbox.get()
+                if item is _END_OF_STREAM:
+                    await outbox.put(_END_OF_STREAM)
+                    return
+                try:
+                    result = await handler(item)
+                except Exception as e:
+                    stats["errors"] += 1
+                    logger.error(f"Pipeline stage {stats['stage']} failed on item: {e}")
+                    continue
+                stats["processed"] += 1
+                if result is None:
+                    stats["dropped"] += 1
+                else:
+                    await outbox.put(result)
+
+        producer = asyncio.create_task(produce())
+        workers = [
+            asyncio.create_task(run_stage(i, handler))
+            for i, handler in enumerate(self._handlers)
+        ]
+
+        try:
+            while True:
+                item = await queues[-1].get()
+                if item is _END_OF_STREAM:
+                    break
+                yield item
+            # Surface source errors once the stages have drained
+            await producer
+        finally:
+            for pending in [producer, *workers]:
+                pending.cancel()
+            await asyncio.gather(producer, *workers, return_exceptions=True)
+
+    async def run(self, task: AgentTask) -> Dict[str, Any]:
+        """
+        Run the pipeline to completion without retaining items
+
+        Args:
+            task: Task for the source agent
+
+        Returns:
+            Dictionary with the number of items completed and per-stage statistics
+        """
+        completed = 0
+        async for _ in self.stream(task):
+            completed += 1
+        return {"items_completed": completed, "stages": self.stage_stats}
+
+
 class AntiDetectionEngine:
     """
     Anti-detection pattern engine for natural behavior simulation
@@ -354,4 +586,5 @@ __all__ = [
     "PerformanceMonitor",
     "RateLimiter",
     "AntiDetectionEngine",
+    "AgentPipeline",
 ]
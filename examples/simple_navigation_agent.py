@@ -31,6 +31,11 @@ class SimpleNavigationAgent(AsyncContextAgent):
             url: Target URL to navigate to
         """
         super().__init__(name, config)
+        self.url: str = self._resolve_url(url)
+            
+        self.logger.info(f"SimpleNavigationAgent initialized with URL: {self.url}")
+
+    def _resolve_url(self, url: Optional[str]) -> str:
         provided_url = url or self.config.get('url')
         
         if not provided_url:
@@ -39,10 +44,19 @@ class SimpleNavigationAgent(AsyncContextAgent):
         # Ensure URL is a string
         if not isinstance(provided_url, str):
             raise ValueError("URL must be a string")
-            
-        self.url: str = provided_url
-            
-        self.logger.info(f"SimpleNavigationAgent initialized with URL: {self.url}")
+        return provided_url
+
+    def reset_for_lease(self, name: Optional[str] = None, config: Optional[dict] = None, url: Optional[str] = None):
+        """
+        Return a pooled instance to the state __init__ gives it, keeping the browser client.
+        
+        Raises:
+            ValueError: If the URL is missing or the name changes (the logger is named after it)
+        """
+        if (name or self.__class__.__name__) != self.name:
+            raise ValueError("A pooled agent cannot be renamed")
+        self.config = config or {}
+        self.url = self._resolve_url(url)
     
     async def run(self) -> Optional[str]:
         """
@@ -6,10 +6,12 @@ Part of the multi-agent specialization architecture for 90%+ field completion ra
 
 import asyncio
 import logging
+import math
 import re
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Mapping, Optional, Union
 from urllib.parse import urlparse
 
 # Legacy compatibility stubs
@@ -39,6 +41,8 @@ class RegionalSession:
 
 # Use current framework BaseAgent
 from core.agents.base import BaseAgent
+from core.shared.bs_utils import HTMLDocument
+from core.shared.selector_plans import ExtractionPlan, compile_plan
 
 # Stub for RegionManager - deprecated
 class RegionManager:
@@ -46,8 +50,37 @@ class RegionManager:
     def __init__(self):
         pass
 
+if TYPE_CHECKING:
+    from core.shared.event_dedup import NearDuplicateIndex
+    from core.shared.write_behind import WriteBehindBuffer
+
 logger = logging.getLogger(__name__)
 
+# Defaults for the concurrent multi-URL extraction mode
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_URL_TIMEOUT_SECONDS = 30.0
+DEFAULT_PLATFORM_CONCURRENCY = 4
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(percentile / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+@dataclass
+class UrlExtractionOutcome:
+    """Outcome of extracting a single URL in the concurrent extraction mode"""
+
+    url: str
+    platform: str
+    event_data: Optional["ExtractedEventData"]
+    latency: float
+    timed_out: bool = False
+    error: Optional[str] = None
+
 
 @dataclass
 class FieldExtractionResult:
@@ -136,14 +169,144 @@ class EnhancedTextExtractionAgent(BaseAgent):
     Target: 90%+ field completion rate with quality validation
     """
 
-    def __init__(self, region_manager: RegionManager):
+    stream_items_key = "extracted_events"
+
+    def __init__(
+        self,
+        region_manager: RegionManager,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        url_timeout: float = DEFAULT_URL_TIMEOUT_SECONDS,
+        dedup_index: Optional["NearDuplicateIndex"] = None,
+        result_buffer: Optional["WriteBehindBuffer"] = None,
+    ):
         super().__init__(region_manager)
+        self._region_manager = region_manager
+
+        # Optional near-duplicate stage: events already listed under another
+        # URL (e.g. on a different platform) are dropped before hand-off
+        self.dedup_index = dedup_index
+
+        # Optional write-behind persistence: each event is journaled as soon
+        # as it is extracted and flushed to the database in the background,
+        # so a crash mid-run does not lose finished work
+        self.result_buffer = result_buffer
+
+        # Concurrent extraction settings: total workers across the batch and a
+        # per-URL deadline so one stuck page cannot stall the whole batch.
+        # Per-platform caps come from each platform config's "max_concurrency";
+        # generic URLs are capped per host.
+        self.max_workers = max(1, max_workers)
+        self.url_timeout = url_timeout
 
         # Enhanced extraction patterns for different event platforms
         self.extraction_patterns = self._initialize_enhanced_extraction_patterns()
 
         # Platform-specific configurations with priority weighting
-        self.platform_configs = {
+        self.platform_configs = self._initialize_platform_configs()
+
+        # Enhanced date parsing patterns with timezone awareness
+        self.date_patterns = [
+            # ISO formats
+            (r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[+-]\d{2}:\d{2}", "iso_with_tz"),
+            (r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z", "iso_utc"),
+            (r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", "iso_local"),
+            # Standard formats
+            (r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", "standard"),
+            (r"\d{2}/\d{2}/\d{4} \d{2}:\d{2}", "us_format"),
+            (r"\d{2}-\d{2}-\d{4} \d{2}:\d{2}", "eu_format"),
+            # Named month formats
+            (r"[A-Za-z]+ \d{1,2}, \d{4} \d{1,2}:\d{2} [AP]M", "named_month_12h"),
+            (r"[A-Za-z]+ \d{1,2}, \d{4} \d{2}:\d{2}", "named_month_24h"),
+            # Relative formats
+            (r"(today|tomorrow|yesterday) at \d{1,2}:\d{2}", "relative_date"),
+        ]
+
+        # Natural language processing patterns for text extraction
+        self.nlp_patterns = {
+            "event_indicators": [
+                r"join us for",
+                r"we're excited to announce",
+                r"don't miss",
+                r"register now",
+                r"limited seats",
+                r"early bird",
+            ],
+            "location_indicators": [
+                r"venue:",
+                r"location:",
+                r"address:",
+                r"at \d+",
+                r"[A-Z][a-z]+ Street",
+                r"[A-Z][a-z]+ Avenue",
+            ],
+            "pricing_indicators": [
+                r"\$\d+",
+                r"free admission",
+                r"no cost",
+                r"registration fee",
+                r"ticket price",
+            ],
+        }
+
+        # State tracking for extraction performance
+        self.extracted_events: Dict[str, ExtractedEventData] = {}
+        self.extraction_stats = self._initialize_extraction_stats()
+
+        # Compiled per-platform extraction plans (see reload_platform_configs)
+        self.extraction_plans: Dict[str, ExtractionPlan] = self._compile_extraction_plans(
+            self.platform_configs
+        )
+
+    def reset_for_lease(
+        self,
+        region_manager: RegionManager,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        url_timeout: float = DEFAULT_URL_TIMEOUT_SECONDS,
+        dedup_index: Optional["NearDuplicateIndex"] = None,
+        result_buffer: Optional["WriteBehindBuffer"] = None,
+    ):
+        """
+        Return a pooled instance to the state __init__ gives it.
+
+        Extracted events and stats from earlier leases are dropped and the
+        default platform configs restored; their plans come from the shared
+        plan cache, so nothing is recompiled.
+
+        Raises:
+            ValueError: If a different region manager is passed in
+        """
+        if region_manager is not self._region_manager:
+            raise ValueError("A pooled agent cannot switch region managers")
+        self.dedup_index = dedup_index
+        self.result_buffer = result_buffer
+        self.max_workers = max(1, max_workers)
+        self.url_timeout = url_timeout
+        self.platform_configs = self._initialize_platform_configs()
+        self.extraction_plans = self._compile_extraction_plans(self.platform_configs)
+        self.extracted_events = {}
+        self.extraction_stats = self._initialize_extraction_stats()
+
+    @staticmethod
+    def _initialize_extraction_stats() -> Dict[str, Any]:
+        """State tracking for extraction performance"""
+        return {
+            "total_processed": 0,
+            "successful_extractions": 0,
+            "failed_extractions": 0,
+            "average_confidence": 0.0,
+            "average_completeness": 0.0,
+            "platform_performance": {},
+            "field_success_rates": {},
+            "timed_out_extractions": 0,
+            "events_per_second": 0.0,
+            "latency_p50": 0.0,
+            "latency_p95": 0.0,
+            "near_duplicates": 0,
+        }
+
+    def _initialize_platform_configs(self) -> Dict[str, Dict[str, Any]]:
+        """Platform-specific selector configurations with priority weighting"""
+        return {
             "eventbrite": {
                 "json_ld_selector": 'script[type="application/ld+json"]',
                 "open_graph_selectors": ['meta[property^="og:"]', 'meta[name^="og:"]'],
@@ -186,6 +349,7 @@ class EnhancedTextExtractionAgent(BaseAgent):
                 ],
                 "reliability_score": 0.95,
                 "extraction_priority": 1,
+                "max_concurrency": 4,
             },
             "meetup": {
                 "json_ld_selector": 'script[type="application/ld+json"]',
@@ -223,6 +387,7 @@ class EnhancedTextExtractionAgent(BaseAgent):
                 ],
                 "reliability_score": 0.90,
                 "extraction_priority": 2,
+                "max_concurrency": 3,
             },
             "facebook": {
                 "json_ld_selector": 'script[type="application/ld+json"]',
@@ -256,6 +421,7 @@ class EnhancedTextExtractionAgent(BaseAgent):
                 ],
                 "reliability_score": 0.85,
                 "extraction_priority": 3,
+                "max_concurrency": 2,
             },
             "lu.ma": {
                 "json_ld_selector": 'script[type="application/ld+json"]',
@@ -273,6 +439,7 @@ class EnhancedTextExtractionAgent(BaseAgent):
                 "organizer_selectors": [".organizer", ".host-info", '[class*="host"]'],
                 "reliability_score": 0.88,
                 "extraction_priority": 2,
+                "max_concurrency": 4,
             },
             "generic": {
                 "json_ld_selector": 'script[type="application/ld+json"]',
@@ -320,65 +487,10 @@ class EnhancedTextExtractionAgent(BaseAgent):
                 ],
                 "reliability_score": 0.70,
                 "extraction_priority": 4,
+                "max_concurrency": 8,
             },
         }
 
-        # Enhanced date parsing patterns with timezone awareness
-        self.date_patterns = [
-            # ISO formats
-            (r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[+-]\d{2}:\d{2}", "iso_with_tz"),
-            (r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z", "iso_utc"),
-            (r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", "iso_local"),
-            # Standard formats
-            (r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", "standard"),
-            (r"\d{2}/\d{2}/\d{4} \d{2}:\d{2}", "us_format"),
-            (r"\d{2}-\d{2}-\d{4} \d{2}:\d{2}", "eu_format"),
-            # Named month formats
-            (r"[A-Za-z]+ \d{1,2}, \d{4} \d{1,2}:\d{2} [AP]M", "named_month_12h"),
-            (r"[A-Za-z]+ \d{1,2}, \d{4} \d{2}:\d{2}", "named_month_24h"),
-            # Relative formats
-            (r"(today|tomorrow|yesterday) at \d{1,2}:\d{2}", "relative_date"),
-        ]
-
-        # Natural language processing patterns for text extraction
-        self.nlp_patterns = {
-            "event_indicators": [
-                r"join us for",
-                r"we're excited to announce",
-                r"don't miss",
-                r"register now",
-                r"limited seats",
-                r"early bird",
-            ],
-            "location_indicators": [
-                r"venue:",
-                r"location:",
-                r"address:",
-                r"at \d+",
-                r"[A-Z][a-z]+ Street",
-                r"[A-Z][a-z]+ Avenue",
-            ],
-            "pricing_indicators": [
-                r"\$\d+",
-                r"free admission",
-                r"no cost",
-                r"registration fee",
-                r"ticket price",
-            ],
-        }
-
-        # State tracking for extraction performance
-        self.extracted_events: Dict[str, ExtractedEventData] = {}
-        self.extraction_stats = {
-            "total_processed": 0,
-            "successful_extractions": 0,
-            "failed_extractions": 0,
-            "average_confidence": 0.0,
-            "average_completeness": 0.0,
-            "platform_performance": {},
-            "field_success_rates": {},
-        }
-
     def _initialize_enhanced_extraction_patterns(self) -> List[ExtractionPattern]:
         """Initialize enhanced extraction patterns for different data fields"""
         return [
@@ -470,21 +582,36 @@ class EnhancedTextExtractionAgent(BaseAgent):
                     error_message="No event URLs provided",
                 )
 
-            # Process each event URL
+            # Process event URLs concurrently, collecting results as they complete
             extracted_events = []
-            for url in event_urls:
-                try:
-                    event_data = await self._extract_event_data(
-                        session, url, session.region
-                    )
-                    if event_data:
-                        extracted_events.append(event_data)
-                        logger.debug(f"Successfully extracted data from: {url}")
-                    else:
-                        logger.warning(f"Failed to extract data from: {url}")
-                except Exception as e:
-                    logger.error(f"Error extracting data from {url}: {e}")
+            latencies = []
+            async for outcome in self.iter_extracted_events(
+                session,
+                event_urls,
+                max_workers=task.metadata.get("max_workers"),
+                pages=task.metadata.get("page_html"),
+            ):
+                latencies.append(outcome.latency)
+                if outcome.event_data and self._is_near_duplicate(outcome.event_data):
                     continue
+                if outcome.event_data:
+                    extracted_events.append(outcome.event_data)
+                    await self._buffer_event(outcome.event_data)
+                    logger.debug(f"Successfully extracted data from: {outcome.url}")
+                elif outcome.timed_out:
+                    self.extraction_stats["timed_out_extractions"] += 1
+                    logger.warning(f"Timed out extracting data from: {outcome.url}")
+                elif outcome.error:
+                    logger.error(
+                        f"Error extracting data from {outcome.url}: {outcome.error}"
+                    )
+                else:
+                    logger.warning(f"Failed to extract data from: {outcome.url}")
+
+            batch_time = asyncio.get_event_loop().time() - start_time
+            latency_stats = self._update_throughput_stats(
+                len(extracted_events), latencies, batch_time
+            )
 
             # Calculate overall confidence and prepare results
             total_confidence = sum(
@@ -497,30 +624,14 @@ class EnhancedTextExtractionAgent(BaseAgent):
             # Prepare next task data for chain
             next_task_data = {
                 "extracted_events": [
-                    {
-                        "url": event.url,
-                        "title": event.title,
-                        "description": event.description,
-                        "start_date": (
-                            event.start_date.isoformat() if event.start_date else None
-                        ),
-                        "end_date": (
-                            event.end_date.isoformat() if event.end_date else None
-                        ),
-                        "location": event.location,
-                        "organizer": event.organizer,
-                        "pricing": event.pricing,
-                        "registration": event.registration,
-                        "metadata": event.metadata,
-                        "confidence": event.extraction_confidence,
-                    }
-                    for event in extracted_events
+                    self._serialize_event(event) for event in extracted_events
                 ],
                 "extraction_stats": {
                     "total_urls": len(event_urls),
                     "successful_extractions": len(extracted_events),
                     "average_confidence": average_confidence,
                     "processing_region": session.region,
+                    **latency_stats,
                 },
             }
 
@@ -539,11 +650,7 @@ class EnhancedTextExtractionAgent(BaseAgent):
                     "average_confidence": average_confidence,
                     "processing_stats": {
                         "extraction_time": execution_time,
-                        "events_per_second": (
-                            len(event_urls) / execution_time
-                            if execution_time > 0
-                            else 0
-                        ),
+                        **latency_stats,
                     },
                 },
                 region_used=session.region,
@@ -565,15 +672,315 @@ class EnhancedTextExtractionAgent(BaseAgent):
                 error_message=str(e),
             )
 
+    def _platform_config_key(self, platform_type: str) -> str:
+        """Config key for the platform detected from a URL"""
+        if platform_type in self.platform_configs:
+            return platform_type
+        # _detect_platform_type reports "luma" while the config key is "lu.ma"
+        return "lu.ma" if platform_type == "luma" else "generic"
+
+    def _concurrency_key(self, url: str, platform_type: str) -> str:
+        """Key URLs share a concurrency cap under: the platform, or the host for generic URLs"""
+        if self._platform_config_key(platform_type) != "generic":
+            return platform_type
+        return f"generic:{urlparse(url).netloc.lower()}"
+
+    def _get_platform_concurrency(self, platform_type: str) -> int:
+        """Per-platform concurrency cap for the platform detected from a URL"""
+        config = self.platform_configs.get(self._platform_config_key(platform_type), {})
+        return max(1, config.get("max_concurrency", DEFAULT_PLATFORM_CONCURRENCY))
+
+    def _compile_extraction_plans(
+        self, platform_configs: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, ExtractionPlan]:
+        return {
+            platform: compile_plan(platform, config, self.extraction_patterns)
+            for platform, config in platform_configs.items()
+        }
+
+    def reload_platform_configs(
+        self, platform_configs: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[str]:
+        """
+        Recompile extraction plans after platform configs change.
+
+        Every plan is compiled before any is swapped in, so a config that
+        fails to compile leaves the current configs and plans in place, and
+        extractions already running finish on the plan they started with.
+
+        Args:
+            platform_configs: Replacement configs (defaults to re-reading
+                self.platform_configs after in-place edits)
+
+        Returns:
+            Platforms whose plan changed
+
+        Raises:
+            ValueError: If a selector or regex does not compile
+        """
+        configs = self.platform_configs if platform_configs is None else platform_configs
+        plans = self._compile_extraction_plans(configs)
+        changed = [
+            platform for platform, plan in plans.items()
+            if self.extraction_plans.get(platform) is not plan
+        ]
+        self.platform_configs = configs
+        self.extraction_plans = plans
+        if changed:
+            logger.info(f"Reloaded extraction plans for: {', '.join(changed)}")
+        return changed
+
+    def get_extraction_plan(self, platform_type: str) -> ExtractionPlan:
+        """Compiled extraction plan for the platform detected from a URL"""
+        return self.extraction_plans[self._platform_config_key(platform_type)]
+
+    def extract_fields_from_html(
+        self, html: Union[str, HTMLDocument], event_url: str
+    ) -> Dict[str, FieldExtractionResult]:
+        """
+        Extract event fields from a fetched page with the platform's compiled plan.
+
+        Args:
+            html: Page HTML, or an HTMLDocument already parsed for other extractors
+            event_url: URL the page was fetched from (selects the platform plan)
+
+        Returns:
+            Dictionary of field name to FieldExtractionResult for the fields found
+        """
+        document = html if isinstance(html, HTMLDocument) else HTMLDocument(html, base_url=event_url)
+        plan = self.get_extraction_plan(self._detect_platform_type(event_url))
+
+        results = {}
+        for name, match in plan.execute(document).items():
+            value = self._clean_extracted_text(match.value, plan.fields_by_name[name].cleaners)
+            results[name] = FieldExtractionResult(
+                field_name=name,
+                raw_value=match.value,
+                processed_value=value,
+                confidence_score=match.confidence,
+                extraction_method=match.method,
+                validation_status="valid" if value else "invalid",
+            )
+        return results
+
+    async def iter_extracted_events(
+        self,
+        session: RegionalSession,
+        urls: List[str],
+        max_workers: Optional[int] = None,
+        url_timeout: Optional[float] = None,
+        pages: Optional[Mapping[str, str]] = None,
+    ) -> AsyncIterator[UrlExtractionOutcome]:
+        """
+        Extract many event URLs with bounded concurrency, yielding results as they complete
+
+        URLs are queued per platform (as detected by _detect_platform_type;
+        generic URLs per host), each served by as many workers as its
+        concurrency cap allows, so a single domain is never hammered. At most
+        max_workers extractions run at once across all queues, and a worker only
+        takes one of those slots after taking its URL, so a busy platform never
+        holds slots that URLs on other platforms could use. Every URL runs under
+        a timeout so a stuck page only costs its own slot.
+
+        Args:
+            session: Regional session for browser operations
+            urls: Event URLs to extract
+            max_workers: Override for the configured worker count
+            url_timeout: Override for the configured per-URL timeout in seconds
+            pages: Already fetched HTML by URL, extracted with the platform plans
+
+        Yields:
+            UrlExtractionOutcome for each URL, in completion order
+        """
+        if not urls:
+            return
+
+        worker_slots = asyncio.Semaphore(max_workers or self.max_workers)
+        timeout = url_timeout if url_timeout is not None else self.url_timeout
+
+        pending: Dict[str, asyncio.Queue] = {}
+        worker_counts: Dict[str, int] = {}
+        for url in urls:
+            platform_type = self._detect_platform_type(url)
+            key = self._concurrency_key(url, platform_type)
+            if key not in pending:
+                pending[key] = asyncio.Queue()
+                worker_counts[key] = self._get_platform_concurrency(platform_type)
+            pending[key].put_nowait((url, platform_type))
+        completed: asyncio.Queue = asyncio.Queue()
+
+        async def extract_one(url: str, platform_type: str) -> UrlExtractionOutcome:
+            async with worker_slots:
+                started = time.perf_counter()
+                try:
+                    event_data = await asyncio.wait_for(
+                        self._extract_event_data(
+                            session, url, session.region, html=(pages or {}).get(url)
+                        ),
+                        timeout=timeout,
+                    )
+                    return UrlExtractionOutcome(
+                        url, platform_type, event_data, time.perf_counter() - started
+                    )
+                except asyncio.TimeoutError:
+                    return UrlExtractionOutcome(
+                        url,
+                        platform_type,
+                        None,
+                        time.perf_counter() - started,
+                        timed_out=True,
+                    )
+                except Exception as e:
+                    return UrlExtractionOutcome(
+                        url,
+                        platform_type,
+                        None,
+                        time.perf_counter() - started,
+                        error=str(e),
+                    )
+
+        async def worker(queue: asyncio.Queue):
+            while True:
+                try:
+                    url, platform_type = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await completed.put(await extract_one(url, platform_type))
+
+        workers = [
+            asyncio.create_task(worker(queue))
+            for key, queue in pending.items()
+            for _ in range(min(worker_counts[key], queue.qsize()))
+        ]
+        try:
+            for _ in range(len(urls)):
+                yield await completed.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _stream_core_logic(
+        self, task: AgentTask, session: RegionalSession
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream extracted events one by one as their URLs complete
+
+        Events are handed downstream immediately and not retained in
+        extracted_events, so peak memory stays bounded on large crawls.
+
+        Args:
+            task: Task containing event URLs to process
+            session: Regional session for browser operations
+
+        Yields:
+            Serialized event dictionaries in completion order
+        """
+        event_urls = task.metadata.get("discovered_links", [])
+        start_time = asyncio.get_event_loop().time()
+        latencies = []
+        extracted = 0
+
+        async for outcome in self.iter_extracted_events(
+            session,
+            event_urls,
+            max_workers=task.metadata.get("max_workers"),
+            pages=task.metadata.get("page_html"),
+        ):
+            latencies.append(outcome.latency)
+            if outcome.timed_out:
+                self.extraction_stats["timed_out_extractions"] += 1
+            if outcome.event_data is None:
+                continue
+            if self._is_near_duplicate(outcome.event_data):
+                self.extracted_events.pop(outcome.url, None)
+                continue
+            extracted += 1
+            self.extracted_events.pop(outcome.url, None)
+            serialized = self._serialize_event(outcome.event_data)
+            await self._buffer_event(outcome.event_data, serialized)
+            yield serialized
+
+        self._update_throughput_stats(
+            extracted, latencies, asyncio.get_event_loop().time() - start_time
+        )
+
+    def _is_near_duplicate(self, event: ExtractedEventData) -> bool:
+        """Run the dedup stage; new events are added to the index as a side effect"""
+        if self.dedup_index is None:
+            return False
+        match = self.dedup_index.check_and_add(event)
+        if match is None:
+            return False
+        self.extraction_stats["near_duplicates"] += 1
+        logger.info(
+            f"Skipping near-duplicate event {event.url} "
+            f"(matches {match.event_id}, similarity {match.similarity:.2f})"
+        )
+        return True
+
+    async def _buffer_event(
+        self, event: ExtractedEventData, serialized: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Journal an extracted event for write-behind persistence, if configured"""
+        if self.result_buffer is None:
+            return
+        await self.result_buffer.put(serialized or self._serialize_event(event))
+
+    def _serialize_event(self, event: ExtractedEventData) -> Dict[str, Any]:
+        """Convert extracted event data into the dictionary handed to the next agent"""
+        return {
+            "url": event.url,
+            "title": event.title,
+            "description": event.description,
+            "start_date": event.start_date.isoformat() if event.start_date else None,
+            "end_date": event.end_date.isoformat() if event.end_date else None,
+            "location": event.location,
+            "organizer": event.organizer,
+            "pricing": event.pricing,
+            "registration": event.registration,
+            "metadata": event.metadata,
+            "confidence": event.extraction_confidence,
+        }
+
+    def _update_throughput_stats(
+        self, events_extracted: int, latencies: List[float], elapsed: float
+    ) -> Dict[str, float]:
+        """Record events/sec and latency percentiles for a finished batch"""
+        ordered = sorted(latencies)
+        latency_stats = {
+            "events_per_second": events_extracted / elapsed if elapsed > 0 else 0.0,
+            "latency_p50": _percentile(ordered, 50),
+            "latency_p95": _percentile(ordered, 95),
+        }
+        self.extraction_stats.update(latency_stats)
+        return latency_stats
+
     async def _extract_event_data(
-        self, session: RegionalSession, event_url: str, region: str
+        self,
+        session: RegionalSession,
+        event_url: str,
+        region: str,
+        html: Optional[str] = None,
     ) -> Optional[ExtractedEventData]:
-        """Extract comprehensive event data from a single event URL"""
+        """
+        Extract comprehensive event data from a single event URL
+
+        Args:
+            session: Regional session for browser operations
+            event_url: Event page URL
+            region: Region the extraction runs in
+            html: Page HTML fetched upstream; extracted with the platform's
+                compiled plan when given
+        """
 
         try:
             # Detect platform type
             platform_type = self._detect_platform_type(event_url)
-            # Note: platform_configs will be used in actual implementation with session browser
+            if html is not None:
+                extracted_data = self._event_from_html(html, event_url, platform_type, region)
+                self.extracted_events[event_url] = extracted_data
+                return extracted_data
 
             # Simulate extraction - in production this would use the session browser
             # For now, create structured event data based on URL and platform
@@ -629,6 +1036,58 @@ class EnhancedTextExtractionAgent(BaseAgent):
             logger.error(f"Error extracting event data from {event_url}: {e}")
             return None
 
+    def _event_from_html(
+        self, html: str, event_url: str, platform_type: str, region: str
+    ) -> ExtractedEventData:
+        """Build event data from the fields the platform plan finds in a page"""
+        fields = self.extract_fields_from_html(html, event_url)
+
+        def value(name: str) -> Optional[str]:
+            result = fields.get(name)
+            return result.processed_value if result and result.processed_value else None
+
+        plan = self.get_extraction_plan(platform_type)
+        confidence = (
+            sum(result.confidence_score for result in fields.values()) / len(plan.fields)
+            if plan.fields
+            else 0.0
+        )
+        return ExtractedEventData(
+            url=event_url,
+            title=value("title") or "",
+            description=value("description") or "",
+            start_date=self._parse_datetime(value("start_date")),
+            end_date=self._parse_datetime(value("end_date")),
+            location={"name": value("location")} if value("location") else {},
+            organizer={"name": value("organizer")} if value("organizer") else {},
+            pricing={"price": value("price")} if value("price") else {},
+            registration={
+                "url": event_url,
+                "deadline": None,
+                "capacity": None,
+                "available_spots": None,
+            },
+            metadata={
+                "platform": platform_type,
+                "extraction_method": "selector_plan",
+                "extraction_region": region,
+                "extraction_timestamp": datetime.now(timezone.utc).isoformat(),
+                "data_sources": sorted({result.extraction_method for result in fields.values()}),
+            },
+            extraction_confidence=confidence,
+            field_extraction_results=fields,
+        )
+
+    @staticmethod
+    def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+        """Parse an ISO 8601 date from structured data; other formats give None"""
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
     def _detect_platform_type(self, url: str) -> str:
         """Detect the event platform type from URL"""
 
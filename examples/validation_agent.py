@@ -23,7 +23,7 @@ import asyncio
 import logging
 import re
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any, Union, Set
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import json
@@ -32,6 +32,9 @@ from urllib.parse import urlparse
 # Data validation libraries
 from dateutil import parser as date_parser
 
+# Events validated per chunk by validate_batch before yielding the event loop
+DEFAULT_BATCH_CHUNK_SIZE = 1000
+
 
 class ValidationSeverity(Enum):
     """Validation issue severity levels"""
@@ -163,6 +166,16 @@ class PlatformValidator:
             },
         }
 
+        # Compile each platform's regex rules once instead of per event
+        self.compiled_patterns: Dict[str, Dict[str, "re.Pattern[str]"]] = {
+            platform: {
+                name: re.compile(pattern)
+                for name, pattern in rules.items()
+                if name.endswith("_pattern")
+            }
+            for platform, rules in self.platform_patterns.items()
+        }
+
     def detect_platform(self, event_data: Dict[str, Any]) -> str:
         """Detect event platform from URL or data patterns"""
         url = event_data.get("url", "").lower()
@@ -182,6 +195,13 @@ class PlatformValidator:
         """Get validation rules for specific platform"""
         return self.platform_patterns.get(platform, self.platform_patterns["generic"])
 
+    def get_compiled_pattern(
+        self, platform: str, rule_name: str
+    ) -> Optional["re.Pattern[str]"]:
+        """Get a precompiled regex rule for a specific platform"""
+        patterns = self.compiled_patterns.get(platform, self.compiled_patterns["generic"])
+        return patterns.get(rule_name)
+
 
 # Import framework BaseAgent
 from core.agents.base import AsyncContextAgent
@@ -235,6 +255,10 @@ class EnhancedValidationAgent(AsyncContextAgent):
         # Initialize validation patterns
         self._init_validation_patterns()
 
+    def reset_for_lease(self, config: Optional[Dict[str, Any]] = None):
+        """Return a pooled instance to the state __init__ gives it (only config varies)"""
+        self.config = config or {}
+
     def _init_validation_patterns(self):
         """Initialize validation patterns and rules"""
         self.validation_patterns = {
@@ -272,11 +296,8 @@ class EnhancedValidationAgent(AsyncContextAgent):
             platform = self.platform_validator.detect_platform(event_data)
             platform_rules = self.platform_validator.get_platform_rules(platform)
 
-            # Initialize validation tracking
-            issues: List[ValidationIssue] = []
-            corrections_applied: List[Dict[str, Any]] = []
-
             # Perform validation checks
+            issues: List[ValidationIssue] = []
             format_score = await self._validate_format(
                 event_data, platform_rules, issues
             )
@@ -291,63 +312,19 @@ class EnhancedValidationAgent(AsyncContextAgent):
                 event_data, platform, platform_rules, issues
             )
 
-            # Apply corrections if enabled
-            if correction_mode:
-                corrections_applied = await self._apply_corrections(event_data, issues)
-
-            # Calculate overall scores
-            confidence_score = self._calculate_confidence_score(
-                format_score, consistency_score, completeness_score, accuracy_score
-            )
-            overall_quality_score = self._calculate_overall_quality_score(
-                format_score,
-                consistency_score,
-                completeness_score,
-                accuracy_score,
-                platform_score,
-            )
-
-            # Determine if data passes validation
-            is_valid = overall_quality_score >= self.quality_thresholds[
-                "acceptable"
-            ] and not any(
-                issue.severity == ValidationSeverity.CRITICAL for issue in issues
-            )
-
-            # Create validation metadata
-            metadata = {
-                "platform": platform,
-                "source_agent": source_agent,
-                "validation_timestamp": datetime.now().isoformat(),
-                "total_issues": len(issues),
-                "critical_issues": sum(
-                    1 for i in issues if i.severity == ValidationSeverity.CRITICAL
-                ),
-                "correctable_issues": sum(
-                    1 for i in issues if i.suggested_correction is not None
-                ),
-                "field_count": len(event_data),
-                "required_fields_present": self._count_required_fields(
-                    event_data, platform_rules
-                ),
-            }
-
-            result = ValidationResult(
-                is_valid=is_valid,
-                confidence_score=confidence_score,
-                completeness_score=completeness_score,
-                accuracy_score=accuracy_score,
-                consistency_score=consistency_score,
-                overall_quality_score=overall_quality_score,
-                platform_specific_score=platform_score,
-                issues=issues,
-                corrections_applied=corrections_applied,
-                validation_metadata=metadata,
+            result = await self._build_result(
+                event_data,
+                platform,
+                platform_rules,
+                source_agent,
+                correction_mode,
+                (format_score, consistency_score, completeness_score, accuracy_score, platform_score),
+                issues,
             )
 
             self.logger.info(
                 f"Validation complete for {event_data.get('name', 'unnamed')}: "
-                f"Valid={is_valid}, Quality={overall_quality_score:.2f}, "
+                f"Valid={result.is_valid}, Quality={result.overall_quality_score:.2f}, "
                 f"Issues={len(issues)}, Platform={platform}"
             )
 
@@ -355,152 +332,427 @@ class EnhancedValidationAgent(AsyncContextAgent):
 
         except Exception as e:
             self.logger.error(f"Validation error: {str(e)}")
-            return ValidationResult(
-                is_valid=False,
-                confidence_score=0.0,
-                completeness_score=0.0,
-                accuracy_score=0.0,
-                consistency_score=0.0,
-                overall_quality_score=0.0,
-                issues=[
-                    ValidationIssue(
-                        category=ValidationCategory.FORMAT,
-                        severity=ValidationSeverity.CRITICAL,
-                        field="validation_process",
-                        message=f"Validation process failed: {str(e)}",
-                        current_value=None,
-                    )
-                ],
-                validation_metadata={"error": str(e)},
-            )
+            return self._error_result(e)
 
-    async def _validate_format(
+    async def _build_result(
         self,
         event_data: Dict[str, Any],
+        platform: str,
         platform_rules: Dict[str, Any],
+        source_agent: str,
+        correction_mode: bool,
+        scores: Tuple[float, float, float, float, float],
         issues: List[ValidationIssue],
-    ) -> float:
-        """Validate data format compliance"""
-        format_score = 1.0
-        checks_performed = 0
-        failed_checks = 0
+    ) -> ValidationResult:
+        """Apply corrections and combine check scores into a ValidationResult"""
+        (
+            format_score,
+            consistency_score,
+            completeness_score,
+            accuracy_score,
+            platform_score,
+        ) = scores
+
+        # Apply corrections if enabled
+        corrections_applied: List[Dict[str, Any]] = []
+        if correction_mode:
+            corrections_applied = await self._apply_corrections(event_data, issues)
+
+        # Calculate overall scores
+        confidence_score = self._calculate_confidence_score(
+            format_score, consistency_score, completeness_score, accuracy_score
+        )
+        overall_quality_score = self._calculate_overall_quality_score(
+            format_score,
+            consistency_score,
+            completeness_score,
+            accuracy_score,
+            platform_score,
+        )
 
-        # URL format validation
-        if "url" in event_data:
-            checks_performed += 1
-            url = event_data["url"]
-            if not self._is_valid_url(url):
-                failed_checks += 1
-                issues.append(
-                    ValidationIssue(
-                        category=ValidationCategory.FORMAT,
-                        severity=ValidationSeverity.HIGH,
-                        field="url",
-                        message="Invalid URL format",
-                        current_value=url,
-                        suggested_correction=self._clean_url(url),
-                        confidence=0.7,
-                        rule_name="url_format",
-                    )
-                )
+        # Determine if data passes validation
+        is_valid = overall_quality_score >= self.quality_thresholds[
+            "acceptable"
+        ] and not any(
+            issue.severity == ValidationSeverity.CRITICAL for issue in issues
+        )
 
-        # Title format validation
-        if "name" in event_data:
-            checks_performed += 1
-            name = event_data["name"]
-            min_length = platform_rules.get("title_min_length", 3)
-            max_length = platform_rules.get("title_max_length", 300)
+        # Create validation metadata
+        metadata = {
+            "platform": platform,
+            "source_agent": source_agent,
+            "validation_timestamp": datetime.now().isoformat(),
+            "total_issues": len(issues),
+            "critical_issues": sum(
+                1 for i in issues if i.severity == ValidationSeverity.CRITICAL
+            ),
+            "correctable_issues": sum(
+                1 for i in issues if i.suggested_correction is not None
+            ),
+            "field_count": len(event_data),
+            "required_fields_present": self._count_required_fields(
+                event_data, platform_rules
+            ),
+        }
 
-            if not isinstance(name, str) or len(name.strip()) < min_length:
-                failed_checks += 1
-                issues.append(
-                    ValidationIssue(
-                        category=ValidationCategory.FORMAT,
-                        severity=ValidationSeverity.HIGH,
-                        field="name",
-                        message=f"Title too short (minimum {min_length} characters)",
-                        current_value=name,
-                        suggested_correction=self._enhance_title(name),
-                        confidence=0.6,
-                        rule_name="title_length",
-                    )
+        return ValidationResult(
+            is_valid=is_valid,
+            confidence_score=confidence_score,
+            completeness_score=completeness_score,
+            accuracy_score=accuracy_score,
+            consistency_score=consistency_score,
+            overall_quality_score=overall_quality_score,
+            platform_specific_score=platform_score,
+            issues=issues,
+            corrections_applied=corrections_applied,
+            validation_metadata=metadata,
+        )
+
+    def _error_result(self, error: Exception) -> ValidationResult:
+        """ValidationResult for an event whose validation raised"""
+        return ValidationResult(
+            is_valid=False,
+            confidence_score=0.0,
+            completeness_score=0.0,
+            accuracy_score=0.0,
+            consistency_score=0.0,
+            overall_quality_score=0.0,
+            issues=[
+                ValidationIssue(
+                    category=ValidationCategory.FORMAT,
+                    severity=ValidationSeverity.CRITICAL,
+                    field="validation_process",
+                    message=f"Validation process failed: {str(error)}",
+                    current_value=None,
                 )
-            elif len(name) > max_length:
-                failed_checks += 1
-                issues.append(
-                    ValidationIssue(
-                        category=ValidationCategory.FORMAT,
-                        severity=ValidationSeverity.MEDIUM,
-                        field="name",
-                        message=f"Title too long (maximum {max_length} characters)",
-                        current_value=name,
-                        suggested_correction=name[: max_length - 3] + "...",
-                        confidence=0.9,
-                        rule_name="title_length",
-                    )
+            ],
+            validation_metadata={"error": str(error)},
+        )
+
+    async def process_item(self, event_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Validate one event handed over by an upstream pipeline stage
+
+        The validation result is attached under the "validation" key. Invalid
+        events are dropped when the "drop_invalid_items" config option is set.
+
+        Args:
+            event_data: Event data dictionary from the previous stage
+
+        Returns:
+            The annotated event, or None if it was dropped
+        """
+        result = await self.validate_event_data(
+            event_data, source_agent=self.config.get("source_agent", "pipeline")
+        )
+        if not result.is_valid and self.config.get("drop_invalid_items", False):
+            return None
+        return {**event_data, "validation": result.to_dict()}
+
+    async def validate_batch(
+        self,
+        events: List[Dict[str, Any]],
+        source_agent: str = "unknown",
+        correction_mode: bool = True,
+        chunk_size: Optional[int] = None,
+    ) -> List[ValidationResult]:
+        """
+        Validate many events at once with column-wise rule evaluation
+
+        Results match calling validate_event_data on each event, but platform
+        rules are resolved once per platform, dates are parsed once per
+        distinct value, and every rule makes a single pass over its field
+        across the batch. The checks are CPU-bound, so each chunk's checks run
+        one after another in a worker thread, keeping the event loop free.
+
+        Args:
+            events: Event data dictionaries to validate
+            source_agent: Name of agent that provided the data
+            correction_mode: Whether to apply automatic corrections
+            chunk_size: Events per chunk (defaults to the "batch_chunk_size"
+                config option)
+
+        Returns:
+            ValidationResults in the same order as events
+        """
+        chunk_size = chunk_size or self.config.get(
+            "batch_chunk_size", DEFAULT_BATCH_CHUNK_SIZE
+        )
+        results: List[ValidationResult] = []
+
+        for offset in range(0, len(events), chunk_size):
+            results.extend(
+                await self._validate_chunk(
+                    events[offset : offset + chunk_size], source_agent, correction_mode
                 )
+            )
 
-        # Date format validation
-        if "start_time" in event_data:
-            checks_performed += 1
-            start_time = event_data["start_time"]
-            if not self._validate_date_format(start_time):
-                failed_checks += 1
-                issues.append(
-                    ValidationIssue(
-                        category=ValidationCategory.FORMAT,
-                        severity=ValidationSeverity.HIGH,
-                        field="start_time",
-                        message="Invalid date/time format",
-                        current_value=start_time,
-                        suggested_correction=self._normalize_date(start_time),
-                        confidence=0.8,
-                        rule_name="datetime_format",
+        self.logger.info(
+            f"Batch validation complete: {len(results)} events, "
+            f"{sum(1 for r in results if r.is_valid)} valid"
+        )
+        return results
+
+    async def _validate_chunk(
+        self,
+        events: List[Dict[str, Any]],
+        source_agent: str,
+        correction_mode: bool,
+    ) -> List[ValidationResult]:
+        """Validate one chunk of a batch column-wise"""
+        # Events whose validation raised, keyed by position (first error wins)
+        errors: Dict[int, Exception] = {}
+        platforms: List[str] = []
+        for i, event_data in enumerate(events):
+            try:
+                platforms.append(self.platform_validator.detect_platform(event_data))
+            except Exception as e:
+                errors[i] = e
+                platforms.append("generic")
+        rules = [self.platform_validator.get_platform_rules(p) for p in platforms]
+
+        checks = await asyncio.to_thread(
+            self._run_chunk_checks, events, platforms, rules, errors
+        )
+
+        results: List[ValidationResult] = []
+        for i, event_data in enumerate(events):
+            if i not in errors:
+                issues = [issue for _, check_issues in checks for issue in check_issues[i]]
+                scores = tuple(check_scores[i] for check_scores, _ in checks)
+                try:
+                    results.append(
+                        await self._build_result(
+                            event_data,
+                            platforms[i],
+                            rules[i],
+                            source_agent,
+                            correction_mode,
+                            scores,
+                            issues,
+                        )
                     )
-                )
+                    continue
+                except Exception as e:
+                    errors[i] = e
+            self.logger.error(f"Validation error: {str(errors[i])}")
+            results.append(self._error_result(errors[i]))
+
+        return results
 
-        # Calculate format score
-        if checks_performed > 0:
-            format_score = 1.0 - (failed_checks / checks_performed)
+    def _run_chunk_checks(
+        self,
+        events: List[Dict[str, Any]],
+        platforms: List[str],
+        rules: List[Dict[str, Any]],
+        errors: Dict[int, Exception],
+    ) -> List[Tuple[List[float], List[List[ValidationIssue]]]]:
+        """Run the five column-wise checks over a chunk, in check order"""
+        # Each distinct date string is parsed once for all checks
+        date_cache: Dict[str, Optional[datetime]] = {}
+
+        def parse_date(value: Any) -> Optional[datetime]:
+            if not value:
+                return None
+            key = str(value)
+            if key not in date_cache:
+                date_cache[key] = self._parse_date(key)
+            return date_cache[key]
+
+        return [
+            self._validate_format_batch(events, rules, parse_date, errors),
+            self._validate_consistency_batch(events, parse_date, errors),
+            self._validate_completeness_batch(events, rules, errors),
+            self._validate_accuracy_batch(events, parse_date, errors),
+            self._validate_platform_specific_batch(events, platforms, errors),
+        ]
+
+    @staticmethod
+    def _check_score(checks_performed: int, failed_checks: int) -> float:
+        """Share of passed checks, 1.0 when nothing was checked"""
+        if checks_performed == 0:
+            return 1.0
+        return max(0.0, 1.0 - (failed_checks / checks_performed))
+
+    # Per-field rules shared by single-event and batch validation
+
+    def _url_format_issue(self, url: Any) -> Optional[ValidationIssue]:
+        if self._is_valid_url(url):
+            return None
+        return ValidationIssue(
+            category=ValidationCategory.FORMAT,
+            severity=ValidationSeverity.HIGH,
+            field="url",
+            message="Invalid URL format",
+            current_value=url,
+            suggested_correction=self._clean_url(url),
+            confidence=0.7,
+            rule_name="url_format",
+        )
 
-        return max(0.0, format_score)
+    def _title_format_issue(
+        self, name: Any, platform_rules: Dict[str, Any]
+    ) -> Optional[ValidationIssue]:
+        min_length = platform_rules.get("title_min_length", 3)
+        max_length = platform_rules.get("title_max_length", 300)
+
+        if not isinstance(name, str) or len(name.strip()) < min_length:
+            return ValidationIssue(
+                category=ValidationCategory.FORMAT,
+                severity=ValidationSeverity.HIGH,
+                field="name",
+                message=f"Title too short (minimum {min_length} characters)",
+                current_value=name,
+                suggested_correction=self._enhance_title(name),
+                confidence=0.6,
+                rule_name="title_length",
+            )
+        if len(name) > max_length:
+            return ValidationIssue(
+                category=ValidationCategory.FORMAT,
+                severity=ValidationSeverity.MEDIUM,
+                field="name",
+                message=f"Title too long (maximum {max_length} characters)",
+                current_value=name,
+                suggested_correction=name[: max_length - 3] + "...",
+                confidence=0.9,
+                rule_name="title_length",
+            )
+        return None
+
+    def _date_format_issue(
+        self, start_time: Any, parsed: Optional[datetime]
+    ) -> Optional[ValidationIssue]:
+        if parsed is not None:
+            return None
+        return ValidationIssue(
+            category=ValidationCategory.FORMAT,
+            severity=ValidationSeverity.HIGH,
+            field="start_time",
+            message="Invalid date/time format",
+            current_value=start_time,
+            suggested_correction=self._normalize_date(start_time),
+            confidence=0.8,
+            rule_name="datetime_format",
+        )
+
+    def _date_order_issue(
+        self,
+        end_value: Any,
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+    ) -> Optional[ValidationIssue]:
+        if not (start_time and end_time and start_time >= end_time):
+            return None
+        return ValidationIssue(
+            category=ValidationCategory.CONSISTENCY,
+            severity=ValidationSeverity.HIGH,
+            field="end_time",
+            message="End time must be after start time",
+            current_value=end_value,
+            suggested_correction=(start_time + timedelta(hours=2)).isoformat(),
+            confidence=0.8,
+            rule_name="date_consistency",
+        )
+
+    def _required_field_issue(
+        self, field: str, event_data: Dict[str, Any]
+    ) -> Optional[ValidationIssue]:
+        if (
+            field in event_data
+            and event_data[field]
+            and str(event_data[field]).strip()
+        ):
+            return None
+        return ValidationIssue(
+            category=ValidationCategory.COMPLETENESS,
+            severity=ValidationSeverity.HIGH,
+            field=field,
+            message=f"Required field '{field}' is missing or empty",
+            current_value=event_data.get(field),
+            suggested_correction=self._suggest_field_value(field, event_data),
+            confidence=0.5,
+            rule_name="required_fields",
+        )
+
+    def _past_date_issue(
+        self, start_value: Any, start_time: Optional[datetime], cutoff: datetime
+    ) -> Optional[ValidationIssue]:
+        if not (start_time and start_time < cutoff):
+            return None
+        return ValidationIssue(
+            category=ValidationCategory.ACCURACY,
+            severity=ValidationSeverity.MEDIUM,
+            field="start_time",
+            message="Event date appears to be in the past",
+            current_value=start_value,
+            confidence=0.8,
+            rule_name="future_date",
+        )
+
+    def _luma_url_issue(self, url: Any) -> Optional[ValidationIssue]:
+        url_pattern = self.platform_validator.get_compiled_pattern("luma", "url_pattern")
+        if not ("lu.ma" in url and not url_pattern.match(url)):
+            return None
+        return ValidationIssue(
+            category=ValidationCategory.PLATFORM_SPECIFIC,
+            severity=ValidationSeverity.MEDIUM,
+            field="url",
+            message="URL doesn't match Lu.ma pattern",
+            current_value=url,
+            confidence=0.8,
+            rule_name="luma_url_pattern",
+        )
+
+    # Single-event checks
+
+    async def _validate_format(
+        self,
+        event_data: Dict[str, Any],
+        platform_rules: Dict[str, Any],
+        issues: List[ValidationIssue],
+    ) -> float:
+        """Validate data format compliance"""
+        checks_performed = 0
+        failed_checks = 0
+
+        for field, find_issue in (
+            ("url", lambda value: self._url_format_issue(value)),
+            ("name", lambda value: self._title_format_issue(value, platform_rules)),
+            (
+                "start_time",
+                lambda value: self._date_format_issue(value, self._parse_date(value)),
+            ),
+        ):
+            if field in event_data:
+                checks_performed += 1
+                issue = find_issue(event_data[field])
+                if issue:
+                    failed_checks += 1
+                    issues.append(issue)
+
+        return self._check_score(checks_performed, failed_checks)
 
     async def _validate_consistency(
         self, event_data: Dict[str, Any], issues: List[ValidationIssue]
     ) -> float:
         """Validate internal data consistency"""
-        consistency_score = 1.0
         checks_performed = 0
         failed_checks = 0
 
         # Date consistency checks
         if "start_time" in event_data and "end_time" in event_data:
             checks_performed += 1
-            start_time = self._parse_date(event_data["start_time"])
-            end_time = self._parse_date(event_data["end_time"])
-
-            if start_time and end_time and start_time >= end_time:
+            issue = self._date_order_issue(
+                event_data["end_time"],
+                self._parse_date(event_data["start_time"]),
+                self._parse_date(event_data["end_time"]),
+            )
+            if issue:
                 failed_checks += 1
-                issues.append(
-                    ValidationIssue(
-                        category=ValidationCategory.CONSISTENCY,
-                        severity=ValidationSeverity.HIGH,
-                        field="end_time",
-                        message="End time must be after start time",
-                        current_value=event_data["end_time"],
-                        suggested_correction=(
-                            start_time + timedelta(hours=2)
-                        ).isoformat(),
-                        confidence=0.8,
-                        rule_name="date_consistency",
-                    )
-                )
-
-        # Calculate consistency score
-        if checks_performed > 0:
-            consistency_score = 1.0 - (failed_checks / checks_performed)
+                issues.append(issue)
 
-        return max(0.0, consistency_score)
+        return self._check_score(checks_performed, failed_checks)
 
     async def _validate_completeness(
         self,
@@ -514,27 +766,11 @@ class EnhancedValidationAgent(AsyncContextAgent):
         present_fields = 0
 
         for field in required_fields:
-            if (
-                field in event_data
-                and event_data[field]
-                and str(event_data[field]).strip()
-            ):
-                present_fields += 1
+            issue = self._required_field_issue(field, event_data)
+            if issue:
+                issues.append(issue)
             else:
-                issues.append(
-                    ValidationIssue(
-                        category=ValidationCategory.COMPLETENESS,
-                        severity=ValidationSeverity.HIGH,
-                        field=field,
-                        message=f"Required field '{field}' is missing or empty",
-                        current_value=event_data.get(field),
-                        suggested_correction=self._suggest_field_value(
-                            field, event_data
-                        ),
-                        confidence=0.5,
-                        rule_name="required_fields",
-                    )
-                )
+                present_fields += 1
 
         completeness_score = present_fields / total_fields if total_fields > 0 else 1.0
         return max(0.0, completeness_score)
@@ -546,33 +782,22 @@ class EnhancedValidationAgent(AsyncContextAgent):
         issues: List[ValidationIssue],
     ) -> float:
         """Validate data accuracy through pattern matching"""
-        accuracy_score = 1.0
         checks_performed = 0
         failed_checks = 0
 
         # Future date validation
         if "start_time" in event_data:
             checks_performed += 1
-            start_time = self._parse_date(event_data["start_time"])
-            if start_time and start_time < datetime.now() - timedelta(days=1):
+            issue = self._past_date_issue(
+                event_data["start_time"],
+                self._parse_date(event_data["start_time"]),
+                datetime.now() - timedelta(days=1),
+            )
+            if issue:
                 failed_checks += 1
-                issues.append(
-                    ValidationIssue(
-                        category=ValidationCategory.ACCURACY,
-                        severity=ValidationSeverity.MEDIUM,
-                        field="start_time",
-                        message="Event date appears to be in the past",
-                        current_value=event_data["start_time"],
-                        confidence=0.8,
-                        rule_name="future_date",
-                    )
-                )
-
-        # Calculate accuracy score
-        if checks_performed > 0:
-            accuracy_score = 1.0 - (failed_checks / checks_performed)
+                issues.append(issue)
 
-        return max(0.0, accuracy_score)
+        return self._check_score(checks_performed, failed_checks)
 
     async def _validate_platform_specific(
         self,
@@ -584,26 +809,166 @@ class EnhancedValidationAgent(AsyncContextAgent):
         """Platform-specific validation rules"""
         platform_score = 1.0
 
-        if platform == "luma":
+        if platform == "luma" and "url" in event_data:
             # Lu.ma specific validations
-            if "url" in event_data:
-                url = event_data["url"]
-                if "lu.ma" in url and not re.match(platform_rules["url_pattern"], url):
-                    issues.append(
-                        ValidationIssue(
-                            category=ValidationCategory.PLATFORM_SPECIFIC,
-                            severity=ValidationSeverity.MEDIUM,
-                            field="url",
-                            message="URL doesn't match Lu.ma pattern",
-                            current_value=url,
-                            confidence=0.8,
-                            rule_name="luma_url_pattern",
-                        )
-                    )
-                    platform_score -= 0.2
+            issue = self._luma_url_issue(event_data["url"])
+            if issue:
+                issues.append(issue)
+                platform_score -= 0.2
 
         return max(0.0, platform_score)
 
+    # Column-wise batch checks: one pass per field over the whole chunk.
+    # Each returns (scores, issues) indexed like the events list.
+
+    def _validate_format_batch(
+        self,
+        events: List[Dict[str, Any]],
+        rules: List[Dict[str, Any]],
+        parse_date: Callable[[Any], Optional[datetime]],
+        errors: Dict[int, Exception],
+    ) -> Tuple[List[float], List[List[ValidationIssue]]]:
+        checks_performed = [0] * len(events)
+        failed_checks = [0] * len(events)
+        issues: List[List[ValidationIssue]] = [[] for _ in events]
+
+        for field, find_issue in (
+            ("url", lambda i, value: self._url_format_issue(value)),
+            ("name", lambda i, value: self._title_format_issue(value, rules[i])),
+            (
+                "start_time",
+                lambda i, value: self._date_format_issue(value, parse_date(value)),
+            ),
+        ):
+            for i, event_data in enumerate(events):
+                if field not in event_data or i in errors:
+                    continue
+                try:
+                    checks_performed[i] += 1
+                    issue = find_issue(i, event_data[field])
+                except Exception as e:
+                    errors.setdefault(i, e)
+                    continue
+                if issue:
+                    failed_checks[i] += 1
+                    issues[i].append(issue)
+
+        scores = [
+            self._check_score(checks_performed[i], failed_checks[i])
+            for i in range(len(events))
+        ]
+        return scores, issues
+
+    def _validate_consistency_batch(
+        self,
+        events: List[Dict[str, Any]],
+        parse_date: Callable[[Any], Optional[datetime]],
+        errors: Dict[int, Exception],
+    ) -> Tuple[List[float], List[List[ValidationIssue]]]:
+        scores = [1.0] * len(events)
+        issues: List[List[ValidationIssue]] = [[] for _ in events]
+
+        for i, event_data in enumerate(events):
+            if "start_time" not in event_data or "end_time" not in event_data:
+                continue
+            try:
+                issue = self._date_order_issue(
+                    event_data["end_time"],
+                    parse_date(event_data["start_time"]),
+                    parse_date(event_data["end_time"]),
+                )
+            except Exception as e:
+                errors.setdefault(i, e)
+                continue
+            if issue:
+                scores[i] = 0.0
+                issues[i].append(issue)
+
+        return scores, issues
+
+    def _validate_completeness_batch(
+        self,
+        events: List[Dict[str, Any]],
+        rules: List[Dict[str, Any]],
+        errors: Dict[int, Exception],
+    ) -> Tuple[List[float], List[List[ValidationIssue]]]:
+        scores = [1.0] * len(events)
+        issues: List[List[ValidationIssue]] = [[] for _ in events]
+
+        # Group by rule set so each required field is one pass over its events
+        groups: Dict[int, List[int]] = {}
+        for i, platform_rules in enumerate(rules):
+            groups.setdefault(id(platform_rules), []).append(i)
+
+        for indices in groups.values():
+            required_fields = rules[indices[0]].get("required_fields", ["name", "url"])
+            present = dict.fromkeys(indices, 0)
+            for field in required_fields:
+                for i in indices:
+                    try:
+                        issue = self._required_field_issue(field, events[i])
+                    except Exception as e:
+                        errors.setdefault(i, e)
+                        continue
+                    if issue:
+                        issues[i].append(issue)
+                    else:
+                        present[i] += 1
+            if required_fields:
+                for i in indices:
+                    scores[i] = present[i] / len(required_fields)
+
+        return scores, issues
+
+    def _validate_accuracy_batch(
+        self,
+        events: List[Dict[str, Any]],
+        parse_date: Callable[[Any], Optional[datetime]],
+        errors: Dict[int, Exception],
+    ) -> Tuple[List[float], List[List[ValidationIssue]]]:
+        scores = [1.0] * len(events)
+        issues: List[List[ValidationIssue]] = [[] for _ in events]
+        cutoff = datetime.now() - timedelta(days=1)
+
+        for i, event_data in enumerate(events):
+            if "start_time" not in event_data:
+                continue
+            try:
+                issue = self._past_date_issue(
+                    event_data["start_time"], parse_date(event_data["start_time"]), cutoff
+                )
+            except Exception as e:
+                errors.setdefault(i, e)
+                continue
+            if issue:
+                scores[i] = 0.0
+                issues[i].append(issue)
+
+        return scores, issues
+
+    def _validate_platform_specific_batch(
+        self,
+        events: List[Dict[str, Any]],
+        platforms: List[str],
+        errors: Dict[int, Exception],
+    ) -> Tuple[List[float], List[List[ValidationIssue]]]:
+        scores = [1.0] * len(events)
+        issues: List[List[ValidationIssue]] = [[] for _ in events]
+
+        for i, event_data in enumerate(events):
+            if platforms[i] != "luma" or "url" not in event_data:
+                continue
+            try:
+                issue = self._luma_url_issue(event_data["url"])
+            except Exception as e:
+                errors.setdefault(i, e)
+                continue
+            if issue:
+                scores[i] = max(0.0, scores[i] - 0.2)
+                issues[i].append(issue)
+
+        return scores, issues
+
     async def _apply_corrections(
         self, event_data: Dict[str, Any], issues: List[ValidationIssue]
     ) -> List[Dict[str, Any]]:
@@ -0,0 +1,437 @@
+"""
+Static Agent Discovery Index for Agent Forge
+
+Finds agent classes by parsing source files with ``ast`` instead of importing
+them, and persists what it found in a JSON manifest keyed by file path,
+modification time, size and content hash. Unchanged files are never parsed
+again, and an agent's module is only imported the first time its class is
+actually requested.
+
+An agent is any class that (transitively) inherits from one of the configured
+root classes, e.g. ``core.agents.base.AsyncContextAgent``. Base classes are
+resolved through each file's imports, so subclasses of subclasses defined in
+other scanned files are found too.
+"""
+
+import ast
+import hashlib
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import re
+import tempfile
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+DEFAULT_ROOT_CLASSES = ("core.agents.base.AsyncContextAgent",)
+
+
+def default_manifest_path() -> Path:
+    """Manifest location, overridable with AGENT_FORGE_DISCOVERY_MANIFEST."""
+    override = os.getenv("AGENT_FORGE_DISCOVERY_MANIFEST")
+    if override:
+        return Path(override)
+    return Path.home() / ".cache" / "agent_forge" / "agent_manifest.json"
+
+
+def normalize_agent_name(class_name: str) -> str:
+    """Convert an agent class name to a friendly snake_case name without the 'Agent' suffix."""
+    name = class_name
+    if name.endswith('Agent'):
+        name = name[:-5]
+    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', name).lower()
+
+
+@dataclass
+class AgentParameter:
+    """A constructor parameter as written in source"""
+
+    name: str
+    annotation: Optional[str] = None
+    default: Optional[str] = None
+    has_default: bool = False
+
+
+@dataclass
+class ClassRecord:
+    """A class definition found by static scanning"""
+
+    class_name: str
+    module: str
+    path: str
+    bases: List[str]
+    docstring: Optional[str] = None
+    init_params: Optional[List[AgentParameter]] = None
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.module}.{self.class_name}"
+
+
+@dataclass
+class AgentEntry:
+    """An indexed agent; importing its module is deferred until ``load``"""
+
+    name: str
+    class_name: str
+    module: str
+    path: str
+    docstring: Optional[str]
+    init_params: List[AgentParameter] = field(default_factory=list)
+
+    @property
+    def description(self) -> str:
+        doc = (self.docstring or "").strip()
+        return doc.split('\n')[0].strip() if doc else "No description available"
+
+    def load(self) -> Type[Any]:
+        """Import the agent's module and return the class."""
+        try:
+            module = importlib.import_module(self.module)
+        except ModuleNotFoundError as e:
+            if not self.module.startswith(str(e.name)):
+                raise
+            # Package not on sys.path: execute the file directly
+            spec = importlib.util.spec_from_file_location(self.module.rsplit('.', 1)[-1], self.path)
+            if spec is None or spec.loader is None:
+                raise
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        return getattr(module, self.class_name)
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """Render Name/Attribute chains like ``pkg.mod.Class``."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        prefix = _dotted_name(node.value)
+        return f"{prefix}.{node.attr}" if prefix else None
+    if isinstance(node, ast.Subscript):
+        # Generic bases such as Base[T]
+        return _dotted_name(node.value)
+    return None
+
+
+def _resolve_relative(module: str, is_package: bool, level: int, target: Optional[str]) -> str:
+    package_parts = module.split('.') if is_package else module.split('.')[:-1]
+    if level > 1:
+        package_parts = package_parts[: len(package_parts) - (level - 1)]
+    return '.'.join(package_parts + ([target] if target else []))
+
+
+def _init_params(node: ast.ClassDef) -> Optional[List[AgentParameter]]:
+    """Parameters of a class's own ``__init__``, or None if it does not define one."""
+    for item in node.body:
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name == "__init__":
+            args = item.args
+            positional = args.posonlyargs + args.args
+            defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+            params = []
+            for arg, default in list(zip(positional, defaults)) + list(zip(args.kwonlyargs, args.kw_defaults)):
+                if arg.arg == "self":
+                    continue
+                params.append(AgentParameter(
+                    name=arg.arg,
+                    annotation=ast.unparse(arg.annotation) if arg.annotation is not None else None,
+                    default=ast.unparse(default) if default is not None else None,
+                    has_default=default is not None,
+                ))
+            return params
+    return None
+
+
+def scan_source(source: str, module: str, path: str, is_package: bool = False) -> List[ClassRecord]:
+    """
+    Parse a module's source and return every top-level class with resolved base names.
+
+    Args:
+        source: Python source code
+        module: Dotted module name the file is imported as
+        path: File path, recorded for reference
+        is_package: Whether the file is a package ``__init__.py``
+
+    Returns:
+        List of ClassRecord objects
+    """
+    tree = ast.parse(source, filename=path)
+
+    # Map local names to the qualified names they were imported as
+    aliases: Dict[str, str] = {}
+    local_classes = {n.name for n in tree.body if isinstance(n, ast.ClassDef)}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+                else:
+                    top = alias.name.split('.')[0]
+                    aliases.setdefault(top, top)
+        elif isinstance(node, ast.ImportFrom):
+            source_module = (
+                _resolve_relative(module, is_package, node.level, node.module)
+                if node.level else node.module
+            )
+            for alias in node.names:
+                if alias.name != "*":
+                    aliases[alias.asname or alias.name] = f"{source_module}.{alias.name}"
+
+    def qualify(name: str) -> str:
+        head, _, rest = name.partition('.')
+        if head in local_classes and not rest:
+            return f"{module}.{head}"
+        if head in aliases:
+            return f"{aliases[head]}.{rest}" if rest else aliases[head]
+        return name
+
+    records = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        bases = [qualify(name) for name in (_dotted_name(b) for b in node.bases) if name]
+        records.append(ClassRecord(
+            class_name=node.name,
+            module=module,
+            path=path,
+            bases=bases,
+            docstring=ast.get_docstring(node),
+            init_params=_init_params(node),
+        ))
+    return records
+
+
+class AgentIndex:
+    """
+    Persistent, import-free index of agent classes under a set of packages.
+
+    Usage:
+        index = AgentIndex({"examples": Path("examples")})
+        entry = index.get("simple_navigation")
+        agent_class = index.load("simple_navigation")
+    """
+
+    def __init__(
+        self,
+        packages: Dict[str, Path],
+        root_classes: Iterable[str] = DEFAULT_ROOT_CLASSES,
+        manifest_path: Optional[Path] = None,
+        use_manifest: bool = True,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            packages: Mapping of importable package name to its directory
+            root_classes: Qualified names of base classes that mark an agent
+            manifest_path: JSON manifest location (defaults to default_manifest_path())
+            use_manifest: Read and write the manifest; False keeps the index in memory only
+        """
+        self.packages = {name: Path(path) for name, path in packages.items()}
+        self.root_classes = set(root_classes)
+        self.manifest_path = Path(manifest_path) if manifest_path else default_manifest_path()
+        self.use_manifest = use_manifest
+
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._entries: Optional[Dict[str, AgentEntry]] = None
+        self._loaded: Dict[str, Type[Any]] = {}
+        self.stats = {"files": 0, "parsed": 0, "hashed": 0, "reused": 0, "imports": 0}
+
+        if self.use_manifest:
+            self._read_manifest()
+
+    def _read_manifest(self) -> None:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self._files = data.get("files", {})
+
+    def _write_manifest(self) -> None:
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            # Merge with entries other indexes may have written for other packages
+            existing: Dict[str, Any] = {}
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    existing = data.get("files", {})
+            except (OSError, ValueError):
+                pass
+            existing.update(self._files)
+            fd, tmp_path = tempfile.mkstemp(dir=self.manifest_path.parent, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"version": MANIFEST_VERSION, "files": existing}, f)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            logger.debug(f"Could not write discovery manifest {self.manifest_path}: {e}")
+
+    def _iter_module_files(self) -> Iterator[Tuple[str, Path, bool]]:
+        """Yield (module name, file, is_package) for the top level of each package."""
+        for package, directory in self.packages.items():
+            if not directory.is_dir():
+                logger.debug(f"Agent package directory not found: {directory}")
+                continue
+            for child in sorted(directory.iterdir()):
+                if child.suffix == ".py" and not child.name.startswith("__"):
+                    yield f"{package}.{child.stem}", child, False
+                elif child.is_dir() and (child / "__init__.py").is_file():
+                    yield f"{package}.{child.name}", child / "__init__.py", True
+
+    def _scan_file(self, module: str, path: Path, is_package: bool) -> Dict[str, Any]:
+        """Return the manifest record for a file, parsing it only if its content changed."""
+        key = str(path.resolve())
+        stat = path.stat()
+        cached = self._files.get(key)
+
+        if cached and cached.get("module") == module and cached["mtime"] == stat.st_mtime and cached["size"] == stat.st_size:
+            self.stats["reused"] += 1
+            return cached
+
+        data = path.read_bytes()
+        digest = hashlib.sha1(data).hexdigest()
+        self.stats["hashed"] += 1
+        if cached and cached.get("module") == module and cached["sha1"] == digest:
+            # Touched but not modified
+            self.stats["reused"] += 1
+            cached.update(mtime=stat.st_mtime, size=stat.st_size)
+            return cached
+
+        try:
+            classes = [asdict(r) for r in scan_source(data.decode('utf-8'), module, key, is_package)]
+        except (SyntaxError, UnicodeDecodeError) as e:
+            logger.debug(f"Could not parse {path}: {e}")
+            classes = []
+        self.stats["parsed"] += 1
+        record = {"module": module, "mtime": stat.st_mtime, "size": stat.st_size, "sha1": digest, "classes": classes}
+        self._files[key] = record
+        return record
+
+    def refresh(self) -> Dict[str, AgentEntry]:
+        """
+        Re-check every file against the manifest and rebuild the agent table.
+
+        Returns:
+            Dictionary mapping agent names to AgentEntry objects
+        """
+        self.stats.update(files=0, parsed=0, hashed=0, reused=0)
+        records: List[ClassRecord] = []
+        for module, path, is_package in self._iter_module_files():
+            self.stats["files"] += 1
+            try:
+                file_record = self._scan_file(module, path, is_package)
+            except OSError as e:
+                logger.debug(f"Could not read {path}: {e}")
+                continue
+            for cls in file_record["classes"]:
+                params = cls.get("init_params")
+                records.append(ClassRecord(
+                    **{**cls, "init_params": [AgentParameter(**p) for p in params] if params is not None else None}
+                ))
+
+        if self.use_manifest and self.stats["hashed"]:
+            self._write_manifest()
+
+        self._entries = self._build_entries(records)
+        logger.info(
+            f"Indexed {len(self._entries)} agents from {self.stats['files']} files "
+            f"({self.stats['parsed']} parsed, {self.stats['reused']} from manifest)"
+        )
+        return self._entries
+
+    def _build_entries(self, records: List[ClassRecord]) -> Dict[str, AgentEntry]:
+        """Select agent classes by transitive inheritance from the root classes."""
+        by_name = {r.qualified_name: r for r in records}
+        agents = set(self.root_classes)
+        changed = True
+        while changed:
+            changed = False
+            for record in records:
+                if record.qualified_name not in agents and any(b in agents for b in record.bases):
+                    agents.add(record.qualified_name)
+                    changed = True
+
+        def resolved_params(record: ClassRecord) -> List[AgentParameter]:
+            # Walk up indexed agent bases until one defines __init__
+            seen = set()
+            current: Optional[ClassRecord] = record
+            while current is not None and current.qualified_name not in seen:
+                if current.init_params is not None:
+                    return current.init_params
+                seen.add(current.qualified_name)
+                current = next((by_name[b] for b in current.bases if b in by_name), None)
+            return []
+
+        entries: Dict[str, AgentEntry] = {}
+        for record in records:
+            if record.qualified_name not in agents or record.qualified_name in self.root_classes:
+                continue
+            if record.class_name.startswith('_'):
+                continue
+            name = normalize_agent_name(record.class_name)
+            entries[name] = AgentEntry(
+                name=name,
+                class_name=record.class_name,
+                module=record.module,
+                path=record.path,
+                docstring=record.docstring,
+                init_params=resolved_params(record),
+            )
+        return entries
+
+    @property
+    def entries(self) -> Dict[str, AgentEntry]:
+        """Indexed agents, scanning on first access."""
+        if self._entries is None:
+            self.refresh()
+        return self._entries
+
+    def get(self, name: str) -> Optional[AgentEntry]:
+        return self.entries.get(name)
+
+    def load(self, name: str) -> Type[Any]:
+        """
+        Import and return an agent class, caching it after the first import.
+
+        Raises:
+            KeyError: If no agent with that name is indexed
+        """
+        agent_class = self._loaded.get(name)
+        if agent_class is None:
+            entry = self.entries[name]
+            agent_class = entry.load()
+            self._loaded[name] = agent_class
+            self.stats["imports"] += 1
+            logger.debug(f"Imported agent {name} from {entry.module}")
+        return agent_class
+
+    def as_mapping(self) -> "LazyAgentMap":
+        return LazyAgentMap(self)
+
+
+class LazyAgentMap(Mapping):
+    """Read-only ``name -> agent class`` mapping that imports a class on first lookup"""
+
+    def __init__(self, index: AgentIndex):
+        self.index = index
+
+    def __getitem__(self, name: str) -> Type[Any]:
+        return self.index.load(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index.entries)
+
+    def __len__(self) -> int:
+        return len(self.index.entries)
@@ -30,10 +30,16 @@ from .date_processing import (
     enhanced_get_events_by_date,
 )
 from .embeddings import (
+    EmbeddingMatrix,
+    EmbeddingService,
     cosine_similarity,
     generate_embedding,  # Alias for backward compatibility
+    generate_embeddings_batch_async,
     generate_vertex_embedding_async,
+    get_embedding_service,
     init_embedding_model,
+    normalize_embeddings,
+    top_k_similar,
     validate_embedding,
 )
 
@@ -70,11 +76,15 @@ from .schemas import (
 )
 from .tokens import (
     TokenCounter,
+    calibrate_token_estimator,
     count_tokens,
     count_tokens_batch,
+    estimate_tokens,
     estimate_tokens_simple,
     is_within_token_limit,
+    is_within_token_limit_async,
     truncate_to_token_limit,
+    truncate_to_token_limit_async,
 )
 
 # Version information
@@ -86,15 +96,25 @@ __all__ = [
     # Embeddings
     "generate_vertex_embedding_async",
     "generate_embedding",
+    "generate_embeddings_batch_async",
+    "get_embedding_service",
+    "EmbeddingService",
     "init_embedding_model",
     "validate_embedding",
     "cosine_similarity",
+    "normalize_embeddings",
+    "top_k_similar",
+    "EmbeddingMatrix",
     # Tokens
     "count_tokens",
     "count_tokens_batch",
+    "estimate_tokens",
     "estimate_tokens_simple",
+    "calibrate_token_estimator",
     "is_within_token_limit",
+    "is_within_token_limit_async",
     "truncate_to_token_limit",
+    "truncate_to_token_limit_async",
     "TokenCounter",
     # Prompts
     "create_gemini_prompt",
@@ -2,15 +2,30 @@
 Embedding generation functionality for Agent Forge operations.
 
 This module handles all embedding-related operations including text embedding
-generation using Google's Generative AI models.
+generation using Google's Generative AI models. Requests are batched and
+cached by ``core.shared.embedding_service``. Vector math runs on numpy via
+``core.shared.vectors``; the list-based helpers here wrap it.
 """
 
-import functools
 import logging
-from typing import List, Optional
-
-import anyio
-import google.generativeai as genai
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..embedding_service import (  # noqa: F401 - re-exported for callers of this module
+    EmbeddingBackend,
+    EmbeddingCache,
+    EmbeddingService,
+    FakeEmbeddingBackend,
+    GeminiEmbeddingBackend,
+)
+from ..vectors import (  # noqa: F401 - re-exported for callers of this module
+    EmbeddingMatrix,
+    as_embedding_array,
+    normalize_rows,
+    top_k_similar,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +33,9 @@ logger = logging.getLogger(__name__)
 DEFAULT_EMBEDDING_MODEL_ID = "models/text-embedding-004"
 DEFAULT_MAX_LENGTH = 2048  # Safe limit for text-embedding-004
 
+_embedding_services: Dict[str, EmbeddingService] = {}
+_embedding_cache: Optional[EmbeddingCache] = None
+
 
 def init_embedding_model():
     """
@@ -29,6 +47,30 @@ def init_embedding_model():
     logger.info("Checked for GOOGLE_API_KEY for embedding model.")
 
 
+def get_embedding_service(model_name: Optional[str] = None) -> EmbeddingService:
+    """
+    Shared batching embedding service for a model.
+
+    Embeddings are cached in the SQLite file named by EMBEDDING_CACHE_PATH
+    (in memory when unset), so unchanged texts are not re-embedded.
+
+    Args:
+        model_name: Embedding model (defaults to DEFAULT_EMBEDDING_MODEL_ID)
+
+    Returns:
+        EmbeddingService: The service for that model
+    """
+    model_id = model_name or DEFAULT_EMBEDDING_MODEL_ID
+    service = _embedding_services.get(model_id)
+    if service is None:
+        global _embedding_cache
+        if _embedding_cache is None:
+            _embedding_cache = EmbeddingCache(os.environ.get("EMBEDDING_CACHE_PATH", ":memory:"))
+        service = EmbeddingService(GeminiEmbeddingBackend(model_id), cache=_embedding_cache)
+        _embedding_services[model_id] = service
+    return service
+
+
 async def generate_vertex_embedding_async(
     text_content: str,
     model_name: Optional[str] = None,
@@ -37,6 +79,9 @@ async def generate_vertex_embedding_async(
     """
     Generates an embedding for the given text using Google's Generative AI model.
 
+    Concurrent calls are batched into one API request and results are cached
+    by content hash (see get_embedding_service).
+
     Args:
         text_content: The text to generate embeddings for
         model_name: Optional model name to use (defaults to DEFAULT_EMBEDDING_MODEL_ID)
@@ -59,46 +104,51 @@ async def generate_vertex_embedding_async(
             f"Truncating text content for embedding from {len(text_content)} to {max_length} chars."
         )
 
-    try:
-        current_model_id = model_name if model_name else DEFAULT_EMBEDDING_MODEL_ID
+    return await get_embedding_service(model_name).embed(truncated_text)
 
-        logger.debug(
-            f"Generating embedding for text snippet: {truncated_text[:100]}... using {current_model_id}"
-        )
 
-        # Asynchronous call using anyio.to_thread for thread safety
-        embed_content_partial = functools.partial(
-            genai.embed_content,
-            model=current_model_id,
-            content=truncated_text,
-            task_type="RETRIEVAL_QUERY",
-        )
-        result = await anyio.to_thread.run_sync(embed_content_partial)
-
-        # Validate and extract embedding from result
-        if (
-            result
-            and isinstance(result, dict)
-            and "embedding" in result
-            and isinstance(result["embedding"], list)
-        ):
-            logger.debug(
-                f"Successfully generated embedding (dimension: {len(result['embedding'])})"
-            )
-            return result["embedding"]
-        else:
-            logger.warning(f"Unexpected result format from embed_content API: {result}")
-            return None
+async def generate_embeddings_batch_async(
+    texts: List[str],
+    model_name: Optional[str] = None,
+    max_length: int = DEFAULT_MAX_LENGTH,
+) -> List[Optional[List[float]]]:
+    """
+    Generates embeddings for many texts in as few API calls as possible.
 
-    except Exception as e:
-        logger.error(f"Error calling Google Embedding API: {e}", exc_info=True)
-        return None
+    Args:
+        texts: The texts to generate embeddings for
+        model_name: Optional model name to use (defaults to DEFAULT_EMBEDDING_MODEL_ID)
+        max_length: Maximum text length before truncation (defaults to 2048)
+
+    Returns:
+        List[Optional[List[float]]]: One embedding per text, None where generation failed
+    """
+    truncated = [text[:max_length] if isinstance(text, str) else "" for text in texts]
+    return await get_embedding_service(model_name).embed_many(truncated)
 
 
 # Backward compatibility alias
 generate_embedding = generate_vertex_embedding_async
 
 
+def _as_vector(embedding: Optional[List[float]]) -> Optional[np.ndarray]:
+    """Embedding as a float64 vector, or None if it is not a non-empty numeric list."""
+    if not isinstance(embedding, list) or not embedding:
+        return None
+    try:
+        vector = np.asarray(embedding)
+    except ValueError:
+        # Ragged nested lists
+        return None
+    if vector.ndim != 1:
+        return None
+    if vector.dtype.kind not in "biuf":
+        # Object arrays pass only when every item is a number (e.g. ints beyond int64)
+        if vector.dtype.kind != "O" or not all(isinstance(x, (int, float)) for x in embedding):
+            return None
+    return vector.astype(np.float64)
+
+
 def validate_embedding(embedding: Optional[List[float]]) -> bool:
     """
     Validate that an embedding is properly formatted.
@@ -109,12 +159,7 @@ def validate_embedding(embedding: Optional[List[float]]) -> bool:
     Returns:
         bool: True if embedding is valid, False otherwise
     """
-    return (
-        embedding is not None
-        and isinstance(embedding, list)
-        and len(embedding) > 0
-        and all(isinstance(x, (int, float)) for x in embedding)
-    )
+    return _as_vector(embedding) is not None
 
 
 def get_embedding_dimension(embedding: Optional[List[float]]) -> int:
@@ -142,17 +187,29 @@ def normalize_embedding(embedding: List[float]) -> List[float]:
     Returns:
         List[float]: The normalized embedding vector
     """
-    if not validate_embedding(embedding):
+    vector = _as_vector(embedding)
+    if vector is None or not vector.any():
         return embedding
 
-    # Calculate magnitude
-    magnitude = sum(x * x for x in embedding) ** 0.5
+    return normalize_rows(vector, copy=False).tolist()
 
-    if magnitude == 0:
-        return embedding
 
-    # Normalize to unit length
-    return [x / magnitude for x in embedding]
+def normalize_embeddings(embeddings: List[List[float]]) -> List[List[float]]:
+    """
+    Normalize a batch of equal-length embeddings to unit length.
+
+    Args:
+        embeddings: The embedding vectors to normalize
+
+    Returns:
+        List[List[float]]: The normalized vectors (zero vectors unchanged)
+
+    Raises:
+        ValueError: If the vectors are not numeric or differ in length
+    """
+    if not embeddings:
+        return []
+    return normalize_rows(as_embedding_array(embeddings, dtype=np.float64), copy=False).tolist()
 
 
 def cosine_similarity(embedding1: List[float], embedding2: List[float]) -> float:
@@ -166,21 +223,21 @@ def cosine_similarity(embedding1: List[float], embedding2: List[float]) -> float
     Returns:
         float: Cosine similarity between -1 and 1, or 0 if invalid inputs
     """
-    if not (validate_embedding(embedding1) and validate_embedding(embedding2)):
+    vector1 = _as_vector(embedding1)
+    vector2 = _as_vector(embedding2)
+    if vector1 is None or vector2 is None:
         return 0.0
 
-    if len(embedding1) != len(embedding2):
+    if len(vector1) != len(vector2):
         logger.warning(
-            f"Embedding dimension mismatch: {len(embedding1)} vs {len(embedding2)}"
+            f"Embedding dimension mismatch: {len(vector1)} vs {len(vector2)}"
         )
         return 0.0
 
-    # Calculate dot product and magnitudes
-    dot_product = sum(a * b for a, b in zip(embedding1, embedding2, strict=False))
-    magnitude1 = sum(a * a for a in embedding1) ** 0.5
-    magnitude2 = sum(b * b for b in embedding2) ** 0.5
+    magnitude1 = np.linalg.norm(vector1)
+    magnitude2 = np.linalg.norm(vector2)
 
     if magnitude1 == 0 or magnitude2 == 0:
         return 0.0
 
-    return dot_product / (magnitude1 * magnitude2)
+    return float(np.dot(vector1, vector2) / (magnitude1 * magnitude2))
@@ -2,27 +2,69 @@
 Token counting functionality for Agent Forge operations.
 
 This module handles token counting operations using Google's Generative AI models
-for accurate token usage tracking and prompt optimization.
+for accurate token usage tracking and prompt optimization. Limit checks and
+truncation run on a calibrated local estimator (``core.shared.token_estimation``)
+and only ask the API for an exact count when the estimate is too close to call.
 """
 
+import asyncio
 import functools
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import anyio
 import google.generativeai as genai
 
+from ..cache import BoundedCache
+from ..token_estimation import TokenEstimator, content_hash
+
 logger = logging.getLogger(__name__)
 
 # Default token counting configuration
 DEFAULT_TOKEN_MODEL = "gemini-1.5-flash-latest"
 MAX_PROMPT_CHARS = 30000  # Maximum characters for prompt processing
+TOKEN_CACHE_MAX_ENTRIES = 1000
+TOKEN_CACHE_MAX_BYTES = 16 * 1024 * 1024  # Cached texts can be long prompts
+# Exact counts cached by content hash, so entries are small
+TOKEN_HASH_CACHE_MAX_ENTRIES = 20000
+DEFAULT_COUNT_CONCURRENCY = 8
+TRUNCATE_MAX_ATTEMPTS = 3
+
+_client = None
+_token_count_cache = BoundedCache(max_entries=TOKEN_HASH_CACHE_MAX_ENTRIES, name="token_counts")
+_estimator = TokenEstimator()
+
+
+def _get_client():
+    """Client shared by every count, created on first use"""
+    global _client
+    if _client is None:
+        _client = genai.Client()
+    return _client
+
+
+async def _count_tokens_remote(text: str, model: str) -> int:
+    """Exact token count from the API; raises on failure."""
+    count_tokens_partial = functools.partial(
+        _get_client().models.count_tokens, model=model, contents=[text]
+    )
+    response = await anyio.to_thread.run_sync(count_tokens_partial)
+    return response.total_tokens
+
+
+async def _count_tokens_cached(text: str, model: str) -> int:
+    """Exact count, cached by content hash; concurrent counts of a text share one call."""
+    return await _token_count_cache.get_or_fetch(
+        content_hash(model, text), lambda: _count_tokens_remote(text, model)
+    )
 
 
 async def count_tokens(text: str, model: str = DEFAULT_TOKEN_MODEL) -> int:
     """
     Counts tokens using the Gemini API.
 
+    Counts are cached by a hash of the model and text.
+
     Args:
         text: The text to count tokens for
         model: The model to use for token counting (defaults to gemini-1.5-flash-latest)
@@ -38,15 +80,7 @@ async def count_tokens(text: str, model: str = DEFAULT_TOKEN_MODEL) -> int:
         return 0
 
     try:
-        client = genai.Client()
-
-        # Use async wrapper for thread safety
-        count_tokens_partial = functools.partial(
-            client.models.count_tokens, model=model, contents=[text]
-        )
-        response = await anyio.to_thread.run_sync(count_tokens_partial)
-
-        token_count = response.total_tokens
+        token_count = await _count_tokens_cached(text, model)
         logger.debug(f"Token count for text ({len(text)} chars): {token_count} tokens")
         return token_count
 
@@ -56,29 +90,89 @@ async def count_tokens(text: str, model: str = DEFAULT_TOKEN_MODEL) -> int:
 
 
 async def count_tokens_batch(
-    texts: List[str], model: str = DEFAULT_TOKEN_MODEL
+    texts: List[str],
+    model: str = DEFAULT_TOKEN_MODEL,
+    max_concurrency: int = DEFAULT_COUNT_CONCURRENCY,
 ) -> List[int]:
     """
     Count tokens for multiple texts efficiently.
 
+    The count_tokens API returns one total per request, so texts are counted
+    by concurrent requests (at most max_concurrency in flight). Duplicate
+    and previously counted texts are not sent again.
+
     Args:
         texts: List of texts to count tokens for
         model: The model to use for token counting
+        max_concurrency: Maximum API requests in flight
 
     Returns:
-        List[int]: Token counts for each text in the same order
+        List[int]: Token counts for each text in the same order (0 where counting failed)
     """
     if not texts:
         return []
 
-    # Process each text individually for now
-    # Could be optimized with batch API calls in the future
-    token_counts = []
-    for text in texts:
-        count = await count_tokens(text, model)
-        token_counts.append(count)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def count_one(text: str) -> int:
+        async with semaphore:
+            return await count_tokens(text, model)
 
-    return token_counts
+    unique = list(dict.fromkeys(text for text in texts if text and isinstance(text, str)))
+    counts = dict(zip(unique, await asyncio.gather(*(count_one(text) for text in unique))))
+    return [counts.get(text, 0) if isinstance(text, str) else 0 for text in texts]
+
+
+def get_token_estimator() -> TokenEstimator:
+    """Estimator used by the local fast path"""
+    return _estimator
+
+
+def set_token_estimator(estimator: TokenEstimator) -> None:
+    """Replace the estimator used by the local fast path (e.g. after calibration)"""
+    global _estimator
+    _estimator = estimator
+
+
+async def calibrate_token_estimator(
+    texts: List[str], model: str = DEFAULT_TOKEN_MODEL
+) -> TokenEstimator:
+    """
+    Fit the local estimator to exact API counts of sample texts and install it.
+
+    Args:
+        texts: Representative texts (e.g. recent prompts)
+        model: The model whose tokenizer to calibrate against
+
+    Returns:
+        TokenEstimator: The calibrated estimator
+
+    Raises:
+        ValueError: If no sample could be counted
+    """
+    counts = await count_tokens_batch(texts, model)
+    estimator = TokenEstimator.calibrate(zip(texts, counts))
+    set_token_estimator(estimator)
+    logger.info(
+        f"Calibrated token estimator on {estimator.samples} samples: "
+        f"scale {estimator.scale:.3f}, error bound {estimator.relative_error:.1%}"
+    )
+    return estimator
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate tokens locally with the calibrated estimator.
+
+    Args:
+        text: The text to estimate tokens for
+
+    Returns:
+        int: Estimated number of tokens
+    """
+    if not text:
+        return 0
+    return _estimator.estimate(text)
 
 
 def estimate_tokens_simple(text: str) -> int:
@@ -109,27 +203,74 @@ def estimate_tokens_simple(text: str) -> int:
     return estimated_tokens
 
 
+def _cached_exact_count(text: str, model: str) -> Optional[int]:
+    return _token_count_cache.get(content_hash(model, text))
+
+
 def is_within_token_limit(
-    text: str, token_limit: int, use_estimate: bool = False
+    text: str, token_limit: int, use_estimate: bool = False, model: str = DEFAULT_TOKEN_MODEL
 ) -> bool:
     """
     Check if text is within a specified token limit.
 
+    Uses the local estimator. Near the limit, an exact count already cached
+    for the text decides; use is_within_token_limit_async to fetch one.
+
     Args:
         text: The text to check
         token_limit: Maximum allowed tokens
-        use_estimate: If True, use simple estimation instead of API call
+        use_estimate: If True, always use the local estimate
+        model: The model whose cached exact counts may be used
 
     Returns:
         bool: True if within limit, False otherwise
     """
-    if use_estimate:
-        token_count = estimate_tokens_simple(text)
-        return token_count <= token_limit
+    if not text:
+        return token_limit >= 0
+    if not use_estimate:
+        low, high = _estimator.bounds(text)
+        if low <= token_limit < high:
+            exact = _cached_exact_count(text, model)
+            if exact is not None:
+                return exact <= token_limit
+    return _estimator.estimate(text) <= token_limit
+
+
+async def is_within_token_limit_async(
+    text: str, token_limit: int, model: str = DEFAULT_TOKEN_MODEL
+) -> bool:
+    """
+    Check a token limit locally, calling the API only when the estimate is too close to tell.
+
+    Args:
+        text: The text to check
+        token_limit: Maximum allowed tokens
+        model: The model to count tokens for
+
+    Returns:
+        bool: True if within limit, False otherwise
+    """
+    if not text:
+        return token_limit >= 0
+    low, high = _estimator.bounds(text)
+    if high <= token_limit:
+        return True
+    if low > token_limit:
+        return False
+    try:
+        return await _count_tokens_cached(text, model) <= token_limit
+    except Exception as e:
+        logger.warning(f"Exact token count failed, using estimate: {e}")
+        return _estimator.estimate(text) <= token_limit
 
-    # For accurate checking, you'd need to await count_tokens()
-    # This function provides a synchronous interface for estimates
-    return estimate_tokens_simple(text) <= token_limit
+
+def _break_at_word(text: str, truncated: str) -> str:
+    """Drop a trailing partial word if that keeps 80% of the cut"""
+    if len(truncated) < len(text) and not text[len(truncated)].isspace():
+        last_space = truncated.rfind(" ")
+        if last_space > len(truncated) * 0.8:
+            return truncated[:last_space]
+    return truncated
 
 
 def truncate_to_token_limit(
@@ -141,7 +282,8 @@ def truncate_to_token_limit(
     Args:
         text: The text to truncate
         token_limit: Maximum allowed tokens
-        use_estimate: Whether to use estimation (True) or exact counting (False)
+        use_estimate: If True, fit the local estimate; if False, fit its upper
+            error bound so the result fits without an exact count
 
     Returns:
         str: Truncated text that should fit within the token limit
@@ -150,29 +292,51 @@ def truncate_to_token_limit(
         return text
 
     if use_estimate:
-        estimated_tokens = estimate_tokens_simple(text)
-        if estimated_tokens <= token_limit:
+        if _estimator.estimate(text) <= token_limit:
             return text
+    elif _estimator.bounds(text)[1] <= token_limit:
+        return text
 
-        # Estimate character limit based on token limit
-        estimated_char_limit = token_limit * 4  # Rough estimation
+    truncated = _estimator.truncate(text, token_limit, conservative=not use_estimate)
+    return _break_at_word(text, truncated)
 
-        # Truncate and try to break at word boundaries
-        if len(text) <= estimated_char_limit:
-            return text
 
-        truncated = text[:estimated_char_limit]
+async def truncate_to_token_limit_async(
+    text: str, token_limit: int, model: str = DEFAULT_TOKEN_MODEL
+) -> str:
+    """
+    Truncate text to fit a token limit, checking with the API only near the limit.
 
-        # Try to break at last word boundary
-        last_space = truncated.rfind(" ")
-        if last_space > estimated_char_limit * 0.8:  # If we can keep 80% of content
-            truncated = truncated[:last_space]
+    Args:
+        text: The text to truncate
+        token_limit: Maximum allowed tokens
+        model: The model to count tokens for
 
-        return truncated
+    Returns:
+        str: Truncated text within the token limit
+    """
+    if not text or await is_within_token_limit_async(text, token_limit, model):
+        return text
 
-    # For exact truncation, you'd need async token counting
-    # Fall back to estimation for now
-    return truncate_to_token_limit(text, token_limit, use_estimate=True)
+    target = token_limit
+    for _ in range(TRUNCATE_MAX_ATTEMPTS):
+        truncated = _break_at_word(text, _estimator.truncate(text, target))
+        low, high = _estimator.bounds(truncated)
+        if high <= token_limit:
+            return truncated
+        try:
+            exact = await _count_tokens_cached(truncated, model)
+        except Exception as e:
+            logger.warning(f"Exact token count failed, truncating conservatively: {e}")
+            break
+        if exact <= token_limit:
+            return truncated
+        # Shrink the target by how far the estimate was off
+        target = int(target * token_limit / exact) - 1
+        if target <= 0:
+            return ""
+
+    return _break_at_word(text, _estimator.truncate(text, token_limit, conservative=True))
 
 
 class TokenCounter:
@@ -180,10 +344,24 @@ class TokenCounter:
     A class for managing token counting operations with caching.
     """
 
-    def __init__(self, model: str = DEFAULT_TOKEN_MODEL):
+    def __init__(
+        self,
+        model: str = DEFAULT_TOKEN_MODEL,
+        cache_size_limit: int = TOKEN_CACHE_MAX_ENTRIES,
+        cache_max_bytes: int = TOKEN_CACHE_MAX_BYTES,
+        cache_name: Optional[str] = None,
+    ):
         self.model = model
-        self._cache: Dict[str, int] = {}
-        self._cache_size_limit = 1000  # Limit cache size
+        self._cache_size_limit = cache_size_limit
+        # LRU eviction keeps recently counted texts instead of freezing the first 1000;
+        # keys are content hashes so long prompts are not held in memory
+        self._cache = BoundedCache(
+            max_entries=cache_size_limit,
+            max_bytes=cache_max_bytes,
+            # Stats are always available from self.get_cache_stats(); a name
+            # also exports them through core.shared.cache.get_cache_stats()
+            name=cache_name,
+        )
 
     async def count(self, text: str, use_cache: bool = True) -> int:
         """
@@ -196,15 +374,13 @@ class TokenCounter:
         Returns:
             int: Token count
         """
-        if use_cache and text in self._cache:
-            return self._cache[text]
-
-        count = await count_tokens(text, self.model)
+        if not use_cache:
+            return await count_tokens(text, self.model)
 
-        if use_cache and len(self._cache) < self._cache_size_limit:
-            self._cache[text] = count
-
-        return count
+        # Concurrent counts of the same text share one API call
+        return await self._cache.get_or_fetch(
+            content_hash(self.model, text), lambda: count_tokens(text, self.model)
+        )
 
     def clear_cache(self):
         """Clear the token count cache."""
@@ -212,8 +388,14 @@ class TokenCounter:
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
+        stats = self._cache.get_stats()
         return {
             "cache_size": len(self._cache),
             "cache_limit": self._cache_size_limit,
+            "cache_bytes": stats["bytes"],
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "evictions": stats["evictions"],
+            "hit_rate": stats["hit_rate"],
             "model": self.model,
         }
@@ -1,31 +1,346 @@
-"""BeautifulSoup utility functions for HTML parsing and text extraction."""
+"""BeautifulSoup utility functions for HTML parsing and text extraction.
 
+``HTMLDocument`` parses a page once with lxml and collects visible text,
+image URLs and meta tags in a single tree walk, so text and image extraction
+for the same page share one parse. ``extract_visible_text`` accepts an
+HTMLDocument, raw HTML or (for existing callers) a BeautifulSoup object or
+Tag, which it walks in place instead of copying it by re-parsing.
+"""
+
+import functools
 import logging
-from typing import List, Optional, Union  # Union for type hint
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union  # Union for type hint
 
+import lxml.html
 from bs4 import BeautifulSoup, Tag  # Tag for type hint
+from bs4.element import CData, NavigableString, TemplateString
+
+from .url_utils import resolve_url
 
 # Standard logger for the module
 logger = logging.getLogger(__name__)
 
+# Elements whose content is never visible text
+ALWAYS_REMOVE_TAGS = frozenset(
+    {
+        "script",
+        "style",
+        "head",
+        "meta",
+        "link",
+        "noscript",
+        "button",
+        "input",
+        "select",
+        "textarea",
+        "form",
+        "iframe",
+        "template",
+    }
+)
+
+# String node types get_text() counts. A bare Tag was historically copied
+# into a fresh document, where text from inside a <template> counts as well
+_TEXT_STRING_TYPES = (NavigableString, CData)
+_TAG_TEXT_STRING_TYPES = (NavigableString, CData, TemplateString)
+
+# Image types skipped when collecting page images
+SKIPPED_IMAGE_EXTENSIONS = (".gif", ".svg")
+
+_STYLE_URL_PATTERN = re.compile(r"url\([\'\"]?([^\'\"]+)[\'\"]?\)")
+
+
+@functools.lru_cache(maxsize=256)
+def _css_selector(selector: str) -> Callable[[Any], List[Any]]:
+    """Compile a CSS selector for lxml trees (requires the cssselect package)."""
+    from lxml.cssselect import CSSSelector
+
+    return CSSSelector(selector)
+
+
+def _parse_html(html: str) -> Optional[Any]:
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # Unicode input with an XML encoding declaration
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+
 
-def extract_visible_text(
+class HTMLDocument:
+    """
+    An HTML page parsed once with lxml and shared by text, image and meta extraction.
+
+    The whole-document scan runs on first access of ``text``, ``image_sources``
+    or ``meta`` and visits every node exactly once.
+
+    Usage:
+        document = HTMLDocument(html_content, base_url=url)
+        text = extract_visible_text(document)
+        images = document.image_urls()
+    """
+
+    def __init__(self, html: str, base_url: Optional[str] = None):
+        """
+        Args:
+            html: Page HTML
+            base_url: URL the page was fetched from, used to resolve relative URLs
+        """
+        self.html = html
+        self.base_url = base_url
+        self.root = _parse_html(html)
+        self._scan: Optional[Tuple[List[str], List[str], Dict[str, str]]] = None
+
+    def _walk(
+        self,
+        scope: Any,
+        removed: Set[Any] = frozenset(),
+        collect_resources: bool = False,
+    ) -> Tuple[List[str], List[str], Dict[str, str]]:
+        """
+        Walk the tree under scope once.
+
+        Returns:
+            (visible text chunks, image sources, meta name/property -> content).
+            Image sources and meta are only collected when collect_resources is set.
+        """
+        texts: List[str] = []
+        images: List[str] = []
+        meta: Dict[str, str] = {}
+
+        # (node, hidden) for elements, (None, text) for a tail to emit
+        stack: List[Tuple[Any, Any]] = [(scope, False)]
+        while stack:
+            node, state = stack.pop()
+            if node is None:
+                stripped = state.strip()
+                if stripped:
+                    texts.append(stripped)
+                continue
+
+            tag = node.tag
+            if not isinstance(tag, str):
+                # Comments and processing instructions: only their tails count
+                continue
+
+            hidden = state or (node is not scope and (tag in ALWAYS_REMOVE_TAGS or node in removed))
+            if not hidden and node.text:
+                stripped = node.text.strip()
+                if stripped:
+                    texts.append(stripped)
+
+            if collect_resources:
+                attrib = node.attrib
+                if tag == "meta":
+                    key = attrib.get("property") or attrib.get("name")
+                    if key:
+                        meta.setdefault(key, attrib.get("content") or "")
+                elif tag == "img":
+                    images.extend(_img_sources(attrib.get))
+                style = attrib.get("style")
+                if style:
+                    images.extend(_STYLE_URL_PATTERN.findall(style))
+            elif hidden:
+                # Nothing visible below and no resources wanted
+                continue
+
+            children = list(node)
+            for child in reversed(children):
+                if child.tail and not hidden:
+                    stack.append((None, child.tail))
+                stack.append((child, hidden))
+
+        return texts, images, meta
+
+    def _scan_document(self) -> Tuple[List[str], List[str], Dict[str, str]]:
+        if self._scan is None:
+            self._scan = self._walk(self.root, collect_resources=True) if self.root is not None else ([], [], {})
+        return self._scan
+
+    @property
+    def text_chunks(self) -> List[str]:
+        """Visible text nodes of the whole document, stripped, in document order"""
+        return self._scan_document()[0]
+
+    @property
+    def image_sources(self) -> List[str]:
+        """Raw image references from <img> tags and inline style url(...) values"""
+        return self._scan_document()[1]
+
+    @property
+    def meta(self) -> Dict[str, str]:
+        """First content value of each <meta> property or name"""
+        return self._scan_document()[2]
+
+    def text(self, separator: str = " ") -> str:
+        return separator.join(self.text_chunks)
+
+    def image_urls(self, custom_logger: Optional[logging.Logger] = None) -> List[str]:
+        """
+        Absolute image URLs from og:image / twitter:image meta tags, <img>
+        data-src, srcset or src, and inline background images.
+
+        Returns:
+            Sorted unique URLs; GIF and SVG images other than meta images are skipped
+        """
+        log = custom_logger or logger
+        found: Set[str] = set()
+        for key in ("og:image", "twitter:image"):
+            content = self.meta.get(key)
+            if content:
+                abs_url = resolve_url(self.base_url, content, custom_logger=log)
+                if abs_url:
+                    found.add(abs_url)
+        for source in self.image_sources:
+            abs_url = resolve_url(self.base_url, source, custom_logger=log)
+            if abs_url and not abs_url.lower().endswith(SKIPPED_IMAGE_EXTENSIONS):
+                found.add(abs_url)
+        return sorted(found)
+
+    def visible_text(
+        self,
+        main_content_selectors: Optional[List[str]] = None,
+        remove_selectors: Optional[List[str]] = None,
+        separator: str = " ",
+        custom_logger: Optional[logging.Logger] = None,
+    ) -> str:
+        """Visible text, optionally narrowed to a main content area; see extract_visible_text."""
+        if self.root is None:
+            return ""
+        if not main_content_selectors and not remove_selectors:
+            return self.text(separator)
+
+        log = custom_logger or logger
+        scope = self.root
+        for selector in main_content_selectors or []:
+            try:
+                matches = _css_selector(selector)(self.root)
+            except Exception as e_sel:  # Invalid selector or cssselect missing
+                log.warning("Error applying main_content_selector '%s': %s", selector, e_sel)
+                continue
+            if matches:
+                scope = matches[0]
+                log.debug("Focused on main content area selected by: '%s'", selector)
+                break
+
+        removed: Set[Any] = set()
+        for selector in remove_selectors or []:
+            try:
+                removed.update(_css_selector(selector)(scope))
+            except Exception as e_rem_sel:
+                log.warning("Error applying remove_selector '%s': %s", selector, e_rem_sel)
+        removed.discard(scope)
+
+        return separator.join(self._walk(scope, removed)[0])
+
+
+def _img_sources(get: Callable[[str], Optional[str]]) -> List[str]:
+    """Image references of one <img>: data-src and srcset entries, else src."""
+    sources: List[str] = []
+    data_src = get("data-src")
+    if data_src:
+        sources.append(data_src)
+    srcset = get("srcset")
+    if srcset:
+        for part in srcset.split(","):
+            url_part = part.strip().split(" ")[0]
+            if url_part:
+                sources.append(url_part)
+    if not data_src and not srcset:
+        src = get("src")
+        if src:
+            sources.append(src)
+    return sources
+
+
+def _soup_matches(tag: Tag, selector: str) -> bool:
+    try:
+        return bool(tag.css.match(selector))
+    except AttributeError:  # bs4 without the .css API
+        return False
+
+
+def _soup_visible_text(
     soup_or_tag: Union[BeautifulSoup, Tag],
+    main_content_selectors: Optional[List[str]],
+    remove_selectors: Optional[List[str]],
+    separator: str,
+    log: logging.Logger,
+) -> str:
+    """Visible text of a BeautifulSoup tree, skipping removed elements without copying or mutating it."""
+    target: Union[BeautifulSoup, Tag] = soup_or_tag
+    # A bare Tag behaves as if it were the child of a new document: selectors may match it
+    include_self = not isinstance(soup_or_tag, BeautifulSoup)
+    string_types = _TAG_TEXT_STRING_TYPES if include_self else _TEXT_STRING_TYPES
+
+    # 1. Try to narrow down to main content area if selectors are provided
+    if main_content_selectors:
+        found_main_content = False
+        for selector in main_content_selectors:
+            try:
+                selected_area = target if include_self and _soup_matches(target, selector) else target.select_one(selector)
+                if selected_area:
+                    target = selected_area
+                    log.debug("Focused on main content area selected by: '%s'", selector)
+                    found_main_content = True
+                    break  # Use the first matching main content selector
+            except Exception as e_sel:  # Catch errors from invalid selectors
+                log.warning("Error applying main_content_selector '%s': %s", selector, e_sel)
+        if found_main_content:
+            include_self = False
+        else:
+            log.debug("No specific main content area found by selectors; using the initial scope.")
+
+    # 2./3. Elements to skip: the always-removed tags plus user selectors
+    removed: Set[int] = set()
+    for selector in remove_selectors or []:
+        try:
+            removed.update(id(el) for el in target.select(selector))
+            if include_self and _soup_matches(target, selector):
+                return ""
+        except Exception as e_rem_sel:
+            log.warning("Error applying remove_selector '%s': %s", selector, e_rem_sel)
+    if include_self and target.name in ALWAYS_REMOVE_TAGS:
+        return ""
+
+    # 4. Collect strings the way get_text(strip=True) would, minus removed subtrees
+    texts: List[str] = []
+    stack = list(reversed(target.contents))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Tag):
+            if node.name in ALWAYS_REMOVE_TAGS or id(node) in removed:
+                continue
+            stack.extend(reversed(node.contents))
+            continue
+        if type(node) not in string_types:
+            continue
+        stripped = node.strip()
+        if stripped:
+            texts.append(stripped)
+    return separator.join(texts)
+
+
+def extract_visible_text(
+    soup_or_tag: Union[BeautifulSoup, Tag, HTMLDocument, str],
     main_content_selectors: Optional[List[str]] = None,
     remove_selectors: Optional[List[str]] = None,
     separator: str = " ",
     custom_logger: Optional[logging.Logger] = None,
 ) -> str:
-    """Extracts visible text from a BeautifulSoup object or a specific Tag.
+    """Extracts visible text from a document, a BeautifulSoup object or a specific Tag.
 
     This function aims to retrieve human-readable text by:
     1. Optionally focusing on a main content area specified by selectors.
-    2. Removing common non-visible elements (scripts, styles, head, etc.).
-    3. Optionally removing other user-specified elements (e.g., nav, footer).
-    4. Using BeautifulSoup's `get_text()` for final extraction.
+    2. Skipping common non-visible elements (scripts, styles, head, etc.).
+    3. Optionally skipping other user-specified elements (e.g., nav, footer).
+    4. Joining the remaining stripped text nodes, as ``get_text(strip=True)`` does.
 
     Args:
-        soup_or_tag: The BeautifulSoup object (representing the whole document)
+        soup_or_tag: An HTMLDocument, raw HTML (parsed with lxml), the
+                     BeautifulSoup object representing the whole document,
                      or a specific bs4.element.Tag to extract text from.
         main_content_selectors: An optional list of CSS selectors. The function
                                 will try these in order to find a primary content
@@ -33,10 +348,10 @@ def extract_visible_text(
                                 for text extraction. If None or if no selector matches,
                                 the entire `soup_or_tag` is used.
         remove_selectors: An optional list of CSS selectors for elements that should
-                          be removed from the soup/tag before text extraction
+                          be left out of the extracted text
                           (e.g., '.ads', 'nav', 'footer').
-        separator: The separator string to use between text blocks when calling
-                   `get_text()`. Defaults to a single space.
+        separator: The separator string to use between text blocks.
+                   Defaults to a single space.
         custom_logger: An optional custom logger instance. If not provided,
                        the module-level logger is used.
 
@@ -45,8 +360,8 @@ def extract_visible_text(
              string if the input is invalid or an error occurs during processing.
 
     Side Effects:
-        - Modifies a copy of the input BeautifulSoup/Tag object by decomposing elements.
-          The original object passed by the caller is not altered.
+        - None on the input: removed elements are skipped during the walk, so the
+          caller's tree is neither modified nor copied.
         - Logs debug or error messages.
     """
     log = custom_logger or logger
@@ -56,96 +371,22 @@ def extract_visible_text(
         return ""
 
     try:
-        # Work on a copy to avoid modifying the original soup/tag passed by the caller.
-        # str(soup_or_tag) re-parses, ensuring a deep copy for BeautifulSoup objects.
-        # .copy() is for Tag objects, but might not be deep enough for all cases if children are complex.
-        # Re-parsing from string is safer for ensuring complete detachment if soup_or_tag is a Tag.
-        if isinstance(soup_or_tag, BeautifulSoup):
-            # If it's already a full soup, re-parse its string representation
-            # Use 'html.parser' as fallback if parser is not available
-            parser_name = (
-                getattr(soup_or_tag.parser, "name", "html.parser")
-                if soup_or_tag.parser
-                else "html.parser"
+        if isinstance(soup_or_tag, str):
+            soup_or_tag = HTMLDocument(soup_or_tag)
+        if isinstance(soup_or_tag, HTMLDocument):
+            return soup_or_tag.visible_text(
+                main_content_selectors, remove_selectors, separator, log
             )
-            current_scope = BeautifulSoup(str(soup_or_tag), features=parser_name)
-        elif isinstance(soup_or_tag, Tag):
-            # If it's a Tag, convert to string and re-parse to ensure it's a new soup structure
-            # Tag objects don't have parser attribute, so use 'html.parser' as fallback
-            current_scope = BeautifulSoup(str(soup_or_tag), "html.parser")
-        else:
-            log.error(
-                "Invalid input type for text extraction: %s. Expected BeautifulSoup or Tag.",
-                type(soup_or_tag),
+        if isinstance(soup_or_tag, Tag):  # BeautifulSoup is a Tag subclass
+            return _soup_visible_text(
+                soup_or_tag, main_content_selectors, remove_selectors, separator, log
             )
-            return ""
 
-        # current_scope is now always a BeautifulSoup object, representing the element to work on.
-        target_element: Union[BeautifulSoup, Tag] = current_scope
-
-        # 1. Try to narrow down to main content area if selectors are provided
-        if main_content_selectors:
-            found_main_content = False
-            for selector in main_content_selectors:
-                try:
-                    selected_area = target_element.select_one(selector)
-                    if selected_area:
-                        target_element = (
-                            selected_area  # Update target_element to the selected area
-                        )
-                        log.debug(
-                            "Focused on main content area selected by: '%s'", selector
-                        )
-                        found_main_content = True
-                        break  # Use the first matching main content selector
-                except Exception as e_sel:  # Catch errors from invalid selectors
-                    log.warning(
-                        "Error applying main_content_selector '%s': %s", selector, e_sel
-                    )
-            if not found_main_content:
-                log.debug(
-                    "No specific main content area found by selectors; using the initial scope."
-                )
-
-        # 2. Remove common non-visible or irrelevant elements from the target_element
-        # These are typically script, style, head, meta, link, noscript.
-        elements_to_always_remove = [
-            "script",
-            "style",
-            "head",
-            "meta",
-            "link",
-            "noscript",
-            "button",
-            "input",
-            "select",
-            "textarea",
-            "form",
-            "iframe",
-        ]
-        for element_type in elements_to_always_remove:
-            # Decompose works directly on the elements found within target_element
-            for el in target_element.find_all(element_type):
-                el.decompose()
-
-        # 3. Remove user-specified elements by selectors from the target_element
-        if remove_selectors:
-            for selector in remove_selectors:
-                try:
-                    for el in target_element.select(selector):
-                        el.decompose()
-                    log.debug(
-                        "Decomposed element(s) matching user selector: '%s'", selector
-                    )
-                except Exception as e_rem_sel:
-                    log.warning(
-                        "Error applying remove_selector '%s': %s", selector, e_rem_sel
-                    )
-
-        # 4. Extract text from the cleaned target_element
-        # `get_text()` is called on the potentially narrowed and cleaned `target_element`.
-        text = target_element.get_text(separator=separator, strip=True)
-        return text
+        log.error(
+            "Invalid input type for text extraction: %s. Expected HTMLDocument, str, BeautifulSoup or Tag.",
+            type(soup_or_tag),
+        )
+        return ""
 
     except Exception as e:
         log.error("Error during visible text extraction: %s", e, exc_info=True)
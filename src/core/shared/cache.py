@@ -0,0 +1,363 @@
+"""
+Bounded in-process caches for Agent Forge.
+
+``BoundedCache`` is an LRU cache with optional per-entry TTL and an optional
+byte budget, so long-running workers keep flat memory no matter how many
+distinct keys pass through them. Every cache keeps hit/miss/eviction counters,
+and ``get_or_fetch`` coalesces concurrent misses on the same key into a single
+fetch (single-flight). ``invalidate`` also covers fetches already in flight,
+so a value read before a write is never stored after it.
+
+Named caches register themselves so their statistics can be collected in one
+place with ``get_cache_stats()``. Names are meant for long-lived caches such
+as module-level singletons; a second live cache with the same name replaces
+the first in the registry and logs a warning.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional, Set, Tuple
+
+# Containers are sized this many levels deep; anything deeper counts as shallow
+_SIZE_DEPTH = 2
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+_registry: "weakref.WeakValueDictionary[str, BoundedCache]" = weakref.WeakValueDictionary()
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Approximate the memory held by a value in bytes.
+
+    Strings and bytes are exact; tuples, lists, sets and dicts include their
+    items a couple of levels deep. This is an estimate for budgeting, not an
+    exact measurement.
+    """
+    size = sys.getsizeof(value)
+    if _depth >= _SIZE_DEPTH:
+        return size
+    if isinstance(value, dict):
+        size += sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+            for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _depth + 1) for item in value)
+    return size
+
+
+class BoundedCache:
+    """
+    Thread-safe LRU cache with TTL expiry, byte accounting and single-flight fetches.
+
+    Usage:
+        cache = BoundedCache(max_entries=1000, ttl_seconds=3600, name="redirects")
+        cache.set(url, final_url)
+        final_url = cache.get(url)
+        count = await cache.get_or_fetch(text, lambda: count_tokens(text))
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 1000,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        name: Optional[str] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries (None for no entry limit)
+            max_bytes: Maximum estimated size of keys plus values (None for no byte limit)
+            ttl_seconds: Default lifetime of an entry (None never expires)
+            name: Registers the cache for ``get_cache_stats()`` under this name
+            sizeof: Function estimating the size of a key or value in bytes
+            clock: Monotonic time source, replaceable in tests
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self.sizeof = sizeof
+        self.clock = clock
+
+        # key -> (value, expires_at or None, size)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        # In-flight fetches invalidated since they started; their results are not stored
+        self._stale_fetches: Set[asyncio.Future] = set()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "rejected": 0,
+            "fetches": 0,
+            "coalesced": 0,
+        }
+
+        if name:
+            previous = _registry.get(name)
+            if previous is not None:
+                logger.warning(f"Cache name {name!r} is already registered; replacing it in get_cache_stats()")
+            _registry[name] = self
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _lookup(self, key: Hashable) -> Any:
+        """Return the live value for key (refreshing its LRU position) or _MISSING."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires_at, _ = entry
+        if expires_at is not None and self.clock() >= expires_at:
+            self._remove(key)
+            self.stats["expirations"] += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, or default if it is missing or expired."""
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.stats["misses"] += 1
+                return default
+            self.stats["hits"] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a value, evicting least recently used entries to stay within bounds.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Lifetime of this entry (defaults to the cache's ttl_seconds)
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        size = self.sizeof(key) + self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Would evict everything else and still not fit
+                self.stats["rejected"] += 1
+                return
+            expires_at = self.clock() + ttl if ttl is not None else None
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            self.stats["sets"] += 1
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.stats["evictions"] += 1
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live value without counting a lookup or refreshing its LRU position."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[1] is not None and self.clock() >= entry[1]):
+                return default
+            return entry[0]
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key and return its value, or default if it is not cached."""
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                return default
+            self._remove(key)
+            return value
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Drop a key after a write, including any fetch for it already in flight.
+
+        A fetch that started before the write may have read the old value; its
+        callers still receive that value, but it is not stored.
+
+        Returns:
+            Whether a stored entry or an in-flight fetch was invalidated
+        """
+        with self._lock:
+            found = key in self._entries
+            if found:
+                self._remove(key)
+            return self._invalidate_fetches(lambda inflight_key: inflight_key == key) > 0 or found
+
+    def invalidate_inflight(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        Keep in-flight fetches from storing their results.
+
+        Args:
+            predicate: Selects the keys to invalidate (None invalidates every fetch)
+
+        Returns:
+            Number of fetches invalidated
+        """
+        with self._lock:
+            return self._invalidate_fetches(predicate or (lambda key: True))
+
+    def _invalidate_fetches(self, predicate: Callable[[Hashable], bool]) -> int:
+        stale = [future for key, future in self._inflight.items() if predicate(key)]
+        self._stale_fetches.update(stale)
+        return len(stale)
+
+    def purge_expired(self) -> int:
+        """
+        Drop every expired entry now instead of waiting for it to be looked up.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            now = self.clock()
+            expired = [
+                key for key, (_, expires_at, _) in self._entries.items()
+                if expires_at is not None and now >= expires_at
+            ]
+            for key in expired:
+                self._remove(key)
+            self.stats["expirations"] += len(expired)
+            return len(expired)
+
+    def clear(self) -> None:
+        """Drop every entry; fetches in flight return their values without storing them."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._invalidate_fetches(lambda key: True)
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl_seconds: Optional[float] = None,
+    ) -> Any:
+        """
+        Return the cached value for key, fetching and caching it on a miss.
+
+        Concurrent callers missing on the same key share one fetch. A fetch
+        that raises is not cached; its exception is raised to every waiter.
+        Neither is a fetch invalidated while it ran (see ``invalidate``).
+
+        Args:
+            key: Cache key
+            fetch: Zero-argument coroutine function producing the value
+            ttl_seconds: Lifetime of the fetched entry (defaults to the cache's ttl_seconds)
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        while True:
+            with self._lock:
+                value = self._lookup(key)
+                if value is not _MISSING:
+                    self.stats["hits"] += 1
+                    return value
+                future = self._inflight.get(key)
+                if future is None:
+                    self.stats["misses"] += 1
+                    self.stats["fetches"] += 1
+                    future = asyncio.get_running_loop().create_future()
+                    self._inflight[key] = future
+                    leader = True
+                else:
+                    self.stats["coalesced"] += 1
+                    leader = False
+
+            if not leader:
+                try:
+                    return await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    if not future.cancelled():
+                        raise
+                    # The fetching caller was cancelled; try again ourselves
+                    continue
+
+            try:
+                value = await fetch()
+            except BaseException as e:
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    # Mark retrieved so a fetch without waiters is not logged
+                    future.exception()
+                raise
+            else:
+                with self._lock:
+                    if future not in self._stale_fetches:
+                        self.set(key, value, ttl_seconds)
+                future.set_result(value)
+                return value
+            finally:
+                with self._lock:
+                    self._stale_fetches.discard(future)
+                    if self._inflight.get(key) is future:
+                        del self._inflight[key]
+
+    @property
+    def bytes(self) -> int:
+        """Estimated size of all cached keys and values"""
+        return self._bytes
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._lookup(key) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit rate, size and eviction statistics"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics for every live named cache, keyed by cache name"""
+    return {name: cache.get_stats() for name, cache in list(_registry.items())}
@@ -5,27 +5,47 @@ This package provides modular database functionality split across focused module
 - client: Supabase client initialization and connection management
 - social_links: Social media link extraction and processing
 - event_data: Event data saving and processing logic
-- search: Search and query functionality (keyword search, date queries, speaker lookup)
+- search: Search and query functionality (keyword, hybrid and semantic search, date queries, speaker lookup)
 - usage_tracking: Usage tracking and analytics logging
 - utils: Database utilities and helper functions
 """
 
 # Import main functions for backward compatibility
-from .client import get_supabase_client, init_supabase_client
+from .client import get_async_db_client, get_supabase_client, init_supabase_client
 from .event_data import save_event_data
+from .query_cache import clear_query_caches
 from .search import (
     _sync_get_events_by_date,
     _sync_get_speaker_by_name,
+    _sync_hybrid_search_events,
     _sync_keyword_search_events,
+    _sync_semantic_search_speakers,
+    fetch_rows_by_id,
+    get_events_by_date_basic,
+    get_speaker_by_name,
+    hybrid_search_events,
+    keyword_search_events,
+    semantic_search_speakers,
 )
 from .social_links import extract_social_links
 from .usage_tracking import log_usage
-from .utils import _create_iso_timestamp, _sync_insert, _sync_upsert
+from .utils import (
+    _create_iso_timestamp,
+    _sync_bulk_persist,
+    _sync_bulk_upsert,
+    _sync_insert,
+    _sync_upsert,
+    bulk_persist,
+    bulk_upsert,
+    insert_rows,
+    upsert_row,
+)
 
 __all__ = [
     # Client management
     "init_supabase_client",
     "get_supabase_client",
+    "get_async_db_client",
     # Social links
     "extract_social_links",
     # Event data
@@ -34,10 +54,25 @@ __all__ = [
     "_sync_get_speaker_by_name",
     "_sync_get_events_by_date",
     "_sync_keyword_search_events",
+    "_sync_hybrid_search_events",
+    "_sync_semantic_search_speakers",
+    "get_speaker_by_name",
+    "get_events_by_date_basic",
+    "keyword_search_events",
+    "fetch_rows_by_id",
+    "hybrid_search_events",
+    "semantic_search_speakers",
+    "clear_query_caches",
     # Usage tracking
     "log_usage",
     # Database utilities
     "_sync_upsert",
     "_sync_insert",
     "_create_iso_timestamp",
+    "upsert_row",
+    "insert_rows",
+    "bulk_upsert",
+    "bulk_persist",
+    "_sync_bulk_upsert",
+    "_sync_bulk_persist",
 ]
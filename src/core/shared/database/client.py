@@ -5,13 +5,15 @@ Supabase client initialization and connection management.
 import logging
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from dotenv import load_dotenv
 
 from supabase import Client as SupabaseClient
 from supabase import create_client
 
+from ..postgrest import AsyncPostgrestClient, StorageBackend
+
 # Load environment variables
 load_dotenv()
 
@@ -20,12 +22,56 @@ logger = logging.getLogger(__name__)
 
 # Global variable to hold the Supabase client instance
 supabase_client: Optional[SupabaseClient] = None
+# Storage backend shared by the async data-access functions: the pooled
+# PostgREST client, or the embedded store when LOCAL_EVENT_STORE_PATH is set
+async_db_client: Optional[StorageBackend] = None
 
 # Constants for database interactions
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 
+def _resolve_credentials() -> Tuple[Optional[str], Optional[str]]:
+    """
+    Read the Supabase URL and key from the environment, falling back to mounted secret files.
+    """
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_KEY")
+
+    # If environment variables are not set, try reading from mounted files
+    if not supabase_url:
+        url_file_path = Path("/etc/secrets/supabase-url/url")
+        if url_file_path.is_file():
+            try:
+                supabase_url = url_file_path.read_text().strip()
+                logger.info(f"Read SUPABASE_URL from file: {url_file_path}")
+            except Exception as e:
+                logger.error(
+                    f"Failed to read SUPABASE_URL from file {url_file_path}: {e}"
+                )
+        else:
+            logger.warning(
+                f"SUPABASE_URL env var not set and file not found at {url_file_path}"
+            )
+
+    if not supabase_key:
+        key_file_path = Path("/etc/secrets/supabase-key/key")
+        if key_file_path.is_file():
+            try:
+                supabase_key = key_file_path.read_text().strip()
+                logger.info(f"Read SUPABASE_KEY from file: {key_file_path}")
+            except Exception as e:
+                logger.error(
+                    f"Failed to read SUPABASE_KEY from file {key_file_path}: {e}"
+                )
+        else:
+            logger.warning(
+                f"SUPABASE_KEY env var not set and file not found at {key_file_path}"
+            )
+
+    return supabase_url, supabase_key
+
+
 def init_supabase_client():
     """
     Initializes the Supabase client using environment variables.
@@ -40,39 +86,7 @@ def init_supabase_client():
             logger.info(
                 "init_supabase_client: About to read SUPABASE_URL and SUPABASE_KEY from environment or files."
             )
-            supabase_url = os.getenv("SUPABASE_URL")
-            supabase_key = os.getenv("SUPABASE_KEY")
-
-            # If environment variables are not set, try reading from mounted files
-            if not supabase_url:
-                url_file_path = Path("/etc/secrets/supabase-url/url")
-                if url_file_path.is_file():
-                    try:
-                        supabase_url = url_file_path.read_text().strip()
-                        logger.info(f"Read SUPABASE_URL from file: {url_file_path}")
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to read SUPABASE_URL from file {url_file_path}: {e}"
-                        )
-                else:
-                    logger.warning(
-                        f"SUPABASE_URL env var not set and file not found at {url_file_path}"
-                    )
-
-            if not supabase_key:
-                key_file_path = Path("/etc/secrets/supabase-key/key")
-                if key_file_path.is_file():
-                    try:
-                        supabase_key = key_file_path.read_text().strip()
-                        logger.info(f"Read SUPABASE_KEY from file: {key_file_path}")
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to read SUPABASE_KEY from file {key_file_path}: {e}"
-                        )
-                else:
-                    logger.warning(
-                        f"SUPABASE_KEY env var not set and file not found at {key_file_path}"
-                    )
+            supabase_url, supabase_key = _resolve_credentials()
 
             # <<< ADDED LOGGING >>>
             logger.info(
@@ -119,3 +133,40 @@ def get_supabase_client() -> SupabaseClient:
         return init_supabase_client()
     logger.info("get_supabase_client: Returning existing client instance.")
     return supabase_client
+
+
+def get_async_db_client() -> StorageBackend:
+    """
+    Returns the shared storage backend, creating it on first use.
+
+    With LOCAL_EVENT_STORE_PATH set this is an embedded SQLite store at that
+    path (offline runs, benchmarks); otherwise the pooled async PostgREST
+    client for Supabase, using the same credentials as the Supabase client.
+
+    Raises:
+        ValueError: If neither a local store nor Supabase is configured
+    """
+    global async_db_client
+    if async_db_client is None:
+        local_store_path = os.getenv("LOCAL_EVENT_STORE_PATH")
+        if local_store_path:
+            from ..local_store import SQLiteEventStore
+
+            async_db_client = SQLiteEventStore(local_store_path)
+            logger.info(f"Using local event store at {local_store_path}.")
+            return async_db_client
+
+        supabase_url, supabase_key = _resolve_credentials()
+        if not supabase_url or not supabase_key:
+            raise ValueError(
+                "Supabase URL or Key not found in environment variables or mounted secret files."
+            )
+        async_db_client = AsyncPostgrestClient(supabase_url, supabase_key)
+        logger.info("Async PostgREST client initialized.")
+    return async_db_client
+
+
+def set_async_db_client(client: Optional[StorageBackend]) -> None:
+    """Replace the shared backend (e.g. with a SQLiteEventStore or one pointed at a local stand-in)."""
+    global async_db_client
+    async_db_client = client
@@ -0,0 +1,187 @@
+"""
+Read-through caches for the hot chatbot/API lookups.
+
+Events-by-date and speaker-by-name results are cached in named
+``BoundedCache`` instances, so their hit rates show up in
+``get_cache_stats()`` and the API metrics:
+
+- event lists are keyed by the day's UTC range plus the timezone, so every
+  spelling of a date ("April 28", "28th April", "2025-04-28") shares an entry;
+  parsing a date string into that range is itself memoized per day
+- speakers are keyed by the stripped, lower-cased name (lookups are ilike)
+- concurrent misses on one key share a single query, and TTLs are jittered
+  so entries written together do not all expire together
+- the upsert path calls ``invalidate_rows``, so entries a write may have
+  changed are dropped at once instead of waiting out their TTL; lookups
+  already in flight when the write lands return their result uncached
+"""
+
+import datetime
+import functools
+import random
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import pytz
+from dateutil import parser as date_parser
+
+from ..cache import BoundedCache
+
+EVENTS_BY_DATE_TTL_SECONDS = 300.0
+SPEAKER_TTL_SECONDS = 900.0
+TTL_JITTER = 0.1
+DATE_PARSE_CACHE_SIZE = 1024
+
+events_by_date_cache = BoundedCache(
+    max_entries=512, ttl_seconds=EVENTS_BY_DATE_TTL_SECONDS, name="db_events_by_date"
+)
+speaker_cache = BoundedCache(
+    max_entries=4096, ttl_seconds=SPEAKER_TTL_SECONDS, name="db_speaker_by_name"
+)
+
+# (UTC start ISO, UTC end ISO, timezone name)
+EventsKey = Tuple[str, str, str]
+
+
+@functools.lru_cache(maxsize=DATE_PARSE_CACHE_SIZE)
+def _parse_day_range(
+    date_str: str, timezone_str: str, today: datetime.date
+) -> Tuple[datetime.date, str, str]:
+    # today is part of the key because fuzzy parsing fills in the current year
+    target_date = date_parser.parse(date_str, fuzzy=True).date()
+    tz = pytz.timezone(timezone_str)
+    start_local = datetime.datetime.combine(target_date, datetime.time.min, tzinfo=tz)
+    end_local = datetime.datetime.combine(target_date, datetime.time.max, tzinfo=tz)
+    return (
+        target_date,
+        start_local.astimezone(pytz.utc).isoformat(),
+        end_local.astimezone(pytz.utc).isoformat(),
+    )
+
+
+def utc_day_range(date_str: str, timezone_str: str) -> Tuple[datetime.date, str, str]:
+    """
+    Parse a date string and return the date and its UTC start/end as ISO strings.
+
+    Raises:
+        ParserError: If the date string cannot be parsed
+        pytz.UnknownTimeZoneError: If the timezone is unknown
+    """
+    return _parse_day_range(date_str.strip(), timezone_str, datetime.date.today())
+
+
+def events_key(start_utc: str, end_utc: str, timezone_str: str) -> EventsKey:
+    return (start_utc, end_utc, timezone_str)
+
+
+def speaker_key(name: str) -> str:
+    return " ".join(name.split()).lower()
+
+
+def _jittered(ttl_seconds: Optional[float]) -> Optional[float]:
+    if ttl_seconds is None:
+        return None
+    return ttl_seconds * random.uniform(1 - TTL_JITTER, 1 + TTL_JITTER)
+
+
+async def cached_events_by_date(
+    key: EventsKey, fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]
+) -> List[Dict[str, Any]]:
+    """Read through the events-by-date cache; failed fetches are not cached."""
+    return await events_by_date_cache.get_or_fetch(
+        key, fetch, ttl_seconds=_jittered(events_by_date_cache.ttl_seconds)
+    )
+
+
+async def cached_speaker(
+    name: str, fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+) -> Optional[Dict[str, Any]]:
+    """Read through the speaker cache; misses (None) are cached too, failed fetches are not."""
+    return await speaker_cache.get_or_fetch(
+        speaker_key(name), fetch, ttl_seconds=_jittered(speaker_cache.ttl_seconds)
+    )
+
+
+def invalidate_speakers(names: Iterable[str]) -> int:
+    """
+    Drop cached and in-flight lookups for the given speaker names.
+
+    Returns:
+        Number of entries and in-flight lookups invalidated
+    """
+    return sum(
+        1 for name in names if isinstance(name, str) and speaker_cache.invalidate(speaker_key(name))
+    )
+
+
+def invalidate_events(
+    start_times: Iterable[Optional[str]] = (),
+    identities: Iterable[Tuple[str, Any]] = (),
+) -> int:
+    """
+    Drop cached event lists a write may have changed.
+
+    A list is dropped when its UTC range covers one of start_times (the
+    event's new day) or when it contains a row matching one of identities
+    (the event's old day, if it moved). Lookups in flight cannot be checked
+    for identities, so with any identity given every one is invalidated.
+
+    Args:
+        start_times: start_time_iso values written
+        identities: (column, value) pairs identifying the written events
+
+    Returns:
+        Number of entries and in-flight lookups invalidated
+    """
+    instants = []
+    for value in start_times:
+        if not value:
+            continue
+        try:
+            instants.append(date_parser.isoparse(value).astimezone(pytz.utc))
+        except (ValueError, TypeError, OverflowError):
+            # Cannot tell which day it lands on
+            removed = len(events_by_date_cache)
+            events_by_date_cache.clear()
+            return removed
+    identities = [(column, value) for column, value in identities if value is not None]
+
+    def covers_write(key: Hashable) -> bool:
+        start_utc, end_utc, _ = key
+        start, end = date_parser.isoparse(start_utc), date_parser.isoparse(end_utc)
+        return any(start <= instant <= end for instant in instants)
+
+    stale: List[Hashable] = []
+    for key in events_by_date_cache:
+        if covers_write(key):
+            stale.append(key)
+            continue
+        rows = events_by_date_cache.peek(key) or []
+        if any(row.get(column) == value for row in rows for column, value in identities):
+            stale.append(key)
+    for key in stale:
+        events_by_date_cache.pop(key)
+    inflight = events_by_date_cache.invalidate_inflight(None if identities else covers_write)
+    return len(stale) + inflight
+
+
+def invalidate_rows(table_name: str, rows: Iterable[Dict[str, Any]], conflict_column: str) -> None:
+    """Invalidation hook for the upsert path: drop entries a write to table_name may have changed."""
+    rows = list(rows)
+    if table_name == "speakers":
+        names = [row.get("name") for row in rows]
+        if conflict_column != "name":
+            # Renamed via another key; the old name is unknown
+            speaker_cache.clear()
+        else:
+            invalidate_speakers(names)
+    elif table_name == "events":
+        invalidate_events(
+            (row.get("start_time_iso") for row in rows),
+            ((column, row.get(column)) for row in rows for column in {"id", conflict_column}),
+        )
+
+
+def clear_query_caches() -> None:
+    """Drop every cached lookup (e.g. after a bulk load)."""
+    events_by_date_cache.clear()
+    speaker_cache.clear()
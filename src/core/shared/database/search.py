@@ -1,21 +1,27 @@
 """
 Search and query functionality for database operations.
+
+Queries run on the pooled async PostgREST client; the ``_sync_*`` functions
+are thin wrappers for synchronous callers. Speaker and events-by-date
+lookups read through the caches in ``query_cache``.
 """
 
-import datetime
-import json
 import logging
-import os
 import time
 from typing import Any, Dict, List, Optional
 
+import httpx
 import pytz
-import requests
-from dateutil import parser as date_parser
 from dateutil.parser import ParserError
 
 from supabase import Client as SupabaseClient
 
+from ..postgrest import DeadlineExceeded, PostgrestError, StorageBackend, run_sync
+from ..vector_index import VectorIndex, reciprocal_rank_fusion
+from . import query_cache
+from .client import get_async_db_client
+from .utils import _backend_from_client, _in_filter
+
 # Enhanced structured logging
 try:
     from chatbot_api.utils.logging_utils import get_logger
@@ -26,33 +32,57 @@ except ImportError:
     logger = logging.getLogger(__name__)
 
 
-def _sync_get_speaker_by_name(client, name: str) -> Optional[Dict[str, Any]]:
-    """Synchronous helper function to retrieve a speaker by exact name match."""
+def _log_database_operation(**kwargs: Any) -> None:
+    # Only the structured logger has log_database_operation
+    if hasattr(logger, "log_database_operation"):
+        logger.log_database_operation(**kwargs)
+
+
+EVENT_COLUMNS = "id, name, description, start_time_iso, luma_url"
+SPEAKER_COLUMNS = "id, name, title, bio, linkedin_url, twitter_url, website_url, source_urls"
+
+
+async def get_speaker_by_name(
+    name: str, db: Optional[StorageBackend] = None, use_cache: bool = True
+) -> Optional[Dict[str, Any]]:
+    """Retrieve a speaker by case-insensitive exact name match (None if missing or on error)."""
+    try:
+        if not use_cache:
+            return await _query_speaker_by_name(name, db)
+        row = await query_cache.cached_speaker(name, lambda: _query_speaker_by_name(name, db))
+        # Copy so callers cleaning the row do not change the cached one
+        return dict(row) if row else None
+    except Exception:
+        return None
+
+
+async def _query_speaker_by_name(
+    name: str, db: Optional[StorageBackend] = None
+) -> Optional[Dict[str, Any]]:
+    """Query a speaker by name; errors are logged and re-raised so they are never cached."""
     db_start_time = time.time()
 
     logger.info(f"Attempting direct DB lookup for speaker: '{name}'")
     try:
+        db = db or get_async_db_client()
         # Select only the columns we actually need and intend to use
-        response = (
-            client.table("speakers")
-            .select(
-                "id, name, title, bio, linkedin_url, twitter_url, website_url, source_urls"
-            )
-            .ilike("name", name)
-            .limit(1)
-            .execute()
+        rows = await db.select(
+            "speakers",
+            SPEAKER_COLUMNS,
+            filters={"name": f"ilike.{name}"},
+            limit=1,
         )
 
         db_end_time = time.time()
         db_duration_ms = (db_end_time - db_start_time) * 1000
 
-        if response.data:
+        if rows:
             # Log successful database operation with structured logging
-            logger.log_database_operation(
+            _log_database_operation(
                 operation="SELECT",
                 table="speakers",
                 duration_ms=db_duration_ms,
-                rows_affected=len(response.data),
+                rows_affected=len(rows),
                 success=True,
                 extra={
                     "query_type": "speaker_name_lookup",
@@ -65,10 +95,10 @@ def _sync_get_speaker_by_name(client, name: str) -> Optional[Dict[str, Any]]:
                 f"Direct lookup successful for speaker '{name}'. Found 1 record."
             )
             # Return the raw data - cleaning will happen in the API handler
-            return response.data[0]
+            return rows[0]
         else:
             # Log empty result with structured logging
-            logger.log_database_operation(
+            _log_database_operation(
                 operation="SELECT",
                 table="speakers",
                 duration_ms=db_duration_ms,
@@ -90,7 +120,7 @@ def _sync_get_speaker_by_name(client, name: str) -> Optional[Dict[str, Any]]:
         db_duration_ms = (db_end_time - db_start_time) * 1000
 
         # Log database error with structured logging
-        logger.log_database_operation(
+        _log_database_operation(
             operation="SELECT",
             table="speakers",
             duration_ms=db_duration_ms,
@@ -107,7 +137,13 @@ def _sync_get_speaker_by_name(client, name: str) -> Optional[Dict[str, Any]]:
         logger.error(
             f"Error during direct speaker lookup for '{name}': {e}", exc_info=True
         )
-        return None
+        raise
+
+
+def _sync_get_speaker_by_name(client, name: str) -> Optional[Dict[str, Any]]:
+    """Synchronous wrapper for get_speaker_by_name (client: StorageBackend or None)."""
+    db = _backend_from_client(client, "_sync_get_speaker_by_name")
+    return run_sync(get_speaker_by_name(name, db=db))
 
 
 def _sync_get_events_by_date(
@@ -145,7 +181,8 @@ def _sync_get_events_by_date(
         logger.warning(
             "Enhanced date processing not available, falling back to basic parsing"
         )
-        return _sync_get_events_by_date_basic(client, date_str, timezone_str)
+        db = client if isinstance(client, StorageBackend) else None
+        return _sync_get_events_by_date_basic(db, date_str, timezone_str)
     except Exception as e:
         logger.error(
             f"Error in enhanced date lookup for '{date_str}': {e}", exc_info=True
@@ -153,49 +190,46 @@ def _sync_get_events_by_date(
         return []
 
 
-def _sync_get_events_by_date_basic(
-    client: SupabaseClient, date_str: str, timezone_str: str = "Asia/Dubai"
+async def get_events_by_date_basic(
+    date_str: str,
+    timezone_str: str = "Asia/Dubai",
+    db: Optional[StorageBackend] = None,
+    use_cache: bool = True,
 ) -> List[Dict[str, Any]]:
     """Basic date parsing implementation (fallback)."""
     logger.info(f"Basic date lookup for events on date string: '{date_str}'")
     try:
-        # Attempt to parse the date string, assuming current year if not specified
-        # Use fuzzy parsing to handle variations like "28th", "April 28"
-        target_date = date_parser.parse(date_str, fuzzy=True).date()
+        # Parse the date string, assuming current year if not specified, and
+        # get the day's range in UTC (timestamptz is stored in UTC).
+        # Fuzzy parsing handles variations like "28th", "April 28".
+        target_date, start_utc, end_utc = query_cache.utc_day_range(date_str, timezone_str)
         logger.debug(f"Parsed target date: {target_date}")
+        logger.debug(f"Querying events between UTC: {start_utc} and {end_utc}")
+
+        async def fetch() -> List[Dict[str, Any]]:
+            return await (db or get_async_db_client()).select(
+                "events",
+                EVENT_COLUMNS,
+                filters=[
+                    ("start_time_iso", f"gte.{start_utc}"),
+                    ("start_time_iso", f"lte.{end_utc}"),
+                ],
+                order="start_time_iso.asc",
+            )
 
-        # Define the date range for the query (using the provided timezone)
-        tz = pytz.timezone(timezone_str)
-        start_datetime_local = datetime.datetime.combine(
-            target_date, datetime.time.min, tzinfo=tz
-        )
-        end_datetime_local = datetime.datetime.combine(
-            target_date, datetime.time.max, tzinfo=tz
-        )
-
-        # Convert to UTC for Supabase query (timestamptz is stored in UTC)
-        start_datetime_utc = start_datetime_local.astimezone(pytz.utc)
-        end_datetime_utc = end_datetime_local.astimezone(pytz.utc)
-
-        logger.debug(
-            f"Querying events between UTC: {start_datetime_utc.isoformat()} and {end_datetime_utc.isoformat()}"
-        )
-
-        response = (
-            client.table("events")
-            .select("id, name, description, start_time_iso, luma_url")
-            .gte("start_time_iso", start_datetime_utc.isoformat())
-            .lte("start_time_iso", end_datetime_utc.isoformat())
-            .order("start_time_iso", desc=False)
-            .execute()
-        )
+        if use_cache:
+            key = query_cache.events_key(start_utc, end_utc, timezone_str)
+            # Copy so callers cleaning rows do not change the cached ones
+            rows = [dict(row) for row in await query_cache.cached_events_by_date(key, fetch)]
+        else:
+            rows = await fetch()
 
-        if response.data:
+        if rows:
             logger.info(
-                f"Basic date lookup found {len(response.data)} events for '{date_str}' ({target_date})."
+                f"Basic date lookup found {len(rows)} events for '{date_str}' ({target_date})."
             )
             # Return raw data - cleaning happens in API handler
-            return response.data
+            return rows
         else:
             logger.info(
                 f"Basic date lookup did not find any events for '{date_str}' ({target_date})."
@@ -216,82 +250,230 @@ def _sync_get_events_by_date_basic(
         return []
 
 
-def _sync_keyword_search_events(
-    client: SupabaseClient, query: str, limit: int = 10
+def _sync_get_events_by_date_basic(
+    client: Optional[StorageBackend], date_str: str, timezone_str: str = "Asia/Dubai"
 ) -> List[Dict[str, Any]]:
-    """Performs a keyword search using the keyword_search_events RPC via direct HTTP POST."""
-    # Ensure we have the necessary config - read directly as client object might not be fully initialized
-    # if client initialization is lazy and this is called before the client is used elsewhere.
-    # If client is guaranteed to be initialized, client.supabase_url/key could be used.
-    supabase_url_local = os.getenv("SUPABASE_URL")
-    supabase_key_local = os.getenv("SUPABASE_KEY")
-
-    if not supabase_url_local or not supabase_key_local:
-        logger.error("Supabase URL or Key not configured for direct RPC call.")
-        return []
+    """Synchronous wrapper for get_events_by_date_basic (client: StorageBackend or None)."""
+    db = _backend_from_client(client, "_sync_get_events_by_date_basic")
+    return run_sync(get_events_by_date_basic(date_str, timezone_str, db=db))
+
 
-    rpc_url = f"{supabase_url_local.rstrip('/')}/rest/v1/rpc/keyword_search_events"
-    headers = {
-        "apikey": supabase_key_local,
-        "Authorization": f"Bearer {supabase_key_local}",
-        "Content-Type": "application/json",
-        "Content-Profile": "public",  # Added: Specify schema for RPC
-        "Prefer": "params=single-object",  # To send params as a single JSON object
-    }
+async def keyword_search_events(
+    query: str, limit: int = 10, db: Optional[StorageBackend] = None
+) -> List[Dict[str, Any]]:
+    """Performs a keyword search using the keyword_search_events RPC."""
     payload = {"keyword": query, "result_limit": limit}
 
-    logger.info(
-        f"Performing keyword search via direct POST to RPC endpoint for query: '{query}'"
-    )
-    logger.debug(f"Calling RPC URL: {rpc_url}")
-    logger.debug(
-        f"Using headers (key redacted): {{'apikey': '...', 'Authorization': 'Bearer ...', 'Content-Type': '{headers.get('Content-Type')}', 'Content-Profile': '{headers.get('Content-Profile')}', 'Prefer': '{headers.get('Prefer')}'}}"
-    )
+    logger.info(f"Performing keyword search via RPC for query: '{query}'")
     logger.debug(f"Using payload: {payload}")
 
     try:
-        # Make the POST request with explicit UTF-8 encoding
-        response = requests.post(
-            rpc_url,
-            headers=headers,
-            data=json.dumps(payload).encode("utf-8"),  # Encode payload explicitly
-            timeout=15,
-        )
-        # Ensure Content-Type reflects the encoded data if needed (requests usually handles this)
-        # If issues persist, might need to set 'Content-Type': 'application/json; charset=utf-8' explicitly
-
-        response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
-
-        response_data = response.json()
+        db = db or get_async_db_client()
+        response_data = await db.rpc("keyword_search_events", payload)
 
         # Check if response contains data (PostgREST returns JSON array)
         if isinstance(response_data, list):
-            logger.info(
-                f"Keyword search direct RPC POST returned {len(response_data)} events."
-            )
+            logger.info(f"Keyword search RPC returned {len(response_data)} events.")
             return response_data
         else:
             # Log unexpected response format
             logger.warning(
-                f"Keyword search direct RPC POST for query '{query}' returned unexpected format. Response: {response_data}"
+                f"Keyword search RPC for query '{query}' returned unexpected format. Response: {response_data}"
             )
             return []
 
-    except requests.exceptions.RequestException as e:
+    except ValueError as e:
+        logger.error(f"Supabase URL or Key not configured for keyword search RPC: {e}")
+        return []
+    except PostgrestError as e:
+        logger.error(
+            f"Keyword search RPC failed (status {e.status_code}, code {e.code}): {e.message}",
+            exc_info=True,
+        )
+        return []
+    except (httpx.HTTPError, DeadlineExceeded) as e:
         logger.error(f"HTTP error calling keyword search RPC: {e}", exc_info=True)
-        # Consider the type of error - e.g., timeout vs. connection error vs. HTTP error code
-        # Log details from response if available (e.g., e.response.text)
-        if e.response is not None:
-            logger.error(f"RPC Response Status: {e.response.status_code}")
-            logger.error(f"RPC Response Body: {e.response.text}")
         return []
     except Exception as e:
         logger.error(
-            f"Unexpected error calling keyword search RPC via POST: {e}", exc_info=True
+            f"Unexpected error calling keyword search RPC: {e}", exc_info=True
         )
         return []
 
 
+def _sync_keyword_search_events(
+    client: Optional[StorageBackend], query: str, limit: int = 10
+) -> List[Dict[str, Any]]:
+    """Synchronous wrapper for keyword_search_events (client: StorageBackend or None)."""
+    db = _backend_from_client(client, "_sync_keyword_search_events")
+    return run_sync(keyword_search_events(query, limit, db=db))
+
+
+async def fetch_rows_by_id(
+    table: str, columns: str, ids: List[Any], db: Optional[StorageBackend] = None
+) -> Dict[Any, Dict[str, Any]]:
+    """Fetch rows by primary key, keyed by id (ids missing from the table are skipped)."""
+    if not ids:
+        return {}
+    db = db or get_async_db_client()
+    rows = await db.select(table, columns, filters={"id": _in_filter(ids)})
+    return {row["id"]: row for row in rows or []}
+
+
+def _sync_fetch_rows_by_id(
+    client: Optional[StorageBackend], table: str, columns: str, ids: List[Any]
+) -> Dict[Any, Dict[str, Any]]:
+    """Synchronous wrapper for fetch_rows_by_id (client: StorageBackend or None)."""
+    db = _backend_from_client(client, "_sync_fetch_rows_by_id")
+    return run_sync(fetch_rows_by_id(table, columns, ids, db=db))
+
+
+async def hybrid_search_events(
+    query: str,
+    query_embedding: Optional[List[float]],
+    vector_index: VectorIndex,
+    limit: int = 10,
+    keyword_weight: float = 1.0,
+    vector_weight: float = 1.0,
+    min_vector_score: Optional[float] = None,
+    db: Optional[StorageBackend] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Hybrid event search merging keyword RPC results with local vector search.
+
+    Both sources are queried for twice the limit and merged with reciprocal
+    rank fusion. Events found only by vector search are fetched from the
+    events table; index entries for events that no longer exist are skipped.
+
+    Args:
+        query: Search text for the keyword RPC (empty to skip it)
+        query_embedding: Embedding of the query (None to skip vector search)
+        vector_index: Local index of event embeddings keyed by event id
+        limit: Maximum number of events to return
+        keyword_weight: Fusion weight of the keyword ranking
+        vector_weight: Fusion weight of the vector ranking
+        min_vector_score: Ignore vector hits below this cosine similarity
+        db: Storage backend (defaults to the shared one)
+
+    Returns:
+        Event rows, best first, each with "hybrid_score" and "vector_score"
+        (None when the event was not a vector hit)
+    """
+    candidates = limit * 2
+    keyword_results = await keyword_search_events(query, limit=candidates, db=db) if query else []
+
+    vector_hits = []
+    if query_embedding is not None and len(vector_index):
+        try:
+            vector_hits = vector_index.search(query_embedding, k=candidates, min_score=min_vector_score)
+        except ValueError as e:
+            logger.error(f"Vector search skipped for query '{query}': {e}")
+    vector_scores = dict(vector_hits)
+
+    fused = reciprocal_rank_fusion(
+        [
+            [row["id"] for row in keyword_results if row.get("id") is not None],
+            [event_id for event_id, _ in vector_hits],
+        ],
+        weights=[keyword_weight, vector_weight],
+    )[:limit]
+
+    rows = {row["id"]: row for row in keyword_results if row.get("id") is not None}
+    missing = [event_id for event_id, _ in fused if event_id not in rows]
+    try:
+        rows.update(await fetch_rows_by_id("events", EVENT_COLUMNS, missing, db=db))
+    except Exception as e:
+        logger.error(f"Error fetching vector search hits {missing}: {e}", exc_info=True)
+
+    results = []
+    for event_id, score in fused:
+        row = rows.get(event_id)
+        if row is None:
+            continue
+        results.append({**row, "hybrid_score": score, "vector_score": vector_scores.get(event_id)})
+
+    logger.info(
+        f"Hybrid search for '{query}': {len(keyword_results)} keyword and "
+        f"{len(vector_hits)} vector candidates, returning {len(results)} events"
+    )
+    return results
+
+
+async def semantic_search_speakers(
+    query_embedding: List[float],
+    vector_index: VectorIndex,
+    limit: int = 10,
+    min_score: Optional[float] = None,
+    db: Optional[StorageBackend] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Find speakers whose embeddings are closest to a query embedding.
+
+    Args:
+        query_embedding: Embedding of the query
+        vector_index: Local index of speaker embeddings keyed by speaker id
+        limit: Maximum number of speakers to return
+        min_score: Ignore hits below this cosine similarity
+        db: Storage backend (defaults to the shared one)
+
+    Returns:
+        Speaker rows, best first, each with a "vector_score"
+    """
+    try:
+        hits = vector_index.search(query_embedding, k=limit, min_score=min_score)
+        rows = await fetch_rows_by_id(
+            "speakers", SPEAKER_COLUMNS, [speaker_id for speaker_id, _ in hits], db=db
+        )
+    except Exception as e:
+        logger.error(f"Error during semantic speaker search: {e}", exc_info=True)
+        return []
+    return [
+        {**rows[speaker_id], "vector_score": score}
+        for speaker_id, score in hits
+        if speaker_id in rows
+    ]
+
+
+def _sync_hybrid_search_events(
+    client: Optional[StorageBackend],
+    query: str,
+    query_embedding: Optional[List[float]],
+    vector_index: VectorIndex,
+    limit: int = 10,
+    keyword_weight: float = 1.0,
+    vector_weight: float = 1.0,
+    min_vector_score: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Synchronous wrapper for hybrid_search_events (client: StorageBackend or None)."""
+    db = _backend_from_client(client, "_sync_hybrid_search_events")
+    return run_sync(
+        hybrid_search_events(
+            query,
+            query_embedding,
+            vector_index,
+            limit=limit,
+            keyword_weight=keyword_weight,
+            vector_weight=vector_weight,
+            min_vector_score=min_vector_score,
+            db=db,
+        )
+    )
+
+
+def _sync_semantic_search_speakers(
+    client: Optional[StorageBackend],
+    query_embedding: List[float],
+    vector_index: VectorIndex,
+    limit: int = 10,
+    min_score: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Synchronous wrapper for semantic_search_speakers (client: StorageBackend or None)."""
+    db = _backend_from_client(client, "_sync_semantic_search_speakers")
+    return run_sync(
+        semantic_search_speakers(query_embedding, vector_index, limit=limit, min_score=min_score, db=db)
+    )
+
+
 def sanitize_search_query(query: str) -> str:
     """
     Sanitize search query to prevent SQL injection and other attacks.
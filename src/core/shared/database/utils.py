@@ -1,23 +1,43 @@
 """
 Database utilities and helper functions.
+
+Writes run on the pooled async PostgREST client; ``_sync_upsert`` and
+``_sync_insert`` are thin wrappers for synchronous callers. ``bulk_upsert``
+and ``bulk_persist`` write many rows per request and return their IDs.
 """
 
+import asyncio
+import contextlib
 import datetime
 import json
 import logging
-import time
-from typing import Any, Dict, List, Optional
+import warnings
+import weakref
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
 
 import httpx
 import pytz
 from postgrest import APIResponse
 
-from supabase import PostgrestAPIError
-
-from .client import get_supabase_client
+from ..postgrest import UNIQUE_VIOLATION, PostgrestError, StorageBackend, run_sync
+from . import query_cache
+from .client import get_async_db_client
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Rows per multi-row upsert or insert request
+DEFAULT_UPSERT_CHUNK_SIZE = 500
+# Tables whose rows keep a source_urls list of the pages they were found on
+SOURCE_URL_TABLES = ("speakers", "organizations")
+
+# Per event loop: (table, conflict value) -> lock held across a source_urls
+# read-merge-write, so concurrent upserts in this process cannot drop URLs
+_source_url_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, weakref.WeakValueDictionary]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 def _create_iso_timestamp(
     date_str: Optional[str],
@@ -213,68 +233,300 @@ def _create_iso_timestamp(
         return None
 
 
-def _sync_upsert(client, table_name, data, conflict_column="name", source_url=None):
-    """Synchronous upsert helper. Returns the ID of the upserted row."""
-    if not data or not data.get(conflict_column):
-        logger.warning(
-            f"Upsert skipped for {table_name}: Missing data or conflict column value."
+def _in_filter(values: List[Any]) -> str:
+    """PostgREST in. filter; strings are quoted so commas and dots survive."""
+    items = (
+        '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"' if isinstance(value, str) else str(value)
+        for value in values
+    )
+    return f"in.({','.join(items)})"
+
+
+def _backend_from_client(client: Any, wrapper: str) -> Optional[StorageBackend]:
+    """
+    Storage backend for the client argument of a _sync_* wrapper.
+
+    A StorageBackend is used as given and None selects the shared backend.
+    Any other client (a supabase Client) is deprecated and ignored.
+    """
+    if client is None or isinstance(client, StorageBackend):
+        return client
+    warnings.warn(
+        f"Passing a {type(client).__name__} to {wrapper} is deprecated and it is ignored; "
+        "pass a StorageBackend, or None for the shared one",
+        DeprecationWarning,
+        stacklevel=3,
+    )
+    return None
+
+
+def _chunks(items: Sequence[T], size: int) -> List[Sequence[T]]:
+    size = max(1, size)
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _parse_source_urls(value: Any) -> List[str]:
+    """Read source_urls stored either as a JSON array string or as a list."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return [value]
+        if isinstance(value, str):
+            return [value]
+    return [url for url in value if url] if isinstance(value, list) else []
+
+
+def _merge_source_urls(*values: Any) -> str:
+    """Union of source_urls values, first-seen order, as a JSON array string."""
+    merged = dict.fromkeys(url for value in values for url in _parse_source_urls(value))
+    return json.dumps(list(merged))
+
+
+@contextlib.asynccontextmanager
+async def _lock_source_urls(table_name: str, keys: Iterable[Any]) -> AsyncIterator[None]:
+    """Hold the source_urls locks for keys, taken in a fixed order so callers cannot deadlock."""
+    loop = asyncio.get_running_loop()
+    locks = _source_url_locks.get(loop)
+    if locks is None:
+        locks = _source_url_locks[loop] = weakref.WeakValueDictionary()
+    ordered = sorted(keys, key=lambda key: (type(key).__name__, str(key)))
+    held = [locks.setdefault((table_name, key), asyncio.Lock()) for key in ordered]
+    async with contextlib.AsyncExitStack() as stack:
+        for lock in held:
+            await stack.enter_async_context(lock)
+        yield
+
+
+async def _upsert_chunk(
+    db: StorageBackend,
+    table_name: str,
+    rows: Dict[Any, Dict[str, Any]],
+    conflict_column: str,
+    new_source_urls: Optional[Dict[Any, List[str]]],
+) -> Dict[Any, Any]:
+    """
+    Upsert one chunk of deduplicated rows and return conflict value -> id.
+
+    When new_source_urls is given, the stored source_urls are read and merged
+    under per-key locks. The locks only serialize writers in this process;
+    writers in other processes can still interleave between the read and the
+    upsert and drop each other's URLs.
+    """
+    if new_source_urls is None:
+        return await _upsert_groups(db, table_name, rows, conflict_column)
+
+    async with _lock_source_urls(table_name, rows):
+        # One read per chunk so source_urls are merged instead of overwritten
+        existing = await db.select(
+            table_name,
+            f"{conflict_column}, source_urls",
+            filters={conflict_column: _in_filter(list(rows))},
         )
-        return None
+        existing_urls = {row[conflict_column]: row.get("source_urls") for row in existing}
+        for key, row in rows.items():
+            if existing_urls.get(key) or new_source_urls[key]:
+                row["source_urls"] = _merge_source_urls(existing_urls.get(key), new_source_urls[key])
+        return await _upsert_groups(db, table_name, rows, conflict_column)
 
-    conflict_value = data[conflict_column]
 
-    # Prepare data for upsert, removing the conflict column itself
-    upsert_data = {k: v for k, v in data.items() if k != conflict_column}
+async def _upsert_groups(
+    db: StorageBackend,
+    table_name: str,
+    rows: Dict[Any, Dict[str, Any]],
+    conflict_column: str,
+) -> Dict[Any, Any]:
+    """Upsert rows grouped by column set; keys whose request failed are left out."""
+    # PostgREST takes the column list of a multi-row upsert from its rows, so
+    # rows with different keys go in separate requests rather than being
+    # padded with NULLs that would overwrite stored values
+    groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+    for row in rows.values():
+        groups.setdefault(frozenset(row), []).append(row)
 
-    # Add source_url handling - only for tables that support it
-    if source_url and table_name in ["speakers", "organizations"]:
-        # Basic approach: OVERWRITE source_urls with the current source_url in an array
-        # In a real scenario, you'd likely want to fetch existing and append
-        # For simplicity here, we'll just store the latest source.
-        upsert_data["source_urls"] = json.dumps(
-            [source_url]
-        )  # Store as JSON array string
+    ids: Dict[Any, Any] = {}
+    written: List[Any] = []
+    for group in groups.values():
+        try:
+            upserted = await db.upsert(
+                table_name, group, on_conflict=conflict_column, returning="representation"
+            )
+        except Exception as e:
+            # Keep going: the other groups' rows are independent of this one
+            logger.error(
+                f"Error during bulk upsert of {len(group)} rows into {table_name}: {e}",
+                exc_info=True,
+            )
+            continue
+        written.extend(row[conflict_column] for row in group)
+        ids.update({row[conflict_column]: row["id"] for row in upserted or []})
 
-    try:
-        response = (
-            client.table(table_name)
-            .upsert(
-                {conflict_column: conflict_value, **upsert_data},
-                on_conflict=conflict_column,
-                returning="representation",  # Request the full row back
+    missing = [key for key in written if key not in ids]
+    if missing:
+        logger.warning(
+            f"Upsert response for {table_name} had no data for {len(missing)} rows. Trying fallback select."
+        )
+        # Fallback: select the IDs based on the conflict column, in one request
+        try:
+            selected = await db.select(
+                table_name, f"id, {conflict_column}", filters={conflict_column: _in_filter(missing)}
             )
-            .execute()
+        except Exception as e:
+            logger.error(f"Fallback select of {len(missing)} {table_name} IDs failed: {e}")
+        else:
+            ids.update({row[conflict_column]: row["id"] for row in selected})
+    return ids
+
+
+async def bulk_upsert(
+    table_name: str,
+    rows: Iterable[Dict[str, Any]],
+    conflict_column: str = "name",
+    source_url: Optional[str] = None,
+    chunk_size: int = DEFAULT_UPSERT_CHUNK_SIZE,
+    db: Optional[StorageBackend] = None,
+) -> Dict[Any, Any]:
+    """
+    Upsert many rows with multi-row requests and return their IDs.
+
+    Rows sharing a conflict value are merged (later values win). For tables
+    that track sources, source_urls is merged with the stored value and with
+    source_url rather than overwritten; the merge is serialized per key within
+    this process only (see _upsert_chunk).
+
+    Args:
+        table_name: Target table
+        rows: Rows to upsert; rows without a conflict value are skipped
+        conflict_column: Unique column identifying existing rows
+        source_url: Source to add to each row's source_urls (speakers, organizations)
+        chunk_size: Rows per upsert request
+        db: Storage backend (defaults to the shared one)
+
+    Returns:
+        Dict[Any, Any]: Conflict value -> row ID (rows whose request failed are missing)
+    """
+    merge_sources = table_name in SOURCE_URL_TABLES
+    merged: Dict[Any, Dict[str, Any]] = {}
+    new_source_urls: Dict[Any, List[str]] = {}
+    skipped = 0
+    for row in rows:
+        conflict_value = row.get(conflict_column) if row else None
+        if not conflict_value:
+            skipped += 1
+            continue
+        row = dict(row)
+        if merge_sources:
+            urls = new_source_urls.setdefault(conflict_value, [])
+            urls.extend(_parse_source_urls(row.pop("source_urls", None)))
+            if source_url:
+                urls.append(source_url)
+        merged.setdefault(conflict_value, {}).update(row)
+    if skipped:
+        logger.warning(
+            f"Upsert skipped {skipped} rows for {table_name}: Missing data or conflict column value."
         )
+    if not merged:
+        return {}
 
-        if response.data:
-            entity_id = response.data[0]["id"]
-            logger.debug(
-                f"Upsert successful for {table_name} '{conflict_value}'. ID: {entity_id}"
+    db = db or get_async_db_client()
+    keys = list(merged)
+
+    async def upsert_keys(chunk_keys: Sequence[Any]) -> Dict[Any, Any]:
+        try:
+            return await _upsert_chunk(
+                db,
+                table_name,
+                {key: merged[key] for key in chunk_keys},
+                conflict_column,
+                {key: new_source_urls[key] for key in chunk_keys} if merge_sources else None,
             )
-            return entity_id
-        else:
-            logger.warning(
-                f"Upsert response for {table_name} '{conflict_value}' had no data. Response: {response}. Trying fallback select."
+        except Exception as e:
+            logger.error(
+                f"Error during bulk upsert of {len(chunk_keys)} rows into {table_name}: {e}",
+                exc_info=True,
             )
-            # Fallback: try to select the ID based on the conflict column
-            select_response = (
-                client.table(table_name)
-                .select("id")
-                .eq(conflict_column, conflict_value)
-                .limit(1)
-                .execute()
+            return {}
+        finally:
+            # Even a failed request may have written; drop cached reads either way
+            query_cache.invalidate_rows(
+                table_name, (merged[key] for key in chunk_keys), conflict_column
             )
-            if select_response.data:
-                entity_id = select_response.data[0]["id"]
-                logger.debug(
-                    f"Upsert fallback select successful for {table_name} '{conflict_value}'. ID: {entity_id}"
-                )
-                return entity_id
-            else:
-                logger.error(
-                    f"Could not retrieve ID after upsert for {table_name} '{conflict_value}'."
-                )
-                return None
+
+    ids: Dict[Any, Any] = {}
+    for chunk_ids in await asyncio.gather(*(upsert_keys(chunk) for chunk in _chunks(keys, chunk_size))):
+        ids.update(chunk_ids)
+    logger.debug(f"Bulk upsert into {table_name}: {len(ids)}/{len(keys)} rows returned IDs")
+    return ids
+
+
+async def bulk_persist(
+    entities: Iterable[Tuple[str, Dict[str, Any]]],
+    conflict_columns: Optional[Dict[str, str]] = None,
+    source_url: Optional[str] = None,
+    chunk_size: int = DEFAULT_UPSERT_CHUNK_SIZE,
+    db: Optional[StorageBackend] = None,
+) -> Dict[str, Dict[Any, Any]]:
+    """
+    Upsert a mix of entities, grouped per table, with the tables written concurrently.
+
+    Usage:
+        ids = await bulk_persist(
+            [("speakers", {"name": "Alice"}), ("organizations", {"name": "IOG"}), ...],
+            source_url=event_url,
+        )
+        speaker_links = [{"event_id": event_id, "speaker_id": i} for i in ids["speakers"].values()]
+        await insert_rows(speaker_links, "event_speakers")
+
+    Args:
+        entities: (table name, row) pairs
+        conflict_columns: Table -> conflict column (default "name")
+        source_url: Source to add to source_urls (speakers, organizations)
+        chunk_size: Rows per upsert request
+        db: Storage backend (defaults to the shared one)
+
+    Returns:
+        Dict[str, Dict[Any, Any]]: Table -> conflict value -> row ID
+    """
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for table_name, row in entities:
+        grouped.setdefault(table_name, []).append(row)
+    conflict_columns = conflict_columns or {}
+
+    results = await asyncio.gather(
+        *(
+            bulk_upsert(
+                table_name,
+                rows,
+                conflict_columns.get(table_name, "name"),
+                source_url=source_url,
+                chunk_size=chunk_size,
+                db=db,
+            )
+            for table_name, rows in grouped.items()
+        )
+    )
+    return dict(zip(grouped, results))
+
+
+async def upsert_row(
+    table_name: str,
+    data: Dict[str, Any],
+    conflict_column: str = "name",
+    source_url: Optional[str] = None,
+    db: Optional[StorageBackend] = None,
+) -> Optional[Any]:
+    """Upsert one row and return its ID (None on failure)."""
+    if not data or not data.get(conflict_column):
+        logger.warning(
+            f"Upsert skipped for {table_name}: Missing data or conflict column value."
+        )
+        return None
+
+    conflict_value = data[conflict_column]
+    try:
+        ids = await bulk_upsert(table_name, [data], conflict_column, source_url, db=db)
     except Exception as e:
         logger.error(
             f"Error during upsert for {table_name} '{conflict_value}': {e}",
@@ -282,83 +534,136 @@ def _sync_upsert(client, table_name, data, conflict_column="name", source_url=No
         )
         return None
 
+    entity_id = ids.get(conflict_value)
+    if entity_id is None:
+        logger.error(
+            f"Could not retrieve ID after upsert for {table_name} '{conflict_value}'."
+        )
+    else:
+        logger.debug(
+            f"Upsert successful for {table_name} '{conflict_value}'. ID: {entity_id}"
+        )
+    return entity_id
+
 
-def _sync_insert(
+def _sync_upsert(client, table_name, data, conflict_column="name", source_url=None):
+    """Synchronous wrapper for upsert_row. Returns the ID of the upserted row (client: StorageBackend or None)."""
+    db = _backend_from_client(client, "_sync_upsert")
+    return run_sync(upsert_row(table_name, data, conflict_column, source_url, db=db))
+
+
+def _sync_bulk_upsert(
+    table_name: str,
+    rows: Iterable[Dict[str, Any]],
+    conflict_column: str = "name",
+    source_url: Optional[str] = None,
+    chunk_size: int = DEFAULT_UPSERT_CHUNK_SIZE,
+) -> Dict[Any, Any]:
+    """Synchronous wrapper for bulk_upsert."""
+    return run_sync(
+        bulk_upsert(table_name, rows, conflict_column, source_url, chunk_size=chunk_size)
+    )
+
+
+def _sync_bulk_persist(
+    entities: Iterable[Tuple[str, Dict[str, Any]]],
+    conflict_columns: Optional[Dict[str, str]] = None,
+    source_url: Optional[str] = None,
+    chunk_size: int = DEFAULT_UPSERT_CHUNK_SIZE,
+) -> Dict[str, Dict[Any, Any]]:
+    """Synchronous wrapper for bulk_persist."""
+    return run_sync(
+        bulk_persist(entities, conflict_columns, source_url, chunk_size=chunk_size)
+    )
+
+
+async def insert_rows(
     data: List[Dict[str, Any]],
     table_name: str,
     max_retries: int = 3,
     delay: float = 1.0,
-) -> APIResponse:
-    """
-    Synchronous helper function to perform insert with retries, ignoring duplicates.
-    Uses standard insert, assumes ON CONFLICT rules are handled by DB policy or structure if needed.
-    For linking tables, PK conflict should implicitly handle duplicates.
+    chunk_size: int = DEFAULT_UPSERT_CHUNK_SIZE,
+    db: Optional[StorageBackend] = None,
+) -> List[Dict[str, Any]]:
     """
-    client = get_supabase_client()
-    last_exception = None
+    Insert rows in chunked requests, retrying transient failures with backoff and ignoring duplicates.
 
+    Rows whose primary key already exists are skipped, so linking tables can
+    be re-inserted safely.
+
+    Args:
+        data: Rows to insert
+        table_name: Target table
+        max_retries: Attempts for transient failures (connection drops, 5xx)
+        delay: First retry delay in seconds, doubled per retry
+        chunk_size: Rows per insert request
+        db: Storage backend (defaults to the shared one)
+
+    Returns:
+        List[Dict[str, Any]]: Always empty (rows are inserted with return=minimal)
+
+    Raises:
+        PostgrestError: For API errors other than duplicate keys
+    """
     if not data:
         logger.debug(
             f"No data provided for insert into table '{table_name}'. Skipping."
         )
-        # Return an empty successful-like response structure
-        return APIResponse(data=[], count=0)
+        return []
 
-    for attempt in range(max_retries):
+    db = db or get_async_db_client()
+
+    async def insert_chunk(chunk: Sequence[Dict[str, Any]]) -> None:
+        logger.debug(f"Inserting {len(chunk)} records into '{table_name}'")
         try:
-            logger.debug(
-                f"Attempt {attempt + 1}: Inserting {len(data)} records into '{table_name}'"
+            await db.insert(
+                table_name,
+                chunk,
+                returning="minimal",
+                ignore_duplicates=True,
+                max_retries=max(0, max_retries - 1),
+                backoff_base=delay,
             )
-            # Simple insert, relies on PK constraints to avoid dupes
-            insert_query = client.table(table_name).insert(data, returning="minimal")
-            # For linking tables, we expect PK conflicts to just fail, which is okay
-            # We might get a PostgrestAPIError (e.g., code 23505 for unique violation)
-            response = insert_query.execute()
-            # Check for errors even if no exception was raised
-            if hasattr(response, "error") and response.error:
-                raise PostgrestAPIError(response.error)
-            return response
-        except httpx.RemoteProtocolError as e:
-            last_exception = e
-            if attempt < max_retries - 1:
-                logger.warning(
-                    f"Database insert attempt {attempt + 1}/{max_retries} for table '{table_name}' failed due to RemoteProtocolError: {e}. Retrying in {delay}s..."
-                )
-                time.sleep(delay)
-            else:
-                logger.error(
-                    f"Database insert for table '{table_name}' failed after {max_retries} attempts due to RemoteProtocolError."
-                )
-        except PostgrestAPIError as e:
+        except PostgrestError as e:
             # Specifically ignore unique constraint violations (duplicate PK) for linking tables
-            if (
-                getattr(e, "code", "") == "23505"
-            ):  # Standard PostgreSQL code for unique_violation
+            if e.code == UNIQUE_VIOLATION:
                 logger.debug(
                     f"Ignoring duplicate entry during insert into linking table '{table_name}': {e.message}"
                 )
-                # Return an empty successful-like response structure
-                return APIResponse(data=[], count=0)
-            else:
-                # Log other API errors and re-raise
-                error_details = {
-                    "code": getattr(e, "code", "N/A"),
-                    "message": getattr(e, "message", "Unknown Error"),
-                    "details": getattr(e, "details", "N/A"),
-                    "hint": getattr(e, "hint", "N/A"),
-                }
-                logger.error(
-                    f"Supabase API Error during insert (Table: {table_name}): {error_details}"
-                )
-                raise e  # Re-raise other API errors
-        except Exception as e:
+                return
+            # Log other API errors and re-raise
+            error_details = {
+                "code": e.code or "N/A",
+                "message": e.message,
+                "details": e.details or "N/A",
+                "hint": e.hint or "N/A",
+            }
             logger.error(
-                f"An unexpected error occurred during the synchronous insert (Table: {table_name}): {e}",
-                exc_info=True,
+                f"Supabase API Error during insert (Table: {table_name}): {error_details}"
+            )
+            raise
+        except httpx.TransportError as e:
+            logger.error(
+                f"Database insert for table '{table_name}' failed after {max_retries} attempts: {e}"
             )
-            raise e  # Re-raise other unexpected errors
-    if last_exception:
-        raise last_exception
-    raise Exception(
-        f"Database insert failed after all retries for table '{table_name}' without a specific exception being stored."
+            raise
+
+    await asyncio.gather(*(insert_chunk(chunk) for chunk in _chunks(data, chunk_size)))
+    return []
+
+
+def _sync_insert(
+    data: List[Dict[str, Any]],
+    table_name: str,
+    max_retries: int = 3,
+    delay: float = 1.0,
+    chunk_size: int = DEFAULT_UPSERT_CHUNK_SIZE,
+) -> APIResponse:
+    """
+    Synchronous wrapper for insert_rows, returning a postgrest APIResponse.
+    For linking tables, PK conflicts are skipped rather than failing the insert.
+    """
+    rows = run_sync(
+        insert_rows(data, table_name, max_retries=max_retries, delay=delay, chunk_size=chunk_size)
     )
+    return APIResponse(data=rows, count=0 if not data else None)
@@ -0,0 +1,392 @@
+"""
+Batched, cached embedding generation for Agent Forge.
+
+``EmbeddingService`` sits in front of an embedding backend:
+
+- concurrent ``embed`` calls arriving within a short window are sent to the
+  backend as one batched request, and identical texts in flight share it
+- embeddings are cached in SQLite keyed by a hash of the model and text, so
+  re-crawled events with unchanged descriptions are never re-embedded
+- the number of batches in flight is bounded
+
+Backends are pluggable. ``GeminiEmbeddingBackend`` calls Google's embedding
+API; ``FakeEmbeddingBackend`` is deterministic and local, for tests and
+benchmarks.
+"""
+
+import abc
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL_ID = "models/text-embedding-004"
+DEFAULT_MAX_LENGTH = 2048  # Safe limit for text-embedding-004
+DEFAULT_BATCH_SIZE = 100  # embed_content accepts up to 100 texts per call
+DEFAULT_BATCH_WINDOW_SECONDS = 0.01
+DEFAULT_MAX_CONCURRENT_BATCHES = 4
+FAKE_EMBEDDING_DIMENSION = 768
+
+_WORD = re.compile(r"\w+")
+
+
+class EmbeddingBackend(abc.ABC):
+    """
+    Interface for embedding providers.
+
+    ``name`` identifies the model and settings that produced a vector and is
+    part of every cache key, so switching models never returns stale vectors.
+    """
+
+    name = "backend"
+    max_batch_size = DEFAULT_BATCH_SIZE
+
+    @abc.abstractmethod
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a batch of texts.
+
+        Returns:
+            One vector per text, in order
+
+        Raises:
+            Exception: Any failure; the service logs it and returns None for
+                every text in the batch
+        """
+
+
+class GeminiEmbeddingBackend(EmbeddingBackend):
+    """Google Generative AI embeddings, one embed_content call per batch"""
+
+    def __init__(
+        self,
+        model_id: str = DEFAULT_EMBEDDING_MODEL_ID,
+        task_type: str = "RETRIEVAL_QUERY",
+        max_batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.model_id = model_id
+        self.task_type = task_type
+        self.max_batch_size = max_batch_size
+        self.name = f"gemini:{model_id}:{task_type}"
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        import anyio
+        import google.generativeai as genai
+
+        embed_content_partial = functools.partial(
+            genai.embed_content,
+            model=self.model_id,
+            content=texts,
+            task_type=self.task_type,
+        )
+        result = await anyio.to_thread.run_sync(embed_content_partial)
+        embeddings = result.get("embedding") if isinstance(result, dict) else None
+        if not isinstance(embeddings, list) or len(embeddings) != len(texts):
+            raise ValueError(f"Unexpected result format from embed_content API: {str(result)[:200]}")
+        return embeddings
+
+
+class FakeEmbeddingBackend(EmbeddingBackend):
+    """
+    Deterministic local embeddings for tests and benchmarks.
+
+    Words are hashed into a signed bag-of-words vector, so identical texts get
+    identical vectors and texts sharing words score as similar. An optional
+    per-call latency simulates a remote API.
+    """
+
+    def __init__(
+        self,
+        dimension: int = FAKE_EMBEDDING_DIMENSION,
+        latency: float = 0.0,
+        max_batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.dimension = dimension
+        self.latency = latency
+        self.max_batch_size = max_batch_size
+        self.name = f"fake:{dimension}"
+        self.batch_sizes: List[int] = []
+
+    def embed_text(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimension, dtype=np.float64)
+        for word in _WORD.findall(text.lower()):
+            digest = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[digest % self.dimension] += 1.0 if (digest >> 32) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        self.batch_sizes.append(len(texts))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [self.embed_text(text) for text in texts]
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache in SQLite, keyed by a hash of backend name and text.
+
+    Vectors are stored as float32 blobs. Safe to share between processes.
+    """
+
+    def __init__(self, path: str = ":memory:", busy_timeout: float = 5.0):
+        """
+        Args:
+            path: SQLite file, or ":memory:" for a process-local cache
+            busy_timeout: Seconds to wait for another process's write lock
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path) if path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, dimension INTEGER NOT NULL, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def key(backend_name: str, text: str) -> str:
+        """Content hash identifying one text embedded by one backend"""
+        return hashlib.sha256(f"{backend_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Cached vectors for the given keys (missing keys are left out)"""
+        found: Dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            # Stay under SQLite's bound parameter limit
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, Sequence[float]]]) -> None:
+        rows = []
+        now = time.time()
+        for key, vector in items:
+            array = np.asarray(vector, dtype=np.float32)
+            rows.append((key, len(array), array.tobytes(), now))
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, dimension, vector, created_at) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingService:
+    """
+    Micro-batching, caching front end for an embedding backend.
+
+    Usage:
+        service = EmbeddingService(GeminiEmbeddingBackend(), cache=EmbeddingCache("data/embeddings.sqlite"))
+        vector = await service.embed(event_description)
+        vectors = await service.embed_many(descriptions)
+
+    A service is bound to the event loop it is first used on.
+    """
+
+    def __init__(
+        self,
+        backend: EmbeddingBackend,
+        cache: Optional[EmbeddingCache] = None,
+        batch_window: float = DEFAULT_BATCH_WINDOW_SECONDS,
+        max_batch_size: Optional[int] = None,
+        max_concurrent_batches: int = DEFAULT_MAX_CONCURRENT_BATCHES,
+        max_length: int = DEFAULT_MAX_LENGTH,
+    ):
+        """
+        Args:
+            backend: Embedding provider
+            cache: Persistent cache (None disables caching)
+            batch_window: Seconds to wait for more requests before sending a partial batch
+            max_batch_size: Texts per backend call (defaults to the backend's limit)
+            max_concurrent_batches: Backend calls allowed in flight at once
+            max_length: Texts are truncated to this many characters before embedding
+        """
+        self.backend = backend
+        self.cache = cache
+        self.batch_window = batch_window
+        self.max_batch_size = max(1, min(max_batch_size or backend.max_batch_size, backend.max_batch_size))
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self.max_length = max_length
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # key -> (text, future) waiting for the next batch, in arrival order
+        self._pending: Dict[str, Tuple[str, asyncio.Future]] = {}
+        # key -> future for texts already sent in a batch
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: set = set()
+
+        self.stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "coalesced": 0,
+            "batches": 0,
+            "texts_embedded": 0,
+            "failures": 0,
+        }
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_batches)
+            self._pending.clear()
+            self._inflight.clear()
+            self._flush_handle = None
+            self._batch_tasks = set()
+
+    async def embed(self, text: str) -> Optional[List[float]]:
+        """
+        Embed one text, batched with any other requests made meanwhile.
+
+        Returns:
+            The embedding, or None for empty text or if the backend failed
+        """
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Embed several texts; cache misses are queued for the next batches.
+
+        Returns:
+            One embedding (or None) per text, in order
+        """
+        self._bind_loop()
+        self.stats["requests"] += len(texts)
+
+        keys: List[Optional[str]] = []
+        for text in texts:
+            if not text or not isinstance(text, str):
+                keys.append(None)
+                continue
+            keys.append(EmbeddingCache.key(self.backend.name, text[: self.max_length]))
+
+        wanted = [key for key in keys if key is not None]
+        cached = (
+            await asyncio.to_thread(self.cache.get_many, wanted)
+            if self.cache is not None and wanted
+            else {}
+        )
+        self.stats["cache_hits"] += sum(1 for key in wanted if key in cached)
+
+        futures: Dict[str, asyncio.Future] = {}
+        for text, key in zip(texts, keys):
+            if key is None or key in cached or key in futures:
+                continue
+            futures[key] = self._enqueue(key, text[: self.max_length])
+
+        if futures:
+            # Futures are shared with every caller coalesced onto the same
+            # text, so cancelling this caller must not cancel them
+            await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+
+        results: List[Optional[List[float]]] = []
+        for key in keys:
+            if key is None:
+                results.append(None)
+            elif key in cached:
+                results.append(cached[key])
+            else:
+                results.append(futures[key].result())
+        return results
+
+    def _enqueue(self, key: str, text: str) -> asyncio.Future:
+        future = self._inflight.get(key)
+        if future is None and key in self._pending:
+            future = self._pending[key][1]
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return future
+
+        future = self._loop.create_future()
+        self._pending[key] = (text, future)
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        """Send everything pending, in batches of at most max_batch_size."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending = list(self._pending.items())
+        self._pending.clear()
+        for start in range(0, len(pending), self.max_batch_size):
+            batch = pending[start:start + self.max_batch_size]
+            for key, (_, future) in batch:
+                self._inflight[key] = future
+            task = self._loop.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, Tuple[str, asyncio.Future]]]) -> None:
+        keys = [key for key, _ in batch]
+        texts = [text for _, (text, _) in batch]
+        vectors: List[Optional[List[float]]] = [None] * len(batch)
+        try:
+            async with self._semaphore:
+                self.stats["batches"] += 1
+                vectors = list(await self.backend.embed_batch(texts))
+            self.stats["texts_embedded"] += len(texts)
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.put_many, list(zip(keys, vectors)))
+        except Exception as e:
+            self.stats["failures"] += 1
+            logger.error(f"Embedding batch of {len(texts)} texts failed: {e}", exc_info=True)
+        finally:
+            for key, (_, future), vector in zip(keys, (item for _, item in batch), vectors):
+                self._inflight.pop(key, None)
+                if not future.done():
+                    future.set_result(vector)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request, cache and batching statistics"""
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "backend": self.backend.name,
+            "average_batch_size": self.stats["texts_embedded"] / batches if batches else 0.0,
+            "cached_embeddings": len(self.cache) if self.cache is not None else 0,
+        }
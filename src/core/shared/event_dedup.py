@@ -0,0 +1,427 @@
+"""
+Near-duplicate event detection for Agent Forge.
+
+The same event is often listed on several platforms (Luma, Eventbrite,
+Meetup) under different URLs, so canonical URL matching misses it. This
+module fingerprints events by title, start date and location name with
+MinHash signatures and indexes them with LSH banding: a new event is only
+compared against events sharing at least one band bucket on a nearby date,
+instead of against every stored event.
+
+The index lives in SQLite, so it persists between runs, accepts incremental
+inserts, and can be shared by several worker processes.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 20 bands of 6 rows put the LSH threshold near 0.6: pairs at 0.8 similarity
+# become candidates >99% of the time, unrelated pairs almost never
+DEFAULT_NUM_PERM = 120
+DEFAULT_BANDS = 20
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_DATE_TOLERANCE_DAYS = 1
+DEFAULT_SEED = 1
+
+# Bucket day for events without a start date
+UNDATED = -1
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_NON_WORD = re.compile(r"[^\w]+")
+_NUMBER = re.compile(r"\d+")
+
+
+@dataclass
+class DuplicateMatch:
+    """An indexed event that a query matched"""
+
+    event_id: str
+    similarity: float
+    title: str
+    start_date: Optional[str]
+    location: Optional[str]
+
+
+def _normalize_text(text: Optional[str]) -> str:
+    return _NON_WORD.sub(" ", (text or "").lower()).strip()
+
+
+def _as_date(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+        except ValueError:
+            return None
+    return None
+
+
+def numbers_compatible(title1: str, title2: str) -> bool:
+    """
+    Whether the numbers in two titles agree.
+
+    Templated titles ("Workshop Session 1" / "Workshop Session 2") are close
+    in n-gram space but are different events; a title that simply omits a
+    number ("EthCC Party" / "EthCC Party 2025") is still compatible.
+    """
+    numbers1 = set(_NUMBER.findall(title1 or ""))
+    numbers2 = set(_NUMBER.findall(title2 or ""))
+    return numbers1 <= numbers2 or numbers2 <= numbers1
+
+
+def event_key_fields(event: Any) -> Tuple[str, Optional[date], str]:
+    """
+    Extract (title, start date, location name) from an event.
+
+    Accepts ExtractedEventData-like objects (``title``, ``start_date`` and a
+    ``location`` dict) as well as event dictionaries using either the
+    extraction keys or the ``events`` table columns.
+    """
+    if isinstance(event, dict):
+        title = event.get("title") or event.get("name") or ""
+        start = event.get("start_date") or event.get("start_time")
+        location = event.get("location_name") or event.get("location")
+    else:
+        title = getattr(event, "title", "") or ""
+        start = getattr(event, "start_date", None)
+        location = getattr(event, "location", None)
+
+    if isinstance(location, dict):
+        location = location.get("name") or location.get("city") or location.get("address")
+    return title, _as_date(start), location or ""
+
+
+def event_shingles(title: str, location: str, size: int = 3) -> Set[str]:
+    """Character n-grams of the title plus location words"""
+    normalized = _normalize_text(title)
+    shingles = {normalized[i:i + size] for i in range(max(len(normalized) - size + 1, 1))}
+    shingles.discard("")
+    shingles.update(f"loc:{word}" for word in _normalize_text(location).split())
+    return shingles
+
+
+class MinHasher:
+    """MinHash signatures using universal hashing over 32-bit shingle hashes"""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = DEFAULT_SEED):
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: Iterable[str]) -> np.ndarray:
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64
+        )
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        # Overflow in a * h wraps deterministically, which is all MinHash needs
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return np.bitwise_and(permuted, _MAX_HASH).min(axis=0).astype(np.uint32)
+
+
+def estimate_similarity(sig1: np.ndarray, sig2: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return float(np.count_nonzero(sig1 == sig2)) / len(sig1)
+
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash/LSH index of events.
+
+    Usage:
+        index = NearDuplicateIndex("data/event_dedup.sqlite")
+        match = index.check_and_add(extracted_event)
+        if match:
+            logger.info(f"{extracted_event.url} duplicates {match.event_id}")
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        threshold: float = DEFAULT_THRESHOLD,
+        date_tolerance_days: int = DEFAULT_DATE_TOLERANCE_DAYS,
+        seed: int = DEFAULT_SEED,
+        busy_timeout: float = 5.0,
+    ):
+        """
+        Open (or create) an index.
+
+        Args:
+            path: SQLite file, or ":memory:" for a throwaway index
+            num_perm: MinHash signature length
+            bands: LSH bands; num_perm / bands rows per band. More bands find
+                less similar pairs at the cost of more candidates
+            threshold: Minimum estimated similarity to report a duplicate
+            date_tolerance_days: Start dates this many days apart still match
+                (listings often disagree on timezone)
+            seed: Hash seed; must match the one the index was built with
+            busy_timeout: Seconds to wait for another process's write lock
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.path = path
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.date_tolerance_days = date_tolerance_days
+        self.hasher = MinHasher(num_perm, seed)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path) if path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema({"num_perm": num_perm, "bands": bands, "seed": seed})
+
+        self.stats = {"queries": 0, "candidates": 0, "duplicates": 0, "inserts": 0}
+
+    def _create_schema(self, params: Dict[str, int]) -> None:
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS dedup_params (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS dedup_events (
+                event_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                start_date TEXT,
+                location TEXT,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS dedup_buckets (
+                bucket INTEGER NOT NULL,
+                event_id TEXT NOT NULL,
+                PRIMARY KEY (bucket, event_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS dedup_buckets_event ON dedup_buckets (event_id);
+            """
+        )
+        stored = dict(self._conn.execute("SELECT name, value FROM dedup_params").fetchall())
+        if not stored:
+            self._conn.executemany(
+                "INSERT INTO dedup_params (name, value) VALUES (?, ?)", params.items()
+            )
+        elif stored != params:
+            raise ValueError(
+                f"Index at {self.path} was built with {stored}, not {params}"
+            )
+
+    def _fingerprint(self, event: Any) -> Tuple[str, Optional[date], str, Optional[np.ndarray]]:
+        title, start, location = event_key_fields(event)
+        shingles = event_shingles(title, location)
+        signature = self.hasher.signature(shingles) if shingles else None
+        return title, start, location, signature
+
+    def _band_keys(self, signature: np.ndarray, day: int) -> List[int]:
+        """One bucket key per band, scoped to a start day"""
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(
+                chunk, digest_size=8, person=band.to_bytes(2, "little") + day.to_bytes(4, "little", signed=True)
+            ).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    def _days(self, start: Optional[date]) -> List[int]:
+        if start is None:
+            return [UNDATED]
+        day = start.toordinal()
+        return list(range(day - self.date_tolerance_days, day + self.date_tolerance_days + 1))
+
+    def _query_signature(
+        self,
+        title: str,
+        signature: np.ndarray,
+        start: Optional[date],
+        exclude: Optional[str] = None,
+    ) -> List[DuplicateMatch]:
+        keys = [key for day in self._days(start) for key in self._band_keys(signature, day)]
+        placeholders = ",".join("?" * len(keys))
+        rows = self._conn.execute(
+            f"SELECT e.event_id, e.title, e.start_date, e.location, e.signature "
+            f"FROM dedup_events e WHERE e.event_id IN "
+            f"(SELECT DISTINCT event_id FROM dedup_buckets WHERE bucket IN ({placeholders}))",
+            keys,
+        ).fetchall()
+
+        self.stats["queries"] += 1
+        self.stats["candidates"] += len(rows)
+        matches = []
+        for event_id, other_title, start_date, location, blob in rows:
+            if event_id == exclude or not numbers_compatible(title, other_title):
+                continue
+            similarity = estimate_similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if similarity >= self.threshold:
+                matches.append(DuplicateMatch(event_id, similarity, other_title, start_date, location))
+        matches.sort(key=lambda m: m.similarity, reverse=True)
+        return matches
+
+    def query(self, event: Any) -> List[DuplicateMatch]:
+        """
+        Find indexed events that are near-duplicates of an event.
+
+        Args:
+            event: ExtractedEventData-like object or event dictionary
+
+        Returns:
+            Matches at or above the threshold, most similar first
+        """
+        title, start, _, signature = self._fingerprint(event)
+        if signature is None:
+            return []
+        with self._lock:
+            return self._query_signature(title, signature, start)
+
+    def _insert(
+        self, event_id: str, title: str, start: Optional[date], location: str, signature: np.ndarray
+    ) -> None:
+        day = start.toordinal() if start else UNDATED
+        self._conn.execute("DELETE FROM dedup_buckets WHERE event_id = ?", (event_id,))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO dedup_events (event_id, title, start_date, location, signature) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (event_id, title, start.isoformat() if start else None, location, signature.tobytes()),
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO dedup_buckets (bucket, event_id) VALUES (?, ?)",
+            [(key, event_id) for key in self._band_keys(signature, day)],
+        )
+        self.stats["inserts"] += 1
+
+    def _event_id(self, event: Any, event_id: Optional[str]) -> str:
+        if event_id is not None:
+            return event_id
+        url = event.get("url") if isinstance(event, dict) else getattr(event, "url", None)
+        if not url:
+            raise ValueError("event_id is required for events without a URL")
+        return url
+
+    def add(self, event: Any, event_id: Optional[str] = None) -> bool:
+        """
+        Index an event (replacing any earlier entry with the same id).
+
+        Args:
+            event: ExtractedEventData-like object or event dictionary
+            event_id: Identifier to store (defaults to the event URL)
+
+        Returns:
+            False if the event has no title to fingerprint
+        """
+        event_id = self._event_id(event, event_id)
+        title, start, location, signature = self._fingerprint(event)
+        if signature is None:
+            return False
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._insert(event_id, title, start, location, signature)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def check_and_add(self, event: Any, event_id: Optional[str] = None) -> Optional[DuplicateMatch]:
+        """
+        Dedup stage: return the best match for a duplicate, otherwise index the event.
+
+        Check and insert run in one transaction, so two workers cannot both
+        admit the same event.
+
+        Returns:
+            The most similar existing event, or None if the event was new
+        """
+        event_id = self._event_id(event, event_id)
+        title, start, location, signature = self._fingerprint(event)
+        if signature is None:
+            return None
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                matches = self._query_signature(title, signature, start, exclude=event_id)
+                if not matches:
+                    self._insert(event_id, title, start, location, signature)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if matches:
+            self.stats["duplicates"] += 1
+            logger.debug(f"Near-duplicate event {event_id} matches {matches[0].event_id} ({matches[0].similarity:.2f})")
+            return matches[0]
+        return None
+
+    def add_many(self, events: Iterable[Any]) -> int:
+        """
+        Bulk-index events (keyed by URL) in a single transaction.
+
+        Returns:
+            Number of events indexed
+        """
+        prepared = []
+        for event in events:
+            title, start, location, signature = self._fingerprint(event)
+            if signature is not None:
+                prepared.append((self._event_id(event, None), title, start, location, signature))
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for row in prepared:
+                    self._insert(*row)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(prepared)
+
+    def remove(self, event_id: str) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM dedup_buckets WHERE event_id = ?", (event_id,))
+                self._conn.execute("DELETE FROM dedup_events WHERE event_id = ?", (event_id,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM dedup_events").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get query, candidate and duplicate counts"""
+        queries = self.stats["queries"]
+        return {
+            **self.stats,
+            "events": len(self),
+            "avg_candidates": self.stats["candidates"] / queries if queries else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,659 @@
+"""
+Embedded event store for Agent Forge.
+
+``SQLiteEventStore`` implements ``StorageBackend`` on one SQLite file, so the
+functions in ``core.shared.database`` run unchanged without Supabase: for
+offline extraction jobs, as a test and benchmark target, or as a fast local
+read tier filled from Supabase with ``mirror_from``.
+
+- rows are stored as JSON documents, so any column can be filtered, ordered
+  and selected with the PostgREST syntax the Supabase client uses
+- timestamp columns (events.start_time_iso by default) are indexed on their
+  UTC instant, so date-range queries are index range scans and compare
+  correctly across UTC offsets
+- conflict columns get a unique index on first upsert, and link tables have
+  composite primary keys, so duplicates are merged, skipped or rejected as
+  in Postgres
+- the keyword_search_events RPC matches as the Postgres function does (a
+  case-insensitive substring of the name or description), served from an
+  FTS5 trigram index (a scan for keywords under three characters, or when
+  SQLite is older than 3.34)
+- ``load`` bulk-loads rows in one transaction
+
+Point the database layer at a store with ``set_async_db_client`` or the
+LOCAL_EVENT_STORE_PATH environment variable.
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .postgrest import UNIQUE_VIOLATION, PostgrestError, StorageBackend
+
+logger = logging.getLogger(__name__)
+
+# Tables keyed by a composite primary key instead of an id column
+DEFAULT_PRIMARY_KEYS = {
+    "event_speakers": ("event_id", "speaker_id"),
+    "event_organizations": ("event_id", "organization_id"),
+}
+# Columns compared and indexed as UTC instants
+DEFAULT_TIMESTAMP_COLUMNS = {"events": ("start_time_iso",)}
+# Columns with plain and case-insensitive lookup indexes
+DEFAULT_INDEXED_COLUMNS = {
+    "events": ("luma_url",),
+    "speakers": ("name",),
+    "organizations": ("name",),
+}
+# Tables with a full-text index, and the columns it covers
+DEFAULT_FTS_COLUMNS = {"events": ("name", "description")}
+DEFAULT_MIRROR_PAGE_SIZE = 1000
+# Stay under SQLite's bound parameter limit
+MAX_VARIABLES = 500
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_ISO_DATETIME = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+_INTEGER = re.compile(r"^-?\d+$")
+_FLOAT = re.compile(r"^-?\d+\.\d+$")
+_COMPARISONS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def _fts5_available() -> bool:
+    """Whether SQLite has FTS5 with the trigram tokenizer (3.34+)."""
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE probe USING fts5(text, tokenize='trigram')")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+FTS5_AVAILABLE = _fts5_available()
+# Shortest keyword a trigram index can answer
+MIN_TRIGRAM_KEYWORD = 3
+
+
+def contains_ignore_case(text: Any, keyword: str) -> bool:
+    """SQL function: text ILIKE '%keyword%', as keyword_search_events matches in Postgres."""
+    return text is not None and keyword.lower() in str(text).lower()
+
+
+def utc_timestamp(value: Any) -> Optional[float]:
+    """Seconds since the epoch for an ISO 8601 datetime string (naive means UTC), else None"""
+    if not isinstance(value, str) or not _ISO_DATETIME.match(value):
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+
+def _identifier(name: str) -> str:
+    name = name.strip()
+    if not _IDENTIFIER.match(name):
+        raise PostgrestError(f"Invalid identifier: {name!r}", code="42601", status_code=400)
+    return name
+
+
+def _coerce(value: str) -> Any:
+    if _INTEGER.match(value):
+        return int(value)
+    if _FLOAT.match(value):
+        return float(value)
+    return value
+
+
+def _parse_in_list(value: str) -> List[Any]:
+    """Values of a PostgREST in.(...) list; quoted items stay strings."""
+    inner = value.strip()
+    if inner.startswith("(") and inner.endswith(")"):
+        inner = inner[1:-1]
+    items: List[Any] = []
+    current: List[str] = []
+    quoted = in_quotes = False
+    i = 0
+    while i < len(inner):
+        char = inner[i]
+        if in_quotes:
+            if char == "\\" and i + 1 < len(inner):
+                current.append(inner[i + 1])
+                i += 1
+            elif char == '"':
+                in_quotes = False
+            else:
+                current.append(char)
+        elif char == '"':
+            in_quotes = quoted = True
+        elif char == ",":
+            text = "".join(current)
+            items.append(text if quoted else _coerce(text.strip()))
+            current, quoted = [], False
+        else:
+            current.append(char)
+        i += 1
+    if current or quoted:
+        text = "".join(current)
+        items.append(text if quoted else _coerce(text.strip()))
+    return items
+
+
+def _like_pattern(pattern: str) -> str:
+    # PostgREST accepts * for % in like patterns
+    return pattern.replace("*", "%")
+
+
+class SQLiteEventStore(StorageBackend):
+    """
+    Embedded StorageBackend on SQLite.
+
+    Usage:
+        store = SQLiteEventStore("data/events.sqlite")
+        store.load("events", events)
+        set_async_db_client(store)
+        rows = await get_events_by_date_basic("April 28")
+        matches = await keyword_search_events("defi")
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        primary_keys: Optional[Dict[str, Tuple[str, ...]]] = None,
+        timestamp_columns: Optional[Dict[str, Tuple[str, ...]]] = None,
+        indexed_columns: Optional[Dict[str, Tuple[str, ...]]] = None,
+        fts_columns: Optional[Dict[str, Tuple[str, ...]]] = None,
+        busy_timeout: float = 5.0,
+    ):
+        """
+        Args:
+            path: SQLite file, or ":memory:" for a process-local store
+            primary_keys: Table -> composite primary key (tables without an id column)
+            timestamp_columns: Table -> columns compared and indexed as UTC instants
+            indexed_columns: Table -> columns with lookup indexes
+            fts_columns: Table -> columns covered by its full-text index
+            busy_timeout: Seconds to wait for another process's write lock
+        """
+        self.path = path
+        self.primary_keys = {**DEFAULT_PRIMARY_KEYS, **(primary_keys or {})}
+        self.timestamp_columns = {**DEFAULT_TIMESTAMP_COLUMNS, **(timestamp_columns or {})}
+        self.indexed_columns = {**DEFAULT_INDEXED_COLUMNS, **(indexed_columns or {})}
+        self.fts_columns = {**DEFAULT_FTS_COLUMNS, **(fts_columns or {})} if FTS5_AVAILABLE else {}
+
+        directory = os.path.dirname(path) if path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.create_function("utc_ts", 1, utc_timestamp, deterministic=True)
+        self._conn.create_function("contains_ci", 2, contains_ignore_case, deterministic=True)
+        self._tables: set = set()
+        self._unique_indexes: set = set()
+
+        self.stats = {"selects": 0, "rows_read": 0, "rows_written": 0, "keyword_searches": 0}
+
+    # Schema
+
+    def _has_id(self, table: str) -> bool:
+        return table not in self.primary_keys
+
+    def _ensure_table(self, table: str) -> str:
+        table = _identifier(table)
+        if table in self._tables:
+            return table
+        quoted = f'"{table}"'
+        statements = []
+        if self._has_id(table):
+            statements.append(
+                f"CREATE TABLE IF NOT EXISTS {quoted} (id INTEGER PRIMARY KEY, data TEXT NOT NULL)"
+            )
+        else:
+            columns = ", ".join(self._json_column(c) for c in self.primary_keys[table])
+            statements.append(f"CREATE TABLE IF NOT EXISTS {quoted} (data TEXT NOT NULL)")
+            statements.append(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS "{table}__pkey" ON {quoted} ({columns})'
+            )
+        for column in self.timestamp_columns.get(table, ()):
+            statements.append(
+                f'CREATE INDEX IF NOT EXISTS "{table}__{column}__ts" '
+                f"ON {quoted} (utc_ts({self._json_column(column)}))"
+            )
+        for column in self.indexed_columns.get(table, ()):
+            expression = self._json_column(column)
+            statements.append(f'CREATE INDEX IF NOT EXISTS "{table}__{column}" ON {quoted} ({expression})')
+            statements.append(
+                f'CREATE INDEX IF NOT EXISTS "{table}__{column}__lower" ON {quoted} (lower({expression}))'
+            )
+        for statement in statements:
+            self._conn.execute(statement)
+        if table in self.fts_columns:
+            self._ensure_fts(table)
+        self._tables.add(table)
+        return table
+
+    def _ensure_fts(self, table: str) -> None:
+        """Create table's trigram index, rebuilding one a file kept from an older tokenizer."""
+        existing = self._conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = ?", (f"{table}__fts",)
+        ).fetchone()
+        if existing and "trigram" in existing[0]:
+            return
+        columns = ", ".join(_identifier(c) for c in self.fts_columns[table])
+        self._conn.execute(f'DROP TABLE IF EXISTS "{table}__fts"')
+        self._conn.execute(f'CREATE VIRTUAL TABLE "{table}__fts" USING fts5({columns}, tokenize="trigram")')
+        if existing:
+            for row_id, data in self._conn.execute(f'SELECT id, data FROM "{table}"').fetchall():
+                self._fts_replace(table, row_id, json.loads(data), replace=False)
+
+    def _ensure_unique(self, table: str, columns: Sequence[str]) -> None:
+        if list(columns) == ["id"] and self._has_id(table):
+            return
+        key = (table, tuple(columns))
+        if key in self._unique_indexes:
+            return
+        name = "__".join([table, *columns, "unique"])
+        expressions = ", ".join(self._json_column(c) for c in columns)
+        self._conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{name}" ON "{table}" ({expressions})')
+        self._unique_indexes.add(key)
+
+    @staticmethod
+    def _json_column(column: str) -> str:
+        return f"json_extract(data, '$.{_identifier(column)}')"
+
+    def _column(self, table: str, column: str) -> str:
+        column = _identifier(column)
+        if column == "id" and self._has_id(table):
+            return "id"
+        return self._json_column(column)
+
+    # Query building
+
+    def _filter_sql(self, table: str, column: str, expression: str) -> Tuple[str, List[Any]]:
+        operator, _, value = expression.partition(".")
+        negate = operator == "not"
+        if negate:
+            operator, _, value = value.partition(".")
+        target = self._column(table, column)
+
+        if operator == "is":
+            literal = {"null": "NULL", "true": "1", "false": "0"}.get(value.lower())
+            if literal is None:
+                raise PostgrestError(f"Unsupported is. value: {value!r}", status_code=400)
+            sql, params = (f"{target} IS {literal}", [])
+        elif operator == "in":
+            values = _parse_in_list(value)
+            if not values:
+                sql, params = ("0", [])
+            else:
+                params = [v for item in values for v in ((item, str(item)) if not isinstance(item, str) else (item,))]
+                sql = f"{target} IN ({','.join('?' * len(params))})"
+        elif operator in ("like", "ilike"):
+            pattern = _like_pattern(value)
+            if operator == "ilike" and "%" not in pattern and "_" not in pattern:
+                # Exact case-insensitive match can use the lower() index
+                sql, params = (f"lower({target}) = lower(?)", [pattern])
+            elif operator == "ilike":
+                sql, params = (f"{target} LIKE ?", [pattern])
+            else:
+                glob = pattern.replace("%", "*").replace("_", "?")
+                sql, params = (f"{target} GLOB ?", [glob])
+        elif operator in _COMPARISONS:
+            comparison = _COMPARISONS[operator]
+            instant = utc_timestamp(value) if column in self.timestamp_columns.get(table, ()) else None
+            if instant is not None:
+                sql, params = (f"utc_ts({target}) {comparison} ?", [instant])
+            else:
+                coerced = _coerce(value)
+                if operator in ("eq", "neq") and not isinstance(coerced, str):
+                    # Match numbers stored as JSON numbers or as strings
+                    joiner = "IN" if operator == "eq" else "NOT IN"
+                    sql, params = (f"{target} {joiner} (?, ?)", [coerced, value])
+                else:
+                    sql, params = (f"{target} {comparison} ?", [coerced])
+        else:
+            raise PostgrestError(f"Unsupported filter operator: {operator!r}", status_code=400)
+        return (f"NOT ({sql})", params) if negate else (sql, params)
+
+    def _order_sql(self, table: str, order: str) -> str:
+        clauses = []
+        for part in order.split(","):
+            column, *modifiers = part.strip().split(".")
+            descending = "desc" in modifiers
+            nulls_first = "nullsfirst" in modifiers or (descending and "nullslast" not in modifiers)
+            expression = self._column(table, column)
+            if column in self.timestamp_columns.get(table, ()):
+                expression = f"utc_ts({expression})"
+            clauses.append(f"({expression} IS NULL) {'ASC' if nulls_first else 'DESC'}")
+            clauses.append(f"{expression} {'DESC' if descending else 'ASC'}")
+        return ", ".join(clauses)
+
+    def _row(self, table: str, row_id: Optional[int], data: str) -> Dict[str, Any]:
+        row = json.loads(data)
+        if row_id is not None:
+            row["id"] = row_id
+        return row
+
+    def _select_sync(
+        self,
+        table: str,
+        columns: str,
+        filters: Union[Dict[str, str], Sequence[Tuple[str, str]], None],
+        order: Optional[str],
+        limit: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            table = self._ensure_table(table)
+            id_column = "id" if self._has_id(table) else "NULL"
+            sql = f'SELECT {id_column}, data FROM "{table}"'
+            where, params = [], []
+            items = filters.items() if isinstance(filters, dict) else filters or []
+            for column, expression in items:
+                clause, clause_params = self._filter_sql(table, column, expression)
+                where.append(clause)
+                params.extend(clause_params)
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            if order:
+                sql += " ORDER BY " + self._order_sql(table, order)
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(int(limit))
+            rows = [self._row(table, row_id, data) for row_id, data in self._conn.execute(sql, params)]
+
+        self.stats["selects"] += 1
+        self.stats["rows_read"] += len(rows)
+        names = [name.strip() for name in columns.split(",")] if columns.strip() != "*" else None
+        if names:
+            rows = [{name: row.get(name) for name in names} for row in rows]
+        return rows
+
+    # Writes
+
+    def _fts_replace(self, table: str, row_id: int, row: Dict[str, Any], replace: bool) -> None:
+        columns = self.fts_columns.get(table)
+        if not columns:
+            return
+        if replace:
+            self._conn.execute(f'DELETE FROM "{table}__fts" WHERE rowid = ?', (row_id,))
+        values = [str(row.get(c) or "") for c in columns]
+        self._conn.execute(
+            f'INSERT INTO "{table}__fts" (rowid, {", ".join(columns)}) VALUES (?{", ?" * len(columns)})',
+            [row_id, *values],
+        )
+
+    def _insert_one(self, table: str, row: Dict[str, Any], ignore: bool) -> Optional[Dict[str, Any]]:
+        """Insert a row inside the current transaction; None if ignored as a duplicate."""
+        verb = "INSERT OR IGNORE" if ignore else "INSERT"
+        if self._has_id(table):
+            data = {k: v for k, v in row.items() if k != "id"}
+            cursor = self._conn.execute(
+                f'{verb} INTO "{table}" (id, data) VALUES (?, ?)',
+                (row.get("id"), json.dumps(data, default=str)),
+            )
+            if not cursor.rowcount:
+                return None
+            stored = {**data, "id": cursor.lastrowid}
+            self._fts_replace(table, cursor.lastrowid, stored, replace=False)
+            return stored
+        cursor = self._conn.execute(
+            f'{verb} INTO "{table}" (data) VALUES (?)', (json.dumps(row, default=str),)
+        )
+        return dict(row) if cursor.rowcount else None
+
+    def _transaction(self, work):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = work()
+            self._conn.execute("COMMIT")
+            return result
+        except sqlite3.IntegrityError as e:
+            self._conn.execute("ROLLBACK")
+            raise PostgrestError(f"duplicate key value violates unique constraint: {e}", code=UNIQUE_VIOLATION, status_code=409) from e
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _insert_sync(
+        self, table: str, rows: Sequence[Dict[str, Any]], ignore_duplicates: bool
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            table = self._ensure_table(table)
+
+            def work():
+                inserted = [self._insert_one(table, row, ignore_duplicates) for row in rows]
+                return [row for row in inserted if row is not None]
+
+            written = self._transaction(work)
+        self.stats["rows_written"] += len(written)
+        return written
+
+    def _existing_by_key(
+        self, table: str, columns: Sequence[str], rows: Sequence[Dict[str, Any]]
+    ) -> Dict[Tuple, Tuple[Optional[int], Dict[str, Any]]]:
+        """Stored rows matching the conflict keys of rows, keyed by key tuple"""
+        id_column = "id" if self._has_id(table) else "rowid"
+        expressions = [self._column(table, c) for c in columns]
+        found: Dict[Tuple, Tuple[Optional[int], Dict[str, Any]]] = {}
+        if len(columns) == 1:
+            keys = list({row.get(columns[0]) for row in rows if row.get(columns[0]) is not None})
+            for start in range(0, len(keys), MAX_VARIABLES):
+                chunk = keys[start:start + MAX_VARIABLES]
+                query = (
+                    f'SELECT {id_column}, data FROM "{table}" '
+                    f"WHERE {expressions[0]} IN ({','.join('?' * len(chunk))})"
+                )
+                for row_id, data in self._conn.execute(query, chunk):
+                    stored = self._row(table, row_id if self._has_id(table) else None, data)
+                    found[(stored.get(columns[0]),)] = (row_id, stored)
+            return found
+        condition = " AND ".join(f"{e} = ?" for e in expressions)
+        for row in rows:
+            key = tuple(row.get(c) for c in columns)
+            if key in found or any(v is None for v in key):
+                continue
+            match = self._conn.execute(
+                f'SELECT {id_column}, data FROM "{table}" WHERE {condition} LIMIT 1', key
+            ).fetchone()
+            if match:
+                found[key] = (match[0], self._row(table, match[0] if self._has_id(table) else None, match[1]))
+        return found
+
+    def _upsert_sync(
+        self, table: str, rows: Sequence[Dict[str, Any]], on_conflict: str
+    ) -> List[Dict[str, Any]]:
+        columns = [_identifier(c) for c in on_conflict.split(",")]
+        with self._lock:
+            table = self._ensure_table(table)
+            self._ensure_unique(table, columns)
+
+            def work():
+                existing = self._existing_by_key(table, columns, rows)
+                written = []
+                for row in rows:
+                    key = tuple(row.get(c) for c in columns)
+                    match = existing.get(key)
+                    if match is None:
+                        stored = self._insert_one(table, row, ignore=False)
+                        if self._has_id(table):
+                            existing[key] = (stored["id"], stored)
+                        written.append(stored)
+                        continue
+                    row_id, current = match
+                    merged = {**current, **row}
+                    if self._has_id(table):
+                        merged["id"] = row_id
+                        data = {k: v for k, v in merged.items() if k != "id"}
+                        self._conn.execute(
+                            f'UPDATE "{table}" SET data = ? WHERE id = ?',
+                            (json.dumps(data, default=str), row_id),
+                        )
+                        self._fts_replace(table, row_id, merged, replace=True)
+                    else:
+                        self._conn.execute(
+                            f'UPDATE "{table}" SET data = ? WHERE rowid = ?',
+                            (json.dumps(merged, default=str), row_id),
+                        )
+                    existing[key] = (row_id, merged)
+                    written.append(merged)
+                return written
+
+            written = self._transaction(work)
+        self.stats["rows_written"] += len(written)
+        return written
+
+    def _keyword_search_sync(self, keyword: str, limit: int) -> List[Dict[str, Any]]:
+        # The whole keyword is one case-insensitive substring of the name or
+        # description, as in the Postgres RPC; rows come in insertion order
+        with self._lock:
+            self._ensure_table("events")
+            if not keyword:
+                return []
+            if "events" in self.fts_columns and len(keyword) >= MIN_TRIGRAM_KEYWORD:
+                # A trigram phrase matches wherever the keyword occurs within a column
+                query = (
+                    'SELECT e.id, e.data FROM "events__fts" f JOIN "events" e ON e.id = f.rowid '
+                    'WHERE "events__fts" MATCH ? ORDER BY e.id LIMIT ?'
+                )
+                params: List[Any] = ['"' + keyword.replace('"', '""') + '"', limit]
+            else:
+                query = (
+                    f'SELECT id, data FROM "events" WHERE contains_ci({self._json_column("name")}, ?) '
+                    f'OR contains_ci({self._json_column("description")}, ?) ORDER BY id LIMIT ?'
+                )
+                params = [keyword, keyword, limit]
+            rows = [self._row("events", row_id, data) for row_id, data in self._conn.execute(query, params)]
+        self.stats["keyword_searches"] += 1
+        return rows
+
+    # StorageBackend
+
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Union[Dict[str, str], Sequence[Tuple[str, str]], None] = None,
+        order: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._select_sync, table, columns, filters, order, limit)
+
+    async def insert(
+        self,
+        table: str,
+        rows: Sequence[Dict[str, Any]],
+        returning: str = "minimal",
+        ignore_duplicates: bool = False,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        if not rows:
+            return []
+        written = await asyncio.to_thread(self._insert_sync, table, list(rows), ignore_duplicates)
+        return written if returning == "representation" else []
+
+    async def upsert(
+        self,
+        table: str,
+        rows: Sequence[Dict[str, Any]],
+        on_conflict: str,
+        returning: str = "representation",
+    ) -> List[Dict[str, Any]]:
+        if not rows:
+            return []
+        written = await asyncio.to_thread(self._upsert_sync, table, list(rows), on_conflict)
+        return written if returning == "representation" else []
+
+    async def rpc(self, function: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        params = params or {}
+        if function != "keyword_search_events":
+            raise PostgrestError(f"function {function} not found", code="PGRST202", status_code=404)
+        return await asyncio.to_thread(
+            self._keyword_search_sync, str(params.get("keyword", "")), int(params.get("result_limit", 10))
+        )
+
+    # Bulk loading and mirroring
+
+    def load(
+        self, table: str, rows: Iterable[Dict[str, Any]], on_conflict: Optional[str] = None
+    ) -> int:
+        """
+        Bulk-load rows in one transaction.
+
+        Args:
+            table: Target table
+            rows: Rows to load
+            on_conflict: Upsert on this column (e.g. "id" or "luma_url");
+                None inserts, skipping rows whose key already exists
+
+        Returns:
+            Number of rows written
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        if on_conflict:
+            return len(self._upsert_sync(table, rows, on_conflict))
+        return len(self._insert_sync(table, rows, ignore_duplicates=True))
+
+    async def mirror_from(
+        self,
+        source: StorageBackend,
+        tables: Sequence[str] = ("events", "speakers", "organizations", "event_speakers", "event_organizations"),
+        page_size: int = DEFAULT_MIRROR_PAGE_SIZE,
+    ) -> Dict[str, int]:
+        """
+        Copy tables from another backend (e.g. Supabase) to use this store as a local read tier.
+
+        Tables with an id column are paged by id and upserted on it, so
+        repeated mirrors refresh changed rows. Link tables are read in one
+        request and their new rows inserted.
+
+        Returns:
+            Table -> rows copied
+        """
+        copied: Dict[str, int] = {}
+        for table in tables:
+            if not self._has_id(table):
+                rows = await source.select(table)
+                copied[table] = await asyncio.to_thread(self.load, table, rows)
+                continue
+            copied[table] = 0
+            last_id = None
+            while True:
+                filters = {"id": f"gt.{last_id}"} if last_id is not None else None
+                rows = await source.select(table, filters=filters, order="id.asc", limit=page_size)
+                if not rows:
+                    break
+                copied[table] += await asyncio.to_thread(self.load, table, rows, "id")
+                last_id = rows[-1]["id"]
+                if len(rows) < page_size:
+                    break
+        logger.info(f"Mirrored {copied} into local store {self.path}")
+        return copied
+
+    def count(self, table: str) -> int:
+        with self._lock:
+            table = self._ensure_table(table)
+            return self._conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get query and write counts"""
+        return {**self.stats, "path": self.path, "fts5": FTS5_AVAILABLE}
@@ -0,0 +1,524 @@
+"""
+Async PostgREST data access for Agent Forge's Supabase database.
+
+``AsyncPostgrestClient`` talks to Supabase's REST endpoint over one pooled
+``httpx.AsyncClient`` per event loop: keep-alive connections, HTTP/2 when the
+``h2`` package is installed, retries with exponential backoff and jitter on
+transient failures, and deadline propagation, so a caller's time budget
+bounds every request and retry made on its behalf:
+
+    with deadline(2.0):
+        rows = await client.select("events", filters={"id": "eq.42"})
+
+Synchronous code runs coroutines through ``run_sync``, which uses one
+long-lived background event loop so the connection pool outlives each call.
+
+``StorageBackend`` is the table/RPC interface the database layer is written
+against; ``AsyncPostgrestClient`` is the Supabase implementation and
+``core.shared.local_store.SQLiteEventStore`` an embedded one.
+"""
+
+import abc
+import asyncio
+import contextlib
+import contextvars
+import importlib.util
+import json
+import logging
+import random
+import threading
+import time
+import weakref
+from typing import Any, Coroutine, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_TIMEOUT_SECONDS = 15.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE_SECONDS = 0.25
+DEFAULT_BACKOFF_MAX_SECONDS = 4.0
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 30.0
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+# PostgreSQL unique_violation
+UNIQUE_VIOLATION = "23505"
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "postgrest_deadline", default=None
+)
+
+
+class PostgrestError(Exception):
+    """Error response from PostgREST (fields follow PostgrestAPIError)."""
+
+    def __init__(
+        self,
+        message: str,
+        code: Optional[str] = None,
+        details: Optional[str] = None,
+        hint: Optional[str] = None,
+        status_code: Optional[int] = None,
+    ):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.details = details
+        self.hint = hint
+        self.status_code = status_code
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "PostgrestError":
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        if not isinstance(body, dict):
+            body = {}
+        return cls(
+            body.get("message") or response.text or f"HTTP {response.status_code}",
+            code=body.get("code"),
+            details=body.get("details"),
+            hint=body.get("hint"),
+            status_code=response.status_code,
+        )
+
+
+class DeadlineExceeded(TimeoutError):
+    """The caller's deadline passed before the request could complete."""
+
+
+@contextlib.contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound every request made inside the block (including retries) to a time budget.
+
+    Nested deadlines never extend an outer one. None leaves the current
+    deadline unchanged.
+    """
+    if seconds is None:
+        yield
+        return
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires_at if current is None else min(current, expires_at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one"""
+    expires_at = _deadline.get()
+    return None if expires_at is None else expires_at - time.monotonic()
+
+
+class StorageBackend(abc.ABC):
+    """
+    Interface of the storage the database layer reads and writes.
+
+    Filters and orders use PostgREST syntax ({"name": "ilike.alice"},
+    "start_time_iso.asc"), so every backend accepts what the Supabase one does.
+    Errors are raised as PostgrestError (code UNIQUE_VIOLATION for duplicate
+    keys, status 404 for unknown functions).
+    """
+
+    @abc.abstractmethod
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Union[Dict[str, str], Sequence[Tuple[str, str]], None] = None,
+        order: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rows of table matching filters, with the given columns."""
+
+    @abc.abstractmethod
+    async def insert(
+        self,
+        table: str,
+        rows: Sequence[Dict[str, Any]],
+        returning: str = "minimal",
+        ignore_duplicates: bool = False,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Insert rows; returns them when returning is "representation"."""
+
+    @abc.abstractmethod
+    async def upsert(
+        self,
+        table: str,
+        rows: Sequence[Dict[str, Any]],
+        on_conflict: str,
+        returning: str = "representation",
+    ) -> List[Dict[str, Any]]:
+        """Insert or merge rows on the on_conflict column."""
+
+    @abc.abstractmethod
+    async def rpc(self, function: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Call a database function and return its JSON result."""
+
+    async def aclose(self) -> None:
+        """Release connections held for the current event loop."""
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class AsyncPostgrestClient(StorageBackend):
+    """
+    Pooled async client for a PostgREST endpoint.
+
+    Usage:
+        client = AsyncPostgrestClient(supabase_url, supabase_key)
+        events = await client.select("events", "id, name", filters={"start_time_iso": "gte.2025-01-01"})
+        await client.insert("event_speakers", links, ignore_duplicates=True)
+        matches = await client.rpc("keyword_search_events", {"keyword": "defi", "result_limit": 10})
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        schema: str = "public",
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        backoff_max: float = DEFAULT_BACKOFF_MAX_SECONDS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+        http2: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            base_url: Supabase project URL (the REST API lives under /rest/v1)
+            api_key: Supabase API key
+            schema: Database schema for reads and writes
+            timeout: Per-request timeout in seconds (shortened by any deadline)
+            max_retries: Retries after the first attempt for transient failures
+            backoff_base: First retry delay in seconds, doubled per retry
+            backoff_max: Longest retry delay in seconds
+            max_connections: Connection pool size
+            max_keepalive_connections: Idle connections kept open
+            keepalive_expiry: Seconds an idle connection stays open
+            http2: Use HTTP/2 when the h2 package is installed
+            transport: Custom httpx transport (for tests)
+        """
+        self.base_url = base_url.rstrip("/") + "/rest/v1"
+        self.schema = schema
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and not HTTP2_AVAILABLE:
+            logger.info("h2 package not installed; PostgREST client will use HTTP/1.1")
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._transport = transport
+        self._headers = {
+            "apikey": api_key,
+            "Authorization": f"Bearer {api_key}",
+            "Accept-Profile": schema,
+            "Content-Profile": schema,
+        }
+        # httpx clients are bound to the loop they were first used on
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "deadline_exceeded": 0}
+
+    def _http(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    base_url=self.base_url,
+                    headers=self._headers,
+                    limits=self.limits,
+                    http2=self.http2,
+                    transport=self._transport,
+                )
+                self._clients[loop] = client
+            return client
+
+    def _backoff(
+        self, attempt: int, response: Optional[httpx.Response], backoff_base: Optional[float] = None
+    ) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_max)
+                except ValueError:
+                    pass
+        base = self.backoff_base if backoff_base is None else backoff_base
+        delay = min(self.backoff_max, base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Any = None,
+        json_body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+    ) -> httpx.Response:
+        """
+        Send a request, retrying transient failures within the current deadline.
+
+        Args:
+            method: HTTP method
+            path: Path under /rest/v1 (e.g. "/events" or "/rpc/keyword_search_events")
+            params: Query parameters as a dict or (name, value) pairs (PostgREST filters, select, order, ...)
+            json_body: JSON request body
+            headers: Extra headers (e.g. Prefer)
+            max_retries: Override the client's retry count for this request
+            backoff_base: Override the client's first retry delay for this request
+
+        Returns:
+            httpx.Response: The successful response
+
+        Raises:
+            PostgrestError: For error responses that are not transient, or
+                transient ones that persisted through every retry
+            DeadlineExceeded: If the deadline passed first
+            httpx.TransportError: If the connection kept failing
+        """
+        client = self._http()
+        content = json.dumps(json_body).encode("utf-8") if json_body is not None else None
+        request_headers = {"Content-Type": "application/json", **(headers or {})}
+        max_retries = self.max_retries if max_retries is None else max_retries
+
+        attempt = 0
+        while True:
+            remaining = remaining_time()
+            if remaining is not None and remaining <= 0:
+                self.stats["deadline_exceeded"] += 1
+                raise DeadlineExceeded(f"Deadline exceeded before {method} {path}")
+            timeout = self.timeout if remaining is None else min(self.timeout, remaining)
+
+            response = None
+            error: Optional[Exception] = None
+            self.stats["requests"] += 1
+            try:
+                response = await client.request(
+                    method, path, params=params, content=content, headers=request_headers, timeout=timeout
+                )
+                if response.status_code < 400:
+                    return response
+                error = PostgrestError.from_response(response)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self.stats["failures"] += 1
+                    raise error
+            except httpx.TransportError as e:
+                error = e
+
+            if attempt >= max_retries:
+                self.stats["failures"] += 1
+                raise error
+            delay = self._backoff(attempt, response, backoff_base)
+            remaining = remaining_time()
+            if remaining is not None and remaining <= delay:
+                self.stats["deadline_exceeded"] += 1
+                raise DeadlineExceeded(f"Deadline exceeded retrying {method} {path}: {error}") from error
+
+            attempt += 1
+            self.stats["retries"] += 1
+            logger.warning(
+                f"PostgREST {method} {path} attempt {attempt}/{max_retries + 1} failed: {error}. "
+                f"Retrying in {delay:.2f}s..."
+            )
+            await asyncio.sleep(delay)
+
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Union[Dict[str, str], Sequence[Tuple[str, str]], None] = None,
+        order: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Read rows from a table.
+
+        Args:
+            table: Table name
+            columns: PostgREST select list
+            filters: Column -> PostgREST filter (e.g. {"name": "ilike.alice"}),
+                or (column, filter) pairs to filter one column more than once
+            order: PostgREST order (e.g. "start_time_iso.asc")
+            limit: Maximum rows
+
+        Returns:
+            List of row dicts
+        """
+        params: List[Tuple[str, Any]] = [("select", columns.replace(" ", ""))]
+        params.extend(filters.items() if isinstance(filters, dict) else filters or [])
+        if order:
+            params.append(("order", order))
+        if limit is not None:
+            params.append(("limit", limit))
+        response = await self.request("GET", f"/{table}", params=params)
+        return response.json()
+
+    async def insert(
+        self,
+        table: str,
+        rows: Sequence[Dict[str, Any]],
+        returning: str = "minimal",
+        ignore_duplicates: bool = False,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert rows in one request.
+
+        Args:
+            table: Table name
+            rows: Rows to insert
+            returning: "minimal" or "representation" (return the inserted rows)
+            ignore_duplicates: Skip rows whose primary key already exists
+            max_retries: Override the client's retry count
+            backoff_base: Override the client's first retry delay
+
+        Returns:
+            Inserted rows (empty with returning="minimal")
+        """
+        if not rows:
+            return []
+        prefer = [f"return={returning}"]
+        if ignore_duplicates:
+            prefer.append("resolution=ignore-duplicates")
+        response = await self.request(
+            "POST",
+            f"/{table}",
+            json_body=list(rows),
+            headers={"Prefer": ",".join(prefer)},
+            max_retries=max_retries,
+            backoff_base=backoff_base,
+        )
+        return response.json() if returning == "representation" and response.content else []
+
+    async def upsert(
+        self,
+        table: str,
+        rows: Sequence[Dict[str, Any]],
+        on_conflict: str,
+        returning: str = "representation",
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert rows or update the existing ones with the same on_conflict key, in one request.
+
+        Args:
+            table: Table name
+            rows: Rows to upsert (all with the same keys)
+            on_conflict: Unique column(s) identifying existing rows
+            returning: "representation" (return the rows) or "minimal"
+
+        Returns:
+            Upserted rows (empty with returning="minimal")
+        """
+        if not rows:
+            return []
+        response = await self.request(
+            "POST",
+            f"/{table}",
+            params={"on_conflict": on_conflict},
+            json_body=list(rows),
+            headers={"Prefer": f"return={returning},resolution=merge-duplicates"},
+        )
+        return response.json() if returning == "representation" and response.content else []
+
+    async def rpc(self, function: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call a database function with its parameters as one JSON object.
+
+        Returns:
+            The decoded JSON result
+        """
+        response = await self.request(
+            "POST",
+            f"/rpc/{function}",
+            json_body=params or {},
+            headers={"Prefer": "params=single-object"},
+        )
+        return response.json()
+
+    async def aclose(self) -> None:
+        """Close the connection pool of the current event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request, retry and failure counts"""
+        return {**self.stats, "http2": self.http2, "event_loops": len(self._clients)}
+
+
+class _BackgroundLoop:
+    """Event loop running in a daemon thread, shared by every sync caller."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="postgrest-sync-loop", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+
+_background_loop = _BackgroundLoop()
+
+
+async def _run_with_deadline(coro: Coroutine[Any, Any, T], expires_at: Optional[float]) -> T:
+    token = _deadline.set(expires_at)
+    try:
+        return await coro
+    finally:
+        _deadline.reset(token)
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine from synchronous code on the shared background loop.
+
+    The caller's deadline carries over. Called from a thread that runs an
+    event loop it blocks that loop like any sync call; await the coroutine
+    there instead.
+
+    Returns:
+        The coroutine's result (its exception is raised here)
+    """
+    future = asyncio.run_coroutine_threadsafe(
+        _run_with_deadline(coro, _deadline.get()), _background_loop.get()
+    )
+    return future.result()
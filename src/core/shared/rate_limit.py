@@ -1,114 +1,359 @@
+"""
+Rate limiting for Agent Forge.
+
+The core is a GCRA (generic cell rate algorithm) limiter: each key stores a
+single "theoretical arrival time", so checks are O(1) in time and memory no
+matter how many requests fall inside the window. Storage is pluggable:
+an in-process LRU backend, or a SQLite backend shared by several worker
+processes so they all respect one global budget.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
 import time
-from collections import defaultdict, deque
-from typing import Deque, Dict
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
 
 # Default production rate limits
 PROD_RATE_LIMIT_MAX_CALLS = 100  # Example: 100 calls
 PROD_RATE_LIMIT_PERIOD_SECONDS = 3600  # Example: per 1 hour (3600 seconds)
 
+# Default number of idle keys kept by the in-memory backend
+DEFAULT_MAX_KEYS = 10000
+
+# Computes (new_tat or None to leave unchanged, result) from the stored TAT
+TatUpdate = Callable[[Optional[float]], Tuple[Optional[float], float]]
+
+
+def domain_key(url: str) -> str:
+    """Build a per-domain rate limit key from a URL"""
+    netloc = urlparse(url).netloc.lower() if url else ""
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    return f"domain:{netloc or 'unknown'}"
+
+
+def user_key(user_id: str) -> str:
+    """Build a per-user rate limit key"""
+    return f"user:{user_id}"
+
+
+class InMemoryRateLimitBackend:
+    """
+    Process-local TAT storage with LRU eviction of idle keys.
+
+    Only keys whose TAT has passed are evicted: GCRA treats those exactly
+    like keys that were never seen, so nothing is lost. Keys still inside
+    their window are kept even past ``max_keys``, since dropping one would
+    hand its caller a fresh budget.
+    """
+
+    shared = False
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self._sweep_at = max_keys
+        self.evictions = 0
+
+    def update(self, key: str, now: float, compute: TatUpdate) -> float:
+        new_tat, result = compute(self._tats.get(key))
+        if new_tat is not None:
+            self._tats[key] = new_tat
+        if key in self._tats:
+            # Denied requests count as use too, keeping busy keys resident
+            self._tats.move_to_end(key)
+            if len(self._tats) > self._sweep_at:
+                self._evict(now)
+        return result
+
+    def peek(self, key: str) -> Optional[float]:
+        return self._tats.get(key)
+
+    def _evict(self, now: float) -> None:
+        # Least recently used idle keys first; stop once back under the limit
+        excess = len(self._tats) - self.max_keys
+        idle = [key for key, tat in self._tats.items() if tat <= now][:excess]
+        for key in idle:
+            del self._tats[key]
+        self.evictions += len(idle)
+        # If too many keys are still active, wait for the store to double
+        # before scanning again so updates stay amortized O(1)
+        if len(self._tats) > self.max_keys:
+            self._sweep_at = 2 * len(self._tats)
+        else:
+            self._sweep_at = self.max_keys
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+
+class SQLiteRateLimitBackend:
+    """
+    TAT storage in a SQLite file shared by every process that opens it.
+
+    Each update runs in an IMMEDIATE transaction, so concurrent workers
+    serialize on the row and never double-spend a token. Uses wall-clock time.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, prune_every: int = 1000, busy_timeout: float = 5.0):
+        self.path = path
+        self.prune_every = prune_every
+        self._ops = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+        )
+
+    def update(self, key: str, now: float, compute: TatUpdate) -> float:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tat FROM rate_limits WHERE key = ?", (key,)
+                ).fetchone()
+                new_tat, result = compute(row[0] if row else None)
+                if new_tat is not None:
+                    self._conn.execute(
+                        "INSERT INTO rate_limits (key, tat) VALUES (?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET tat = excluded.tat",
+                        (key, new_tat),
+                    )
+                self._ops += 1
+                if self.prune_every and self._ops % self.prune_every == 0:
+                    # Keys whose TAT has passed are indistinguishable from new keys
+                    self._conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def peek(self, key: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tat FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class GCRARateLimiter:
+    """
+    GCRA / token-bucket limiter allowing ``max_calls`` per ``period_seconds``.
+
+    Tokens refill smoothly (one every ``period_seconds / max_calls``) and up
+    to ``burst`` calls may be made back to back.
+    """
+
+    def __init__(
+        self,
+        max_calls: int,
+        period_seconds: float,
+        burst: Optional[int] = None,
+        backend=None,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        if max_calls < 1 or period_seconds <= 0:
+            raise ValueError("max_calls and period_seconds must be positive")
+
+        self.max_calls = max_calls
+        self.period_seconds = period_seconds
+        self.burst = burst or max_calls
+        self.emission_interval = period_seconds / max_calls
+        self.tolerance = self.emission_interval * (self.burst - 1)
+        self.backend = backend if backend is not None else InMemoryRateLimitBackend()
+        # Shared backends are compared across processes, so they need wall time
+        self.clock = clock or (time.time if self.backend.shared else time.monotonic)
+
+    def try_acquire(self, key: str = "default", cost: int = 1) -> Tuple[bool, float]:
+        """
+        Take ``cost`` tokens if available.
+
+        Returns:
+            (allowed, retry_after_seconds); retry_after is 0 when allowed
+        """
+        now = self.clock()
+        increment = self.emission_interval * cost
+
+        def compute(stored: Optional[float]) -> Tuple[Optional[float], float]:
+            tat = now if stored is None else max(stored, now)
+            new_tat = tat + increment
+            allow_at = new_tat - self.tolerance - self.emission_interval
+            if now < allow_at:
+                return None, allow_at - now
+            return new_tat, 0.0
+
+        retry_after = self.backend.update(key, now, compute)
+        return retry_after == 0.0, retry_after
+
+    def reserve(self, key: str = "default", cost: int = 1) -> float:
+        """
+        Unconditionally reserve the next ``cost`` tokens.
+
+        Returns:
+            Seconds the caller must wait before using the reservation
+        """
+        now = self.clock()
+        increment = self.emission_interval * cost
+
+        def compute(stored: Optional[float]) -> Tuple[Optional[float], float]:
+            tat = now if stored is None else max(stored, now)
+            new_tat = tat + increment
+            return new_tat, max(0.0, new_tat - self.tolerance - self.emission_interval - now)
+
+        return self.backend.update(key, now, compute)
+
+    async def acquire(self, key: str = "default", cost: int = 1) -> float:
+        """
+        Wait exactly until ``cost`` tokens are available for ``key``.
+
+        Reservations are made up front, so concurrent waiters are served in
+        order without waking up to re-check. A shared backend may block on
+        other processes' transactions, so its update runs in a worker thread.
+
+        Returns:
+            Seconds waited
+        """
+        if self.backend.shared:
+            delay = await asyncio.to_thread(self.reserve, key, cost)
+        else:
+            delay = self.reserve(key, cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def get_remaining(self, key: str = "default") -> int:
+        """Tokens that could be taken right now without waiting"""
+        now = self.clock()
+        stored = self.backend.peek(key)
+        tat = now if stored is None else max(stored, now)
+        available = (self.tolerance + self.emission_interval - (tat - now)) / self.emission_interval
+        return max(0, min(self.burst, int(available + 1e-9)))
+
+    def get_retry_after(self, key: str = "default") -> float:
+        """Seconds until one token is available (0 if available now)"""
+        now = self.clock()
+        stored = self.backend.peek(key)
+        tat = now if stored is None else max(stored, now)
+        return max(0.0, tat - self.tolerance - now)
+
 
 class RateLimiter:
     """
     A simple rate limiter that tracks requests for a single entity (e.g., a user or IP).
     """
 
-    def __init__(self, max_calls: int, period_seconds: int):
+    def __init__(self, max_calls: int, period_seconds: int, backend=None, key: str = "default"):
         self.max_calls = max_calls
         self.period_seconds = period_seconds
-        self.timestamps: Deque[float] = deque()
+        self.key = key
+        self._limiter = GCRARateLimiter(max_calls, period_seconds, backend=backend)
 
     def is_allowed(self) -> bool:
         """
         Checks if a new request is allowed based on the rate limit.
-        Adds the current timestamp if allowed.
+        Consumes a token if allowed.
         """
-        current_time = time.monotonic()
-
-        # Remove timestamps older than the current period
-        while (
-            self.timestamps and self.timestamps[0] <= current_time - self.period_seconds
-        ):
-            self.timestamps.popleft()
-
-        if len(self.timestamps) < self.max_calls:
-            self.timestamps.append(current_time)
-            return True
-        return False
+        allowed, _ = self._limiter.try_acquire(self.key)
+        return allowed
 
     def get_remaining_calls(self) -> int:
         """
-        Returns the number of calls remaining in the current window.
-        This is an estimate as the window slides.
+        Returns the number of calls that can be made right now.
         """
-        current_time = time.monotonic()
-        # Remove old timestamps to get an accurate count for the current window
-        while (
-            self.timestamps and self.timestamps[0] <= current_time - self.period_seconds
-        ):
-            self.timestamps.popleft()
-        return max(0, self.max_calls - len(self.timestamps))
+        return self._limiter.get_remaining(self.key)
 
     def get_retry_after_seconds(self) -> float:
         """
         Returns the time in seconds after which the user can try again.
         Returns 0 if allowed.
         """
-        current_time = time.monotonic()
-        while (
-            self.timestamps and self.timestamps[0] <= current_time - self.period_seconds
-        ):
-            self.timestamps.popleft()
-
-        if len(self.timestamps) < self.max_calls:
-            return 0.0
-
-        # If rate limited, the retry time is when the oldest timestamp in the queue expires
-        if self.timestamps:
-            return (self.timestamps[0] + self.period_seconds) - current_time
-        return float(
-            self.period_seconds
-        )  # Should not happen if timestamps is empty and limit exceeded
+        return self._limiter.get_retry_after(self.key)
 
 
 class UserRateLimitManager:
     """
-    Manages rate limiters for multiple users.
+    Manages rate limits for multiple users.
+
+    All users share one backend, so memory stays O(1) per active user, idle
+    users are evicted LRU and a shared backend covers overrides too. Users
+    with default limits share one GCRA limiter keyed by user id; an override
+    gets its own limiter and key, so its budget starts fresh.
     """
 
     def __init__(
         self,
         default_max_calls: int = PROD_RATE_LIMIT_MAX_CALLS,
         default_period_seconds: int = PROD_RATE_LIMIT_PERIOD_SECONDS,
+        backend=None,
     ):
-        self.user_limiters: Dict[str, RateLimiter] = defaultdict(
-            lambda: RateLimiter(default_max_calls, default_period_seconds)
-        )
         self.default_max_calls = default_max_calls
         self.default_period_seconds = default_period_seconds
+        self.backend = backend if backend is not None else InMemoryRateLimitBackend()
+        self.default_limiter = GCRARateLimiter(
+            default_max_calls, default_period_seconds, backend=self.backend
+        )
+        self.user_overrides: Dict[str, GCRARateLimiter] = {}
+
+    def _limiter_for(self, user_id: str) -> Tuple[GCRARateLimiter, str]:
+        limiter = self.user_overrides.get(user_id)
+        if limiter is None:
+            return self.default_limiter, user_key(user_id)
+        # The TAT means something different under another emission interval
+        return limiter, f"{user_key(user_id)}:{limiter.max_calls}/{limiter.period_seconds}"
 
     def is_user_allowed(self, user_id: str) -> bool:
         """
         Checks if a user is allowed to make a request.
         """
-        return self.user_limiters[user_id].is_allowed()
+        limiter, key = self._limiter_for(user_id)
+        allowed, _ = limiter.try_acquire(key)
+        return allowed
+
+    async def wait_for_user(self, user_id: str) -> float:
+        """
+        Waits until the user may make a request. Returns the seconds waited.
+        """
+        limiter, key = self._limiter_for(user_id)
+        return await limiter.acquire(key)
 
     def get_user_remaining_calls(self, user_id: str) -> int:
         """
         Gets the remaining calls for a specific user.
         """
-        return self.user_limiters[user_id].get_remaining_calls()
+        limiter, key = self._limiter_for(user_id)
+        return limiter.get_remaining(key)
 
     def get_user_retry_after_seconds(self, user_id: str) -> float:
         """
         Gets the retry_after time for a specific user.
         """
-        return self.user_limiters[user_id].get_retry_after_seconds()
+        limiter, key = self._limiter_for(user_id)
+        return limiter.get_retry_after(key)
 
     def update_user_limit(self, user_id: str, max_calls: int, period_seconds: int):
         """
         Updates the rate limit settings for a specific user.
         """
-        self.user_limiters[user_id] = RateLimiter(max_calls, period_seconds)
+        self.user_overrides[user_id] = GCRARateLimiter(
+            max_calls, period_seconds, backend=self.backend
+        )
 
 
 # Example usage (can be removed or kept for testing)
@@ -0,0 +1,591 @@
+"""
+Compiled selector plans for structured event-data extraction.
+
+Platform configs list CSS selectors and regexes per field as plain strings.
+``compile_plan`` turns one platform config into an ``ExtractionPlan`` once:
+regexes are compiled and the selectors of every field are merged into one
+selector index, answered by a single walk of the page. Executing a plan reads
+JSON-LD and OpenGraph meta first; only fields they did not supply fall back to
+the selector walk and then the regexes.
+
+Compiled plans are cached by the content of the config that produced them, so
+reloading an unchanged config costs nothing and a changed one compiles fresh.
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from lxml import etree
+
+from .bs_utils import HTMLDocument
+from .cache import BoundedCache
+
+logger = logging.getLogger(__name__)
+
+# Config key prefix for each field's CSS selector list ("date_selectors" -> start_date)
+CONFIG_SELECTOR_FIELDS = {
+    "title": "title",
+    "description": "description",
+    "date": "start_date",
+    "location": "location",
+    "organizer": "organizer",
+    "price": "price",
+}
+
+# Paths into a schema.org Event object, tried in order
+JSON_LD_FIELD_PATHS: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+    "title": (("name",),),
+    "description": (("description",),),
+    "start_date": (("startDate",),),
+    "end_date": (("endDate",),),
+    "location": (
+        ("location", "name"),
+        ("location", "address", "streetAddress"),
+        ("location", "address"),
+    ),
+    "organizer": (("organizer", "name"), ("organizer",)),
+    "price": (("offers", "price"), ("offers", "lowPrice")),
+}
+
+# Meta property/name keys, tried in order
+OPEN_GRAPH_FIELD_KEYS: Dict[str, Tuple[str, ...]] = {
+    "title": ("og:title", "twitter:title"),
+    "description": ("og:description", "twitter:description"),
+    "start_date": ("event:start_time",),
+    "end_date": ("event:end_time",),
+}
+
+# Confidence of a value relative to the field's weight, by where it came from
+METHOD_CONFIDENCE = {
+    "json_ld": 1.0,
+    "open_graph": 0.9,
+    "css_selector": 0.85,
+    "regex": 0.7,
+}
+
+DEFAULT_FIELD_WEIGHT = 0.8
+DEFAULT_CLEANERS = ("strip", "normalize_whitespace")
+
+# Compiled plans by (platform, config fingerprint)
+PLAN_CACHE_MAX_ENTRIES = 256
+_plan_cache = BoundedCache(max_entries=PLAN_CACHE_MAX_ENTRIES, name="selector_plans")
+
+
+@dataclass
+class FieldMatch:
+    """A field value found by an extraction plan"""
+
+    field_name: str
+    value: str
+    method: str
+    confidence: float
+
+
+def _css_to_xpath(selector: str, prefix: str = "descendant-or-self::") -> str:
+    from cssselect import HTMLTranslator
+
+    return HTMLTranslator().css_to_xpath(selector, prefix=prefix)
+
+
+def _compile_query(selectors: Sequence[str]) -> Optional[etree.XPath]:
+    """One XPath union query matching any of the selectors."""
+    if not selectors:
+        return None
+    return etree.XPath(" | ".join(_css_to_xpath(s) for s in selectors))
+
+
+# Attribute operators evaluated in Python, same semantics as cssselect's XPath
+_ATTRIB_TESTS: Dict[str, Callable[[str, str], bool]] = {
+    "exists": lambda actual, expected: True,
+    "=": lambda actual, expected: actual == expected,
+    "~=": lambda actual, expected: bool(expected.strip()) and expected in actual.split(),
+    "|=": lambda actual, expected: actual == expected or actual.startswith(expected + "-"),
+    "^=": lambda actual, expected: bool(expected) and actual.startswith(expected),
+    "$=": lambda actual, expected: bool(expected) and actual.endswith(expected),
+    "*=": lambda actual, expected: bool(expected) and expected in actual,
+}
+
+
+class _CompiledSelector:
+    """
+    One CSS selector compiled for the single-walk selector index.
+
+    ``key`` is the most selective part of the rightmost compound (id, class,
+    attribute name, tag), used to look up which selectors an element could
+    match. Compounds made of tags, ids, classes and attribute tests are checked
+    in Python; anything else (pseudo-classes, :not) uses an XPath self-test.
+    Selectors with combinators ("main h1") additionally check membership in
+    the selector's full query result, evaluated once per page when needed.
+    """
+
+    def __init__(self, selector: str, field_name: str, rank: int):
+        from cssselect import parse
+        from cssselect.parser import Attrib, Class, CombinedSelector, Element, Hash
+
+        self.selector = selector
+        self.field_name = field_name
+        self.rank = rank
+
+        parsed = parse(selector)
+        if len(parsed) != 1:
+            raise ValueError(f"Expected a single selector, got {selector!r}")
+        if parsed[0].pseudo_element:
+            raise ValueError(f"Pseudo-elements are not supported: {selector!r}")
+        tree = parsed[0].parsed_tree
+        combined = isinstance(tree, CombinedSelector)
+        node = tree.subselector if combined else tree
+
+        self.tag: Optional[str] = None
+        self.classes: List[str] = []
+        self.ids: List[str] = []
+        self.attribs: List[Tuple[str, str, str]] = []
+        native = True
+        while node is not None:
+            if isinstance(node, Element):
+                if node.element not in (None, "*"):
+                    self.tag = node.element.lower()
+                break
+            if isinstance(node, Class):
+                self.classes.append(node.class_name)
+            elif isinstance(node, Hash):
+                self.ids.append(node.id)
+            elif isinstance(node, Attrib) and not node.namespace and node.operator in _ATTRIB_TESTS:
+                value = node.value.value if node.value is not None else ""
+                self.attribs.append((node.attrib.lower(), node.operator, value))
+            else:
+                native = False
+            node = getattr(node, "selector", None)
+
+        if self.ids:
+            self.key: Tuple[str, ...] = ("id", self.ids[0])
+        elif self.classes:
+            self.key = ("class", self.classes[0])
+        elif self.attribs:
+            self.key = ("attr", self.attribs[0][0])
+        elif self.tag:
+            self.key = ("tag", self.tag)
+        else:
+            self.key = ("*",)
+
+        self._self_test = None if native or combined else etree.XPath(_css_to_xpath(selector, prefix="self::"))
+        self.query = etree.XPath(_css_to_xpath(selector)) if combined else None
+
+    def matches_compound(self, element: Any, classes: Sequence[str]) -> bool:
+        """Whether the element matches the rightmost compound of the selector."""
+        if self.tag is not None and element.tag != self.tag:
+            return False
+        for class_name in self.classes:
+            if class_name not in classes:
+                return False
+        for element_id in self.ids:
+            if element.get("id") != element_id:
+                return False
+        for name, operator, expected in self.attribs:
+            actual = element.get(name)
+            if actual is None or not _ATTRIB_TESTS[operator](actual, expected):
+                return False
+        if self._self_test is not None:
+            return bool(self._self_test(element))
+        return True
+
+
+class SelectorIndex:
+    """
+    Selectors of several fields merged into one index answered by a single walk.
+
+    Each element visited is only tested against the selectors keyed by its id,
+    classes, attribute names or tag. For every field the best match is the
+    element matching the earliest selector in config order, first in document
+    order, exactly as if the field's selectors were tried one after another.
+    """
+
+    def __init__(self, fields: Sequence["FieldPlan"]):
+        self._by_key: Dict[Tuple[str, ...], List[_CompiledSelector]] = {}
+        self._universal: List[_CompiledSelector] = []
+        for field_plan in fields:
+            for rank, selector in enumerate(field_plan.selectors):
+                compiled = _CompiledSelector(selector, field_plan.field_name, rank)
+                if compiled.key == ("*",):
+                    self._universal.append(compiled)
+                else:
+                    self._by_key.setdefault(compiled.key, []).append(compiled)
+        self._attr_names = frozenset(key[1] for key in self._by_key if key[0] == "attr")
+        self._tags = frozenset(key[1] for key in self._by_key if key[0] == "tag")
+        self.field_names = frozenset(f.field_name for f in fields if f.selectors)
+
+    def select(self, root: Any, field_names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        Walk the tree once and return the best value for each field.
+
+        Args:
+            root: lxml element to search under
+            field_names: Fields to look for (defaults to every indexed field)
+
+        Returns:
+            Dictionary of field name to matched text for the fields found
+        """
+        wanted = self.field_names if field_names is None else self.field_names.intersection(field_names)
+        if root is None or not wanted:
+            return {}
+
+        by_key = self._by_key
+        attr_names = self._attr_names
+        best: Dict[str, Tuple[int, str]] = {}
+        unresolved = set(wanted)
+        full_matches: Dict[str, Set[Any]] = {}
+
+        for element in root.iter(etree.Element):
+            candidates = []
+            if element.tag in self._tags:
+                candidates.extend(by_key[("tag", element.tag)])
+            attrib = element.attrib
+            if attrib:
+                for name in attrib:
+                    if name in attr_names:
+                        candidates.extend(by_key[("attr", name)])
+                element_id = attrib.get("id")
+                if element_id is not None:
+                    candidates.extend(by_key.get(("id", element_id), ()))
+                class_attr = attrib.get("class")
+                classes = class_attr.split() if class_attr else ()
+                for class_name in classes:
+                    candidates.extend(by_key.get(("class", class_name), ()))
+            else:
+                classes = ()
+            candidates.extend(self._universal)
+
+            value = None
+            for compiled in candidates:
+                field_name = compiled.field_name
+                if field_name not in wanted:
+                    continue
+                current = best.get(field_name)
+                if current is not None and current[0] <= compiled.rank:
+                    continue
+                if not compiled.matches_compound(element, classes):
+                    continue
+                if compiled.query is not None:
+                    if compiled.selector not in full_matches:
+                        full_matches[compiled.selector] = set(compiled.query(root))
+                    if element not in full_matches[compiled.selector]:
+                        continue
+                if value is None:
+                    value = _element_value(element)
+                if value:
+                    best[field_name] = (compiled.rank, value)
+                    if compiled.rank == 0:
+                        unresolved.discard(field_name)
+
+            if not unresolved:
+                # Every field matched its first-choice selector
+                break
+
+        return {name: value for name, (_, value) in best.items()}
+
+
+def _element_value(element: Any) -> str:
+    """Text of a matched element; meta and time elements carry it in attributes."""
+    value = element.get("content") or element.get("datetime")
+    if value is None:
+        value = element.text_content()
+    return value.strip()
+
+
+def _scalar(value: Any) -> Optional[str]:
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, str):
+        return value.strip() or None
+    return None
+
+
+def _resolve_path(data: Any, path: Tuple[str, ...]) -> Optional[str]:
+    for key in path:
+        if isinstance(data, list):
+            data = data[0] if data else None
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    if isinstance(data, list):
+        data = data[0] if data else None
+    return _scalar(data)
+
+
+def _is_event(obj: Dict[str, Any]) -> bool:
+    types = obj.get("@type")
+    if isinstance(types, str):
+        types = [types]
+    return isinstance(types, list) and any(
+        isinstance(t, str) and t.endswith("Event") for t in types
+    )
+
+
+def _iter_json_ld_events(data: Any) -> Iterable[Dict[str, Any]]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_json_ld_events(item)
+    elif isinstance(data, dict):
+        if _is_event(data):
+            yield data
+        if "@graph" in data:
+            yield from _iter_json_ld_events(data["@graph"])
+
+
+class FieldPlan:
+    """
+    Compiled extraction steps for one field.
+
+    Selectors are tried in config order; regexes run on the raw HTML and
+    return their first capture group.
+    """
+
+    def __init__(
+        self,
+        field_name: str,
+        selectors: Sequence[str] = (),
+        regex_patterns: Sequence[str] = (),
+        cleaners: Sequence[str] = DEFAULT_CLEANERS,
+        weight: float = DEFAULT_FIELD_WEIGHT,
+    ):
+        self.field_name = field_name
+        self.selectors = tuple(dict.fromkeys(selectors))
+        self.regexes = tuple(re.compile(p) for p in dict.fromkeys(regex_patterns))
+        self.cleaners = tuple(cleaners)
+        self.weight = weight
+        self.json_ld_paths = JSON_LD_FIELD_PATHS.get(field_name, ())
+        self.open_graph_keys = OPEN_GRAPH_FIELD_KEYS.get(field_name, ())
+
+        self._index: Optional[SelectorIndex] = None
+
+    def from_json_ld(self, events: List[Dict[str, Any]]) -> Optional[str]:
+        """First value found along the field's paths in the JSON-LD events."""
+        for event in events:
+            for path in self.json_ld_paths:
+                value = _resolve_path(event, path)
+                if value:
+                    return value
+        return None
+
+    def from_meta(self, meta: Dict[str, str]) -> Optional[str]:
+        """First OpenGraph/Twitter meta value for the field."""
+        for key in self.open_graph_keys:
+            if key in meta:
+                return meta[key]
+        return None
+
+    def select(self, root: Any) -> Optional[str]:
+        """Value of the best-ranked element matching the field's selectors."""
+        if self._index is None:
+            self._index = SelectorIndex([self])
+        return self._index.select(root).get(self.field_name)
+
+    def search(self, html: str) -> Optional[str]:
+        """First regex capture found in the raw HTML."""
+        for regex in self.regexes:
+            match = regex.search(html)
+            if match:
+                value = (match.group(1) if regex.groups else match.group(0)).strip()
+                if value:
+                    return value
+        return None
+
+    def _match(self, value: str, method: str) -> FieldMatch:
+        return FieldMatch(self.field_name, value, method, self.weight * METHOD_CONFIDENCE[method])
+
+
+class ExtractionPlan:
+    """
+    Compiled extraction plan for one platform.
+
+    Usage:
+        plan = compile_plan("eventbrite", platform_config, extraction_patterns)
+        matches = plan.execute(HTMLDocument(html, base_url=url))
+    """
+
+    def __init__(
+        self,
+        platform: str,
+        fields: Sequence[FieldPlan],
+        json_ld_selector: Optional[str] = None,
+        open_graph_selectors: Sequence[str] = (),
+        fingerprint: str = "",
+    ):
+        self.platform = platform
+        self.fields = tuple(fields)
+        self.fields_by_name = {f.field_name: f for f in self.fields}
+        self.fingerprint = fingerprint
+        self.json_ld_query = _compile_query([json_ld_selector] if json_ld_selector else [])
+        self.open_graph_query = _compile_query(open_graph_selectors)
+        self.selector_index = SelectorIndex(self.fields)
+
+    def _json_ld_events(self, root: Any) -> List[Dict[str, Any]]:
+        events = []
+        for script in self.json_ld_query(root):
+            if not script.text:
+                continue
+            try:
+                data = json.loads(script.text)
+            except ValueError:
+                continue
+            events.extend(_iter_json_ld_events(data))
+        return events
+
+    def _open_graph_meta(self, root: Any) -> Dict[str, str]:
+        meta: Dict[str, str] = {}
+        for element in self.open_graph_query(root):
+            key = element.get("property") or element.get("name")
+            content = (element.get("content") or "").strip()
+            if key and content:
+                meta.setdefault(key, content)
+        return meta
+
+    def execute(self, document: Union[HTMLDocument, str]) -> Dict[str, FieldMatch]:
+        """
+        Extract every field of the plan from a page.
+
+        Each field takes the first source that supplies it: JSON-LD, then
+        OpenGraph meta, then the CSS query, then the regexes.
+
+        Args:
+            document: Parsed page, or raw HTML to parse
+
+        Returns:
+            Dictionary of field name to FieldMatch for the fields found
+        """
+        if isinstance(document, str):
+            document = HTMLDocument(document)
+        root = document.root
+        html = document.html or ""
+        results: Dict[str, FieldMatch] = {}
+        pending = list(self.fields)
+
+        if root is not None and self.json_ld_query is not None:
+            events = self._json_ld_events(root)
+            if events:
+                pending = self._resolve(pending, results, "json_ld", lambda f: f.from_json_ld(events))
+
+        if pending and root is not None and self.open_graph_query is not None:
+            meta = self._open_graph_meta(root)
+            if meta:
+                pending = self._resolve(pending, results, "open_graph", lambda f: f.from_meta(meta))
+
+        if pending and root is not None:
+            css = self.selector_index.select(root, [f.field_name for f in pending])
+            pending = self._resolve(pending, results, "css_selector", lambda f: css.get(f.field_name))
+
+        if pending and html:
+            self._resolve(pending, results, "regex", lambda f: f.search(html))
+
+        return results
+
+    @staticmethod
+    def _resolve(
+        pending: List[FieldPlan],
+        results: Dict[str, FieldMatch],
+        method: str,
+        lookup: Callable[[FieldPlan], Optional[str]],
+    ) -> List[FieldPlan]:
+        remaining = []
+        for field_plan in pending:
+            value = lookup(field_plan)
+            if value:
+                results[field_plan.field_name] = field_plan._match(value, method)
+            else:
+                remaining.append(field_plan)
+        return remaining
+
+
+def _pattern_attr(pattern: Any, name: str, default: Any) -> Any:
+    if isinstance(pattern, dict):
+        return pattern.get(name, default)
+    return getattr(pattern, name, default)
+
+
+def config_fingerprint(config: Dict[str, Any], patterns: Sequence[Any] = ()) -> str:
+    """Stable fingerprint of a platform config and its extraction patterns."""
+    pattern_data = [
+        [
+            _pattern_attr(p, "field_name", None),
+            list(_pattern_attr(p, "css_selectors", [])),
+            list(_pattern_attr(p, "regex_patterns", [])),
+            list(_pattern_attr(p, "data_cleaners", [])),
+            _pattern_attr(p, "confidence_weight", None),
+        ]
+        for p in patterns
+    ]
+    return json.dumps([config, pattern_data], sort_keys=True, default=str)
+
+
+def _build_plan(
+    platform: str, config: Dict[str, Any], patterns: Sequence[Any], fingerprint: str
+) -> ExtractionPlan:
+    by_field = {_pattern_attr(p, "field_name", None): p for p in patterns}
+    field_names = list(JSON_LD_FIELD_PATHS)
+    for name in by_field:
+        if name and name not in field_names:
+            field_names.append(name)
+
+    fields = []
+    for name in field_names:
+        config_key = next((k for k, v in CONFIG_SELECTOR_FIELDS.items() if v == name), name)
+        pattern = by_field.get(name)
+        # Platform selectors first, then the generic pattern selectors
+        selectors = list(config.get(f"{config_key}_selectors", []))
+        selectors += list(_pattern_attr(pattern, "css_selectors", []))
+        fields.append(
+            FieldPlan(
+                name,
+                selectors=selectors,
+                regex_patterns=_pattern_attr(pattern, "regex_patterns", []),
+                cleaners=_pattern_attr(pattern, "data_cleaners", None) or DEFAULT_CLEANERS,
+                weight=_pattern_attr(pattern, "confidence_weight", DEFAULT_FIELD_WEIGHT),
+            )
+        )
+
+    return ExtractionPlan(
+        platform,
+        fields,
+        json_ld_selector=config.get("json_ld_selector"),
+        open_graph_selectors=config.get("open_graph_selectors", []),
+        fingerprint=fingerprint,
+    )
+
+
+def compile_plan(
+    platform: str, config: Dict[str, Any], patterns: Sequence[Any] = ()
+) -> ExtractionPlan:
+    """
+    Compile a platform config into an extraction plan.
+
+    Plans are cached by platform and config content, so compiling the same
+    config again returns the existing plan.
+
+    Args:
+        platform: Platform name (e.g. "eventbrite")
+        config: Platform config with "<field>_selectors" lists, "json_ld_selector"
+            and "open_graph_selectors"
+        patterns: ExtractionPattern objects (or dicts) adding selectors,
+            regexes, cleaners and confidence weights per field
+
+    Returns:
+        Compiled ExtractionPlan
+
+    Raises:
+        ValueError: If a selector or regex in the config does not compile
+    """
+    fingerprint = config_fingerprint(config, patterns)
+    key = (platform, fingerprint)
+    plan = _plan_cache.get(key)
+    if plan is None:
+        try:
+            plan = _build_plan(platform, config, patterns, fingerprint)
+        except Exception as e:
+            raise ValueError(f"Invalid extraction config for platform {platform}: {e}") from e
+        _plan_cache.set(key, plan)
+        logger.debug(f"Compiled extraction plan for {platform} ({len(plan.fields)} fields)")
+    return plan
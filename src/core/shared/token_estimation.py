@@ -0,0 +1,143 @@
+"""
+Offline token estimation for Gemini prompts.
+
+``TokenEstimator`` approximates the model's SentencePiece tokenization with a
+regex pre-tokenizer: short words are one token, long words split into
+several, digits and punctuation count individually and CJK characters count
+one each. A linear scale and a relative error bound are fitted against exact
+counts from the API with ``calibrate``, so callers know when an estimate is
+close enough to a limit that an exact count is needed.
+"""
+
+import hashlib
+import math
+import re
+from typing import Iterable, Optional, Tuple
+
+# Words up to this many characters are usually a single token
+SINGLE_TOKEN_WORD_CHARS = 7
+# Each further token of a long word covers about this many characters
+CHARS_PER_EXTRA_TOKEN = 4
+# Before calibration, estimates are assumed within 25% of the real count
+DEFAULT_RELATIVE_ERROR = 0.25
+# Slack for very short texts, where relative error says little
+DEFAULT_ABSOLUTE_ERROR = 4
+
+# Letter runs, digits (tokenized one by one), CJK characters, other symbols
+_CJK = "\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_PIECE = re.compile(rf"[^\W\d_{_CJK}]+|\d|[{_CJK}]|[^\w\s]|_")
+
+
+def content_hash(model: str, text: str) -> str:
+    """Cache key for a text counted by a model, independent of the text's size"""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+def _piece_tokens(piece: str) -> int:
+    if len(piece) <= SINGLE_TOKEN_WORD_CHARS:
+        return 1
+    return 1 + math.ceil((len(piece) - SINGLE_TOKEN_WORD_CHARS) / CHARS_PER_EXTRA_TOKEN)
+
+
+def raw_token_estimate(text: str) -> int:
+    """Uncalibrated token count from the regex pre-tokenizer"""
+    if not text:
+        return 0
+    return sum(_piece_tokens(match.group()) for match in _PIECE.finditer(text))
+
+
+class TokenEstimator:
+    """
+    Calibrated local token counter with a known error bound.
+
+    The real token count of a text lies within ``bounds(text)``: the
+    estimate plus or minus ``relative_error`` of it and ``absolute_error``
+    tokens. After ``calibrate`` the bound is the largest error seen on the
+    calibration samples.
+    """
+
+    def __init__(
+        self,
+        scale: float = 1.0,
+        relative_error: float = DEFAULT_RELATIVE_ERROR,
+        absolute_error: int = DEFAULT_ABSOLUTE_ERROR,
+        samples: int = 0,
+    ):
+        self.scale = scale
+        self.relative_error = relative_error
+        self.absolute_error = absolute_error
+        self.samples = samples
+
+    @classmethod
+    def calibrate(
+        cls, samples: Iterable[Tuple[str, int]], absolute_error: int = DEFAULT_ABSOLUTE_ERROR
+    ) -> "TokenEstimator":
+        """
+        Fit an estimator to exact token counts.
+
+        Args:
+            samples: (text, exact token count) pairs, e.g. from the count_tokens API
+            absolute_error: Token slack added to every bound
+
+        Returns:
+            TokenEstimator: Estimator with the least-squares scale and the
+                largest relative error observed on the samples
+
+        Raises:
+            ValueError: If no sample has a positive count
+        """
+        pairs = [(raw_token_estimate(text), actual) for text, actual in samples if actual > 0]
+        pairs = [(raw, actual) for raw, actual in pairs if raw > 0]
+        if not pairs:
+            raise ValueError("Calibration needs samples with positive token counts")
+
+        scale = sum(raw * actual for raw, actual in pairs) / sum(raw * raw for raw, _ in pairs)
+        relative_error = max(
+            max(0.0, abs(actual - raw * scale) - absolute_error) / (raw * scale) for raw, actual in pairs
+        )
+        return cls(scale=scale, relative_error=relative_error, absolute_error=absolute_error, samples=len(pairs))
+
+    def estimate(self, text: str) -> int:
+        """Estimated token count"""
+        return round(raw_token_estimate(text) * self.scale)
+
+    def bounds(self, text: str) -> Tuple[int, int]:
+        """Lowest and highest token counts consistent with the error bound"""
+        estimate = raw_token_estimate(text) * self.scale
+        margin = estimate * self.relative_error + self.absolute_error
+        return max(0, math.floor(estimate - margin)), math.ceil(estimate + margin)
+
+    def truncate(self, text: str, token_limit: int, conservative: bool = False) -> str:
+        """
+        Cut text at a piece boundary so that its estimate fits token_limit.
+
+        Args:
+            text: Text to cut
+            token_limit: Maximum tokens
+            conservative: Fit the upper error bound instead of the estimate,
+                so the result fits even if the estimate is off
+
+        Returns:
+            str: Prefix of text
+        """
+        if token_limit <= 0:
+            return ""
+        if conservative:
+            budget = (token_limit - self.absolute_error) / (self.scale * (1 + self.relative_error))
+        else:
+            budget = (token_limit + 0.5) / self.scale
+        end = self.prefix_end(text, budget)
+        return text if end is None else text[:end].rstrip()
+
+    @staticmethod
+    def prefix_end(text: str, raw_budget: float) -> Optional[int]:
+        """Offset where the raw estimate first exceeds raw_budget, or None if it never does"""
+        used = 0
+        end = 0
+        for match in _PIECE.finditer(text):
+            used += _piece_tokens(match.group())
+            if used > raw_budget:
+                return end
+            end = match.end()
+        return None
+
@@ -1,14 +1,58 @@
 """URL utility functions for resolving and normalizing web addresses."""
 
+import asyncio
+import functools
 import logging
-from typing import Dict, List, Optional, Set, Tuple
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import parse_qs, urlencode, urljoin, urlparse, urlunparse
 
+import aiohttp
 import requests
 
+from .cache import BoundedCache
+
 # Standard logger for the module
 logger = logging.getLogger(__name__)
 
+# Bounds for the in-process URL caches
+REDIRECT_CACHE_MAX_ENTRIES = 10000
+REDIRECT_CACHE_TTL_SECONDS = 24 * 3600
+DEDUP_MAX_URLS = 100000
+
+# Async redirect resolution
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+DEFAULT_RESOLVE_CONCURRENCY = 20
+DEFAULT_RESOLVE_PER_HOST_LIMIT = 4
+
+# Raw URL strings whose normalized form is memoized
+NORMALIZE_MEMO_SIZE = 65536
+
+# Query parameters removed by normalization; keys are lowercased before lookup
+TRACKING_PARAMS = frozenset({
+    "utm_source",
+    "utm_medium",
+    "utm_campaign",
+    "utm_term",
+    "utm_content",
+    "fbclid",
+    "gclid",
+    "ref",
+    "source",
+    "medium",
+    "campaign",
+    "_ga",
+    "_gl",
+    "mc_cid",
+    "mc_eid",
+    "hsCtaTracking",
+})
+
+# http(s) URLs that urlparse would split into just scheme, netloc and path
+_SIMPLE_URL_PATTERN = re.compile(
+    r"(https?)://([A-Za-z0-9.\-_~%@:]+)(/[^?#;\s\[\]]*)?\Z", re.IGNORECASE
+)
+
 
 def resolve_url(
     base_url: Optional[str], url: str, custom_logger: Optional[logging.Logger] = None
@@ -163,19 +207,90 @@ def normalize_luma_url(
         return None  # Or resolve_url(luma_base, url_stripped, custom_logger=log) for broader coverage.
 
 
+@functools.lru_cache(maxsize=NORMALIZE_MEMO_SIZE)
+def _normalize_url(url: str) -> str:
+    """Memoized normalization of a non-empty URL string; see URLNormalizer.normalize_url."""
+    stripped = url.strip()
+
+    # Fast path: plain http(s) URL without query or params; only the
+    # fragment (if any) is dropped, so no parse/unparse round-trip is needed
+    match = _SIMPLE_URL_PATTERN.match(stripped.partition("#")[0])
+    if match:
+        scheme, netloc, path = match.groups()
+        path = path or ""
+        if path != "/" and path.endswith("/"):
+            path = path.rstrip("/")
+        return f"{scheme.lower()}://{netloc.lower()}{path}"
+
+    try:
+        parsed = urlparse(stripped)
+
+        # Normalize scheme and domain
+        scheme = parsed.scheme.lower() if parsed.scheme else "https"
+        netloc = parsed.netloc.lower()
+
+        # Drop tracking parameters
+        query = ""
+        if parsed.query:
+            query_params = parse_qs(parsed.query, keep_blank_values=False)
+            filtered_params = {
+                k: v for k, v in query_params.items() if k.lower() not in TRACKING_PARAMS
+            }
+            if filtered_params:
+                query = urlencode(filtered_params, doseq=True)
+
+        # Normalize path (remove trailing slash unless it's root)
+        path = parsed.path
+        if path != "/" and path.endswith("/"):
+            path = path.rstrip("/")
+
+        # Rebuild URL without the fragment
+        return urlunparse((scheme, netloc, path, parsed.params, query, ""))
+
+    except Exception as e:
+        logger.warning(f"Failed to normalize URL {url}: {e}")
+        return url
+
+
 class URLNormalizer:
     """Enhanced URL normalization and redirect handling"""
 
-    def __init__(self, max_redirects: int = 10, timeout: int = 10):
+    def __init__(
+        self,
+        max_redirects: int = 10,
+        timeout: int = 10,
+        per_host_limit: int = DEFAULT_RESOLVE_PER_HOST_LIMIT,
+        cache_prefix: Optional[str] = None,
+    ):
+        """
+        Args:
+            max_redirects: Redirect hops followed before giving up
+            timeout: Per-request timeout in seconds
+            per_host_limit: Concurrent redirect resolutions per host
+            cache_prefix: Registers the caches for ``get_cache_stats()`` as
+                "<prefix>_redirects" and "<prefix>_redirect_hops"
+        """
         self.max_redirects = max_redirects
         self.timeout = timeout
+        self.per_host_limit = per_host_limit
         self.session = requests.Session()
         self.session.headers.update(
             {"User-Agent": "Mozilla/5.0 (compatible; EventCrawler/1.0)"}
         )
 
         # Cache for resolved URLs to avoid redundant requests
-        self.redirect_cache: Dict[str, str] = {}
+        self.redirect_cache = BoundedCache(
+            max_entries=REDIRECT_CACHE_MAX_ENTRIES,
+            ttl_seconds=REDIRECT_CACHE_TTL_SECONDS,
+            name=f"{cache_prefix}_redirects" if cache_prefix else None,
+        )
+        # Single hops (normalized URL -> next normalized URL, itself if final),
+        # so chains sharing a prefix or tail only request each hop once
+        self.hop_cache = BoundedCache(
+            max_entries=REDIRECT_CACHE_MAX_ENTRIES,
+            ttl_seconds=REDIRECT_CACHE_TTL_SECONDS,
+            name=f"{cache_prefix}_redirect_hops" if cache_prefix else None,
+        )
 
     def normalize_url(self, url: str) -> str:
         """
@@ -183,74 +298,28 @@ class URLNormalizer:
         """
         if not url or not isinstance(url, str):
             return ""
+        return _normalize_url(url)
 
-        try:
-            # Parse the URL
-            parsed = urlparse(url.strip())
-
-            # Normalize scheme
-            scheme = parsed.scheme.lower() if parsed.scheme else "https"
-
-            # Normalize netloc (domain)
-            netloc = parsed.netloc.lower()
-
-            # Remove common tracking parameters
-            tracking_params = {
-                "utm_source",
-                "utm_medium",
-                "utm_campaign",
-                "utm_term",
-                "utm_content",
-                "fbclid",
-                "gclid",
-                "ref",
-                "source",
-                "medium",
-                "campaign",
-                "_ga",
-                "_gl",
-                "mc_cid",
-                "mc_eid",
-                "hsCtaTracking",
-            }
-
-            # Parse and filter query parameters
-            query_params = parse_qs(parsed.query, keep_blank_values=False)
-            filtered_params = {
-                k: v
-                for k, v in query_params.items()
-                if k.lower() not in tracking_params
-            }
-
-            # Rebuild query string
-            query = urlencode(filtered_params, doseq=True) if filtered_params else ""
-
-            # Normalize path (remove trailing slash unless it's root)
-            path = parsed.path
-            if path != "/" and path.endswith("/"):
-                path = path.rstrip("/")
-
-            # Remove fragment (hash)
-            fragment = ""
-
-            # Rebuild URL
-            normalized = urlunparse(
-                (scheme, netloc, path, parsed.params, query, fragment)
-            )
-
-            return normalized
+    def normalize_many(self, urls: Iterable[str]) -> List[str]:
+        """
+        Normalize a batch of URLs, in input order.
 
-        except Exception as e:
-            logger.warning(f"Failed to normalize URL {url}: {e}")
-            return url
+        Equivalent to calling normalize_url on each URL without the per-call
+        method overhead.
+        """
+        return [
+            _normalize_url(url) if url and isinstance(url, str) else ""
+            for url in urls
+        ]
 
     def follow_redirects(self, url: str) -> Tuple[str, List[str]]:
         """
         Follow redirect chain and return final URL with redirect chain
         Returns: (final_url, redirect_chain)
         """
-        if url in self.redirect_cache:
-            return self.redirect_cache[url], []
+        cached = self.redirect_cache.get(url)
+        if cached is not None:
+            return cached, []
 
         normalized_url = self.normalize_url(url)
         redirect_chain = []
@@ -292,7 +361,7 @@ class URLNormalizer:
                     break
 
             # Cache the result
-            self.redirect_cache[url] = current_url
+            self.redirect_cache.set(url, current_url)
 
             return current_url, redirect_chain
 
@@ -300,6 +369,100 @@ class URLNormalizer:
             logger.warning(f"Failed to follow redirects for {url}: {e}")
             return normalized_url, []
 
+    async def _fetch_hop(self, session: aiohttp.ClientSession, url: str) -> str:
+        """Request one URL without following redirects and return where it points."""
+        async with session.head(url, allow_redirects=False) as response:
+            if response.status in REDIRECT_STATUSES:
+                location = response.headers.get("location")
+                if location:
+                    return self.normalize_url(urljoin(url, location))
+        return url
+
+    async def follow_redirects_async(
+        self, url: str, session: aiohttp.ClientSession
+    ) -> Tuple[str, List[str]]:
+        """
+        Async equivalent of follow_redirects using a shared aiohttp session.
+
+        Each hop is memoized and concurrent requests for the same hop are
+        coalesced, so overlapping chains are only walked once.
+
+        Returns: (final_url, redirect_chain)
+        """
+        cached = self.redirect_cache.get(url)
+        if cached is not None:
+            return cached, []
+
+        normalized_url = self.normalize_url(url)
+        redirect_chain: List[str] = []
+        current_url = normalized_url
+
+        for _ in range(self.max_redirects):
+            try:
+                redirect_url = await self.hop_cache.get_or_fetch(
+                    current_url,
+                    lambda hop=current_url: self._fetch_hop(session, hop),
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.warning(f"Request failed for {current_url}: {e}")
+                break
+
+            if redirect_url == current_url:
+                # Not a redirect, we're done
+                break
+
+            # Avoid infinite loops
+            if redirect_url in redirect_chain:
+                logger.warning(f"Redirect loop detected for {url}")
+                break
+
+            redirect_chain.append(current_url)
+            current_url = redirect_url
+
+        self.redirect_cache.set(url, current_url)
+        return current_url, redirect_chain
+
+    async def resolve_many(
+        self,
+        urls: Iterable[str],
+        max_concurrency: int = DEFAULT_RESOLVE_CONCURRENCY,
+    ) -> Dict[str, Tuple[str, List[str]]]:
+        """
+        Resolve redirect chains for many URLs concurrently.
+
+        One session is shared by every chain so connections to a host are
+        reused, with at most per_host_limit open per host.
+
+        Args:
+            urls: URLs to resolve; duplicates and empty values are collapsed
+            max_concurrency: Requests in flight across all hosts
+
+        Returns:
+            Dictionary mapping each distinct URL to (final_url, redirect_chain)
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return {}
+
+        connector = aiohttp.TCPConnector(
+            limit=max_concurrency, limit_per_host=self.per_host_limit
+        )
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=dict(self.session.headers),
+        ) as session:
+            resolved = await asyncio.gather(
+                *(self.follow_redirects_async(url, session) for url in unique_urls)
+            )
+
+        hop_stats = self.hop_cache.get_stats()
+        logger.info(
+            f"Resolved {len(unique_urls)} URLs "
+            f"({hop_stats['fetches']} hops requested, {hop_stats['coalesced']} shared)"
+        )
+        return dict(zip(unique_urls, resolved))
+
     def get_canonical_url(self, url: str) -> str:
         """
         Get the canonical URL by normalizing and following redirects
@@ -353,29 +516,64 @@ class URLNormalizer:
 class URLDeduplicator:
     """Detect and handle duplicate URLs across different formats"""
 
-    def __init__(self):
+    def __init__(self, max_urls: int = DEDUP_MAX_URLS, cache_prefix: Optional[str] = None):
+        """
+        Args:
+            max_urls: URLs remembered before the least recently seen are forgotten
+            cache_prefix: Registers the caches for ``get_cache_stats()`` as
+                "<prefix>_mappings" and "<prefix>_canonical"
+        """
         self.normalizer = URLNormalizer()
-        self.url_mappings: Dict[str, Set[str]] = {}  # canonical -> {variants}
-        self.canonical_urls: Dict[str, str] = {}  # variant -> canonical
+        # canonical -> {variants}; least recently seen URLs are forgotten first
+        self.url_mappings = BoundedCache(
+            max_entries=max_urls, name=f"{cache_prefix}_mappings" if cache_prefix else None
+        )
+        # variant -> canonical
+        self.canonical_urls = BoundedCache(
+            max_entries=max_urls, name=f"{cache_prefix}_canonical" if cache_prefix else None
+        )
 
     def add_url(self, url: str) -> str:
         """
         Add URL to the deduplicator and return its canonical form
         """
         canonical = self.normalizer.get_canonical_url(url)
+        self._record(url, canonical)
+        return canonical
 
-        # Add to mappings
-        if canonical not in self.url_mappings:
-            self.url_mappings[canonical] = set()
-
-        self.url_mappings[canonical].add(url)
-        self.canonical_urls[url] = canonical
+    def _record(self, url: str, canonical: str) -> None:
+        # Re-set so the variant set's size is re-accounted
+        variants = self.url_mappings.get(canonical) or set()
+        variants.add(url)
+        self.url_mappings.set(canonical, variants)
+        self.canonical_urls.set(url, canonical)
+
+    async def add_urls(
+        self,
+        urls: Iterable[str],
+        max_concurrency: int = DEFAULT_RESOLVE_CONCURRENCY,
+    ) -> List[str]:
+        """
+        Add many URLs at once, resolving their redirects concurrently.
 
-        return canonical
+        Returns:
+            Canonical form of each URL, in input order
+        """
+        urls = list(urls)
+        resolved = await self.normalizer.resolve_many(urls, max_concurrency)
+        canonicals = []
+        for url in urls:
+            canonical = resolved[url][0] if url in resolved else self.normalizer.normalize_url(url)
+            self._record(url, canonical)
+            canonicals.append(canonical)
+        return canonicals
 
     def get_canonical_url(self, url: str) -> str:
         """Get the canonical URL for a given variant"""
-        return self.canonical_urls.get(url, self.normalizer.get_canonical_url(url))
+        canonical = self.canonical_urls.get(url)
+        if canonical is None:
+            canonical = self.normalizer.get_canonical_url(url)
+        return canonical
 
     def get_url_variants(self, url: str) -> Set[str]:
         """Get all known variants of a URL"""
@@ -388,8 +586,8 @@ class URLDeduplicator:
 
 
 # Global instances for easy access
-url_normalizer = URLNormalizer()
-url_deduplicator = URLDeduplicator()
+url_normalizer = URLNormalizer(cache_prefix="url")
+url_deduplicator = URLDeduplicator(cache_prefix="url_dedup")
 
 
 def normalize_url_enhanced(url: str) -> str:
@@ -402,6 +600,18 @@ def follow_redirects_enhanced(url: str) -> Tuple[str, List[str]]:
     return url_normalizer.follow_redirects(url)
 
 
+def normalize_many(urls: Iterable[str]) -> List[str]:
+    """Normalize a batch of URLs with the global normalizer"""
+    return url_normalizer.normalize_many(urls)
+
+
+async def resolve_redirects_many(
+    urls: Iterable[str], max_concurrency: int = DEFAULT_RESOLVE_CONCURRENCY
+) -> Dict[str, Tuple[str, List[str]]]:
+    """Resolve redirect chains for many URLs concurrently without blocking the event loop"""
+    return await url_normalizer.resolve_many(urls, max_concurrency)
+
+
 def get_canonical_url(url: str) -> str:
     """Get canonical URL by normalizing and following redirects"""
     return url_normalizer.get_canonical_url(url)
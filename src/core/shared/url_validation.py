@@ -2,25 +2,72 @@
 """
 Real-time URL Validation System
 Prevent fake/404 events from being added to the database by validating URLs before insertion.
+
+Pages are probed with a streamed GET that stops reading once ``</title>`` has
+arrived (or a HEAD request when titles are not checked). Bulk validation
+dedupes URLs and checks them concurrently under per-host limits, and results
+are kept in a bounded TTL cache shared by all validators in the process.
 """
 
 import asyncio
 import logging
 import re
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import aiohttp
 
+from .cache import BoundedCache
+
 logger = logging.getLogger(__name__)
 
+# (is_valid, title, error_message)
+URLValidationResult = Tuple[bool, Optional[str], Optional[str]]
+
+DEFAULT_CACHE_MAX_ENTRIES = 10000
+DEFAULT_CACHE_TTL_SECONDS = 3600
+DEFAULT_MAX_CONCURRENCY = 20
+DEFAULT_PER_HOST_LIMIT = 4
+# Stop reading a page after this many bytes if no </title> has been seen
+DEFAULT_MAX_TITLE_BYTES = 64 * 1024
+READ_CHUNK_SIZE = 4096
+
+TITLE_END_PATTERN = re.compile(rb"</title\s*>", re.IGNORECASE)
+# Statuses meaning the server does not support HEAD for this resource
+HEAD_UNSUPPORTED_STATUSES = {405, 501}
+
+
+# One cache for every validator so repeated imports skip already-checked URLs
+_shared_validation_cache = BoundedCache(
+    max_entries=DEFAULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=DEFAULT_CACHE_TTL_SECONDS,
+    name="url_validation",
+)
+
 
 class URLValidator:
     """Real-time URL validation to prevent fake events from entering the database."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[BoundedCache] = None,
+        check_title: bool = True,
+        max_title_bytes: int = DEFAULT_MAX_TITLE_BYTES,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    ):
+        """
+        Args:
+            cache: Result cache (defaults to the process-wide shared cache)
+            check_title: Read the page title to catch soft-404 pages; when False
+                a HEAD request is enough
+            max_title_bytes: Maximum bytes read while looking for </title>
+            per_host_limit: Concurrent connections allowed to one host
+        """
         self.session: Optional[aiohttp.ClientSession] = None
+        self.check_title = check_title
+        self.max_title_bytes = max_title_bytes
+        self.per_host_limit = per_host_limit
         self.fake_patterns = [
             r"^Page Not Found",
             r"^404",
@@ -43,14 +90,20 @@ class URLValidator:
             # Remove the 8-char pattern as it catches legitimate URLs like cymcvco8
         ]
 
+        self._fake_url_regexes = [re.compile(p, re.IGNORECASE) for p in self.fake_url_patterns]
+        self._fake_title_regexes = [re.compile(p, re.IGNORECASE) for p in self.fake_patterns]
+
         # Cache for recent validations (avoid re-checking same URLs)
-        self.validation_cache: Dict[str, Tuple[bool, datetime]] = {}
-        self.cache_ttl = timedelta(hours=1)
+        self.validation_cache = cache if cache is not None else _shared_validation_cache
+        ttl = self.validation_cache.ttl_seconds
+        self.cache_ttl = timedelta(seconds=ttl) if ttl is not None else None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
 
     async def __aenter__(self):
         """Async context manager entry."""
         self.session = aiohttp.ClientSession(
             timeout=aiohttp.ClientTimeout(total=10),
+            connector=aiohttp.TCPConnector(limit_per_host=self.per_host_limit),
             headers={
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             },
@@ -64,8 +117,8 @@ class URLValidator:
 
     def is_fake_url_pattern(self, url: str) -> bool:
         """Check if URL matches known fake patterns."""
-        for pattern in self.fake_url_patterns:
-            if re.match(pattern, url, re.IGNORECASE):
+        for pattern in self._fake_url_regexes:
+            if pattern.match(url):
                 logger.warning(f"🚫 URL matches fake pattern: {url}")
                 return True
         return False
@@ -75,15 +128,13 @@ class URLValidator:
         if not title:
             return False
 
-        for pattern in self.fake_patterns:
-            if re.search(pattern, title, re.IGNORECASE):
+        for pattern in self._fake_title_regexes:
+            if pattern.search(title):
                 logger.warning(f"🚫 Title matches fake pattern: {title}")
                 return True
         return False
 
-    async def validate_url_exists(
-        self, url: str
-    ) -> Tuple[bool, Optional[str], Optional[str]]:
+    async def validate_url_exists(self, url: str) -> URLValidationResult:
         """
         Validate that URL exists and returns valid content.
 
@@ -94,71 +145,139 @@ class URLValidator:
             return False, None, "Empty URL"
 
         # Check cache first
-        if url in self.validation_cache:
-            cached_result, cached_time = self.validation_cache[url]
-            if datetime.now() - cached_time < self.cache_ttl:
-                logger.debug(f"Using cached validation for {url}: {cached_result}")
-                return (
-                    cached_result,
-                    None,
-                    None if cached_result else "Cached as invalid",
-                )
+        key = self._cache_key(url)
+        cached = self.validation_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Using cached validation for {url}: {cached[0]}")
+            return cached
 
         # Check fake URL patterns
         if self.is_fake_url_pattern(url):
-            self.validation_cache[url] = (False, datetime.now())
-            return False, None, "Matches fake URL pattern"
+            result = (False, None, "Matches fake URL pattern")
+            self.validation_cache.set(key, result)
+            return result
 
         if not self.session:
             return False, None, "No HTTP session available"
 
+        # Concurrent checks of the same URL share one request
+        return await self.validation_cache.get_or_fetch(key, lambda: self._probe_url(url))
+
+    def _cache_key(self, url: str) -> Tuple[str, bool]:
+        # A HEAD-only pass says nothing about soft-404 titles, so results are
+        # cached separately for validators that do and do not check titles
+        return url, self.check_title
+
+    async def _probe_url(self, url: str) -> URLValidationResult:
+        """Check a URL over HTTP, reading no more of the body than needed."""
         try:
             logger.info(f"🔍 Validating URL: {url}")
 
-            async with self.session.get(url, allow_redirects=True) as response:
-                status = response.status
-
-                if status == 404:
-                    logger.warning(f"🚫 URL returns 404: {url}")
-                    self.validation_cache[url] = (False, datetime.now())
-                    return False, None, f"HTTP {status} Not Found"
+            if not self.check_title:
+                async with self.session.head(url, allow_redirects=True) as response:
+                    if response.status not in HEAD_UNSUPPORTED_STATUSES:
+                        return self._status_result(url, response.status) or (True, None, None)
 
-                if status >= 400:
-                    logger.warning(f"🚫 URL returns error {status}: {url}")
-                    self.validation_cache[url] = (False, datetime.now())
-                    return False, None, f"HTTP {status} Error"
+            async with self.session.get(url, allow_redirects=True) as response:
+                status_result = self._status_result(url, response.status)
+                if status_result:
+                    return status_result
+                if not self.check_title:
+                    return True, None, None
 
-                # Get page content to check title
+                # Read only up to the closing </title> to check the title
                 try:
-                    content = await response.text()
-                    title = self.extract_title(content)
-
-                    # Check if title indicates fake/error page
-                    if self.is_fake_title_pattern(title):
-                        logger.warning(f"🚫 URL has fake title: {url} -> {title}")
-                        self.validation_cache[url] = (False, datetime.now())
-                        return False, title, "Title indicates error page"
-
-                    logger.info(f"✅ URL is valid: {url} -> {title}")
-                    self.validation_cache[url] = (True, datetime.now())
-                    return True, title, None
-
+                    title = self.extract_title(await self._read_until_title(response))
                 except Exception as e:
                     logger.warning(f"⚠️ Could not read content from {url}: {str(e)}")
                     # Still consider it valid if HTTP status is OK
-                    self.validation_cache[url] = (True, datetime.now())
                     return True, None, None
 
+                # Check if title indicates fake/error page
+                if self.is_fake_title_pattern(title):
+                    logger.warning(f"🚫 URL has fake title: {url} -> {title}")
+                    return False, title, "Title indicates error page"
+
+                logger.info(f"✅ URL is valid: {url} -> {title}")
+                return True, title, None
+
         except asyncio.TimeoutError:
             logger.warning(f"⏰ Timeout validating URL: {url}")
-            self.validation_cache[url] = (False, datetime.now())
             return False, None, "Request timeout"
 
         except Exception as e:
             logger.warning(f"❌ Error validating URL {url}: {str(e)}")
-            self.validation_cache[url] = (False, datetime.now())
             return False, None, f"Validation error: {str(e)}"
 
+    def _status_result(self, url: str, status: int) -> Optional[URLValidationResult]:
+        """Invalid result for an HTTP error status, None if the status is OK."""
+        if status == 404:
+            logger.warning(f"🚫 URL returns 404: {url}")
+            return False, None, f"HTTP {status} Not Found"
+
+        if status >= 400:
+            logger.warning(f"🚫 URL returns error {status}: {url}")
+            return False, None, f"HTTP {status} Error"
+
+        return None
+
+    async def _read_until_title(self, response: aiohttp.ClientResponse) -> str:
+        """Stream the body until </title> is seen or max_title_bytes are read."""
+        buffer = bytearray()
+        async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+            search_from = max(0, len(buffer) - 16)
+            buffer.extend(chunk)
+            if TITLE_END_PATTERN.search(buffer, search_from) or len(buffer) >= self.max_title_bytes:
+                break
+        return bytes(buffer).decode(response.charset or "utf-8", errors="replace")
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def validate_urls(
+        self,
+        urls: Iterable[str],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> Dict[str, URLValidationResult]:
+        """
+        Validate many URLs concurrently, checking each distinct URL once.
+
+        Args:
+            urls: URLs to validate; duplicates and empty values are collapsed
+            max_concurrency: Requests in flight across all hosts
+
+        Returns:
+            Dictionary mapping each distinct URL to (is_valid, title, error_message)
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        results: Dict[str, URLValidationResult] = {}
+        pending: List[str] = []
+        for url in unique_urls:
+            cached = self.validation_cache.get(self._cache_key(url))
+            if cached is not None:
+                results[url] = cached
+            else:
+                pending.append(url)
+
+        global_semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def validate_one(url: str) -> None:
+            async with global_semaphore, self._host_semaphore(url):
+                results[url] = await self.validate_url_exists(url)
+
+        await asyncio.gather(*(validate_one(url) for url in pending))
+
+        logger.info(
+            f"Validated {len(unique_urls)} distinct URLs "
+            f"({len(unique_urls) - len(pending)} cached, {len(pending)} checked)"
+        )
+        return results
+
     def extract_title(self, html_content: str) -> Optional[str]:
         """Extract title from HTML content."""
         try:
@@ -186,24 +305,46 @@ class URLValidator:
         """
         Validate complete event data before database insertion.
 
+        Returns:
+            (is_valid, list_of_issues)
+        """
+        url = self._event_url(event_data)
+        url_result = await self.validate_url_exists(url) if url else None
+        return self.evaluate_event(event_data, url_result)
+
+    @staticmethod
+    def _event_url(event_data: Dict[str, Any]) -> Optional[str]:
+        return event_data.get("luma_url") or event_data.get("url")
+
+    def evaluate_event(
+        self, event_data: Dict[str, Any], url_result: Optional[URLValidationResult]
+    ) -> Tuple[bool, List[str]]:
+        """
+        Apply the event rules given an already computed URL validation result.
+
+        ``url_result`` is None for events without a URL; every missing
+        required field is still reported.
+
         Returns:
             (is_valid, list_of_issues)
         """
         issues = []
 
         # Check required fields
-        url = event_data.get("luma_url") or event_data.get("url")
+        url = self._event_url(event_data)
         name = event_data.get("name")
 
         if not url:
             issues.append("Missing event URL")
-            return False, issues
 
         if not name:
             issues.append("Missing event name")
 
+        if url_result is None:
+            return False, issues
+
         # Validate URL
-        is_valid_url, title, error = await self.validate_url_exists(url)
+        is_valid_url, title, error = url_result
         if not is_valid_url:
             issues.append(f"Invalid URL: {error}")
             return False, issues
@@ -246,15 +387,23 @@ class EventValidator:
             return await self.url_validator.validate_event_data(event_data)
 
     async def validate_bulk_events(
-        self, events_data: List[Dict[str, Any]]
+        self,
+        events_data: List[Dict[str, Any]],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
     ) -> List[Tuple[bool, List[str]]]:
-        """Validate multiple events efficiently."""
+        """
+        Validate multiple events efficiently.
+
+        Distinct URLs are validated once, concurrently and under per-host
+        limits; results are returned in the same order as events_data.
+        """
         async with self.url_validator:
-            results = []
-            for event_data in events_data:
-                result = await self.url_validator.validate_event_data(event_data)
-                results.append(result)
-            return results
+            urls = [self.url_validator._event_url(event_data) for event_data in events_data]
+            url_results = await self.url_validator.validate_urls(urls, max_concurrency)
+            return [
+                self.url_validator.evaluate_event(event_data, url_results[url] if url else None)
+                for event_data, url in zip(events_data, urls)
+            ]
 
 
 # Decorator for automatic validation
@@ -0,0 +1,490 @@
+"""
+Local approximate nearest neighbour index for event and speaker embeddings.
+
+``VectorIndex`` is an IVF (inverted file) index: vectors are grouped under
+the nearest of ``n_lists`` k-means centroids, and a query only scores the
+vectors in its ``n_probe`` closest groups. Small indexes are searched exactly.
+Adds and deletes are incremental, and the index persists to a directory whose
+vectors reload memory-mapped. Everything runs in-process on numpy; no vector
+database is involved.
+
+``reciprocal_rank_fusion`` merges ranked result lists (e.g. keyword RPC hits
+and vector hits) for hybrid search.
+"""
+
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .vectors import EMBEDDING_DTYPE, _is_private_copy, as_embedding_array, normalize_rows
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_N_PROBE = 8
+# Indexes up to this many vectors are scanned exactly and left untrained
+EXACT_SEARCH_MAX_ROWS = 4096
+# Retrain once the index has grown this much since the last training
+RETRAIN_GROWTH = 4.0
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLES_PER_LIST = 32
+# Compact once this fraction of rows are deleted
+COMPACT_DELETED_FRACTION = 0.5
+MIN_CAPACITY = 1024
+
+FORMAT_VERSION = 1
+CURRENT_FILE = "CURRENT"
+
+# Standard reciprocal rank fusion constant
+RRF_K = 60
+
+
+def _default_n_lists(rows: int) -> int:
+    return max(1, min(4096, int(math.sqrt(rows))))
+
+
+def _kmeans(
+    vectors: np.ndarray, n_lists: int, iterations: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Spherical k-means on unit vectors; returns unit-length centroids."""
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        empty = ~sums.any(axis=1)
+        if empty.any():
+            # Reseed empty lists with random vectors
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums, copy=False)
+    return centroids
+
+
+class VectorIndex:
+    """
+    Persistent IVF index of unit-normalized embeddings, searched by cosine similarity.
+
+    Usage:
+        index = VectorIndex(dimension=768, path="data/vector_index/events")
+        index.add_many(event_ids, embeddings)
+        index.save()
+        matches = index.search(query_embedding, k=10)  # [(event_id, score), ...]
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        path: Optional[str] = None,
+        n_lists: Optional[int] = None,
+        n_probe: int = DEFAULT_N_PROBE,
+        seed: int = 0,
+    ):
+        """
+        Open the index saved at path, or create an empty one.
+
+        Args:
+            dimension: Embedding dimension
+            path: Directory the index is saved to (None for an in-memory index)
+            n_lists: Number of IVF lists (defaults to sqrt of the row count at training)
+            n_probe: Lists scanned per query; higher is more accurate and slower
+            seed: Seed for k-means initialization
+        """
+        self.dimension = dimension
+        self.path = path
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.RLock()
+
+        self._vectors = np.zeros((0, dimension), dtype=EMBEDDING_DTYPE)
+        self._size = 0
+        self._ids: List[Optional[Hashable]] = []
+        self._row_of: Dict[Hashable, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._list_arrays: List[Optional[np.ndarray]] = []
+        self._trained_rows = 0
+        self._version = 0
+
+        self.stats = {"adds": 0, "removes": 0, "searches": 0, "trainings": 0, "compactions": 0}
+
+        if path and os.path.exists(os.path.join(path, CURRENT_FILE)):
+            self._load(path)
+
+    # Storage
+
+    def _reserve(self, rows: int) -> None:
+        """Make room for rows more vectors, copying a memory-mapped matrix on first write."""
+        needed = self._size + rows
+        if needed <= len(self._vectors) and self._vectors.flags.writeable:
+            return
+        capacity = max(MIN_CAPACITY, needed, 2 * len(self._vectors))
+        vectors = np.zeros((capacity, self.dimension), dtype=EMBEDDING_DTYPE)
+        vectors[: self._size] = self._vectors[: self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        assign = np.full(capacity, -1, dtype=np.int32)
+        assign[: self._size] = self._assign[: self._size]
+        self._vectors, self._alive, self._assign = vectors, alive, assign
+
+    def _set_lists(self, assignment: np.ndarray) -> None:
+        """Rebuild the inverted lists from a row -> list assignment."""
+        n_lists = len(self._centroids) if self._centroids is not None else 0
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+        self._lists = [order[bounds[i]: bounds[i + 1]].tolist() for i in range(n_lists)]
+        self._list_arrays = [None] * n_lists
+
+    def _assign_rows(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    # Updates
+
+    def add(self, item_id: Hashable, embedding: Sequence[float]) -> None:
+        """Add or replace one embedding."""
+        self.add_many([item_id], [embedding])
+
+    def add_many(self, item_ids: Sequence[Hashable], embeddings: Any) -> int:
+        """
+        Add or replace embeddings.
+
+        Ids already in the index are replaced. Trains (or retrains) the IVF
+        lists once the index outgrows exact search.
+
+        Args:
+            item_ids: Event or speaker ids (strings or integers, for persistence)
+            embeddings: One vector per id
+
+        Returns:
+            Number of vectors added
+        """
+        if len(item_ids) == 0:
+            return 0
+        vectors = as_embedding_array(embeddings)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        if vectors.shape[1] != self.dimension:
+            raise ValueError(f"Expected embeddings of dimension {self.dimension}, got {vectors.shape[1]}")
+        if len(vectors) != len(item_ids):
+            raise ValueError(f"Got {len(item_ids)} ids for {len(vectors)} embeddings")
+
+        # Last occurrence wins within a batch, as with sequential adds
+        latest = {item_id: position for position, item_id in enumerate(item_ids)}
+        positions = sorted(latest.values())
+        # Fancy indexing copies, so the caller's array is never normalized in place
+        vectors = normalize_rows(vectors[positions], copy=False)
+
+        with self._lock:
+            for item_id in latest:
+                self._delete(item_id)
+            self._reserve(len(vectors))
+            start, end = self._size, self._size + len(vectors)
+            self._vectors[start:end] = vectors
+            self._alive[start:end] = True
+            for row, position in enumerate(positions, start):
+                item_id = item_ids[position]
+                self._ids.append(item_id)
+                self._row_of[item_id] = row
+            self._size = end
+
+            if self._centroids is not None:
+                assignment = self._assign_rows(vectors)
+                self._assign[start:end] = assignment
+                for row, list_index in zip(range(start, end), assignment.tolist()):
+                    self._lists[list_index].append(row)
+                    self._list_arrays[list_index] = None
+
+            self.stats["adds"] += len(vectors)
+            self._maybe_compact()
+            live = len(self._row_of)
+            if live > EXACT_SEARCH_MAX_ROWS and (
+                self._centroids is None or live > RETRAIN_GROWTH * self._trained_rows
+            ):
+                self.train()
+        return len(vectors)
+
+    def _delete(self, item_id: Hashable) -> bool:
+        row = self._row_of.pop(item_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._ids[row] = None
+        return True
+
+    def remove(self, item_id: Hashable) -> bool:
+        """
+        Delete an embedding by id.
+
+        Returns:
+            True if the id was in the index
+        """
+        with self._lock:
+            if not self._delete(item_id):
+                return False
+            self.stats["removes"] += 1
+            self._maybe_compact()
+            return True
+
+    def _maybe_compact(self) -> None:
+        if self._size - len(self._row_of) > COMPACT_DELETED_FRACTION * max(self._size, MIN_CAPACITY):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop deleted rows and renumber the live ones."""
+        keep = np.flatnonzero(self._alive[: self._size])
+        self._vectors = np.ascontiguousarray(self._vectors[keep])
+        self._alive = np.ones(len(keep), dtype=bool)
+        self._assign = self._assign[keep].copy()
+        self._ids = [self._ids[row] for row in keep.tolist()]
+        self._row_of = {item_id: row for row, item_id in enumerate(self._ids)}
+        self._size = len(keep)
+        if self._centroids is not None:
+            self._set_lists(self._assign)
+        self.stats["compactions"] += 1
+
+    def train(self, n_lists: Optional[int] = None) -> None:
+        """
+        Cluster the live vectors into IVF lists and reassign every vector.
+
+        Args:
+            n_lists: Number of lists (defaults to the configured n_lists, or
+                sqrt of the live row count)
+        """
+        with self._lock:
+            if self._size - len(self._row_of):
+                self._compact()
+            rows = self._size
+            if rows == 0:
+                return
+            n_lists = min(n_lists or self.n_lists or _default_n_lists(rows), rows)
+            vectors = self._vectors[:rows]
+            sample_size = min(rows, n_lists * KMEANS_SAMPLES_PER_LIST)
+            sample = vectors[self._rng.choice(rows, sample_size, replace=False)]
+            self._centroids = _kmeans(sample, n_lists, KMEANS_ITERATIONS, self._rng)
+            self._assign[:rows] = self._assign_rows(vectors)
+            self._set_lists(self._assign[:rows])
+            self._trained_rows = rows
+            self.stats["trainings"] += 1
+            logger.info(f"Trained vector index with {n_lists} lists over {rows} vectors")
+
+    # Queries
+
+    def _candidate_rows(self, query: np.ndarray, n_probe: int) -> np.ndarray:
+        if self._centroids is None or len(self._row_of) <= EXACT_SEARCH_MAX_ROWS:
+            return np.flatnonzero(self._alive[: self._size])
+        n_probe = min(n_probe, len(self._centroids))
+        closest = np.argpartition(-(self._centroids @ query), n_probe - 1)[:n_probe]
+        arrays = []
+        for list_index in closest.tolist():
+            array = self._list_arrays[list_index]
+            if array is None:
+                array = self._list_arrays[list_index] = np.asarray(self._lists[list_index], dtype=np.int64)
+            arrays.append(array)
+        rows = np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int64)
+        return rows[self._alive[rows]]
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int = 10,
+        n_probe: Optional[int] = None,
+        min_score: Optional[float] = None,
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Find the embeddings most similar to a query.
+
+        Args:
+            query: Query embedding
+            k: Maximum number of results
+            n_probe: Lists to scan (defaults to the index's n_probe)
+            min_score: Drop results with a lower cosine similarity
+
+        Returns:
+            List of (id, cosine similarity) tuples, best first
+        """
+        vector = as_embedding_array(query)
+        if vector.shape != (self.dimension,):
+            raise ValueError(f"Expected a query of dimension {self.dimension}, got shape {vector.shape}")
+        vector = normalize_rows(vector, copy=not _is_private_copy(vector, query))
+
+        with self._lock:
+            self.stats["searches"] += 1
+            rows = self._candidate_rows(vector, n_probe or self.n_probe)
+            if len(rows) == 0 or k <= 0:
+                return []
+            scores = self._vectors[rows] @ vector
+            if k < len(rows):
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(len(rows))
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            results = []
+            for position in top.tolist():
+                score = float(scores[position])
+                if min_score is not None and score < min_score:
+                    break
+                results.append((self._ids[rows[position]], score))
+            return results
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        return item_id in self._row_of
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def get_embedding(self, item_id: Hashable) -> Optional[np.ndarray]:
+        """Stored (unit-length) embedding for an id, or None"""
+        with self._lock:
+            row = self._row_of.get(item_id)
+            return None if row is None else np.array(self._vectors[row])
+
+    # Persistence
+
+    def save(self, path: Optional[str] = None) -> str:
+        """
+        Write the index to a directory.
+
+        Each save writes a new version subdirectory and then switches the
+        CURRENT pointer to it with an atomic rename, so readers never see a
+        half-written index.
+
+        Args:
+            path: Directory to save to (defaults to the index's path)
+
+        Returns:
+            Directory of the saved version
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for saving the vector index")
+        with self._lock:
+            if self._size - len(self._row_of):
+                self._compact()
+            os.makedirs(path, exist_ok=True)
+            previous = _read_current(path)
+            self._version = max(self._version, _version_number(previous)) + 1
+            name = f"v{self._version:06d}"
+            directory = os.path.join(path, name)
+            os.makedirs(directory, exist_ok=True)
+
+            np.save(os.path.join(directory, "vectors.npy"), self._vectors[: self._size])
+            np.save(os.path.join(directory, "assign.npy"), self._assign[: self._size])
+            if self._centroids is not None:
+                np.save(os.path.join(directory, "centroids.npy"), self._centroids)
+            with open(os.path.join(directory, "ids.json"), "w") as f:
+                json.dump(self._ids[: self._size], f)
+            with open(os.path.join(directory, "meta.json"), "w") as f:
+                json.dump(
+                    {
+                        "format_version": FORMAT_VERSION,
+                        "dimension": self.dimension,
+                        "n_lists": self.n_lists,
+                        "n_probe": self.n_probe,
+                        "trained_rows": self._trained_rows,
+                    },
+                    f,
+                )
+
+            pointer = os.path.join(path, CURRENT_FILE + ".tmp")
+            with open(pointer, "w") as f:
+                f.write(name)
+            os.replace(pointer, os.path.join(path, CURRENT_FILE))
+
+            for entry in os.listdir(path):
+                if entry != name and entry.startswith("v") and entry[1:].isdigit():
+                    shutil.rmtree(os.path.join(path, entry), ignore_errors=True)
+            self.path = path
+            return directory
+
+    def _load(self, path: str) -> None:
+        name = _read_current(path)
+        directory = os.path.join(path, name)
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        if meta["dimension"] != self.dimension:
+            raise ValueError(
+                f"Index at {path} has dimension {meta['dimension']}, expected {self.dimension}"
+            )
+        with open(os.path.join(directory, "ids.json")) as f:
+            ids = json.load(f)
+
+        # Vectors stay memory-mapped until the first write
+        self._vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        self._size = len(self._vectors)
+        self._ids = ids
+        self._row_of = {item_id: row for row, item_id in enumerate(ids)}
+        self._alive = np.ones(self._size, dtype=bool)
+        self._assign = np.load(os.path.join(directory, "assign.npy"))
+        centroids_path = os.path.join(directory, "centroids.npy")
+        if os.path.exists(centroids_path):
+            self._centroids = np.load(centroids_path)
+            self._set_lists(self._assign)
+        self.n_lists = self.n_lists or meta.get("n_lists")
+        self._trained_rows = meta.get("trained_rows", 0)
+        self._version = _version_number(name)
+        logger.info(f"Loaded vector index {name} with {self._size} vectors from {path}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size, training and query statistics"""
+        return {
+            **self.stats,
+            "vectors": len(self._row_of),
+            "deleted_rows": self._size - len(self._row_of),
+            "dimension": self.dimension,
+            "n_lists": len(self._centroids) if self._centroids is not None else 0,
+            "n_probe": self.n_probe,
+            "exact_search": self._centroids is None or len(self._row_of) <= EXACT_SEARCH_MAX_ROWS,
+            "memory_mapped": isinstance(self._vectors, np.memmap),
+        }
+
+
+def _read_current(path: str) -> str:
+    try:
+        with open(os.path.join(path, CURRENT_FILE)) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return ""
+
+
+def _version_number(name: str) -> int:
+    return int(name[1:]) if name[1:].isdigit() else 0
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Iterable[Sequence[Hashable]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = RRF_K,
+) -> List[Tuple[Hashable, float]]:
+    """
+    Merge ranked id lists with reciprocal rank fusion.
+
+    Each list contributes weight / (k + rank) for every id it contains, so
+    ids ranked well by several sources rise to the top without having to
+    compare keyword and vector scores directly.
+
+    Args:
+        ranked_lists: Id lists, best first
+        weights: Weight per list (defaults to 1.0 each)
+        k: Rank offset damping the influence of the top positions
+
+    Returns:
+        List of (id, fused score) tuples, best first
+    """
+    scores: Dict[Hashable, float] = {}
+    for list_index, ranked in enumerate(ranked_lists):
+        weight = weights[list_index] if weights is not None else 1.0
+        seen = set()
+        for rank, item_id in enumerate(ranked, start=1):
+            if item_id in seen:
+                continue
+            seen.add(item_id)
+            scores[item_id] = scores.get(item_id, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
@@ -0,0 +1,309 @@
+"""
+Dense embedding storage and similarity search for Agent Forge.
+
+``EmbeddingMatrix`` keeps a set of embeddings as one contiguous float32
+array, so comparing a query against every stored event is a single
+matrix-vector product instead of a Python loop per event. Matrices saved with
+``save`` reload from their ``.npy`` file memory-mapped, without copying the
+vectors into memory.
+"""
+
+import logging
+import os
+from typing import Any, Hashable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DTYPE = np.float32
+
+# Ids are stored next to the matrix as "<name>.ids.npy"
+IDS_SUFFIX = ".ids.npy"
+
+ArrayLike = Union[np.ndarray, Sequence[float], Sequence[Sequence[float]]]
+
+
+def as_embedding_array(embeddings: ArrayLike, dtype: Any = EMBEDDING_DTYPE) -> np.ndarray:
+    """
+    Convert embeddings to a contiguous floating point array.
+
+    Args:
+        embeddings: One vector or a sequence of vectors
+        dtype: Floating point dtype of the result
+
+    Returns:
+        A C-contiguous array; the input itself when it already qualifies
+
+    Raises:
+        ValueError: If the values are not numeric, are ragged or are not finite
+    """
+    try:
+        array = np.ascontiguousarray(embeddings, dtype=dtype)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Embeddings must be numeric vectors of equal length: {e}") from e
+    if array.ndim not in (1, 2) or array.size == 0:
+        raise ValueError(f"Expected a non-empty vector or matrix, got shape {array.shape}")
+    if not np.isfinite(array).all():
+        raise ValueError("Embeddings contain NaN or infinite values")
+    return array
+
+
+def _is_private_copy(array: np.ndarray, source: ArrayLike) -> bool:
+    """Whether array can be modified in place without touching the caller's source."""
+    if isinstance(source, (list, tuple)):
+        return True  # Converting a sequence always copies
+    # Memmaps, subclasses and views convert to new array objects over the same buffer
+    return not np.shares_memory(array, np.asarray(source))
+
+
+def normalize_rows(matrix: np.ndarray, copy: bool = True) -> np.ndarray:
+    """
+    Scale every row of a matrix (or a single vector) to unit length.
+
+    Zero rows are left as they are.
+
+    Args:
+        matrix: 1-D vector or 2-D matrix of embeddings
+        copy: Return a new array instead of normalizing in place
+
+    Returns:
+        The normalized array
+    """
+    result = np.array(matrix, copy=True) if copy else matrix
+    norms = np.linalg.norm(result, axis=-1, keepdims=True)
+    np.divide(result, norms, out=result, where=norms > 0)
+    return result
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores along the last axis, best first."""
+    if k >= scores.shape[-1]:
+        return np.argsort(-scores, axis=-1, kind="stable")
+    top = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(top, order, axis=-1)
+
+
+def _row_norms(matrix: np.ndarray) -> np.ndarray:
+    # einsum avoids materializing a squared copy of a memory-mapped matrix
+    return np.sqrt(np.einsum("ij,ij->i", matrix, matrix))
+
+
+def _ids_path(path: str) -> str:
+    base = path[: -len(".npy")] if path.endswith(".npy") else path
+    return base + IDS_SUFFIX
+
+
+class EmbeddingMatrix:
+    """
+    A set of embeddings as one contiguous float32 matrix with optional ids.
+
+    Usage:
+        matrix = EmbeddingMatrix.from_embeddings(vectors, ids=event_ids)
+        matches = matrix.top_k(query_embedding, k=10)  # [(event_id, score), ...]
+        matrix.save("events.npy")
+        matrix = EmbeddingMatrix.load("events.npy")  # memory-mapped
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        ids: Optional[Sequence[Hashable]] = None,
+        normalized: bool = False,
+    ):
+        """
+        Wrap an existing array without copying it.
+
+        Args:
+            vectors: 2-D float32 array, one embedding per row
+            ids: Identifier for each row (defaults to the row index)
+            normalized: Whether every non-zero row already has unit length
+        """
+        if vectors.ndim != 2:
+            raise ValueError(f"Expected a 2-D matrix, got shape {vectors.shape}")
+        if ids is not None and len(ids) != len(vectors):
+            raise ValueError(f"Got {len(ids)} ids for {len(vectors)} embeddings")
+        self.vectors = vectors
+        self.ids = list(ids) if ids is not None else None
+        self.normalized = normalized
+        self._norms: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_embeddings(
+        cls,
+        embeddings: ArrayLike,
+        ids: Optional[Sequence[Hashable]] = None,
+        normalize: bool = True,
+    ) -> "EmbeddingMatrix":
+        """
+        Build a matrix from a list of vectors or an existing array.
+
+        Args:
+            embeddings: Sequence of equal-length vectors, or a 2-D array
+            ids: Identifier for each row
+            normalize: Store unit-length rows so searches skip the norm division
+
+        Returns:
+            New EmbeddingMatrix
+        """
+        vectors = as_embedding_array(embeddings)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        if normalize:
+            # as_embedding_array may have returned the caller's own buffer
+            vectors = normalize_rows(vectors, copy=not _is_private_copy(vectors, embeddings))
+        return cls(vectors, ids=ids, normalized=normalize)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, normalized: Optional[bool] = None) -> "EmbeddingMatrix":
+        """
+        Load a matrix saved with ``save`` (or any 2-D float32 ``.npy`` file).
+
+        Args:
+            path: Path of the ``.npy`` file
+            mmap: Memory-map the file read-only instead of reading it into memory
+            normalized: Whether rows have unit length (defaults to checking every row,
+                one sequential read of the file)
+
+        Returns:
+            EmbeddingMatrix backed by the file
+        """
+        vectors = np.load(path, mmap_mode="r" if mmap else None)
+        if vectors.dtype != EMBEDDING_DTYPE or not vectors.flags.c_contiguous:
+            logger.warning(f"{path} is not contiguous float32; loading a converted copy")
+            vectors = np.ascontiguousarray(vectors, dtype=EMBEDDING_DTYPE)
+
+        ids = None
+        ids_path = _ids_path(path)
+        if os.path.exists(ids_path):
+            ids = np.load(ids_path, allow_pickle=False).tolist()
+
+        norms = None
+        if normalized is None:
+            norms = _row_norms(vectors)
+            normalized = bool(np.all((np.abs(norms - 1) < 1e-3) | (norms == 0)))
+        matrix = cls(vectors, ids=ids, normalized=normalized)
+        matrix._norms = norms
+        return matrix
+
+    def save(self, path: str) -> None:
+        """
+        Save the matrix as ``.npy`` (plus ``.ids.npy`` when it has ids).
+
+        Ids are stored as a numpy array, so they must be all strings or all
+        integers.
+        """
+        np.save(path, np.ascontiguousarray(self.vectors, dtype=EMBEDDING_DTYPE))
+        if self.ids is not None:
+            np.save(_ids_path(path), np.asarray(self.ids), allow_pickle=False)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @property
+    def dimension(self) -> int:
+        return self.vectors.shape[1]
+
+    def normalize(self) -> "EmbeddingMatrix":
+        """Unit-length copy of this matrix (self when it already is)."""
+        if self.normalized:
+            return self
+        return EmbeddingMatrix(normalize_rows(self.vectors), ids=self.ids, normalized=True)
+
+    @property
+    def norms(self) -> np.ndarray:
+        """Row norms, computed once"""
+        if self._norms is None:
+            self._norms = _row_norms(self.vectors)
+        return self._norms
+
+    def similarities(self, queries: ArrayLike) -> np.ndarray:
+        """
+        Cosine similarity of one query (or a batch) against every row.
+
+        Args:
+            queries: One vector of length ``dimension``, or a (q, dimension) batch
+
+        Returns:
+            Array of shape (len(self),) for one query, (q, len(self)) for a batch.
+            Rows or queries of zero length score 0.
+        """
+        array = as_embedding_array(queries)
+        if array.shape[-1] != self.dimension:
+            raise ValueError(
+                f"Query dimension {array.shape[-1]} does not match matrix dimension {self.dimension}"
+            )
+        # Normalize in place only when the conversion already made a copy
+        array = normalize_rows(array, copy=not _is_private_copy(array, queries))
+        scores = array @ self.vectors.T
+        if not self.normalized:
+            # Zero rows have a zero dot product and keep it
+            norms = self.norms
+            np.divide(scores, norms, out=scores, where=norms > 0)
+        return scores
+
+    def top_k(self, query: ArrayLike, k: int = 10, min_score: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """
+        Rows most similar to a query.
+
+        Args:
+            query: Query vector
+            k: Maximum number of results
+            min_score: Drop results scoring below this
+
+        Returns:
+            List of (id, cosine similarity) tuples, best first. Ids default to
+            row indices.
+        """
+        return self.top_k_batch([query], k=k, min_score=min_score)[0]
+
+    def top_k_batch(
+        self, queries: ArrayLike, k: int = 10, min_score: Optional[float] = None
+    ) -> List[List[Tuple[Hashable, float]]]:
+        """
+        ``top_k`` for a batch of queries with one matrix product.
+
+        Returns:
+            One result list per query
+        """
+        if len(self) == 0 or k <= 0:
+            return [[] for _ in range(len(queries))]
+        scores = self.similarities(queries)
+        if scores.ndim == 1:
+            scores = scores.reshape(1, -1)
+        indices = _top_k_indices(scores, k)
+
+        results = []
+        for row_scores, row_indices in zip(scores, indices):
+            matches = []
+            for index in row_indices.tolist():
+                score = float(row_scores[index])
+                if min_score is not None and score < min_score:
+                    break
+                matches.append((self.ids[index] if self.ids is not None else index, score))
+            results.append(matches)
+        return results
+
+
+def top_k_similar(
+    query: ArrayLike,
+    embeddings: Union[EmbeddingMatrix, ArrayLike],
+    k: int = 10,
+    ids: Optional[Sequence[Hashable]] = None,
+) -> List[Tuple[Hashable, float]]:
+    """
+    Top-k cosine search of a query against a set of embeddings.
+
+    Args:
+        query: Query vector
+        embeddings: EmbeddingMatrix, 2-D array or list of vectors
+        k: Maximum number of results
+        ids: Identifier for each embedding when not passing an EmbeddingMatrix
+
+    Returns:
+        List of (id, cosine similarity) tuples, best first
+    """
+    if not isinstance(embeddings, EmbeddingMatrix):
+        embeddings = EmbeddingMatrix.from_embeddings(embeddings, ids=ids, normalize=False)
+    return embeddings.top_k(query, k=k)
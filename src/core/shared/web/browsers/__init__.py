@@ -5,6 +5,24 @@ This module provides browser automation clients for web scraping
 and navigation tasks.
 """
 
+from .browser_pool import (
+    BrowserLease,
+    BrowserPool,
+    BrowserPoolExhausted,
+    close_browser_pool,
+    get_browser_pool,
+    release_browser_pool,
+    retain_browser_pool,
+)
 from .steel_browser_client import SteelBrowserClient
 
-__all__ = ['SteelBrowserClient']
\ No newline at end of file
+__all__ = [
+    'SteelBrowserClient',
+    'BrowserPool',
+    'BrowserLease',
+    'BrowserPoolExhausted',
+    'get_browser_pool',
+    'close_browser_pool',
+    'retain_browser_pool',
+    'release_browser_pool',
+]
\ No newline at end of file
@@ -0,0 +1,622 @@
+"""
+Playwright Browser Pool for Agent Forge Framework
+
+This module keeps a fixed set of long-lived Chromium instances warm so that
+agents can borrow a cheap, isolated ``BrowserContext`` per task instead of
+paying for a full browser cold start on every URL.
+
+Browsers are keyed by evasion profile (their launch arguments), checked for
+health before reuse, and recycled after serving a configurable number of pages
+or when the pool exceeds a memory ceiling. When every slot is busy, callers
+wait (back-pressure) until a context is returned.
+
+The Playwright driver and the pool's condition belong to the event loop they
+were created on, so the shared pool is kept per running loop. Agents take a
+reference with ``retain_browser_pool`` and drop it with
+``release_browser_pool``; once the last user leaves, the browsers stay warm
+for ``DEFAULT_IDLE_CLOSE_SECONDS`` (or until the loop shuts down) before the
+pool closes, so agents opened per call still find them running. Servers call
+``close_browser_pool`` on shutdown.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext
+
+logger = logging.getLogger(__name__)
+
+# Default pool sizing
+DEFAULT_MAX_BROWSERS = 4
+DEFAULT_MAX_CONTEXTS_PER_BROWSER = 4
+DEFAULT_MAX_PAGES_PER_BROWSER = 200
+
+# Seconds the shared pool stays open after its last user releases it
+DEFAULT_IDLE_CLOSE_SECONDS = 60.0
+
+BrowserLauncher = Callable[[Dict[str, Any]], Awaitable["Browser"]]
+MemoryProbe = Callable[[], Optional[float]]
+
+
+class BrowserPoolExhausted(asyncio.TimeoutError):
+    """Raised when no browser context becomes available within the acquire timeout."""
+
+
+@dataclass
+class _BrowserSlot:
+    """A long-lived browser and its bookkeeping inside the pool"""
+
+    profile_key: str
+    launch_args: Dict[str, Any]
+    browser: Optional["Browser"] = None
+    launched_at: float = field(default_factory=time.monotonic)
+    pages_served: int = 0
+    active_contexts: int = 0
+    retiring: bool = False
+
+    @property
+    def is_ready(self) -> bool:
+        return self.browser is not None and not self.retiring
+
+    def is_healthy(self) -> bool:
+        """Check whether the underlying browser process is still connected"""
+        if self.browser is None:
+            return False
+        try:
+            return bool(self.browser.is_connected())
+        except Exception:
+            return False
+
+
+@dataclass
+class BrowserLease:
+    """A borrowed browser context; hand it back with ``BrowserPool.release``"""
+
+    context: "BrowserContext"
+    profile_key: str
+    wait_time: float
+    _slot: _BrowserSlot = field(repr=False)
+
+
+def _default_memory_probe() -> Optional[float]:
+    """Return resident memory (MB) of this process's children, if psutil is available"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    try:
+        children = psutil.Process().children(recursive=True)
+    except Exception:
+        return None
+
+    total_bytes = 0
+    for child in children:
+        try:
+            total_bytes += child.memory_info().rss
+        except Exception:
+            continue
+    return total_bytes / (1024 * 1024)
+
+
+def _profile_key(launch_args: Dict[str, Any]) -> str:
+    """Build a stable key for a set of browser launch arguments"""
+    encoded = json.dumps(launch_args, sort_keys=True, default=str).encode()
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+class BrowserPool:
+    """
+    Process-wide pool of warm Playwright browsers.
+
+    Each browser serves up to ``max_contexts_per_browser`` concurrent contexts.
+    Contexts are created per lease from the evasion profile's context arguments
+    and closed on release, so tasks stay isolated while the browser stays warm.
+    """
+
+    def __init__(
+        self,
+        max_browsers: int = DEFAULT_MAX_BROWSERS,
+        max_contexts_per_browser: int = DEFAULT_MAX_CONTEXTS_PER_BROWSER,
+        max_pages_per_browser: int = DEFAULT_MAX_PAGES_PER_BROWSER,
+        max_memory_mb: Optional[float] = None,
+        acquire_timeout: Optional[float] = None,
+        launcher: Optional[BrowserLauncher] = None,
+        memory_probe: Optional[MemoryProbe] = None,
+    ):
+        """
+        Initialize the browser pool.
+
+        Args:
+            max_browsers: Maximum number of live browser processes
+            max_contexts_per_browser: Concurrent contexts allowed per browser
+            max_pages_per_browser: Recycle a browser after serving this many leases
+            max_memory_mb: Recycle browsers while the pool's memory exceeds this ceiling
+            acquire_timeout: Seconds to wait for a free slot (None waits forever)
+            launcher: Optional coroutine that launches a browser from launch args
+            memory_probe: Optional callable returning current browser memory in MB
+        """
+        if max_browsers < 1 or max_contexts_per_browser < 1:
+            raise ValueError("Pool must allow at least one browser and one context")
+
+        self.max_browsers = max_browsers
+        self.max_contexts_per_browser = max_contexts_per_browser
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_memory_mb = max_memory_mb
+        self.acquire_timeout = acquire_timeout
+        self.logger = logging.getLogger(f"{__name__}.BrowserPool")
+
+        self._launcher = launcher or self._launch_with_playwright
+        self._memory_probe = memory_probe or _default_memory_probe
+        self._playwright = None
+        self._slots: List[_BrowserSlot] = []
+        self._condition = asyncio.Condition()
+        self._closed = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._users = 0
+        self._idle_close: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "leases": 0,
+            "launches": 0,
+            "recycles": 0,
+            "unhealthy": 0,
+            "waits": 0,
+            "total_wait_time": 0.0,
+        }
+
+    async def _launch_with_playwright(self, launch_args: Dict[str, Any]) -> "Browser":
+        """Launch a Chromium instance, starting the Playwright driver on first use"""
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(**launch_args)
+
+    def _bind_loop(self) -> None:
+        """Bind to the running loop; a pool left behind by a closed loop starts over."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            if not self._loop.is_closed():
+                raise RuntimeError(
+                    "BrowserPool is in use on another event loop; use get_browser_pool() per loop"
+                )
+            # Closing the old loop killed the driver and its browsers with it
+            self.logger.warning(
+                f"Event loop changed; dropping {len(self._slots)} browser(s) from the closed loop"
+            )
+            self._slots = []
+            self._playwright = None
+            self._condition = asyncio.Condition()
+        self._loop = loop
+
+    def _find_slot(self, profile_key: str) -> Optional[_BrowserSlot]:
+        """
+        Return the least-loaded browser for a profile with spare capacity.
+
+        Browsers still launching count too, so concurrent first acquires
+        share one launch instead of each starting a browser.
+        """
+        candidates = [
+            slot
+            for slot in self._slots
+            if slot.profile_key == profile_key
+            and not slot.retiring
+            and slot.active_contexts < self.max_contexts_per_browser
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda slot: slot.active_contexts)
+
+    def _find_idle_victim(self) -> Optional[_BrowserSlot]:
+        """Return an idle browser that can be closed to make room for another profile"""
+        idle = [
+            slot
+            for slot in self._slots
+            if slot.browser is not None and slot.active_contexts == 0
+        ]
+        if not idle:
+            return None
+        return max(idle, key=lambda slot: slot.pages_served)
+
+    def _detach(self, slot: _BrowserSlot) -> None:
+        """Remove a slot from the pool (caller holds the condition lock)"""
+        slot.retiring = True
+        if slot in self._slots:
+            self._slots.remove(slot)
+
+    async def _close_browser(self, slot: _BrowserSlot) -> None:
+        """Close a detached browser, ignoring errors from already-dead processes"""
+        if slot.browser is None:
+            return
+        try:
+            await slot.browser.close()
+        except Exception as e:
+            self.logger.debug(f"Ignoring error while closing browser: {e}")
+
+    async def acquire(self, evasion_config: Any) -> BrowserLease:
+        """
+        Borrow a fresh browser context for the given evasion profile.
+
+        Args:
+            evasion_config: Object exposing ``browser_args`` and ``context_args``
+
+        Returns:
+            BrowserLease holding the new context
+
+        Raises:
+            BrowserPoolExhausted: If no slot frees up within ``acquire_timeout``
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+        self._bind_loop()
+
+        launch_args = dict(getattr(evasion_config, "browser_args", None) or {})
+        context_args = dict(getattr(evasion_config, "context_args", None) or {})
+        profile_key = _profile_key(launch_args)
+
+        start = time.monotonic()
+        deadline = start + self.acquire_timeout if self.acquire_timeout else None
+        waited = False
+        to_close: List[_BrowserSlot] = []
+        slot: Optional[_BrowserSlot] = None
+        needs_launch = False
+
+        try:
+            async with self._condition:
+                while True:
+                    slot, needs_launch, searched_waited = await self._reserve_slot(
+                        profile_key, launch_args, deadline, to_close
+                    )
+                    waited = waited or searched_waited
+                    if needs_launch or slot.browser is not None:
+                        break
+                    # Another caller is launching this browser; share its launch
+                    waited = True
+                    if await self._wait_for_launch(slot, deadline):
+                        break
+        finally:
+            # Close browsers evicted while searching, even if we gave up waiting
+            for stale in to_close:
+                await self._close_browser(stale)
+
+        try:
+            if needs_launch:
+                self.logger.debug(f"Launching pooled browser for profile {profile_key}")
+                slot.browser = await self._launcher(launch_args)
+                slot.launched_at = time.monotonic()
+                self.stats["launches"] += 1
+                async with self._condition:
+                    # Wake callers waiting on this launch
+                    self._condition.notify_all()
+            context = await slot.browser.new_context(**context_args)
+        except BaseException:
+            async with self._condition:
+                slot.active_contexts -= 1
+                if not slot.is_healthy():
+                    self._detach(slot)
+                # A failed launch wakes the callers waiting on it so they search again
+                self._condition.notify_all()
+                retire_now = slot.retiring and slot.active_contexts == 0
+            if retire_now:
+                await self._close_browser(slot)
+            raise
+
+        wait_time = time.monotonic() - start
+        self.stats["leases"] += 1
+        if waited:
+            self.stats["waits"] += 1
+            self.stats["total_wait_time"] += wait_time
+
+        return BrowserLease(
+            context=context, profile_key=profile_key, wait_time=wait_time, _slot=slot
+        )
+
+    def _exhausted(self) -> BrowserPoolExhausted:
+        return BrowserPoolExhausted(f"No browser context available within {self.acquire_timeout}s")
+
+    async def _reserve_slot(
+        self,
+        profile_key: str,
+        launch_args: Dict[str, Any],
+        deadline: Optional[float],
+        to_close: List[_BrowserSlot],
+    ) -> Tuple[_BrowserSlot, bool, bool]:
+        """
+        Reserve a context on a browser for the profile (caller holds the condition lock).
+
+        Returns:
+            (slot, needs_launch, waited); the caller launches the browser when
+            needs_launch is True
+        """
+        waited = False
+        while True:
+            # Drop idle browsers that died since they were last used
+            for dead in [
+                s
+                for s in self._slots
+                if s.browser is not None and s.active_contexts == 0 and not s.is_healthy()
+            ]:
+                self.stats["unhealthy"] += 1
+                self._detach(dead)
+                to_close.append(dead)
+
+            slot = self._find_slot(profile_key)
+            if slot is not None:
+                slot.active_contexts += 1
+                return slot, False, waited
+
+            if len(self._slots) >= self.max_browsers:
+                victim = self._find_idle_victim()
+                if victim is not None:
+                    self._detach(victim)
+                    to_close.append(victim)
+
+            if len(self._slots) < self.max_browsers:
+                slot = _BrowserSlot(profile_key=profile_key, launch_args=launch_args)
+                slot.active_contexts += 1
+                self._slots.append(slot)
+                return slot, True, waited
+
+            # Every slot is busy: apply back-pressure until a lease is released
+            waited = True
+            await self._wait(deadline)
+
+    async def _wait_for_launch(self, slot: _BrowserSlot, deadline: Optional[float]) -> bool:
+        """
+        Wait for a reserved slot's browser to finish launching (caller holds the lock).
+
+        Returns:
+            True once the browser is up, False if the launch failed and the
+            reservation was dropped so the caller can search again
+        """
+        try:
+            while slot.browser is None and not slot.retiring:
+                await self._wait(deadline)
+        except BaseException:
+            slot.active_contexts -= 1
+            raise
+        if slot.retiring:
+            slot.active_contexts -= 1
+            return False
+        return True
+
+    async def _wait(self, deadline: Optional[float]) -> None:
+        """Wait on the condition until notified or the acquire deadline passes"""
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            raise self._exhausted()
+        try:
+            await asyncio.wait_for(self._condition.wait(), remaining)
+        except asyncio.TimeoutError:
+            raise self._exhausted() from None
+
+    async def release(self, lease: BrowserLease) -> None:
+        """
+        Return a lease to the pool, closing its context and recycling the browser if due.
+
+        Args:
+            lease: The lease obtained from ``acquire``
+        """
+        try:
+            await lease.context.close()
+        except Exception as e:
+            self.logger.debug(f"Ignoring error while closing context: {e}")
+
+        slot = lease._slot
+        retire_now = False
+        async with self._condition:
+            slot.active_contexts -= 1
+            slot.pages_served += 1
+
+            if not slot.retiring:
+                if not slot.is_healthy():
+                    self.stats["unhealthy"] += 1
+                    self._detach(slot)
+                elif slot.pages_served >= self.max_pages_per_browser:
+                    self.stats["recycles"] += 1
+                    self._detach(slot)
+                elif self._over_memory_ceiling():
+                    self.stats["recycles"] += 1
+                    self._detach(slot)
+
+            retire_now = slot.retiring and slot.active_contexts == 0
+            self._condition.notify_all()
+
+        if retire_now:
+            self.logger.debug(
+                f"Recycling browser for profile {slot.profile_key} "
+                f"after {slot.pages_served} pages"
+            )
+            await self._close_browser(slot)
+
+    def _over_memory_ceiling(self) -> bool:
+        """Check the memory probe against the configured ceiling"""
+        if self.max_memory_mb is None:
+            return False
+        used = self._memory_probe()
+        return used is not None and used > self.max_memory_mb
+
+    @asynccontextmanager
+    async def context(self, evasion_config: Any) -> AsyncIterator["BrowserContext"]:
+        """Async context manager that borrows a context and always gives it back"""
+        lease = await self.acquire(evasion_config)
+        try:
+            yield lease.context
+        finally:
+            await self.release(lease)
+
+    async def health_check(self) -> Dict[str, Any]:
+        """
+        Close idle browsers that are no longer connected.
+
+        Returns:
+            Dictionary containing the pool statistics after the check
+        """
+        async with self._condition:
+            dead = [
+                slot
+                for slot in self._slots
+                if slot.browser is not None
+                and slot.active_contexts == 0
+                and not slot.is_healthy()
+            ]
+            for slot in dead:
+                self.stats["unhealthy"] += 1
+                self._detach(slot)
+            self._condition.notify_all()
+
+        for slot in dead:
+            await self._close_browser(slot)
+        return self.get_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool utilisation and lifecycle statistics"""
+        return {
+            **self.stats,
+            "browsers": len(self._slots),
+            "active_contexts": sum(slot.active_contexts for slot in self._slots),
+            "capacity": self.max_browsers * self.max_contexts_per_browser,
+            "average_wait_time": (
+                self.stats["total_wait_time"] / self.stats["waits"]
+                if self.stats["waits"]
+                else 0.0
+            ),
+        }
+
+    async def _close_when_idle(self, delay: float) -> None:
+        """Close the pool after ``delay`` seconds unless a new user retains it first"""
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # A new user cancels the timer; loop shutdown cancels it too, and
+            # then the browsers should still be closed
+            if self._users or self._closed:
+                raise
+        if self._users == 0 and not self._closed:
+            self.logger.debug(f"Closing browser pool after {delay}s idle")
+            await self.close()
+
+    def _cancel_idle_close(self) -> None:
+        task = self._idle_close
+        self._idle_close = None
+        if task is not None and task is not asyncio.current_task() and not task.done():
+            task.cancel()
+
+    async def close(self) -> None:
+        """Close every browser and stop the Playwright driver"""
+        self._cancel_idle_close()
+        if self._loop is not None and self._loop is not asyncio.get_running_loop():
+            # Browsers from another loop cannot be awaited here
+            self._closed = True
+            self._slots = []
+            self._playwright = None
+            return
+
+        async with self._condition:
+            self._closed = True
+            slots = list(self._slots)
+            for slot in slots:
+                self._detach(slot)
+            self._condition.notify_all()
+
+        for slot in slots:
+            await self._close_browser(slot)
+
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            finally:
+                self._playwright = None
+
+
+# Shared pools, one per event loop
+_browser_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BrowserPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_browser_pool(**kwargs: Any) -> BrowserPool:
+    """
+    Get the running event loop's shared browser pool, creating it on first use.
+
+    Args:
+        **kwargs: BrowserPool options, only applied when the pool is created
+
+    Returns:
+        The shared BrowserPool instance for this loop
+
+    Raises:
+        RuntimeError: If called outside a running event loop
+    """
+    loop = asyncio.get_running_loop()
+    pool = _browser_pools.get(loop)
+    if pool is None or pool._closed:
+        pool = BrowserPool(**kwargs)
+        _browser_pools[loop] = pool
+    return pool
+
+
+def retain_browser_pool(**kwargs: Any) -> BrowserPool:
+    """
+    Get the running loop's shared pool and count the caller as a user.
+
+    Pair every call with ``release_browser_pool``.
+    """
+    pool = get_browser_pool(**kwargs)
+    pool._users += 1
+    pool._cancel_idle_close()
+    return pool
+
+
+async def release_browser_pool(
+    pool: BrowserPool, idle_timeout: float = DEFAULT_IDLE_CLOSE_SECONDS
+) -> None:
+    """
+    Drop a ``retain_browser_pool`` reference.
+
+    When the last user leaves, the browsers stay warm for ``idle_timeout``
+    seconds so the next agent skips the cold launch; the pool closes if
+    nobody retains it in that time, or when the event loop shuts down.
+
+    Args:
+        pool: Pool returned by ``retain_browser_pool``
+        idle_timeout: Seconds to keep an unused pool open; 0 closes it now
+    """
+    pool._users = max(0, pool._users - 1)
+    if pool._users or pool._closed:
+        return
+    if idle_timeout <= 0:
+        await pool.close()
+        return
+    pool._cancel_idle_close()
+    pool._idle_close = asyncio.get_running_loop().create_task(
+        pool._close_when_idle(idle_timeout)
+    )
+
+
+async def close_browser_pool() -> None:
+    """Close the running loop's shared browser pool if it was created (e.g. on server shutdown)"""
+    pool = _browser_pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
@@ -3,12 +3,31 @@ Steel Browser Client for Agent Forge Framework
 
 This module provides a client interface to interact with the Steel Browser
 service for web automation and scraping tasks.
+
+Requests share one tuned connection pool (per-host limits, keep-alive and a
+DNS cache), transient failures are retried with jittered exponential backoff,
+and batch helpers fan many URLs out over the pooled connections.
 """
 
 import asyncio
 import logging
+import random
 import aiohttp
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+# Connection pool defaults
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 20
+DEFAULT_KEEPALIVE_TIMEOUT = 30
+DEFAULT_DNS_CACHE_TTL = 300
+
+# Retry defaults
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 10.0
+
+# Batch defaults
+DEFAULT_BATCH_CONCURRENCY = 10
 
 
 class SteelBrowserClient:
@@ -19,18 +38,47 @@ class SteelBrowserClient:
     and perform browser automation tasks through the Steel Browser API.
     """
     
-    def __init__(self, api_url: str, timeout: int = 30):
+    def __init__(
+        self,
+        api_url: str,
+        timeout: int = 30,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int = DEFAULT_DNS_CACHE_TTL,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        batch_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ):
         """
         Initialize the Steel Browser client.
         
         Args:
             api_url: The URL of the Steel Browser service
             timeout: Request timeout in seconds
+            max_connections: Total connections kept in the pool
+            max_connections_per_host: Connections allowed to a single host
+            keepalive_timeout: Seconds an idle connection is kept open
+            dns_cache_ttl: Seconds resolved addresses are cached
+            max_retries: Retries for 5xx responses, timeouts and connection errors
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Upper bound for a single backoff delay
+            batch_concurrency: Default in-flight requests for batch methods
         """
         self.api_url = api_url.rstrip('/')
         self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.batch_concurrency = batch_concurrency
         self.logger = logging.getLogger(f"{__name__}.SteelBrowserClient")
         self.session: Optional[aiohttp.ClientSession] = None
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
         
     async def __aenter__(self):
         """Async context manager entry."""
@@ -42,10 +90,68 @@ class SteelBrowserClient:
         await self.close()
         
     async def _ensure_session(self):
-        """Ensure aiohttp session is created."""
+        """Ensure aiohttp session with a tuned connection pool is created."""
         if self.session is None or self.session.closed:
             timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+                enable_cleanup_closed=True,
+            )
+            self.session = aiohttp.ClientSession(
+                timeout=timeout,
+                connector=connector,
+                headers={"Content-Type": "application/json"},
+            )
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for a retry attempt."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def _post_with_retry(self, endpoint: str, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        """
+        POST a JSON payload, retrying 5xx responses, timeouts and connection errors.
+        
+        Args:
+            endpoint: Path on the Steel Browser service (e.g. "/navigate")
+            payload: JSON request body
+            
+        Returns:
+            Tuple of (HTTP status, parsed JSON on 200 or response text otherwise)
+            
+        Raises:
+            asyncio.TimeoutError or aiohttp.ClientError once retries are exhausted
+        """
+        await self._ensure_session()
+        url = f"{self.api_url}{endpoint}"
+
+        for attempt in range(self.max_retries + 1):
+            self.stats["requests"] += 1
+            try:
+                async with self.session.post(url, json=payload) as response:
+                    if response.status == 200:
+                        return response.status, await response.json()
+                    body = await response.text()
+                    if response.status < 500 or attempt == self.max_retries:
+                        return response.status, body
+                    self.logger.warning(
+                        f"{endpoint} returned {response.status}, retrying ({attempt + 1}/{self.max_retries})"
+                    )
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                if attempt == self.max_retries:
+                    self.stats["failures"] += 1
+                    raise
+                self.logger.warning(
+                    f"{endpoint} failed with {type(e).__name__}, retrying ({attempt + 1}/{self.max_retries})"
+                )
+
+            self.stats["retries"] += 1
+            await asyncio.sleep(self._backoff_delay(attempt))
+
+        raise RuntimeError("unreachable")  # pragma: no cover
             
     async def close(self):
         """Close the HTTP session."""
@@ -63,8 +169,6 @@ class SteelBrowserClient:
         Returns:
             Dictionary containing page information including title
         """
-        await self._ensure_session()
-        
         try:
             self.logger.info(f"Navigating to URL: {url}")
             
@@ -77,24 +181,18 @@ class SteelBrowserClient:
             }
             
             # Make request to Steel Browser service
-            async with self.session.post(
-                f"{self.api_url}/navigate",
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            ) as response:
-                
-                if response.status == 200:
-                    result = await response.json()
-                    self.logger.info(f"Successfully navigated to {url}")
-                    return result
-                else:
-                    error_text = await response.text()
-                    self.logger.error(f"Navigation failed with status {response.status}: {error_text}")
-                    return {
-                        "success": False,
-                        "error": f"HTTP {response.status}: {error_text}",
-                        "page_title": None
-                    }
+            status, result = await self._post_with_retry("/navigate", payload)
+            
+            if status == 200:
+                self.logger.info(f"Successfully navigated to {url}")
+                return result
+            else:
+                self.logger.error(f"Navigation failed with status {status}: {result}")
+                return {
+                    "success": False,
+                    "error": f"HTTP {status}: {result}",
+                    "page_title": None
+                }
                     
         except asyncio.TimeoutError:
             self.logger.error(f"Navigation to {url} timed out")
@@ -122,8 +220,6 @@ class SteelBrowserClient:
         Returns:
             Dictionary containing extracted content
         """
-        await self._ensure_session()
-        
         try:
             self.logger.info(f"Extracting content from URL: {url}")
             
@@ -135,24 +231,24 @@ class SteelBrowserClient:
                 "wait_for": "load"
             }
             
-            async with self.session.post(
-                f"{self.api_url}/extract",
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            ) as response:
-                
-                if response.status == 200:
-                    result = await response.json()
-                    self.logger.info(f"Successfully extracted content from {url}")
-                    return result
-                else:
-                    error_text = await response.text()
-                    self.logger.error(f"Content extraction failed with status {response.status}: {error_text}")
-                    return {
-                        "success": False,
-                        "error": f"HTTP {response.status}: {error_text}"
-                    }
+            status, result = await self._post_with_retry("/extract", payload)
+            
+            if status == 200:
+                self.logger.info(f"Successfully extracted content from {url}")
+                return result
+            else:
+                self.logger.error(f"Content extraction failed with status {status}: {result}")
+                return {
+                    "success": False,
+                    "error": f"HTTP {status}: {result}"
+                }
                     
+        except asyncio.TimeoutError:
+            self.logger.error(f"Content extraction from {url} timed out")
+            return {
+                "success": False,
+                "error": "Request timed out"
+            }
         except Exception as e:
             self.logger.error(f"Content extraction from {url} failed: {e}")
             return {
@@ -160,6 +256,51 @@ class SteelBrowserClient:
                 "error": str(e)
             }
             
+    async def _run_batch(self, urls: List[str], worker, max_concurrency: Optional[int]) -> List[Dict[str, Any]]:
+        """Run a per-URL coroutine over many URLs with bounded concurrency, preserving order."""
+        await self._ensure_session()
+        semaphore = asyncio.Semaphore(max_concurrency or self.batch_concurrency)
+
+        async def run_one(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await worker(url)
+
+        return await asyncio.gather(*(run_one(url) for url in urls))
+
+    async def navigate_many(self, urls: List[str], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Navigate to many URLs concurrently over the pooled connections.
+        
+        Args:
+            urls: The URLs to navigate to
+            max_concurrency: In-flight requests (defaults to batch_concurrency)
+            
+        Returns:
+            List of navigation results in the same order as urls
+        """
+        return await self._run_batch(urls, self.navigate, max_concurrency)
+
+    async def extract_many(
+        self,
+        urls: List[str],
+        selectors: Optional[Dict[str, str]] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract content from many URLs concurrently over the pooled connections.
+        
+        Args:
+            urls: The URLs to extract content from
+            selectors: Optional dictionary of CSS selectors applied to every URL
+            max_concurrency: In-flight requests (defaults to batch_concurrency)
+            
+        Returns:
+            List of extraction results in the same order as urls
+        """
+        return await self._run_batch(
+            urls, lambda url: self.extract_content(url, selectors), max_concurrency
+        )
+
     async def get_page_title(self, url: str) -> Optional[str]:
         """
         Get the page title for a specific URL.
@@ -0,0 +1,635 @@
+"""
+Write-behind persistence for extraction results.
+
+``WriteBehindBuffer`` decouples crawl speed from database latency without
+risking results on a crash:
+
+- ``put`` appends each result to a ``ResultJournal``, an append-only log of
+  segment files on local disk, and returns once the record is durable
+- a background flusher reads the journal in batches and hands them to a
+  sink (e.g. ``bulk_upsert_sink``); the journal offset is checkpointed only
+  after the sink succeeds, and failed batches are retried with backoff
+- a batch is tried at most ``max_attempts`` times; records that still fail,
+  or that the sink rejects outright, move to a dead-letter journal so one
+  bad row cannot stall the buffer (``requeue_dead_letters`` replays them)
+- after a restart, flushing resumes from the last checkpoint, so every
+  journaled result reaches the sink at least once (sinks must be idempotent,
+  which upserts are)
+- when more than ``max_pending`` records are waiting, ``put`` blocks until
+  the flusher catches up, so a slow database slows the crawl instead of
+  growing the journal without bound
+
+Records are msgpack-encoded when the ``msgpack`` package is installed and
+JSON otherwise. Each record carries its length and a CRC32, so a record torn
+by a crash mid-write is detected and dropped when the journal is reopened.
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import random
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+from .postgrest import RETRYABLE_STATUS_CODES, DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+DEFAULT_MAX_PENDING = 10_000
+DEFAULT_RETRY_BASE_SECONDS = 0.5
+DEFAULT_RETRY_MAX_SECONDS = 30.0
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_CLOSE_TIMEOUT_SECONDS = 60.0
+DEAD_LETTER_DIRECTORY = "dead_letter"
+
+MSGPACK_AVAILABLE = importlib.util.find_spec("msgpack") is not None
+
+# Record header: payload length, CRC32 of the payload, codec
+_HEADER = struct.Struct(">IIc")
+_CODEC_MSGPACK = b"M"
+_CODEC_JSON = b"J"
+_SEGMENT_SUFFIX = ".seg"
+_CHECKPOINT_FILE = "checkpoint.json"
+
+# (segment number, byte offset within the segment)
+JournalPosition = Tuple[int, int]
+Sink = Callable[[List[Any]], Awaitable[Any]]
+
+
+def _encode(record: Any) -> Tuple[bytes, bytes]:
+    if MSGPACK_AVAILABLE:
+        import msgpack
+
+        return _CODEC_MSGPACK, msgpack.packb(record, use_bin_type=True)
+    return _CODEC_JSON, json.dumps(record, separators=(",", ":")).encode("utf-8")
+
+
+def _decode(codec: bytes, payload: bytes) -> Any:
+    if codec == _CODEC_MSGPACK:
+        import msgpack
+
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload.decode("utf-8"))
+
+
+class IncompleteWriteError(RuntimeError):
+    """The sink accepted a batch but some records were not persisted"""
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether a sink failure may succeed on retry (connection drops, timeouts, 408/429/5xx)."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    return isinstance(
+        error,
+        (ConnectionError, TimeoutError, asyncio.TimeoutError, OSError, httpx.TransportError, DeadlineExceeded),
+    )
+
+
+def _fsync_directory(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # Not supported on every platform
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ResultJournal:
+    """
+    Append-only, segmented record log with a durable read checkpoint.
+
+    Usage:
+        journal = ResultJournal("/var/lib/agent-forge/journal")
+        journal.append_many(events)
+        records, end = journal.read(max_records=100)
+        journal.commit(end, len(records))  # records before end are never read again
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        fsync: bool = True,
+    ):
+        """
+        Args:
+            directory: Directory holding the segment files and checkpoint
+            segment_bytes: Size after which appends start a new segment
+            fsync: fsync every append (turn off only when losing the last
+                records on power loss is acceptable)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self._lock = threading.Lock()
+
+        self.checkpoint = self._load_checkpoint()
+        segments = self._segments()
+        # Segments before the checkpoint are fully flushed; finish deleting them
+        for segment in segments:
+            if segment < self.checkpoint[0]:
+                self._segment_path(segment).unlink(missing_ok=True)
+        segments = [segment for segment in segments if segment >= self.checkpoint[0]]
+
+        self.pending = 0
+        for segment in segments:
+            start = self.checkpoint[1] if segment == self.checkpoint[0] else 0
+            count, valid_end = self._scan(segment, start)
+            self.pending += count
+            if valid_end < self._segment_path(segment).stat().st_size:
+                logger.warning(
+                    f"Journal segment {segment} has a torn record at byte {valid_end}; truncating"
+                )
+                with open(self._segment_path(segment), "r+b") as f:
+                    f.truncate(valid_end)
+
+        self._write_segment = segments[-1] if segments else self.checkpoint[0]
+        self._file = open(self._segment_path(self._write_segment), "ab")
+        if self.pending:
+            logger.info(f"Journal {self.directory} recovered {self.pending} unflushed records")
+
+    # Files
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"{segment:010d}{_SEGMENT_SUFFIX}"
+
+    def _segments(self) -> List[int]:
+        return sorted(
+            int(path.stem) for path in self.directory.glob(f"*{_SEGMENT_SUFFIX}") if path.stem.isdigit()
+        )
+
+    def _load_checkpoint(self) -> JournalPosition:
+        path = self.directory / _CHECKPOINT_FILE
+        if not path.is_file():
+            return (0, 0)
+        try:
+            data = json.loads(path.read_text())
+            return (int(data["segment"]), int(data["offset"]))
+        except (ValueError, KeyError, TypeError) as e:
+            # Replaying from the start only duplicates sink writes, never loses them
+            logger.error(f"Unreadable journal checkpoint {path}: {e}. Replaying from the first segment.")
+            segments = self._segments()
+            return (segments[0], 0) if segments else (0, 0)
+
+    def _iter_records(self, segment: int, offset: int, max_records: Optional[int] = None):
+        """Yield (record codec, payload, end offset) for valid records from offset."""
+        path = self._segment_path(segment)
+        if not path.is_file():
+            return
+        read = 0
+        with open(path, "rb") as f:
+            f.seek(offset)
+            while max_records is None or read < max_records:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                length, checksum, codec = _HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    return
+                offset += _HEADER.size + length
+                read += 1
+                yield codec, payload, offset
+
+    def _scan(self, segment: int, offset: int) -> Tuple[int, int]:
+        count, end = 0, offset
+        for _, _, end in self._iter_records(segment, offset):
+            count += 1
+        return count, end
+
+    # Writes
+
+    def append(self, record: Any) -> None:
+        """Durably append one record."""
+        self.append_many([record])
+
+    def append_many(self, records: Sequence[Any]) -> None:
+        """Durably append records, with one fsync for the whole call."""
+        if not records:
+            return
+        frames = []
+        for record in records:
+            codec, payload = _encode(record)
+            frames.append(_HEADER.pack(len(payload), zlib.crc32(payload), codec) + payload)
+        with self._lock:
+            if self._file.tell() >= self.segment_bytes:
+                self._roll_segment()
+            self._file.write(b"".join(frames))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.pending += len(records)
+
+    def _roll_segment(self) -> None:
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._write_segment += 1
+        self._file = open(self._segment_path(self._write_segment), "ab")
+        if self.fsync:
+            _fsync_directory(self.directory)
+
+    # Reads
+
+    def read(
+        self, position: Optional[JournalPosition] = None, max_records: int = DEFAULT_BATCH_SIZE
+    ) -> Tuple[List[Any], JournalPosition]:
+        """
+        Read up to max_records records.
+
+        Args:
+            position: Where to start (defaults to the checkpoint)
+            max_records: Maximum records to return
+
+        Returns:
+            The records and the position just after the last one
+        """
+        segment, offset = position or self.checkpoint
+        records: List[Any] = []
+        with self._lock:
+            while len(records) < max_records:
+                for codec, payload, offset in self._iter_records(
+                    segment, offset, max_records - len(records)
+                ):
+                    records.append(_decode(codec, payload))
+                if len(records) >= max_records or segment >= self._write_segment:
+                    break
+                segment, offset = segment + 1, 0
+        return records, (segment, offset)
+
+    def commit(self, position: JournalPosition, records: int) -> None:
+        """
+        Durably record that everything before position has been flushed.
+
+        Args:
+            position: Position returned by read
+            records: Number of records the commit covers
+        """
+        path = self.directory / _CHECKPOINT_FILE
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"segment": position[0], "offset": position[1]}, f)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        if self.fsync:
+            _fsync_directory(self.directory)
+
+        with self._lock:
+            self.checkpoint = position
+            self.pending = max(0, self.pending - records)
+            # Flushed segments are no longer needed
+            for segment in self._segments():
+                if segment < position[0]:
+                    self._segment_path(segment).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pending record count, checkpoint and segment count"""
+        return {
+            "pending": self.pending,
+            "checkpoint_segment": self.checkpoint[0],
+            "checkpoint_offset": self.checkpoint[1],
+            "segments": len(self._segments()),
+            "codec": "msgpack" if MSGPACK_AVAILABLE else "json",
+        }
+
+
+class WriteBehindBuffer:
+    """
+    Journal-backed write-behind queue drained to a sink by a background task.
+
+    Usage:
+        async with WriteBehindBuffer(journal_dir, bulk_upsert_sink("events", "luma_url", to_row)) as buffer:
+            async for event in agent.stream(task):
+                await buffer.put(event)
+        # Leaving the block drains everything journaled to the sink
+    """
+
+    def __init__(
+        self,
+        journal: Union[ResultJournal, str, Path],
+        sink: Sink,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        retry_base: float = DEFAULT_RETRY_BASE_SECONDS,
+        retry_max: float = DEFAULT_RETRY_MAX_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        dead_letter: Union[ResultJournal, str, Path, None] = None,
+    ):
+        """
+        Args:
+            journal: Journal, or directory to open one in
+            sink: Async callable persisting a batch of records; raising leaves
+                the batch in the journal to be retried
+            batch_size: Maximum records per sink call
+            flush_interval: Longest a record waits for a batch to fill
+            max_pending: Unflushed records at which put blocks (back-pressure)
+            retry_base: First retry delay after a failed sink call, doubled per failure
+            retry_max: Longest retry delay
+            max_attempts: Sink calls per batch before its records are dead-lettered
+            dead_letter: Journal, or directory, for records the sink could not
+                persist (defaults to a dead_letter directory inside the journal's)
+        """
+        self.journal = journal if isinstance(journal, ResultJournal) else ResultJournal(journal)
+        if not isinstance(dead_letter, ResultJournal):
+            dead_letter = ResultJournal(
+                dead_letter or self.journal.directory / DEAD_LETTER_DIRECTORY, fsync=self.journal.fsync
+            )
+        self.dead_letter = dead_letter
+        self.sink = sink
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max(self.batch_size, max_pending)
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.max_attempts = max(1, max_attempts)
+
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = False
+        self._flush_requests = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._drained: Optional[asyncio.Condition] = None
+        self._last_error: Optional[str] = None
+
+        self.stats = {
+            "records_written": 0,
+            "records_flushed": 0,
+            "batches_flushed": 0,
+            "sink_failures": 0,
+            "records_dead_lettered": 0,
+            "backpressure_waits": 0,
+        }
+
+    @property
+    def pending(self) -> int:
+        """Records journaled but not yet flushed"""
+        return self.journal.pending
+
+    async def start(self) -> None:
+        """Start the flusher; records recovered from the journal are flushed first."""
+        if self._flusher is not None:
+            return
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Condition()
+        self._flusher = asyncio.create_task(self._flush_loop())
+        if self.pending:
+            self._wakeup.set()
+
+    async def put(self, record: Any) -> None:
+        """Journal one record, waiting first if the flusher is too far behind."""
+        await self.put_many([record])
+
+    async def put_many(self, records: Sequence[Any]) -> None:
+        """Journal records with one fsync, waiting first if the flusher is too far behind."""
+        if not records:
+            return
+        if self._flusher is None:
+            await self.start()
+        if self.pending >= self.max_pending:
+            self.stats["backpressure_waits"] += 1
+            async with self._drained:
+                await self._drained.wait_for(
+                    lambda: self.pending < self.max_pending or self._flusher.done()
+                )
+        if self._flusher.done():
+            raise RuntimeError("Write-behind flusher is not running")
+
+        await asyncio.to_thread(self.journal.append_many, list(records))
+        self.stats["records_written"] += len(records)
+        if self.pending >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until every journaled record has been flushed or dead-lettered.
+
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Raises:
+            asyncio.TimeoutError: If records are still pending after timeout
+        """
+        if self._flusher is None:
+            await self.start()
+        self._flush_requests += 1
+        self._wakeup.set()
+
+        async def drained():
+            async with self._drained:
+                await self._drained.wait_for(lambda: self.pending == 0 or self._flusher.done())
+
+        try:
+            await asyncio.wait_for(drained(), timeout=timeout)
+        finally:
+            self._flush_requests -= 1
+
+    async def close(self, drain: bool = True, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT_SECONDS) -> None:
+        """
+        Stop the flusher.
+
+        Args:
+            drain: Flush everything journaled first; otherwise unflushed
+                records stay in the journal for the next run
+            timeout: Longest to wait for the drain; records still pending
+                then stay in the journal for the next run
+        """
+        if self._flusher is None:
+            self.journal.close()
+            self.dead_letter.close()
+            return
+        if drain:
+            try:
+                await self.flush(timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Write-behind drain timed out after {timeout}s; "
+                    f"{self.pending} records stay journaled for the next run"
+                )
+        self._closing = True
+        self._wakeup.set()
+        self._flusher.cancel()
+        await asyncio.gather(self._flusher, return_exceptions=True)
+        self._flusher = None
+        self.journal.close()
+        self.dead_letter.close()
+
+    async def _flush_loop(self) -> None:
+        try:
+            await self._drain_journal()
+        finally:
+            # Wake put/flush callers so they notice the flusher stopped
+            async with self._drained:
+                self._drained.notify_all()
+
+    async def _drain_journal(self) -> None:
+        failures = 0
+        while not self._closing:
+            # Wait for a full batch, the flush interval or an explicit flush
+            if self.pending == 0 or (self.pending < self.batch_size and not self._flush_requests):
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            if self.pending == 0:
+                continue
+
+            records, end = await asyncio.to_thread(self.journal.read, None, self.batch_size)
+            if not records:
+                await asyncio.sleep(self.flush_interval)
+                continue
+            try:
+                await self.sink(records)
+                flushed = len(records)
+            except Exception as e:
+                failures += 1
+                self.stats["sink_failures"] += 1
+                self._last_error = str(e)
+                if is_transient_error(e) and failures < self.max_attempts:
+                    delay = min(self.retry_max, self.retry_base * (2 ** (failures - 1)))
+                    delay *= random.uniform(0.5, 1.0)
+                    logger.warning(
+                        f"Write-behind sink failed for {len(records)} records ({failures} in a row): {e}. "
+                        f"Retrying in {delay:.2f}s..."
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                flushed = await self._dead_letter(records, e, isolate=not is_transient_error(e))
+
+            failures = 0
+            await asyncio.to_thread(self.journal.commit, end, len(records))
+            self.stats["records_flushed"] += flushed
+            self.stats["batches_flushed"] += 1
+            async with self._drained:
+                self._drained.notify_all()
+
+    async def _dead_letter(self, records: List[Any], error: Exception, isolate: bool) -> int:
+        """
+        Move records the sink could not persist to the dead-letter journal.
+
+        When the sink rejected the batch outright (isolate), each record is
+        retried on its own first so one bad row does not take its batch with it.
+
+        Returns:
+            Number of records that were persisted after all
+        """
+        failed: List[Tuple[Any, Exception]] = [(record, error) for record in records]
+        if isolate and len(records) > 1:
+            failed = []
+            for record in records:
+                try:
+                    await self.sink([record])
+                except Exception as e:
+                    failed.append((record, e))
+        if failed:
+            logger.error(
+                f"Write-behind sink gave up on {len(failed)} of {len(records)} records: {error}. "
+                f"Moved to dead-letter journal {self.dead_letter.directory}"
+            )
+            entries = [
+                {"record": record, "error": f"{type(e).__name__}: {e}", "failed_at": time.time()}
+                for record, e in failed
+            ]
+            await asyncio.to_thread(self.dead_letter.append_many, entries)
+            self.stats["records_dead_lettered"] += len(failed)
+        return len(records) - len(failed)
+
+    async def requeue_dead_letters(self) -> int:
+        """
+        Move dead-lettered records back into the journal to be flushed again.
+
+        Returns:
+            Number of records requeued
+        """
+        requeued = 0
+        while True:
+            entries, end = await asyncio.to_thread(self.dead_letter.read, None, self.batch_size)
+            if not entries:
+                return requeued
+            await self.put_many([entry["record"] for entry in entries])
+            await asyncio.to_thread(self.dead_letter.commit, end, len(entries))
+            requeued += len(entries)
+
+    async def __aenter__(self) -> "WriteBehindBuffer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get write, flush and back-pressure counts plus the journal state"""
+        return {
+            **self.stats,
+            **self.journal.get_stats(),
+            "dead_letter_pending": self.dead_letter.pending,
+            "running": self._flusher is not None and not self._flusher.done(),
+            "last_error": self._last_error,
+        }
+
+
+def bulk_upsert_sink(
+    table_name: str,
+    conflict_column: str = "name",
+    transform: Optional[Callable[[Any], Optional[Dict[str, Any]]]] = None,
+    chunk_size: Optional[int] = None,
+    db: Any = None,
+) -> Sink:
+    """
+    Build a sink that upserts each batch with database.bulk_upsert.
+
+    Args:
+        table_name: Target table
+        conflict_column: Unique column identifying existing rows
+        transform: Maps a journaled record to a row (None skips the record)
+        chunk_size: Rows per upsert request (defaults to bulk_upsert's)
+        db: Async PostgREST client (defaults to the shared one)
+
+    Returns:
+        Async sink raising IncompleteWriteError when any row came back without
+        an ID, so the batch's records are retried one by one and the failing
+        ones dead-lettered
+    """
+    from .database.utils import DEFAULT_UPSERT_CHUNK_SIZE, bulk_upsert
+
+    async def sink(records: List[Any]) -> None:
+        rows = [transform(record) if transform else record for record in records]
+        rows = [row for row in rows if row and row.get(conflict_column)]
+        if not rows:
+            return
+        ids = await bulk_upsert(
+            table_name,
+            rows,
+            conflict_column,
+            chunk_size=chunk_size or DEFAULT_UPSERT_CHUNK_SIZE,
+            db=db,
+        )
+        missing = {row[conflict_column] for row in rows} - set(ids)
+        if missing:
+            raise IncompleteWriteError(f"{len(missing)} of {len(rows)} rows were not upserted into {table_name}")
+
+    return sink
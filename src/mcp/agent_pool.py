@@ -0,0 +1,514 @@
+"""
+Agent Instance Pool for the Agent Forge MCP Servers
+
+Entering an agent's async context (browser client, HTTP sessions, evasion
+manager) is far more expensive than the work most MCP tool calls do. This
+module keeps already-entered agent instances per agent class and leases them
+to tool handlers, re-targeting each instance with the call's parameters via a
+reset hook instead of constructing a new agent per call.
+
+An agent class opts into reuse by defining ``reset_for_lease(**params)``,
+which must leave the instance exactly as ``__init__(**params)`` would while
+keeping its entered resources. Instances of classes without the hook are
+never re-targeted or parked: each lease gets a fresh instance, closed as soon
+as it is returned.
+
+Pools are bounded (callers wait when every instance is busy), can be warmed up
+ahead of traffic, reap instances that sit idle for too long, and report hit
+rate and lease wait time.
+"""
+
+import asyncio
+import inspect
+import logging
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Type
+
+logger = logging.getLogger(__name__)
+
+# Default pool sizing
+DEFAULT_MAX_SIZE = 4
+DEFAULT_MIN_SIZE = 0
+DEFAULT_IDLE_TIMEOUT = 300.0
+DEFAULT_REAP_INTERVAL = 30.0
+
+AgentFactory = Callable[..., Any]
+ResetHook = Callable[[Any, Dict[str, Any]], Any]
+
+# Per-class method restoring an instance to its constructor state for new parameters
+RESET_HOOK_METHOD = "reset_for_lease"
+
+
+class AgentPoolExhausted(asyncio.TimeoutError):
+    """Raised when no agent instance becomes available within the acquire timeout."""
+
+
+class AgentResetError(Exception):
+    """Raised by a reset hook when a pooled instance cannot take the new parameters."""
+
+
+def apply_parameters(agent: Any, params: Dict[str, Any]) -> Any:
+    """
+    Default reset hook: call the agent's ``reset_for_lease`` with the new parameters.
+
+    Overwriting only the attributes passed in would let state from an earlier
+    lease leak into this one, so agents without the hook are not reused.
+
+    Returns:
+        The hook's result (awaited by the pool if it is awaitable)
+
+    Raises:
+        AgentResetError: If the agent class defines no reset hook
+    """
+    hook = getattr(agent, RESET_HOOK_METHOD, None)
+    if hook is None:
+        raise AgentResetError(f"{type(agent).__name__} defines no {RESET_HOOK_METHOD} hook")
+    return hook(**params)
+
+
+@dataclass
+class _PooledAgent:
+    """An entered agent instance and its bookkeeping inside the pool"""
+
+    agent: Any
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    leases: int = 0
+
+
+class AgentPool:
+    """
+    Bounded pool of entered instances of a single agent class.
+
+    Usage:
+        pool = AgentPool(SimpleNavigationAgent, max_size=4)
+        async with pool.lease(url="https://example.com") as agent:
+            result = await agent.run()
+    """
+
+    def __init__(
+        self,
+        agent_class: Type[Any],
+        max_size: int = DEFAULT_MAX_SIZE,
+        min_size: int = DEFAULT_MIN_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        acquire_timeout: Optional[float] = None,
+        factory: Optional[AgentFactory] = None,
+        reset: Optional[ResetHook] = None,
+        warmup_params: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            agent_class: Agent class whose instances are pooled
+            max_size: Maximum instances alive at once (idle plus leased)
+            min_size: Instances kept warm; idle reaping never goes below this
+            idle_timeout: Seconds an idle instance is kept before being closed
+            acquire_timeout: Seconds to wait for a free instance (None waits forever)
+            factory: Builds a new instance from call parameters (defaults to agent_class)
+            reset: Sync or async hook returning a reused instance to its
+                constructor state for new parameters; raising discards the
+                instance (defaults to ``apply_parameters``)
+            warmup_params: Constructor parameters used for warmup instances
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size > max_size:
+            raise ValueError("min_size cannot exceed max_size")
+
+        self.agent_class = agent_class
+        self.max_size = max_size
+        self.min_size = min_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.factory = factory or agent_class
+        self.reset = reset or apply_parameters
+        self.warmup_params = warmup_params or {}
+        # Without a hook a parked instance could only be destroyed on its next lease
+        self.reusable = reset is not None or getattr(agent_class, RESET_HOOK_METHOD, None) is not None
+
+        self._idle: List[_PooledAgent] = []
+        self._size = 0
+        self._condition = asyncio.Condition()
+        self._closed = False
+
+        self.stats = {
+            "leases": 0,
+            "hits": 0,
+            "misses": 0,
+            "created": 0,
+            "destroyed": 0,
+            "reaped": 0,
+            "reset_failures": 0,
+            "waits": 0,
+            "total_wait_time": 0.0,
+            "max_wait_time": 0.0,
+        }
+
+    @property
+    def name(self) -> str:
+        return self.agent_class.__name__
+
+    async def _create(self, params: Dict[str, Any]) -> _PooledAgent:
+        """Construct and enter a new agent instance."""
+        agent = self.factory(**params)
+        entered = await agent.__aenter__()
+        self.stats["created"] += 1
+        logger.debug(f"Created pooled {self.name} instance")
+        return _PooledAgent(agent=entered if entered is not None else agent)
+
+    async def _destroy(self, pooled: _PooledAgent, exc_info: tuple = (None, None, None)) -> None:
+        """Exit an agent's async context, ignoring cleanup errors."""
+        try:
+            await pooled.agent.__aexit__(*exc_info)
+        except Exception as e:
+            logger.warning(f"Error closing pooled {self.name} instance: {e}")
+        self.stats["destroyed"] += 1
+
+    async def _apply_reset(self, pooled: _PooledAgent, params: Dict[str, Any]) -> bool:
+        """Run the reset hook; False means the instance must be discarded."""
+        try:
+            result = self.reset(pooled.agent, params)
+            if inspect.isawaitable(result):
+                await result
+            return True
+        except Exception as e:
+            self.stats["reset_failures"] += 1
+            logger.debug(f"Reset of pooled {self.name} failed, discarding instance: {e}")
+            return False
+
+    async def warmup(self, count: Optional[int] = None) -> int:
+        """
+        Pre-create idle instances ahead of traffic.
+
+        Args:
+            count: Target number of idle instances (defaults to min_size)
+
+        Returns:
+            Number of instances created (always 0 for non-reusable classes)
+        """
+        if not self.reusable:
+            return 0
+        target = min(self.max_size, self.min_size if count is None else count)
+        created = 0
+        while not self._closed:
+            async with self._condition:
+                if len(self._idle) >= target or self._size >= self.max_size:
+                    break
+                self._size += 1
+            try:
+                pooled = await self._create(self.warmup_params)
+            except Exception:
+                async with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+            async with self._condition:
+                self._idle.append(pooled)
+                self._condition.notify()
+            created += 1
+
+        if created:
+            logger.info(f"Warmed up {created} {self.name} instance(s)")
+        return created
+
+    async def _acquire(self, params: Dict[str, Any]) -> _PooledAgent:
+        """Take an idle instance or reserve capacity for a new one, waiting if full."""
+        wait_started = time.monotonic()
+        waited = False
+        deadline = None if self.acquire_timeout is None else wait_started + self.acquire_timeout
+
+        async with self._condition:
+            while not self._idle and self._size >= self.max_size:
+                if self._closed:
+                    raise RuntimeError(f"{self.name} pool is closed")
+                waited = True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise AgentPoolExhausted(
+                        f"No {self.name} instance available within {self.acquire_timeout}s"
+                    )
+                try:
+                    await asyncio.wait_for(self._condition.wait(), remaining)
+                except asyncio.TimeoutError:
+                    continue
+
+            if self._closed:
+                raise RuntimeError(f"{self.name} pool is closed")
+
+            # Most recently used first keeps the warm set small so idle ones reap
+            pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                self._size += 1
+
+        self._record_wait(time.monotonic() - wait_started, waited)
+
+        if pooled is None:
+            try:
+                pooled = await self._create(params)
+            except Exception:
+                async with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+            self.stats["misses"] += 1
+            return pooled
+
+        if await self._apply_reset(pooled, params):
+            self.stats["hits"] += 1
+            return pooled
+
+        # Instance could not be re-targeted: replace it with a fresh one
+        await self._destroy(pooled)
+        try:
+            fresh = await self._create(params)
+        except Exception:
+            async with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        self.stats["misses"] += 1
+        return fresh
+
+    def _record_wait(self, wait_time: float, waited: bool) -> None:
+        self.stats["leases"] += 1
+        if waited:
+            self.stats["waits"] += 1
+        self.stats["total_wait_time"] += wait_time
+        self.stats["max_wait_time"] = max(self.stats["max_wait_time"], wait_time)
+
+    async def _release(self, pooled: _PooledAgent, exc_info: tuple) -> None:
+        """Return an instance to the pool, or destroy it if its call failed or it cannot be reused."""
+        pooled.leases += 1
+        pooled.last_used = time.monotonic()
+
+        if exc_info[0] is not None or self._closed or not self.reusable:
+            # A failed run may have left the agent in an unknown state
+            await self._destroy(pooled, exc_info)
+            async with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            return
+
+        async with self._condition:
+            self._idle.append(pooled)
+            self._condition.notify()
+
+    @asynccontextmanager
+    async def lease(self, **params: Any) -> AsyncIterator[Any]:
+        """
+        Borrow an entered agent re-targeted with the given parameters.
+
+        Args:
+            **params: Constructor parameters for this call
+
+        Yields:
+            The agent instance, already inside its async context
+        """
+        pooled = await self._acquire(params)
+        try:
+            yield pooled.agent
+        except BaseException as e:
+            await self._release(pooled, (type(e), e, e.__traceback__))
+            raise
+        else:
+            await self._release(pooled, (None, None, None))
+
+    async def reap_idle(self) -> int:
+        """
+        Close instances idle for longer than idle_timeout, keeping min_size warm.
+
+        Returns:
+            Number of instances reaped
+        """
+        now = time.monotonic()
+        expired: List[_PooledAgent] = []
+        async with self._condition:
+            keep: List[_PooledAgent] = []
+            # Oldest first so the most recently used survive
+            for pooled in sorted(self._idle, key=lambda p: p.last_used):
+                if (
+                    now - pooled.last_used > self.idle_timeout
+                    and self._size - len(expired) > self.min_size
+                ):
+                    expired.append(pooled)
+                else:
+                    keep.append(pooled)
+            self._idle = keep
+            self._size -= len(expired)
+            if expired:
+                self._condition.notify(len(expired))
+
+        for pooled in expired:
+            await self._destroy(pooled)
+        self.stats["reaped"] += len(expired)
+        if expired:
+            logger.info(f"Reaped {len(expired)} idle {self.name} instance(s)")
+        return len(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool utilization, hit rate and wait time statistics"""
+        leases = self.stats["leases"]
+        return {
+            **self.stats,
+            "agent_class": self.name,
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": self._size - len(self._idle),
+            "max_size": self.max_size,
+            "hit_rate": self.stats["hits"] / leases if leases else 0.0,
+            "avg_wait_ms": (self.stats["total_wait_time"] / leases * 1000) if leases else 0.0,
+            "max_wait_ms": self.stats["max_wait_time"] * 1000,
+        }
+
+    async def close(self) -> None:
+        """Close idle instances; leased ones are closed when they are returned."""
+        async with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for pooled in idle:
+            await self._destroy(pooled)
+
+
+class AgentPoolManager:
+    """
+    One AgentPool per agent class, created on first use.
+
+    Also runs a background task that periodically reaps idle instances.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        min_size: int = DEFAULT_MIN_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        acquire_timeout: Optional[float] = None,
+        reap_interval: float = DEFAULT_REAP_INTERVAL,
+    ):
+        """
+        Initialize the manager with defaults applied to every new pool.
+
+        Args:
+            max_size: Default maximum instances per agent class
+            min_size: Default warm instances per agent class
+            idle_timeout: Default idle lifetime in seconds
+            acquire_timeout: Default lease wait timeout in seconds
+            reap_interval: Seconds between background idle reaping passes
+        """
+        self.defaults = {
+            "max_size": max_size,
+            "min_size": min_size,
+            "idle_timeout": idle_timeout,
+            "acquire_timeout": acquire_timeout,
+        }
+        self.reap_interval = reap_interval
+        self._overrides: Dict[Type[Any], Dict[str, Any]] = {}
+        self._pools: Dict[Type[Any], AgentPool] = {}
+        self._reaper: Optional[asyncio.Task] = None
+
+    def configure(self, agent_class: Type[Any], **pool_kwargs: Any) -> None:
+        """
+        Set per-class pool options (max_size, factory, reset, warmup_params, ...).
+
+        Must be called before the class's pool is first used.
+        """
+        if agent_class in self._pools:
+            raise RuntimeError(f"Pool for {agent_class.__name__} already created")
+        self._overrides[agent_class] = pool_kwargs
+
+    def get_pool(self, agent_class: Type[Any]) -> AgentPool:
+        """Get (or create) the pool for an agent class."""
+        pool = self._pools.get(agent_class)
+        if pool is None:
+            options = {**self.defaults, **self._overrides.get(agent_class, {})}
+            pool = AgentPool(agent_class, **options)
+            self._pools[agent_class] = pool
+        return pool
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.get_running_loop().create_task(self._reap_forever())
+
+    async def _reap_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            for pool in list(self._pools.values()):
+                try:
+                    await pool.reap_idle()
+                except Exception as e:
+                    logger.warning(f"Idle reaping failed for {pool.name}: {e}")
+
+    @asynccontextmanager
+    async def lease(self, agent_class: Type[Any], **params: Any) -> AsyncIterator[Any]:
+        """Borrow an entered instance of agent_class re-targeted with params."""
+        self._ensure_reaper()
+        async with self.get_pool(agent_class).lease(**params) as agent:
+            yield agent
+
+    async def warmup(self, *agent_classes: Type[Any]) -> Dict[str, int]:
+        """Warm up the given classes (or every configured class) to their min_size."""
+        classes = agent_classes or tuple(self._overrides)
+        created = {}
+        for agent_class in classes:
+            try:
+                created[agent_class.__name__] = await self.get_pool(agent_class).warmup()
+            except Exception as e:
+                logger.warning(f"Warmup failed for {agent_class.__name__}: {e}")
+                created[agent_class.__name__] = 0
+        return created
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-class pool statistics plus an overall hit rate"""
+        pools = {pool.name: pool.get_stats() for pool in self._pools.values()}
+        leases = sum(s["leases"] for s in pools.values())
+        hits = sum(s["hits"] for s in pools.values())
+        return {
+            "pools": pools,
+            "total_leases": leases,
+            "hit_rate": hits / leases if leases else 0.0,
+        }
+
+    async def close(self) -> None:
+        """Stop the reaper and close every pool."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+        for pool in self._pools.values():
+            await pool.close()
+        self._pools.clear()
+
+
+def server_lifespan(manager: AgentPoolManager) -> Callable[[Any], Any]:
+    """
+    FastMCP lifespan closing pooled agents and then the shared browser pool on shutdown.
+
+    Args:
+        manager: The server's agent pools
+
+    Returns:
+        Lifespan factory to pass as ``FastMCP(..., lifespan=...)``
+    """
+
+    @asynccontextmanager
+    async def lifespan(server: Any) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            yield {}
+        finally:
+            await manager.close()
+            # Loaded only once an agent used it; importing it here would pull in Playwright
+            browser_pool = sys.modules.get("core.shared.web.browsers.browser_pool")
+            if browser_pool is not None:
+                await browser_pool.close_browser_pool()
+
+    return lifespan
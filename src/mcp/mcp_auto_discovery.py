@@ -6,100 +6,107 @@ Automatically discovers Agent Forge agents and creates MCP tools for them.
 This module can be imported to extend the main MCP server with dynamic agent discovery.
 """
 
-import inspect
-import importlib
-import pkgutil
+import ast
+import importlib.util
 from pathlib import Path
-from typing import Dict, Any, List, Type, Callable
+from typing import Dict, Any, List, Optional, Type, Callable
 import logging
 
 from core.agents.base import AsyncContextAgent
+from core.shared.agent_index import AgentEntry, AgentIndex, LazyAgentMap, normalize_agent_name
 
 logger = logging.getLogger(__name__)
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Annotation strings from the discovery manifest mapped to tool parameter types
+_ANNOTATION_TYPES = {
+    "str": str, "int": int, "float": float, "bool": bool,
+    "dict": dict, "Dict": dict, "list": list, "List": list,
+}
+
+
+def _package_directory(package: str) -> Path:
+    """Locate a package directory without importing it."""
+    try:
+        spec = importlib.util.find_spec(package)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is not None and spec.submodule_search_locations:
+        return Path(list(spec.submodule_search_locations)[0])
+    return PROJECT_ROOT.joinpath(*package.split('.'))
+
+
 class AgentDiscovery:
     """Auto-discovery system for Agent Forge agents."""
     
-    def __init__(self, search_paths: List[str] = None):
+    def __init__(self, search_paths: List[str] = None, manifest_path: Optional[Path] = None):
         """
         Initialize the agent discovery system.
         
+        Agents are found by static scanning backed by a persistent manifest;
+        their modules are only imported when a class is first looked up.
+        
         Args:
             search_paths: List of paths to search for agents. Defaults to examples/ and custom agent directories.
+            manifest_path: Discovery manifest location (defaults to the user cache)
         """
         self.search_paths = search_paths or [
             "examples",
             "custom_agents",  # For user-defined agents
         ]
-        self.discovered_agents: Dict[str, Type[AsyncContextAgent]] = {}
+        self.index = AgentIndex(
+            {path: _package_directory(path) for path in self.search_paths},
+            root_classes=[f"{AsyncContextAgent.__module__}.{AsyncContextAgent.__name__}"],
+            manifest_path=manifest_path,
+        )
+        self.discovered_agents: LazyAgentMap = self.index.as_mapping()
         
-    def discover_agents(self) -> Dict[str, Type[AsyncContextAgent]]:
+    def discover_agents(self, refresh: bool = False) -> LazyAgentMap:
         """
         Discover all available Agent Forge agents.
         
+        Args:
+            refresh: Re-check agent files for changes instead of using the in-memory index
+        
         Returns:
-            Dictionary mapping agent names to agent classes
+            Mapping of agent names to agent classes, imported lazily on lookup
         """
-        logger.info("Starting agent discovery...")
-        
-        for search_path in self.search_paths:
-            try:
-                self._discover_agents_in_path(search_path)
-            except Exception as e:
-                logger.warning(f"Failed to discover agents in {search_path}: {e}")
-                
-        logger.info(f"Discovered {len(self.discovered_agents)} agents: {list(self.discovered_agents.keys())}")
+        if refresh:
+            self.index.refresh()
+        logger.debug(f"Discovered {len(self.discovered_agents)} agents: {list(self.discovered_agents.keys())}")
         return self.discovered_agents
     
-    def _discover_agents_in_path(self, search_path: str) -> None:
-        """Discover agents in a specific path."""
-        try:
-            # Import the module/package
-            module = importlib.import_module(search_path)
-            
-            # If it's a package, iterate through submodules
-            if hasattr(module, '__path__'):
-                for importer, modname, ispkg in pkgutil.iter_modules(module.__path__, module.__name__ + "."):
-                    try:
-                        submodule = importlib.import_module(modname)
-                        self._extract_agents_from_module(submodule)
-                    except Exception as e:
-                        logger.debug(f"Failed to import {modname}: {e}")
-            else:
-                self._extract_agents_from_module(module)
-                
-        except ImportError as e:
-            logger.debug(f"Could not import {search_path}: {e}")
-    
-    def _extract_agents_from_module(self, module) -> None:
-        """Extract agent classes from a module."""
-        for name, obj in inspect.getmembers(module):
-            if (inspect.isclass(obj) and 
-                issubclass(obj, AsyncContextAgent) and 
-                obj is not AsyncContextAgent and
-                not name.startswith('_')):
-                
-                agent_name = self._normalize_agent_name(name)
-                self.discovered_agents[agent_name] = obj
-                logger.debug(f"Discovered agent: {agent_name} ({name})")
+    def get_agent_entry(self, agent_name: str) -> Optional[AgentEntry]:
+        """Get indexed metadata for an agent without importing it."""
+        return self.index.get(agent_name)
     
     def _normalize_agent_name(self, class_name: str) -> str:
         """Normalize agent class name to a friendly name."""
-        # Remove 'Agent' suffix and convert to snake_case
-        name = class_name
-        if name.endswith('Agent'):
-            name = name[:-5]
-        
-        # Convert CamelCase to snake_case
-        import re
-        name = re.sub('([a-z0-9])([A-Z])', r'\1_\2', name).lower()
-        return name
+        return normalize_agent_name(class_name)
+
+
+_discovery: Optional[AgentDiscovery] = None
+
+
+def get_agent_discovery() -> AgentDiscovery:
+    """Get the process-wide AgentDiscovery instance."""
+    global _discovery
+    if _discovery is None:
+        _discovery = AgentDiscovery()
+    return _discovery
 
 class MCPToolGenerator:
     """Generate MCP tools from discovered agents."""
     
-    def __init__(self):
-        self.discovery = AgentDiscovery()
+    def __init__(self, agent_pools=None):
+        """
+        Args:
+            agent_pools: Optional AgentPoolManager; generated tools lease pooled
+                agents from it instead of constructing one per call
+        """
+        self.discovery = get_agent_discovery()
+        self.agent_pools = agent_pools
     
     def generate_tools_for_agents(self) -> List[Callable]:
         """
@@ -108,39 +115,45 @@ class MCPToolGenerator:
         Returns:
             List of MCP tool functions that can be registered with FastMCP
         """
-        agents = self.discovery.discover_agents()
+        self.discovery.discover_agents()
         tools = []
         
-        for agent_name, agent_class in agents.items():
-            tool_func = self._create_tool_function(agent_name, agent_class)
+        for agent_name, entry in self.discovery.index.entries.items():
+            tool_func = self._create_tool_function(agent_name, entry)
             tools.append(tool_func)
             
         return tools
     
-    def _create_tool_function(self, agent_name: str, agent_class: Type[AsyncContextAgent]) -> Callable:
+    def _create_tool_function(self, agent_name: str, entry: AgentEntry) -> Callable:
         """Create an MCP tool function for a specific agent."""
         
-        # Extract agent metadata
-        agent_doc = agent_class.__doc__ or f"Execute {agent_name} agent"
-        agent_signature = self._extract_agent_signature(agent_class)
+        # Extract agent metadata from the index; the module is imported on first call
+        agent_doc = entry.docstring or f"Execute {agent_name} agent"
+        agent_signature = self._extract_agent_signature(entry)
         
         async def agent_tool(**kwargs) -> Dict[str, Any]:
             """Dynamically generated agent tool function."""
             try:
                 logger.info(f"Executing {agent_name} with params: {kwargs}")
+                agent_class = self.discovery.index.load(agent_name)
                 
-                # Create agent instance with provided parameters
-                agent_instance = agent_class(**kwargs)
-                
-                # Execute agent
-                async with agent_instance as agent:
-                    result = await agent.run()
+                if self.agent_pools is not None:
+                    # Lease a pooled agent re-targeted with the provided parameters
+                    async with self.agent_pools.lease(agent_class, **kwargs) as agent:
+                        result = await agent.run()
+                else:
+                    # Create agent instance with provided parameters
+                    agent_instance = agent_class(**kwargs)
+                    
+                    # Execute agent
+                    async with agent_instance as agent:
+                        result = await agent.run()
                 
                 return {
                     "success": True,
                     "result": result,
                     "agent": agent_name,
-                    "agent_class": agent_class.__name__,
+                    "agent_class": entry.class_name,
                     "parameters": kwargs
                 }
                 
@@ -150,7 +163,7 @@ class MCPToolGenerator:
                     "success": False,
                     "error": str(e),
                     "agent": agent_name,
-                    "agent_class": agent_class.__name__,
+                    "agent_class": entry.class_name,
                     "parameters": kwargs
                 }
         
@@ -161,42 +174,41 @@ class MCPToolGenerator:
         
         return agent_tool
     
-    def _extract_agent_signature(self, agent_class: Type[AsyncContextAgent]) -> Dict[str, Any]:
-        """Extract the function signature for an agent's __init__ method."""
-        try:
-            init_signature = inspect.signature(agent_class.__init__)
-            annotations = {}
-            
-            for param_name, param in init_signature.parameters.items():
-                if param_name in ['self', 'args', 'kwargs']:
-                    continue
-                    
-                # Extract type annotation
-                annotation = param.annotation if param.annotation != inspect.Parameter.empty else str
-                
-                # Extract default value
-                if param.default != inspect.Parameter.empty:
-                    annotation = type(param.default)
-                
-                annotations[param_name] = annotation
-            
-            # Add return type
-            annotations['return'] = Dict[str, Any]
+    def _extract_agent_signature(self, entry: AgentEntry) -> Dict[str, Any]:
+        """Build tool annotations from an agent's indexed __init__ parameters."""
+        annotations = {}
+        
+        for param in entry.init_params:
+            if param.name in ['self', 'args', 'kwargs']:
+                continue
             
-            return annotations
+            annotation = str
+            if param.annotation:
+                # Optional[int] -> int, Dict[str, Any] -> dict
+                base = param.annotation.replace("Optional[", "").split("[")[0].strip("] ")
+                annotation = _ANNOTATION_TYPES.get(base, str)
+            if param.has_default and param.default not in (None, "None"):
+                try:
+                    annotation = type(ast.literal_eval(param.default))
+                except (ValueError, SyntaxError):
+                    pass
             
-        except Exception as e:
-            logger.debug(f"Could not extract signature for {agent_class.__name__}: {e}")
-            return {'return': Dict[str, Any]}
+            annotations[param.name] = annotation
+        
+        # Add return type
+        annotations['return'] = Dict[str, Any]
+        
+        return annotations
 
-def register_discovered_agents_with_mcp(mcp_server):
+def register_discovered_agents_with_mcp(mcp_server, agent_pools=None):
     """
     Register all discovered agents with an existing FastMCP server.
     
     Args:
         mcp_server: FastMCP server instance to register tools with
+        agent_pools: Optional AgentPoolManager the generated tools lease agents from
     """
-    generator = MCPToolGenerator()
+    generator = MCPToolGenerator(agent_pools=agent_pools)
     tools = generator.generate_tools_for_agents()
     
     for tool_func in tools:
@@ -215,13 +227,13 @@ if __name__ == "__main__":
     agents = discovery.discover_agents()
     
     print(f"\nDiscovered {len(agents)} agents:")
-    for name, agent_class in agents.items():
-        print(f"  - {name}: {agent_class.__name__}")
-        print(f"    Doc: {agent_class.__doc__}")
+    for name, entry in discovery.index.entries.items():
+        print(f"  - {name}: {entry.class_name} ({entry.module})")
+        print(f"    Doc: {entry.docstring}")
         
         # Show agent signature
         generator = MCPToolGenerator()
-        signature = generator._extract_agent_signature(agent_class)
+        signature = generator._extract_agent_signature(entry)
         print(f"    Signature: {signature}")
         print()
     
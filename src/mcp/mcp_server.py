@@ -7,12 +7,22 @@ for Claude Desktop and other MCP clients.
 
 This server includes only open source community agents.
 Premium agents are available in Professional and Enterprise tiers.
+
+Run it as a script (``python mcp_server.py``, as the Claude Desktop config
+does) or as a module from the repository root (``python -m src.mcp.mcp_server``).
 """
 
+import time
+
+_server_import_started = time.perf_counter()
+
 import asyncio
+import importlib
 import json
 import logging
-from typing import Dict, Any, Optional, List
+import os
+import sys
+from typing import Dict, Any, Optional, List, Type
 from pathlib import Path
 
 try:
@@ -21,19 +31,53 @@ except ImportError:
     print("FastMCP not installed. Install with: pip install fastmcp")
     exit(1)
 
-# Import Agent Forge community tier components only
-from examples.simple_navigation_agent import SimpleNavigationAgent
-from examples.text_extraction_agent import EnhancedTextExtractionAgent
-from examples.validation_agent import EnhancedValidationAgent
-from examples.page_scraper_agent import PageScraperAgent
-from examples.documentation_manager_agent import DocumentationManagerAgent
+# Pooled agent instances shared across tool calls
+if __package__:
+    from .agent_pool import AgentPoolManager, server_lifespan
+else:
+    # Run as a script: sibling modules are importable from this directory
+    sys.path.insert(0, str(Path(__file__).parent))
+    from agent_pool import AgentPoolManager, server_lifespan
+
+# Agent Forge community tier components only. Agent modules pull in Playwright,
+# BeautifulSoup, aiohttp and the AI stack, so each one is imported the first
+# time its tool is called rather than at server startup.
+COMMUNITY_AGENTS = {
+    "SimpleNavigationAgent": "examples.simple_navigation_agent",
+    "EnhancedTextExtractionAgent": "examples.text_extraction_agent",
+    "EnhancedValidationAgent": "examples.validation_agent",
+    "PageScraperAgent": "examples.page_scraper_agent",
+    "DocumentationManagerAgent": "examples.documentation_manager_agent",
+}
+
+_agent_classes: Dict[str, Type] = {}
+_agent_import_times: Dict[str, float] = {}
+
+
+def load_agent_class(agent_name: str) -> Type:
+    """Import a community agent's module on first use and return its class."""
+    agent_class = _agent_classes.get(agent_name)
+    if agent_class is None:
+        start_time = time.perf_counter()
+        module = importlib.import_module(COMMUNITY_AGENTS[agent_name])
+        agent_class = getattr(module, agent_name)
+        _agent_import_times[agent_name] = time.perf_counter() - start_time
+        _agent_classes[agent_name] = agent_class
+        logger.info(f"Loaded {agent_name} in {_agent_import_times[agent_name]:.2f}s")
+    return agent_class
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create MCP server
-mcp = FastMCP("Agent Forge Community")
+# Agents are leased from per-class pools instead of being built and torn down per call
+agent_pools = AgentPoolManager(
+    max_size=int(os.getenv('AGENT_POOL_MAX_SIZE', '4')),
+    idle_timeout=float(os.getenv('AGENT_POOL_IDLE_TIMEOUT', '300')),
+)
+
+# Create MCP server; pooled agents and browsers are closed on shutdown
+mcp = FastMCP("Agent Forge Community", lifespan=server_lifespan(agent_pools))
 
 @mcp.tool()
 async def navigate_website(
@@ -55,7 +99,8 @@ async def navigate_website(
     try:
         logger.info(f"Navigating to website: {url}")
         
-        async with SimpleNavigationAgent(
+        async with agent_pools.lease(
+            load_agent_class("SimpleNavigationAgent"),
             url=url,
             extraction_target=extraction_target,
             timeout=timeout
@@ -101,7 +146,8 @@ async def extract_text_content(
     try:
         logger.info(f"Extracting text content from: {url}")
         
-        async with EnhancedTextExtractionAgent(
+        async with agent_pools.lease(
+            load_agent_class("EnhancedTextExtractionAgent"),
             url=url,
             content_type=content_type,
             clean_text=clean_text,
@@ -150,7 +196,8 @@ async def validate_page_quality(
         if validation_criteria is None:
             validation_criteria = ["accessibility", "performance", "content"]
         
-        async with EnhancedValidationAgent(
+        async with agent_pools.lease(
+            load_agent_class("EnhancedValidationAgent"),
             url=url,
             validation_criteria=validation_criteria,
             timeout=timeout
@@ -197,7 +244,8 @@ async def scrape_page_content(
     try:
         logger.info(f"Scraping page content from: {url}")
         
-        async with PageScraperAgent(
+        async with agent_pools.lease(
+            load_agent_class("PageScraperAgent"),
             url=url,
             content_selectors=content_selectors,
             wait_for=wait_for,
@@ -245,7 +293,8 @@ async def manage_documentation(
     try:
         logger.info(f"Managing documentation: {action}")
         
-        async with DocumentationManagerAgent(
+        async with agent_pools.lease(
+            load_agent_class("DocumentationManagerAgent"),
             action=action,
             target_path=target_path,
             content=content,
@@ -317,18 +366,55 @@ async def server_health_check() -> Dict[str, Any]:
         "status": "healthy",
         "server": "Agent Forge Community MCP Server",
         "version": "1.0.0",
-        "available_agents": [
-            "SimpleNavigationAgent",
-            "EnhancedTextExtractionAgent", 
-            "EnhancedValidationAgent",
-            "PageScraperAgent",
-            "DocumentationManagerAgent"
-        ],
-        "total_tools": 7,
+        "available_agents": list(COMMUNITY_AGENTS),
+        "loaded_agents": list(_agent_classes),
+        "total_tools": 8,
+        "agent_pools": agent_pools.get_stats(),
         "tier": "Community (Open Source)",
         "upgrade_info": "Premium agents available in paid tiers"
     }
 
+@mcp.tool()
+async def startup_import_report(top_n: int = 20) -> Dict[str, Any]:
+    """
+    Profile MCP server cold start with `python -X importtime` in a fresh interpreter.
+    
+    Args:
+        top_n: Number of slowest imports to list (default: 20)
+    
+    Returns:
+        Dictionary containing startup time, slowest imports, heavy modules
+        loaded at startup and first-call import times of agents loaded so far
+    """
+    if __package__:
+        from .startup_profile import profile_imports
+    else:
+        from startup_profile import profile_imports
+    
+    server_dir = Path(__file__).parent
+    module = f"{__package__}.mcp_server" if __package__ else "mcp_server"
+    try:
+        report = await asyncio.to_thread(
+            profile_imports,
+            module,
+            [str(server_dir), str(server_dir.parent), str(server_dir.parent.parent)],
+            top_n,
+        )
+    except Exception as e:
+        logger.error(f"Startup import profiling failed: {str(e)}")
+        return {"success": False, "error": str(e)}
+    
+    return {
+        "success": report["success"],
+        "startup_report": report,
+        "in_process_import_seconds": round(SERVER_IMPORT_SECONDS, 3),
+        "agent_first_call_import_seconds": {
+            name: round(seconds, 3) for name, seconds in _agent_import_times.items()
+        },
+    }
+
+SERVER_IMPORT_SECONDS = time.perf_counter() - _server_import_started
+
 if __name__ == "__main__":
     print("🚀 Starting Agent Forge Community MCP Server...")
     print("📋 Available Community Agents:")
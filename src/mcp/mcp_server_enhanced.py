@@ -25,7 +25,8 @@ except ImportError:
     exit(1)
 
 # Import auto-discovery system
-from mcp_auto_discovery import register_discovered_agents_with_mcp
+from mcp_auto_discovery import get_agent_discovery, register_discovered_agents_with_mcp
+from agent_pool import AgentPoolManager, server_lifespan
 
 # Configure logging
 logging.basicConfig(
@@ -34,8 +35,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create enhanced MCP server
-mcp = FastMCP("Agent Forge Enhanced")
+# Agents are leased from per-class pools instead of being built and torn down per call
+agent_pools = AgentPoolManager(
+    max_size=int(os.getenv('AGENT_POOL_MAX_SIZE', '4')),
+    idle_timeout=float(os.getenv('AGENT_POOL_IDLE_TIMEOUT', '300')),
+)
+
+# Create enhanced MCP server; pooled agents and browsers are closed on shutdown
+mcp = FastMCP("Agent Forge Enhanced", lifespan=server_lifespan(agent_pools))
 
 # Core manually-defined tools (these are guaranteed to work)
 @mcp.tool()
@@ -95,9 +102,7 @@ async def get_agent_forge_status() -> Dict[str, Any]:
             pass
         
         # Auto-discovery status
-        from mcp_auto_discovery import AgentDiscovery
-        discovery = AgentDiscovery()
-        discovered_agents = discovery.discover_agents()
+        discovered_agents = get_agent_discovery().discover_agents()
         
         return {
             "success": True,
@@ -109,7 +114,8 @@ async def get_agent_forge_status() -> Dict[str, Any]:
                 "examples_available": examples_available,
                 "total_discovered_agents": len(discovered_agents),
                 "example_agents": example_agents,
-                "discovered_agents": list(discovered_agents.keys())
+                "discovered_agents": list(discovered_agents.keys()),
+                "agent_pools": agent_pools.get_stats()
             },
             "blockchain_integration": blockchain_status,
             "environment": {
@@ -154,10 +160,8 @@ async def execute_agent_by_name(
     try:
         logger.info(f"Executing agent '{agent_name}' with parameters: {parameters}")
         
-        # Get discovered agents
-        from mcp_auto_discovery import AgentDiscovery
-        discovery = AgentDiscovery()
-        agents = discovery.discover_agents()
+        # Look up the agent in the cached discovery index
+        agents = get_agent_discovery().discover_agents()
         
         if agent_name not in agents:
             available_agents = list(agents.keys())
@@ -171,10 +175,8 @@ async def execute_agent_by_name(
         agent_class = agents[agent_name]
         params = parameters or {}
         
-        # Create and execute agent
-        agent_instance = agent_class(**params)
-        
-        async with agent_instance as agent:
+        # Lease a pooled agent and execute
+        async with agent_pools.lease(agent_class, **params) as agent:
             result = await agent.run()
         
         return {
@@ -183,7 +185,8 @@ async def execute_agent_by_name(
             "agent": agent_name,
             "agent_class": agent_class.__name__,
             "parameters": params,
-            "execution_method": "dynamic_discovery"
+            "execution_method": "dynamic_discovery",
+            "pool": agent_pools.get_pool(agent_class).get_stats()
         }
         
     except Exception as e:
@@ -240,9 +243,7 @@ async def test_agent_forge_installation() -> Dict[str, Any]:
         
         # Test 3: Auto-discovery
         try:
-            from mcp_auto_discovery import AgentDiscovery
-            discovery = AgentDiscovery()
-            discovered = discovery.discover_agents()
+            discovered = get_agent_discovery().discover_agents(refresh=True)
             test_results["tests"]["auto_discovery"] = {
                 "status": "pass", 
                 "message": f"Auto-discovery found {len(discovered)} agents",
@@ -305,7 +306,7 @@ async def test_agent_forge_installation() -> Dict[str, Any]:
 # Register auto-discovered agents
 try:
     logger.info("Registering auto-discovered agents...")
-    register_discovered_agents_with_mcp(mcp)
+    register_discovered_agents_with_mcp(mcp, agent_pools=agent_pools)
     logger.info("Auto-discovered agents registered successfully")
 except Exception as e:
     logger.warning(f"Failed to register auto-discovered agents: {e}")
@@ -0,0 +1,113 @@
+"""
+Import-time profiling for the Agent Forge MCP servers
+
+Runs a fresh interpreter with ``-X importtime`` to import a module and parses
+the per-module timings it reports, so cold-start cost can be inspected from an
+MCP tool or the performance validator without re-running by hand.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Modules that should never be imported at server startup
+HEAVY_MODULES = ("playwright", "bs4", "aiohttp", "examples")
+
+
+@dataclass
+class ImportTiming:
+    """One line of ``-X importtime`` output (microseconds)"""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """
+    Parse ``-X importtime`` stderr output.
+
+    Args:
+        output: Text written to stderr by ``python -X importtime``
+
+    Returns:
+        List of ImportTiming objects in the order they were reported
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            # Header line
+            continue
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        timings.append(ImportTiming(stripped, self_us, cumulative_us, max(depth, 0)))
+    return timings
+
+
+def profile_imports(
+    module: str,
+    search_paths: Optional[List[str]] = None,
+    top_n: int = 20,
+    timeout: float = 60.0,
+) -> Dict[str, Any]:
+    """
+    Import a module in a fresh interpreter under ``-X importtime``.
+
+    Args:
+        module: Module to import (e.g. "mcp_server")
+        search_paths: Directories prepended to PYTHONPATH for the child process
+        top_n: Number of slowest imports to report
+        timeout: Seconds before the child process is killed
+
+    Returns:
+        Dictionary with wall time, total import time, the slowest modules by
+        cumulative and self time, and which heavy modules were loaded
+    """
+    env = dict(os.environ)
+    if search_paths:
+        env["PYTHONPATH"] = os.pathsep.join(
+            [str(Path(p)) for p in search_paths] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+        )
+
+    start_time = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=timeout,
+    )
+    wall_time = time.perf_counter() - start_time
+
+    timings = parse_importtime(completed.stderr)
+    top_level = [t for t in timings if t.depth == 0]
+    loaded = {t.module for t in timings}
+    heavy_loaded = sorted(
+        m for m in loaded if m.split(".")[0] in HEAVY_MODULES
+    )
+
+    return {
+        "module": module,
+        "success": completed.returncode == 0,
+        "error": completed.stderr.strip().splitlines()[-1] if completed.returncode != 0 and completed.stderr.strip() else None,
+        "wall_time_seconds": round(wall_time, 3),
+        "total_import_seconds": round(sum(t.cumulative_us for t in top_level) / 1_000_000, 3),
+        "modules_imported": len(timings),
+        "slowest_cumulative": [asdict(t) for t in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top_n]],
+        "slowest_self": [asdict(t) for t in sorted(timings, key=lambda t: t.self_us, reverse=True)[:top_n]],
+        "heavy_modules_loaded": heavy_loaded,
+    }
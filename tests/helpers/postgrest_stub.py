@@ -0,0 +1,250 @@
+"""
+Local stand-in for Supabase's PostgREST API.
+
+Serves /rest/v1/{table} reads, inserts and upserts and the
+keyword_search_events RPC from in-memory tables, with configurable latency
+and injected failures, so the database layer can be tested and benchmarked
+without a Supabase instance.
+"""
+
+import asyncio
+import contextlib
+import fnmatch
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+# Columns that identify a row for duplicate detection on plain inserts
+DEFAULT_PRIMARY_KEYS = {
+    "event_speakers": ("event_id", "speaker_id"),
+    "event_organizations": ("event_id", "organization_id"),
+}
+
+
+def _coerce(value: str, like: Any) -> Any:
+    if isinstance(like, bool):
+        return value.lower() == "true"
+    if isinstance(like, int):
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    if isinstance(like, float):
+        return float(value)
+    return value
+
+
+def _matches(row: Dict[str, Any], column: str, expression: str) -> bool:
+    operator, _, value = expression.partition(".")
+    actual = row.get(column)
+    if operator == "is":
+        return actual is None if value == "null" else str(actual).lower() == value
+    if actual is None:
+        return False
+    if operator == "in":
+        options = [option.strip('"') for option in value.strip("()").split(",")]
+        return actual in [_coerce(option, actual) for option in options]
+    if operator in ("like", "ilike"):
+        pattern = value.replace("*", "%").replace("%", "*")
+        if operator == "ilike":
+            return fnmatch.fnmatchcase(str(actual).lower(), pattern.lower())
+        return fnmatch.fnmatchcase(str(actual), pattern)
+    expected = _coerce(value, actual)
+    comparisons = {
+        "eq": lambda: actual == expected,
+        "neq": lambda: actual != expected,
+        "gt": lambda: actual > expected,
+        "gte": lambda: actual >= expected,
+        "lt": lambda: actual < expected,
+        "lte": lambda: actual <= expected,
+    }
+    return comparisons[operator]()
+
+
+class PostgrestStub:
+    """In-process aiohttp server mimicking the PostgREST endpoints the database layer uses."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        fail_first: int = 0,
+        fail_status: int = 503,
+        primary_keys: Optional[Dict[str, Tuple[str, ...]]] = None,
+    ):
+        """
+        Args:
+            latency: Seconds each request sleeps before answering
+            fail_first: Number of initial requests answered with fail_status
+            fail_status: HTTP status used for injected failures
+            primary_keys: Table -> columns treated as its primary key (default "id")
+        """
+        self.latency = latency
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.primary_keys = {**DEFAULT_PRIMARY_KEYS, **(primary_keys or {})}
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.requests = 0
+        self.request_log: List[Tuple[str, str, int]] = []
+        self.peers = set()
+        self._next_id: Dict[str, int] = {}
+        # (table, columns) -> key -> row, built on first lookup
+        self._indexes: Dict[Tuple[str, Tuple[str, ...]], Dict[Tuple, Dict[str, Any]]] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+
+    # Data
+
+    def seed(self, table: str, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add rows directly, assigning ids where missing."""
+        return [self._add_row(table, dict(row)) for row in rows]
+
+    def _add_row(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        if "id" not in row and table not in self.primary_keys:
+            self._next_id[table] = self._next_id.get(table, 0) + 1
+            row["id"] = self._next_id[table]
+        self.tables.setdefault(table, []).append(row)
+        for (indexed_table, columns), index in self._indexes.items():
+            if indexed_table == table:
+                index.setdefault(tuple(row.get(column) for column in columns), row)
+        return row
+
+    def _find(self, table: str, columns: Sequence[str], row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        columns = tuple(columns)
+        index = self._indexes.get((table, columns))
+        if index is None:
+            index = self._indexes[(table, columns)] = {}
+            for existing in self.tables.get(table, []):
+                index.setdefault(tuple(existing.get(column) for column in columns), existing)
+        return index.get(tuple(row.get(column) for column in columns))
+
+    # Handlers
+
+    async def _maybe_fail(self, request: web.Request) -> Optional[web.Response]:
+        self.requests += 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.requests <= self.fail_first:
+            return web.json_response({"message": "unavailable"}, status=self.fail_status)
+        return None
+
+    async def _select(self, request: web.Request) -> web.Response:
+        failure = await self._maybe_fail(request)
+        if failure is not None:
+            return failure
+        table = request.match_info["table"]
+        rows = list(self.tables.get(table, []))
+        params = request.query
+        for column, expression in params.items():
+            if column not in ("select", "order", "limit", "offset"):
+                rows = [row for row in rows if _matches(row, column, expression)]
+        if "order" in params:
+            column, _, direction = params["order"].partition(".")
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=direction == "desc")
+        if "limit" in params:
+            rows = rows[: int(params["limit"])]
+        columns = params.get("select", "*")
+        if columns != "*":
+            names = columns.split(",")
+            rows = [{name: row.get(name) for name in names} for row in rows]
+        self.request_log.append(("GET", table, len(rows)))
+        return web.json_response(rows)
+
+    async def _write(self, request: web.Request) -> web.Response:
+        failure = await self._maybe_fail(request)
+        if failure is not None:
+            return failure
+        table = request.match_info["table"]
+        body = await request.json()
+        rows = body if isinstance(body, list) else [body]
+        prefer = request.headers.get("Prefer", "")
+        on_conflict = request.query.get("on_conflict")
+        self.request_log.append(("POST", table, len(rows)))
+
+        written = []
+        if on_conflict and "resolution=merge-duplicates" in prefer:
+            columns = on_conflict.split(",")
+            for row in rows:
+                existing = self._find(table, columns, row)
+                if existing is not None:
+                    existing.update(row)
+                    written.append(existing)
+                else:
+                    written.append(self._add_row(table, dict(row)))
+        else:
+            columns = on_conflict.split(",") if on_conflict else self.primary_keys.get(table, ("id",))
+            duplicates = [row for row in rows if all(c in row for c in columns) and self._find(table, columns, row)]
+            if duplicates and "resolution=ignore-duplicates" not in prefer:
+                return web.json_response(
+                    {"code": "23505", "message": f"duplicate key value violates unique constraint on {table}"},
+                    status=409,
+                )
+            for row in rows:
+                if all(c in row for c in columns) and self._find(table, columns, row):
+                    continue
+                written.append(self._add_row(table, dict(row)))
+
+        if "return=representation" in prefer:
+            return web.json_response(written, status=201)
+        return web.Response(status=201)
+
+    async def _rpc(self, request: web.Request) -> web.Response:
+        failure = await self._maybe_fail(request)
+        if failure is not None:
+            return failure
+        function = request.match_info["function"]
+        params = await request.json()
+        self.request_log.append(("RPC", function, 1))
+        if function != "keyword_search_events":
+            return web.json_response({"message": f"function {function} not found"}, status=404)
+        keyword = params.get("keyword", "").lower()
+        matches = [
+            row for row in self.tables.get("events", [])
+            if keyword in (row.get("name") or "").lower() or keyword in (row.get("description") or "").lower()
+        ]
+        return web.json_response(matches[: params.get("result_limit", 10)])
+
+    # Lifecycle
+
+    async def start(self) -> str:
+        """Start listening on an ephemeral localhost port and return the Supabase-style base URL."""
+        app = web.Application()
+        app.router.add_post("/rest/v1/rpc/{function}", self._rpc)
+        app.router.add_get("/rest/v1/{table}", self._select)
+        app.router.add_post("/rest/v1/{table}", self._write)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "PostgrestStub":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    @contextlib.contextmanager
+    def serve_in_thread(self) -> Iterator["PostgrestStub"]:
+        """Run the server on its own event loop thread, for testing synchronous callers."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        asyncio.run_coroutine_threadsafe(self.start(), loop).result()
+        try:
+            yield self
+        finally:
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
@@ -0,0 +1,91 @@
+"""
+Local stand-in for the Steel Browser service.
+
+Serves /navigate, /extract and /health with configurable latency and
+injected failures so SteelBrowserClient can be tested and benchmarked
+without a real browser backend.
+"""
+
+import asyncio
+from typing import Optional
+
+from aiohttp import web
+
+
+class SteelBrowserStub:
+    """In-process aiohttp server mimicking the Steel Browser API."""
+
+    def __init__(self, latency: float = 0.0, fail_first: int = 0, fail_status: int = 503):
+        """
+        Args:
+            latency: Seconds each request sleeps before answering
+            fail_first: Number of initial requests answered with fail_status
+            fail_status: HTTP status used for injected failures
+        """
+        self.latency = latency
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.requests = 0
+        self.peers = set()
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+
+    async def _maybe_fail(self, request: web.Request) -> Optional[web.Response]:
+        self.requests += 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.requests <= self.fail_first:
+            return web.Response(status=self.fail_status, text="unavailable")
+        return None
+
+    async def _navigate(self, request: web.Request) -> web.Response:
+        failure = await self._maybe_fail(request)
+        if failure is not None:
+            return failure
+        payload = await request.json()
+        return web.json_response({
+            "success": True,
+            "url": payload["url"],
+            "page_title": f"Title of {payload['url']}",
+        })
+
+    async def _extract(self, request: web.Request) -> web.Response:
+        failure = await self._maybe_fail(request)
+        if failure is not None:
+            return failure
+        payload = await request.json()
+        return web.json_response({
+            "success": True,
+            "url": payload["url"],
+            "content": {name: f"{name}-value" for name in payload.get("selectors", {})},
+        })
+
+    async def _health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    async def start(self) -> str:
+        """Start listening on an ephemeral localhost port and return the base URL."""
+        app = web.Application()
+        app.router.add_post("/navigate", self._navigate)
+        app.router.add_post("/extract", self._extract)
+        app.router.add_get("/health", self._health)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "SteelBrowserStub":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
@@ -0,0 +1,79 @@
+"""
+Reference copy of URLNormalizer.normalize_url before the fast canonicalizer.
+
+Used by the property test and benchmarks to check the fast path produces
+identical output.
+"""
+
+import logging
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+logger = logging.getLogger(__name__)
+
+
+def reference_normalize_url(url: str) -> str:
+    """
+    Normalize URL by removing tracking parameters and standardizing format
+    """
+    if not url or not isinstance(url, str):
+        return ""
+
+    try:
+        # Parse the URL
+        parsed = urlparse(url.strip())
+
+        # Normalize scheme
+        scheme = parsed.scheme.lower() if parsed.scheme else "https"
+
+        # Normalize netloc (domain)
+        netloc = parsed.netloc.lower()
+
+        # Remove common tracking parameters
+        tracking_params = {
+            "utm_source",
+            "utm_medium",
+            "utm_campaign",
+            "utm_term",
+            "utm_content",
+            "fbclid",
+            "gclid",
+            "ref",
+            "source",
+            "medium",
+            "campaign",
+            "_ga",
+            "_gl",
+            "mc_cid",
+            "mc_eid",
+            "hsCtaTracking",
+        }
+
+        # Parse and filter query parameters
+        query_params = parse_qs(parsed.query, keep_blank_values=False)
+        filtered_params = {
+            k: v
+            for k, v in query_params.items()
+            if k.lower() not in tracking_params
+        }
+
+        # Rebuild query string
+        query = urlencode(filtered_params, doseq=True) if filtered_params else ""
+
+        # Normalize path (remove trailing slash unless it's root)
+        path = parsed.path
+        if path != "/" and path.endswith("/"):
+            path = path.rstrip("/")
+
+        # Remove fragment (hash)
+        fragment = ""
+
+        # Rebuild URL
+        normalized = urlunparse(
+            (scheme, netloc, path, parsed.params, query, fragment)
+        )
+
+        return normalized
+
+    except Exception as e:
+        logger.warning(f"Failed to normalize URL {url}: {e}")
+        return url
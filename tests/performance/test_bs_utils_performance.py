@@ -0,0 +1,139 @@
+"""
+Benchmarks for page text and image extraction on captured pages.
+Compares one lxml parse shared by text and images against the previous
+pipeline: html.parser for images, plus a soup copy-by-reparse and one
+find_all pass per removed tag type for text.
+
+Pages are real captures in tests/fixtures/pages/*.html, e.g. the
+``html_content`` PageScraperAgent.run_async returns for an event listing,
+plus a generated listing of the same shape (cards with images, inline
+background URLs, scripts, styles and SVG icons) so the benchmarks always
+have a large page to run on. Timings are recorded as test properties
+(--junitxml) rather than asserted, so results do not depend on the machine
+running them.
+"""
+
+import pytest
+import re
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from core.shared import bs_utils
+from core.shared.bs_utils import ALWAYS_REMOVE_TAGS, HTMLDocument, extract_visible_text
+
+ROUNDS = 3
+GENERATED_EVENTS = 400
+FIXTURE_DIR = Path(__file__).resolve().parent.parent / "fixtures" / "pages"
+GENERATED_PAGE = "generated_listing"
+PAGES = sorted(FIXTURE_DIR.glob("*.html")) + [GENERATED_PAGE]
+BASE_URL = "https://lu.ma/discover"
+
+
+def generated_listing(events=GENERATED_EVENTS):
+    """An event listing page shaped like a captured discovery page"""
+    icon = '<svg viewBox="0 0 16 16"><path d="M8 0a8 8 0 1 0 0 16A8 8 0 0 0 8 0z"/></svg>'
+    cards = [
+        f"""<div class="event-card" style="background-image: url('/covers/{i}-bg.webp')">
+  <a href="/e/evt-{i}"><img src="/covers/{i}.jpg" data-src="/covers/{i}@2x.jpg" alt="Event {i}"></a>
+  <div class="meta">{icon}<span class="date">Oct {i % 28 + 1}, 2026 &middot; 18:00</span></div>
+  <h3>Builders Night #{i}</h3>
+  <p>Talks, demos and networking for people building on-chain apps. Session {i} of the series.</p>
+  <script type="application/ld+json">{{"@type": "Event", "name": "Builders Night #{i}"}}</script>
+  <noscript><img src="/pixel/{i}.gif"></noscript>
+</div>"""
+        for i in range(events)
+    ]
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Discover Events</title>'
+        '<meta property="og:image" content="/og/discover.png">'
+        "<style>" + ".event-card{display:flex}" * 200 + "</style>"
+        "<script>" + "window.__DATA__ = {};" * 500 + "</script>"
+        '</head><body><nav><a href="/">Home</a><a href="/discover">Discover</a></nav>'
+        '<main class="listing">' + "\n".join(cards) + "</main>"
+        "<footer><p>&copy; 2026</p></footer></body></html>"
+    )
+
+
+def load_page(page):
+    if page == GENERATED_PAGE:
+        return generated_listing()
+    return page.read_text(encoding="utf-8", errors="replace")
+
+
+def legacy_pipeline(html, base_url):
+    """Text and images the way they were extracted before HTMLDocument"""
+    # Text: parse, copy by re-parsing, decompose per tag type, get_text
+    soup = BeautifulSoup(html, "lxml")
+    copy = BeautifulSoup(str(soup), "lxml")
+    for tag_name in ALWAYS_REMOVE_TAGS:
+        for el in copy.find_all(tag_name):
+            el.decompose()
+    text = copy.get_text(separator=" ", strip=True)
+
+    # Images: a second, independent html.parser parse
+    images = BeautifulSoup(html, "html.parser")
+    sources = [t.get("content") for t in images.find_all("meta", property="og:image")]
+    for img in images.find_all("img"):
+        sources.extend(filter(None, [img.get("data-src"), img.get("srcset"), img.get("src")]))
+    for tag in images.find_all(style=True):
+        sources.extend(re.findall(r"url\(['\"]?([^'\"]+)['\"]?\)", tag["style"]))
+    return text, sources
+
+
+def legacy_text(soup):
+    copy = BeautifulSoup(str(soup), "lxml")
+    for tag_name in ALWAYS_REMOVE_TAGS:
+        for el in copy.find_all(tag_name):
+            el.decompose()
+    return copy.get_text(separator=" ", strip=True)
+
+
+def shared_document(html, base_url):
+    document = HTMLDocument(html, base_url=base_url)
+    return extract_visible_text(document), document.image_urls()
+
+
+def best_time_ms(func, *args):
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return round(min(timings) * 1000, 2)
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda page: getattr(page, "stem", page))
+class TestBsUtilsPerformance:
+    """Parse-once extraction benchmarks."""
+
+    @pytest.mark.performance
+    def test_shared_document_parses_once(self, page, monkeypatch, record_property):
+        html = load_page(page)
+        parses = []
+        parse_html = bs_utils._parse_html
+        monkeypatch.setattr(bs_utils, "_parse_html", lambda markup: parses.append(1) or parse_html(markup))
+
+        text, images = shared_document(html, BASE_URL)
+
+        assert len(parses) == 1
+        # Same results as extracting text and images from separate parses
+        assert text == extract_visible_text(html)
+        assert images == HTMLDocument(html, base_url=BASE_URL).image_urls()
+
+        record_property("page_bytes", len(html))
+        record_property("legacy_ms", best_time_ms(legacy_pipeline, html, BASE_URL))
+        record_property("shared_ms", best_time_ms(shared_document, html, BASE_URL))
+
+    @pytest.mark.performance
+    def test_soup_input_is_walked_in_place(self, page, monkeypatch, record_property):
+        soup = BeautifulSoup(load_page(page), "lxml")
+        markup = str(soup)
+        monkeypatch.setattr(bs_utils, "_parse_html", lambda html: pytest.fail("soup input was reparsed"))
+
+        assert extract_visible_text(soup) == legacy_text(soup)
+        assert str(soup) == markup
+
+        record_property("legacy_ms", best_time_ms(legacy_text, soup))
+        record_property("in_place_ms", best_time_ms(extract_visible_text, soup))
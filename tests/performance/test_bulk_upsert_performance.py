@@ -0,0 +1,69 @@
+"""
+Throughput benchmarks for the batched upsert pipeline.
+Compares rows/sec of bulk_persist plus chunked link inserts against
+one upsert_row call per entity and one insert per link.
+"""
+
+import pytest
+import time
+
+from core.shared.database.utils import bulk_persist, insert_rows, upsert_row
+from core.shared.postgrest import AsyncPostgrestClient
+from tests.helpers.postgrest_stub import PostgrestStub
+
+NUM_EVENTS = 20
+SPEAKERS_PER_EVENT = 20
+SERVER_LATENCY = 0.005
+
+
+def event_entities(event_index):
+    speakers = [{"name": f"Speaker {event_index}-{i}", "title": "Dev"} for i in range(SPEAKERS_PER_EVENT)]
+    return {"luma_url": f"https://lu.ma/event-{event_index}", "name": f"Event {event_index}"}, speakers
+
+
+class TestBulkUpsertPerformance:
+    """Rows/sec against the local PostgREST stand-in."""
+
+    @pytest.mark.performance
+    @pytest.mark.asyncio
+    async def test_bulk_persist_beats_per_row_upserts(self):
+        total_rows = NUM_EVENTS * (1 + 2 * SPEAKERS_PER_EVENT)
+
+        async with PostgrestStub(latency=SERVER_LATENCY) as stub:
+            client = AsyncPostgrestClient(stub.url, "test-key")
+            start = time.perf_counter()
+            for event_index in range(NUM_EVENTS):
+                event, speakers = event_entities(event_index)
+                event_id = await upsert_row("events", event, conflict_column="luma_url", db=client)
+                for speaker in speakers:
+                    speaker_id = await upsert_row("speakers", speaker, source_url=event["luma_url"], db=client)
+                    await insert_rows([{"event_id": event_id, "speaker_id": speaker_id}], "event_speakers", db=client)
+            per_row_rps = total_rows / (time.perf_counter() - start)
+            per_row_requests = stub.requests
+            await client.aclose()
+
+        async with PostgrestStub(latency=SERVER_LATENCY) as stub:
+            client = AsyncPostgrestClient(stub.url, "test-key")
+            start = time.perf_counter()
+            for event_index in range(NUM_EVENTS):
+                event, speakers = event_entities(event_index)
+                ids = await bulk_persist(
+                    [("events", event)] + [("speakers", speaker) for speaker in speakers],
+                    conflict_columns={"events": "luma_url"},
+                    source_url=event["luma_url"],
+                    db=client,
+                )
+                event_id = ids["events"][event["luma_url"]]
+                links = [{"event_id": event_id, "speaker_id": i} for i in ids["speakers"].values()]
+                await insert_rows(links, "event_speakers", db=client)
+            bulk_rps = total_rows / (time.perf_counter() - start)
+            bulk_requests = stub.requests
+            assert len(stub.tables["event_speakers"]) == NUM_EVENTS * SPEAKERS_PER_EVENT
+            await client.aclose()
+
+        print(
+            f"\nper-row: {per_row_rps:.0f} rows/s ({per_row_requests} requests), "
+            f"bulk: {bulk_rps:.0f} rows/s ({bulk_requests} requests)"
+        )
+        assert bulk_requests <= NUM_EVENTS * 4
+        assert bulk_rps > per_row_rps * 5
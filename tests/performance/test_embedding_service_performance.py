@@ -0,0 +1,57 @@
+"""
+Benchmarks for batched embedding generation against a fake backend with
+simulated API latency: one call per text vs the micro-batching service,
+and a warm re-crawl served from the content-hash cache.
+"""
+
+import pytest
+import asyncio
+import time
+
+from core.shared.embedding_service import EmbeddingCache, EmbeddingService, FakeEmbeddingBackend
+
+TEXTS = 500
+API_LATENCY = 0.02
+MAX_CONCURRENT_CALLS = 4
+
+
+class TestEmbeddingServicePerformance:
+    """Per-text calls vs micro-batched, cached calls."""
+
+    @pytest.mark.performance
+    @pytest.mark.asyncio
+    async def test_batching_and_cache(self):
+        texts = [f"Blockchain event {i} with speakers and a long description" for i in range(TEXTS)]
+
+        unbatched = FakeEmbeddingBackend(latency=API_LATENCY)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CALLS)
+
+        async def embed_one(text):
+            async with semaphore:
+                return (await unbatched.embed_batch([text]))[0]
+
+        start = time.perf_counter()
+        expected = await asyncio.gather(*(embed_one(text) for text in texts))
+        unbatched_time = time.perf_counter() - start
+
+        backend = FakeEmbeddingBackend(latency=API_LATENCY)
+        service = EmbeddingService(
+            backend, cache=EmbeddingCache(), max_concurrent_batches=MAX_CONCURRENT_CALLS
+        )
+        start = time.perf_counter()
+        results = await asyncio.gather(*(service.embed(text) for text in texts))
+        batched_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await asyncio.gather(*(service.embed(text) for text in texts))
+        cached_time = time.perf_counter() - start
+
+        print(
+            f"\n{TEXTS} texts: per-text {unbatched_time * 1000:.0f} ms ({len(unbatched.batch_sizes)} calls), "
+            f"batched {batched_time * 1000:.0f} ms ({len(backend.batch_sizes)} calls), "
+            f"cached {cached_time * 1000:.0f} ms"
+        )
+        assert results == expected
+        assert len(backend.batch_sizes) == TEXTS // backend.max_batch_size
+        assert batched_time * 10 < unbatched_time
+        assert service.stats["cache_hits"] == TEXTS
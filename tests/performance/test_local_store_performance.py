@@ -0,0 +1,69 @@
+"""
+Benchmarks for the embedded SQLite event store: bulk-load throughput and
+date-range query latency with and without the UTC timestamp index.
+"""
+
+import pytest
+import datetime
+import time
+
+from core.shared.database.search import get_events_by_date_basic, keyword_search_events
+from core.shared.local_store import SQLiteEventStore
+
+NUM_EVENTS = 20_000
+NUM_QUERIES = 100
+START = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def make_events():
+    return [
+        {
+            "name": f"Event {i}",
+            "description": f"Track {i % 50} talks on topic{i % 200}",
+            "start_time_iso": (START + datetime.timedelta(minutes=37 * i)).isoformat(),
+            "luma_url": f"https://lu.ma/event-{i}",
+        }
+        for i in range(NUM_EVENTS)
+    ]
+
+
+async def query_days(store):
+    start = time.perf_counter()
+    found = 0
+    for day in range(NUM_QUERIES):
+        date_str = (START + datetime.timedelta(days=day)).date().isoformat()
+        found += len(await get_events_by_date_basic(date_str, "UTC", db=store, use_cache=False))
+    return (time.perf_counter() - start) / NUM_QUERIES * 1000, found
+
+
+class TestLocalStorePerformance:
+    """Load throughput and query latency of SQLiteEventStore."""
+
+    @pytest.mark.performance
+    @pytest.mark.asyncio
+    async def test_indexed_date_queries_beat_full_scans(self, tmp_path):
+        events = make_events()
+        store = SQLiteEventStore(str(tmp_path / "events.sqlite"))
+        start = time.perf_counter()
+        store.load("events", events, on_conflict="luma_url")
+        load_rps = NUM_EVENTS / (time.perf_counter() - start)
+
+        unindexed = SQLiteEventStore(timestamp_columns={"events": ()})
+        unindexed.load("events", events)
+
+        indexed_ms, indexed_found = await query_days(store)
+        scan_ms, scan_found = await query_days(unindexed)
+
+        start = time.perf_counter()
+        for i in range(NUM_QUERIES):
+            await keyword_search_events(f"topic{i}", limit=20, db=store)
+        keyword_ms = (time.perf_counter() - start) / NUM_QUERIES * 1000
+
+        print(f"\nBulk load: {load_rps:.0f} rows/sec ({NUM_EVENTS} events)")
+        print(f"Date query: {indexed_ms:.2f}ms indexed vs {scan_ms:.2f}ms full scan ({scan_ms / indexed_ms:.1f}x)")
+        print(f"Keyword search: {keyword_ms:.2f}ms")
+
+        assert indexed_found == scan_found > 0
+        assert indexed_ms * 5 < scan_ms
+        store.close()
+        unindexed.close()
@@ -0,0 +1,103 @@
+"""
+Benchmarks for field extraction with compiled platform plans.
+Compares ExtractionPlan.execute against reinterpreting the raw platform
+config per page: every selector translated and queried on its own, field
+by field, then the regex strings.
+"""
+
+import pytest
+import json
+import re
+import time
+
+from lxml.cssselect import CSSSelector
+
+from core.shared.bs_utils import HTMLDocument
+from core.shared.selector_plans import CONFIG_SELECTOR_FIELDS, _element_value
+from examples.text_extraction_agent import EnhancedTextExtractionAgent
+
+PAGES = 50
+
+
+def event_page(i, structured):
+    """An event detail page, with or without JSON-LD/OpenGraph markup"""
+    head = ""
+    if structured:
+        event = {
+            "@context": "https://schema.org",
+            "@type": "Event",
+            "name": f"Builders Night #{i}",
+            "description": "Talks and demos",
+            "startDate": "2025-07-01T18:00:00Z",
+            "location": {"@type": "Place", "name": "Factory Berlin"},
+            "organizer": {"name": "Builders"},
+            "offers": {"price": "0"},
+        }
+        head = (
+            f'<meta property="og:title" content="Builders Night #{i}">'
+            f'<script type="application/ld+json">{json.dumps(event)}</script>'
+        )
+    related = "".join(
+        f'<li class="card"><span class="card-date">Jul {j}</span><a href="/e/{j}">Related {j}</a></li>'
+        for j in range(200)
+    )
+    return (
+        f"<html><head><title>Builders Night #{i}</title>{head}</head><body>"
+        f"<nav>{'<a href=/x>Link</a>' * 40}</nav>"
+        f'<main><h1 class="event-title">Builders Night #{i}</h1>'
+        f'<div class="event-description">{"Talks, demos and networking. " * 20}</div>'
+        f'<div class="venue-info">Factory Berlin</div><ul>{related}</ul></main>'
+        f"<footer>{'<p>Footer</p>' * 30}</footer></body></html>"
+    )
+
+
+def raw_config_extract(config, patterns, document):
+    """Field extraction reinterpreting the raw config strings for one page"""
+    results = {}
+    by_field = {p.field_name: p for p in patterns}
+    for config_key, name in CONFIG_SELECTOR_FIELDS.items():
+        pattern = by_field.get(name)
+        selectors = config.get(f"{config_key}_selectors", []) + (pattern.css_selectors if pattern else [])
+        for selector in selectors:
+            values = [v for v in map(_element_value, CSSSelector(selector, translator="html")(document.root)) if v]
+            if values:
+                results[name] = values[0]
+                break
+        else:
+            for regex in pattern.regex_patterns if pattern else []:
+                match = re.search(regex, document.html)
+                if match:
+                    results[name] = match.group(1)
+                    break
+    return results
+
+
+def total_time(func, documents):
+    start = time.perf_counter()
+    for document in documents:
+        func(document)
+    return time.perf_counter() - start
+
+
+class TestSelectorPlanPerformance:
+    """Compiled plan vs per-page config interpretation."""
+
+    @pytest.mark.performance
+    @pytest.mark.parametrize("structured", [True, False])
+    def test_compiled_plan_beats_raw_config(self, structured):
+        agent = EnhancedTextExtractionAgent(region_manager=None)
+        config = agent.platform_configs["eventbrite"]
+        plan = agent.get_extraction_plan("eventbrite")
+        documents = [HTMLDocument(event_page(i, structured)) for i in range(PAGES)]
+
+        raw = total_time(lambda d: raw_config_extract(config, agent.extraction_patterns, d), documents)
+        compiled = total_time(plan.execute, documents)
+
+        matches = plan.execute(documents[-1])
+        print(
+            f"\n{PAGES} pages (structured={structured}): raw config {raw * 1000:.0f} ms, "
+            f"compiled plan {compiled * 1000:.0f} ms ({raw / compiled:.1f}x)"
+        )
+        assert matches["title"].value == f"Builders Night #{PAGES - 1}"
+        assert matches["title"].method == ("json_ld" if structured else "css_selector")
+        assert compiled * 2 < raw
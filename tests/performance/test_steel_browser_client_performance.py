@@ -0,0 +1,46 @@
+"""
+Performance benchmarks for SteelBrowserClient.
+Compares requests/sec of the pooled, concurrent batch path against
+sequential calls that open a fresh session per request.
+"""
+
+import pytest
+import time
+
+from core.shared.web.browsers.steel_browser_client import SteelBrowserClient
+from tests.helpers.steel_browser_stub import SteelBrowserStub
+
+NUM_URLS = 100
+SERVER_LATENCY = 0.01
+
+
+class TestSteelBrowserClientPerformance:
+    """Throughput benchmarks against the local Steel Browser stub."""
+
+    @pytest.mark.performance
+    @pytest.mark.asyncio
+    async def test_navigate_many_beats_sequential_fresh_sessions(self):
+        urls = [f"https://example.com/event/{i}" for i in range(NUM_URLS)]
+
+        async with SteelBrowserStub(latency=SERVER_LATENCY) as stub:
+            start = time.perf_counter()
+            for url in urls:
+                async with SteelBrowserClient(stub.url) as client:
+                    await client.navigate(url)
+            sequential_rps = NUM_URLS / (time.perf_counter() - start)
+            sequential_connections = len(stub.peers)
+
+            stub.peers.clear()
+            async with SteelBrowserClient(stub.url, max_connections_per_host=10) as client:
+                start = time.perf_counter()
+                results = await client.navigate_many(urls, max_concurrency=10)
+                pooled_rps = NUM_URLS / (time.perf_counter() - start)
+            pooled_connections = len(stub.peers)
+
+        print(
+            f"\nsequential: {sequential_rps:.1f} req/s ({sequential_connections} connections), "
+            f"pooled batch: {pooled_rps:.1f} req/s ({pooled_connections} connections)"
+        )
+        assert all(r["success"] for r in results)
+        assert pooled_connections <= 10
+        assert pooled_rps > sequential_rps * 3
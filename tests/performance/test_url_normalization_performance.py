@@ -0,0 +1,58 @@
+"""
+Microbenchmarks for URL canonicalization.
+Compares the fast normalize_many against the original parse/unparse implementation.
+"""
+
+import pytest
+import time
+
+from core.shared.url_utils import URLNormalizer, _normalize_url
+from tests.helpers.url_reference import reference_normalize_url
+
+NUM_URLS = 100000
+
+
+def crawled_hrefs():
+    # Link discovery mostly sees plain paths, repeated across pages, plus some tracked links
+    return [
+        f"https://Lu.ma/event-{i % 2000}/" if i % 4 else f"https://example.com/e/{i}?utm_source=x&id={i}#top"
+        for i in range(NUM_URLS)
+    ]
+
+
+def unique_plain_urls():
+    return [f"https://lu.ma/user/u-{i}/events/" for i in range(NUM_URLS)]
+
+
+def benchmark(func, urls):
+    start = time.perf_counter()
+    func(urls)
+    return NUM_URLS / (time.perf_counter() - start)
+
+
+class TestURLNormalizationPerformance:
+    """Throughput benchmarks for URL canonicalization."""
+
+    @pytest.mark.performance
+    def test_normalize_many_beats_reference_on_crawl_mix(self):
+        urls = crawled_hrefs()
+        normalizer = URLNormalizer()
+        _normalize_url.cache_clear()
+
+        reference_ups = benchmark(lambda us: [reference_normalize_url(u) for u in us], urls)
+        fast_ups = benchmark(normalizer.normalize_many, urls)
+
+        print(f"\nreference: {reference_ups:.0f} urls/s, fast: {fast_ups:.0f} urls/s")
+        assert fast_ups > reference_ups * 1.5
+
+    @pytest.mark.performance
+    def test_fast_path_without_memo_hits(self):
+        urls = unique_plain_urls()
+        normalizer = URLNormalizer()
+        _normalize_url.cache_clear()
+
+        reference_ups = benchmark(lambda us: [reference_normalize_url(u) for u in us], urls)
+        fast_ups = benchmark(normalizer.normalize_many, urls)
+
+        print(f"\nreference: {reference_ups:.0f} urls/s, fast path: {fast_ups:.0f} urls/s")
+        assert fast_ups > reference_ups * 2
@@ -0,0 +1,60 @@
+"""
+Performance benchmarks for EnhancedValidationAgent batch validation.
+Compares events/sec of validate_batch against validating one event at a time.
+"""
+
+import pytest
+import copy
+import time
+from datetime import datetime, timedelta
+
+from examples.validation_agent import EnhancedValidationAgent
+
+NUM_EVENTS = 2000
+# Crawls see the same handful of dates across many events
+DISTINCT_DATES = 30
+
+
+def crawl_events():
+    base = datetime.now() + timedelta(days=5)
+    platforms = [
+        "https://www.eventbrite.com/e/event-{i}",
+        "https://www.meetup.com/group/events/{i}",
+        "https://lu.ma/event-{i}",
+        "https://example.com/events/{i}",
+    ]
+    return [
+        {
+            "name": f"Crawled Event {i}",
+            "url": platforms[i % len(platforms)].format(i=i),
+            "start_time": (base + timedelta(days=i % DISTINCT_DATES)).isoformat(),
+            "end_time": (base + timedelta(days=i % DISTINCT_DATES, hours=2)).isoformat(),
+            "location": "Berlin",
+            "description": "A description that is long enough for every platform.",
+        }
+        for i in range(NUM_EVENTS)
+    ]
+
+
+class TestValidationBatchPerformance:
+    """Throughput benchmarks for batch vs. per-event validation."""
+
+    @pytest.mark.performance
+    @pytest.mark.asyncio
+    async def test_validate_batch_beats_per_event_loop(self):
+        agent = EnhancedValidationAgent()
+        single_events = crawl_events()
+        batch_events = copy.deepcopy(single_events)
+
+        start = time.perf_counter()
+        for event in single_events:
+            await agent.validate_event_data(event, correction_mode=False)
+        single_eps = NUM_EVENTS / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        results = await agent.validate_batch(batch_events, correction_mode=False)
+        batch_eps = NUM_EVENTS / (time.perf_counter() - start)
+
+        print(f"\nper-event: {single_eps:.0f} events/s, batch: {batch_eps:.0f} events/s")
+        assert len(results) == NUM_EVENTS
+        assert batch_eps > single_eps * 2
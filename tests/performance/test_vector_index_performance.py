@@ -0,0 +1,52 @@
+"""
+Benchmarks for the local IVF vector index: query latency and recall
+against exact search over the same embeddings.
+"""
+
+import pytest
+import time
+
+import numpy as np
+
+from core.shared.vector_index import VectorIndex
+
+ROWS = 100_000
+DIMENSION = 256
+QUERIES = 100
+
+
+class TestVectorIndexPerformance:
+    """IVF search latency at event-catalogue scale."""
+
+    @pytest.mark.performance
+    def test_query_latency_and_recall(self):
+        rng = np.random.default_rng(1)
+        centres = rng.normal(size=(500, DIMENSION))
+        vectors = (centres[rng.integers(0, 500, ROWS)] + 0.5 * rng.normal(size=(ROWS, DIMENSION))).astype(np.float32)
+
+        start = time.perf_counter()
+        index = VectorIndex(DIMENSION, n_probe=16)
+        index.add_many(list(range(ROWS)), vectors)
+        build_time = time.perf_counter() - start
+
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        queries = vectors[rng.choice(ROWS, QUERIES, replace=False)] + 0.2 * rng.normal(size=(QUERIES, DIMENSION)).astype(np.float32)
+
+        start = time.perf_counter()
+        results = [index.search(query, k=10) for query in queries]
+        query_time = (time.perf_counter() - start) / QUERIES
+
+        start = time.perf_counter()
+        exact = [np.argsort(-(unit @ (q / np.linalg.norm(q))))[:10] for q in queries]
+        exact_time = (time.perf_counter() - start) / QUERIES
+
+        recall = np.mean([
+            len({i for i, _ in found} & set(truth.tolist())) / 10 for found, truth in zip(results, exact)
+        ])
+        print(
+            f"\n{ROWS}x{DIMENSION}: build {build_time:.1f} s, IVF query {query_time * 1000:.2f} ms, "
+            f"exact scan {exact_time * 1000:.2f} ms, recall@10 {recall:.3f}"
+        )
+        assert recall >= 0.9
+        assert query_time < 0.01
+        assert query_time * 3 < exact_time
@@ -0,0 +1,123 @@
+"""
+Unit tests for the static, manifest-backed agent discovery index.
+"""
+
+import sys
+import pytest
+import textwrap
+
+from core.shared.agent_index import AgentIndex, normalize_agent_name, scan_source
+
+ROOT = "core.agents.base.AsyncContextAgent"
+
+
+def write(path, source):
+    path.write_text(textwrap.dedent(source))
+
+
+@pytest.fixture
+def agent_package(tmp_path, monkeypatch):
+    """A throwaway agent package on sys.path with a base stub."""
+    package = tmp_path / "idx_agents"
+    package.mkdir()
+    write(package / "__init__.py", "")
+    write(package / "nav_agent.py", '''
+        from core.agents.base import AsyncContextAgent
+
+        class NavAgent(AsyncContextAgent):
+            """Navigate somewhere.
+
+            Longer description.
+            """
+            def __init__(self, url: str, timeout: int = 30):
+                self.url = url
+
+        class _PrivateAgent(AsyncContextAgent):
+            pass
+
+        class Helper:
+            pass
+    ''')
+    write(package / "derived_agent.py", '''
+        from .nav_agent import NavAgent as Base
+
+        class DerivedAgent(Base):
+            pass
+    ''')
+    write(package / "broken.py", "class Oops(:\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield package
+    for name in list(sys.modules):
+        if name.startswith("idx_agents"):
+            del sys.modules[name]
+
+
+class TestAgentIndex:
+    """Tests for AgentIndex scanning, manifest reuse and lazy loading."""
+
+    @pytest.mark.unit
+    def test_scan_source_resolves_bases_through_imports(self):
+        records = scan_source(
+            "import core.agents.base as b\nclass A(b.AsyncContextAgent):\n    pass\n",
+            "pkg.mod", "mod.py",
+        )
+        assert records[0].bases == [ROOT]
+        assert records[0].init_params is None
+
+    @pytest.mark.unit
+    def test_finds_agents_statically_without_importing(self, agent_package, tmp_path):
+        index = AgentIndex({"idx_agents": agent_package}, root_classes=[ROOT], manifest_path=tmp_path / "m.json")
+
+        entries = index.entries
+
+        assert set(entries) == {"nav", "derived"}
+        assert entries["nav"].description == "Navigate somewhere."
+        assert [p.name for p in entries["nav"].init_params] == ["url", "timeout"]
+        # Inherited __init__ is resolved through the indexed base
+        assert [p.name for p in entries["derived"].init_params] == ["url", "timeout"]
+        assert not any(name.startswith("idx_agents.") for name in sys.modules)
+
+    @pytest.mark.unit
+    def test_manifest_skips_unchanged_files(self, agent_package, tmp_path):
+        manifest = tmp_path / "m.json"
+        AgentIndex({"idx_agents": agent_package}, root_classes=[ROOT], manifest_path=manifest).refresh()
+
+        index = AgentIndex({"idx_agents": agent_package}, root_classes=[ROOT], manifest_path=manifest)
+        index.refresh()
+        assert index.stats["parsed"] == 0
+        assert index.stats["reused"] == index.stats["files"] == 3
+
+        write(agent_package / "derived_agent.py", '''
+            from .nav_agent import NavAgent
+
+            class RenamedAgent(NavAgent):
+                pass
+        ''')
+        entries = index.refresh()
+        assert index.stats["parsed"] == 1
+        assert "renamed" in entries and "derived" not in entries
+
+    @pytest.mark.unit
+    def test_lazy_mapping_imports_on_first_lookup(self, agent_package, tmp_path, monkeypatch):
+        base = tmp_path / "core" / "agents"
+        base.mkdir(parents=True)
+        for pkg in (tmp_path / "core", base):
+            write(pkg / "__init__.py", "")
+        write(base / "base.py", "class AsyncContextAgent:\n    pass\n")
+        for name in [n for n in sys.modules if n == "core" or n.startswith("core.agents")]:
+            monkeypatch.delitem(sys.modules, name)
+
+        index = AgentIndex({"idx_agents": agent_package}, root_classes=[ROOT], use_manifest=False)
+        agents = index.as_mapping()
+
+        assert "nav" in agents and len(agents) == 2
+        assert "idx_agents.nav_agent" not in sys.modules
+        agent_class = agents["nav"]
+        assert agent_class.__name__ == "NavAgent"
+        assert agents["nav"] is agent_class
+        assert index.stats["imports"] == 1
+
+    @pytest.mark.unit
+    def test_normalize_agent_name(self):
+        assert normalize_agent_name("SimpleNavigationAgent") == "simple_navigation"
+        assert normalize_agent_name("EnhancedTextExtractionAgent") == "enhanced_text_extraction"
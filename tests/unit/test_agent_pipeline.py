@@ -0,0 +1,204 @@
+"""
+Unit tests for the streaming execution mode of the rotation BaseAgent
+and the AgentPipeline helper that chains agents with bounded queues.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from examples.base_agent import (
+    AgentPipeline,
+    AgentResult,
+    AgentTask,
+    AgentTaskType,
+    BaseAgent,
+)
+
+
+class StreamingSourceAgent(BaseAgent):
+    """Source agent that yields items one at a time."""
+
+    def __init__(self, region_manager, items, produced):
+        super().__init__(region_manager)
+        self.items = items
+        self.produced = produced
+
+    async def _execute_core_logic(self, task, session):
+        raise AssertionError("streaming agents should not build a full batch")
+
+    async def _stream_core_logic(self, task, session):
+        for item in self.items:
+            self.produced.append(item)
+            yield item
+
+
+class BatchSourceAgent(BaseAgent):
+    """Agent without streaming support, adapted via stream_items_key."""
+
+    stream_items_key = "extracted_events"
+
+    async def _execute_core_logic(self, task, session):
+        return AgentResult(
+            task_id=task.task_id,
+            success=True,
+            data={},
+            performance_metrics={},
+            region_used="us-central1",
+            execution_time=0.0,
+            next_task_data={"extracted_events": [{"id": 1}, {"id": 2}]},
+        )
+
+
+async def passthrough(item):
+    return item
+
+
+@pytest.fixture
+def region_manager():
+    manager = Mock()
+    manager.get_optimal_region = AsyncMock(return_value="us-central1")
+    manager.get_regional_session = AsyncMock(return_value=Mock(region="us-central1"))
+    manager.update_regional_metrics = AsyncMock()
+    return manager
+
+
+@pytest.fixture
+def task():
+    return AgentTask(
+        task_id="stream-1",
+        task_type=AgentTaskType.EXTRACT_TEXT,
+        target_url="https://example.com",
+        metadata={},
+    )
+
+
+@pytest.mark.unit
+class TestExecuteStream:
+    """BaseAgent.execute_stream yields items as they are produced."""
+
+    @pytest.mark.asyncio
+    async def test_default_adapter_streams_items_key(self, region_manager, task):
+        agent = BatchSourceAgent(region_manager)
+
+        items = [item async for item in agent.execute_stream(task)]
+
+        assert items == [{"id": 1}, {"id": 2}]
+        region_manager.update_regional_metrics.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_items_reach_consumer_before_source_finishes(self, region_manager, task):
+        produced = []
+        agent = StreamingSourceAgent(region_manager, [1, 2, 3], produced)
+
+        stream = agent.execute_stream(task)
+        first = await stream.__anext__()
+
+        assert first == 1
+        assert produced == [1]
+        await stream.aclose()
+
+
+@pytest.mark.unit
+class TestAgentPipeline:
+    """Stages overlap and are bounded by their queues."""
+
+    @pytest.mark.asyncio
+    async def test_chains_stages_and_drops_none(self, region_manager, task):
+        source = StreamingSourceAgent(region_manager, list(range(10)), [])
+        persisted = []
+
+        async def validate(item):
+            return item if item % 2 == 0 else None
+
+        async def persist(item):
+            persisted.append(item)
+            return item
+
+        pipeline = AgentPipeline(source, [validate, persist], queue_size=2)
+        summary = await pipeline.run(task)
+
+        assert persisted == [0, 2, 4, 6, 8]
+        assert summary["items_completed"] == 5
+        assert summary["stages"][0]["dropped"] == 5
+
+    @pytest.mark.asyncio
+    async def test_bounded_queues_apply_back_pressure(self, region_manager, task):
+        produced = []
+        source = StreamingSourceAgent(region_manager, list(range(50)), produced)
+        release = asyncio.Event()
+
+        async def slow_persist(item):
+            await release.wait()
+            return item
+
+        pipeline = AgentPipeline(source, [slow_persist], queue_size=2)
+        runner = asyncio.create_task(pipeline.run(task))
+        await asyncio.sleep(0.05)
+
+        # One item in the stage, two queued, one blocked in put()
+        assert len(produced) <= 5
+
+        release.set()
+        summary = await asyncio.wait_for(runner, timeout=1)
+        assert summary["items_completed"] == 50
+
+    @pytest.mark.asyncio
+    async def test_early_aclose_with_full_queues_does_not_hang(self, region_manager, task):
+        source = StreamingSourceAgent(region_manager, list(range(50)), [])
+        pipeline = AgentPipeline(source, [passthrough], queue_size=1)
+
+        stream = pipeline.stream(task)
+        assert await stream.__anext__() == 0
+        await asyncio.sleep(0.01)  # Let the producer fill its queue
+
+        await asyncio.wait_for(stream.aclose(), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_source_errors_reach_the_consumer(self, region_manager, task):
+        class FailingSourceAgent(StreamingSourceAgent):
+            async def _stream_core_logic(self, task, session):
+                yield 1
+                raise RuntimeError("source failed")
+
+        pipeline = AgentPipeline(FailingSourceAgent(region_manager, [], []), [passthrough])
+        results = []
+        with pytest.raises(RuntimeError, match="source failed"):
+            async for item in pipeline.stream(task):
+                results.append(item)
+        assert results == [1]
+
+    @pytest.mark.asyncio
+    async def test_stage_errors_are_counted_not_fatal(self, region_manager, task):
+        source = StreamingSourceAgent(region_manager, [1, 2, 3], [])
+
+        async def flaky(item):
+            if item == 2:
+                raise ValueError("bad row")
+            return item
+
+        pipeline = AgentPipeline(source, [flaky])
+        results = [item async for item in pipeline.stream(task)]
+
+        assert results == [1, 3]
+        assert pipeline.stage_stats[0]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_agent_stage_uses_process_item(self, region_manager, task):
+        source = StreamingSourceAgent(region_manager, [{"name": "a"}], [])
+        stage = Mock()
+        stage.process_item = AsyncMock(side_effect=lambda item: {**item, "ok": True})
+
+        pipeline = AgentPipeline(source, [stage])
+        results = [item async for item in pipeline.stream(task)]
+
+        assert results == [{"name": "a", "ok": True}]
+
+    def test_stages_without_process_item_are_rejected_up_front(self, region_manager):
+        source = StreamingSourceAgent(region_manager, [], [])
+
+        with pytest.raises(TypeError, match="StreamingSourceAgent does not implement process_item"):
+            AgentPipeline(source, [passthrough, StreamingSourceAgent(region_manager, [], [])])
+        with pytest.raises(TypeError, match="is not callable"):
+            AgentPipeline(source, [object()])
+
@@ -0,0 +1,209 @@
+"""
+Unit tests for the MCP server agent instance pool.
+"""
+
+import sys
+import pytest
+import asyncio
+from pathlib import Path
+
+# MCP server modules are imported from their own directory, as the servers do
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "mcp"))
+
+from agent_pool import AgentPool, AgentPoolExhausted, AgentPoolManager
+
+
+class FakeAgent:
+    """Agent with an expensive-to-enter async context."""
+
+    instances = 0
+
+    def __init__(self, url=None, timeout=30, **options):
+        FakeAgent.instances += 1
+        self.url = url
+        self.timeout = timeout
+        self.entered = False
+        self.exited = False
+
+    def reset_for_lease(self, url=None, timeout=30):
+        self.url = url
+        self.timeout = timeout
+
+    async def __aenter__(self):
+        self.entered = True
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.exited = True
+
+    async def run(self):
+        await asyncio.sleep(0.01)
+        return self.url
+
+
+@pytest.fixture(autouse=True)
+def reset_instance_count():
+    FakeAgent.instances = 0
+
+
+class TestAgentPool:
+    """Tests for AgentPool leasing, bounds, reaping and metrics."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_instances_are_reused_and_retargeted(self):
+        pool = AgentPool(FakeAgent, max_size=2)
+
+        for i in range(5):
+            async with pool.lease(url=f"https://example.com/{i}") as agent:
+                assert await agent.run() == f"https://example.com/{i}"
+
+        stats = pool.get_stats()
+        assert FakeAgent.instances == 1
+        assert stats["hits"] == 4
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.8)
+        await pool.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_max_size_applies_back_pressure(self):
+        pool = AgentPool(FakeAgent, max_size=2)
+
+        async def call(i):
+            async with pool.lease(url=str(i)) as agent:
+                return await agent.run()
+
+        results = await asyncio.gather(*(call(i) for i in range(8)))
+
+        stats = pool.get_stats()
+        assert results == [str(i) for i in range(8)]
+        assert stats["created"] == 2
+        assert stats["waits"] > 0
+        assert stats["max_wait_ms"] > 0
+        await pool.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_acquire_timeout_raises(self):
+        pool = AgentPool(FakeAgent, max_size=1, acquire_timeout=0.01)
+
+        async with pool.lease(url="a"):
+            with pytest.raises(AgentPoolExhausted):
+                async with pool.lease(url="b"):
+                    pass
+        await pool.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_runs_and_failed_resets_discard_instances(self):
+        pool = AgentPool(FakeAgent, max_size=2)
+
+        with pytest.raises(RuntimeError):
+            async with pool.lease(url="a") as agent:
+                broken = agent
+                raise RuntimeError("boom")
+        assert broken.exited
+        assert pool.get_stats()["size"] == 0
+
+        async with pool.lease(url="b") as agent:
+            first = agent
+        # The reset hook rejects the parameter, so a fresh instance is built
+        async with pool.lease(url="c", unknown_option=True) as agent:
+            assert agent is not first
+        assert first.exited
+        assert pool.get_stats()["reset_failures"] == 1
+        await pool.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reused_instances_do_not_keep_earlier_parameters(self):
+        pool = AgentPool(FakeAgent)
+
+        async with pool.lease(url="a", timeout=5):
+            pass
+        async with pool.lease(url="b") as agent:
+            assert (agent.url, agent.timeout) == ("b", 30)
+        assert FakeAgent.instances == 1
+        await pool.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_classes_without_reset_hook_get_fresh_instances(self):
+        class NoResetAgent(FakeAgent):
+            reset_for_lease = None
+
+        pool = AgentPool(NoResetAgent)
+        assert await pool.warmup(count=2) == 0
+        async with pool.lease(url="a", timeout=5) as agent:
+            first = agent
+        # Closed on return rather than parked until the next lease
+        assert first.exited
+        assert pool.get_stats()["size"] == 0
+        async with pool.lease(url="b") as agent:
+            assert agent is not first
+            assert (agent.url, agent.timeout) == ("b", 30)
+        assert pool.get_stats()["destroyed"] == 2
+        await pool.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_custom_async_reset_hook(self):
+        resets = []
+
+        async def reset(agent, params):
+            resets.append(params)
+            agent.url = params["url"].upper()
+
+        pool = AgentPool(FakeAgent, reset=reset)
+        async with pool.lease(url="a"):
+            pass
+        async with pool.lease(url="b") as agent:
+            assert agent.url == "B"
+        assert resets == [{"url": "b"}]
+        await pool.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_warmup_and_idle_reaping_keep_min_size(self):
+        pool = AgentPool(FakeAgent, max_size=4, min_size=1, idle_timeout=0.0, warmup_params={"url": "about:blank"})
+
+        assert await pool.warmup(count=3) == 3
+        assert pool.get_stats()["idle"] == 3
+
+        await asyncio.sleep(0.01)
+        assert await pool.reap_idle() == 2
+        stats = pool.get_stats()
+        assert stats["size"] == 1
+        assert stats["reaped"] == 2
+        await pool.close()
+        assert pool.get_stats()["size"] == 0
+
+
+class TestAgentPoolManager:
+    """Tests for per-class pools managed by AgentPoolManager."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_per_class_pools_and_stats(self):
+        class OtherAgent(FakeAgent):
+            pass
+
+        manager = AgentPoolManager(max_size=2, reap_interval=0.01)
+        manager.configure(OtherAgent, max_size=1)
+
+        for _ in range(3):
+            async with manager.lease(FakeAgent, url="x") as agent:
+                await agent.run()
+            async with manager.lease(OtherAgent, url="y") as agent:
+                await agent.run()
+
+        stats = manager.get_stats()
+        assert set(stats["pools"]) == {"FakeAgent", "OtherAgent"}
+        assert stats["pools"]["OtherAgent"]["max_size"] == 1
+        assert stats["total_leases"] == 6
+        assert stats["hit_rate"] == pytest.approx(4 / 6)
+
+        with pytest.raises(RuntimeError):
+            manager.configure(OtherAgent, max_size=3)
+        await manager.close()
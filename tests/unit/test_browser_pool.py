@@ -0,0 +1,353 @@
+"""
+Unit tests for the shared Playwright browser pool.
+Uses in-memory fake browsers so no Chromium binary is required.
+"""
+
+import pytest
+import asyncio
+from types import SimpleNamespace
+
+from core.shared.web.browsers import browser_pool
+from core.shared.web.browsers.browser_pool import BrowserPool, BrowserPoolExhausted
+
+
+class FakeContext:
+    """Minimal stand-in for a Playwright BrowserContext."""
+
+    def __init__(self, browser, options):
+        self.browser = browser
+        self.options = options
+        self.closed = False
+
+    async def new_page(self):
+        return SimpleNamespace(context=self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    """Minimal stand-in for a Playwright Browser."""
+
+    def __init__(self, launch_args):
+        self.launch_args = launch_args
+        self.connected = True
+        self.closed = False
+        self.contexts = []
+
+    async def new_context(self, **options):
+        context = FakeContext(self, options)
+        self.contexts.append(context)
+        return context
+
+    def is_connected(self):
+        return self.connected and not self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+def make_profile(name="default", headless=True):
+    return SimpleNamespace(
+        profile_name=name,
+        browser_args={"headless": headless, "args": [f"--profile={name}"]},
+        context_args={"user_agent": f"agent-{name}"},
+    )
+
+
+@pytest.fixture
+def launched():
+    return []
+
+
+@pytest.fixture
+def launcher(launched):
+    async def _launch(launch_args):
+        browser = FakeBrowser(launch_args)
+        launched.append(browser)
+        return browser
+
+    return _launch
+
+
+@pytest.mark.unit
+class TestBrowserPoolReuse:
+    """Browsers stay warm across leases."""
+
+    @pytest.mark.asyncio
+    async def test_browser_reused_across_leases(self, launcher, launched):
+        pool = BrowserPool(max_browsers=2, launcher=launcher)
+        profile = make_profile()
+
+        for _ in range(5):
+            async with pool.context(profile) as context:
+                assert context.options == {"user_agent": "agent-default"}
+
+        assert len(launched) == 1
+        assert pool.get_stats()["leases"] == 5
+        assert all(context.closed for context in launched[0].contexts)
+        await pool.close()
+        assert launched[0].closed
+
+    @pytest.mark.asyncio
+    async def test_profiles_get_separate_browsers(self, launcher, launched):
+        pool = BrowserPool(max_browsers=2, launcher=launcher)
+
+        async with pool.context(make_profile("a")):
+            async with pool.context(make_profile("b")):
+                pass
+
+        assert len(launched) == 2
+        assert launched[0].launch_args != launched[1].launch_args
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_browser_evicted_for_new_profile(self, launcher, launched):
+        pool = BrowserPool(max_browsers=1, launcher=launcher)
+
+        async with pool.context(make_profile("a")):
+            pass
+        async with pool.context(make_profile("b")):
+            pass
+
+        assert len(launched) == 2
+        assert launched[0].closed
+        assert pool.get_stats()["browsers"] == 1
+        await pool.close()
+
+
+@pytest.mark.unit
+class TestBrowserPoolRecycling:
+    """Browsers are recycled on page count, memory, or health."""
+
+    @pytest.mark.asyncio
+    async def test_recycle_after_max_pages(self, launcher, launched):
+        pool = BrowserPool(max_browsers=1, max_pages_per_browser=3, launcher=launcher)
+        profile = make_profile()
+
+        for _ in range(7):
+            async with pool.context(profile):
+                pass
+
+        assert len(launched) == 3
+        assert launched[0].closed and launched[1].closed
+        assert pool.get_stats()["recycles"] == 2
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_recycle_over_memory_ceiling(self, launcher, launched):
+        pool = BrowserPool(
+            max_browsers=1,
+            max_memory_mb=500,
+            launcher=launcher,
+            memory_probe=lambda: 800.0,
+        )
+
+        async with pool.context(make_profile()):
+            pass
+        async with pool.context(make_profile()):
+            pass
+
+        assert len(launched) == 2
+        assert launched[0].closed
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_disconnected_browser_replaced(self, launcher, launched):
+        pool = BrowserPool(max_browsers=1, launcher=launcher)
+        profile = make_profile()
+
+        async with pool.context(profile):
+            pass
+        launched[0].connected = False
+
+        stats = await pool.health_check()
+        assert stats["browsers"] == 0
+
+        async with pool.context(profile):
+            pass
+        assert len(launched) == 2
+        await pool.close()
+
+
+@pytest.mark.unit
+class TestBrowserPoolBackPressure:
+    """Callers wait when every context slot is busy."""
+
+    @pytest.mark.asyncio
+    async def test_waits_for_released_context(self, launcher):
+        pool = BrowserPool(max_browsers=1, max_contexts_per_browser=1, launcher=launcher)
+        profile = make_profile()
+
+        first = await pool.acquire(profile)
+        waiter = asyncio.create_task(pool.acquire(profile))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+
+        await pool.release(first)
+        second = await asyncio.wait_for(waiter, timeout=1)
+        await pool.release(second)
+
+        assert pool.get_stats()["waits"] == 1
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_acquire_timeout(self, launcher):
+        pool = BrowserPool(
+            max_browsers=1,
+            max_contexts_per_browser=1,
+            acquire_timeout=0.05,
+            launcher=launcher,
+        )
+        lease = await pool.acquire(make_profile())
+
+        with pytest.raises(BrowserPoolExhausted):
+            await pool.acquire(make_profile())
+
+        await pool.release(lease)
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_launch_frees_slot(self, launcher):
+        attempts = []
+
+        async def flaky_launcher(launch_args):
+            attempts.append(launch_args)
+            if len(attempts) == 1:
+                raise RuntimeError("chromium crashed")
+            return await launcher(launch_args)
+
+        pool = BrowserPool(max_browsers=1, launcher=flaky_launcher)
+
+        with pytest.raises(RuntimeError):
+            await pool.acquire(make_profile())
+
+        async with pool.context(make_profile()):
+            pass
+        assert len(attempts) == 2
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_acquires_share_one_launch(self, launched):
+        gate = asyncio.Event()
+
+        async def slow_launcher(launch_args):
+            await gate.wait()
+            browser = FakeBrowser(launch_args)
+            launched.append(browser)
+            return browser
+
+        pool = BrowserPool(max_browsers=4, max_contexts_per_browser=4, launcher=slow_launcher)
+        pending = asyncio.gather(*(pool.acquire(make_profile()) for _ in range(3)))
+        await asyncio.sleep(0)
+        gate.set()
+        leases = await pending
+
+        assert len(launched) == 1
+        assert {lease.context.browser for lease in leases} == {launched[0]}
+        for lease in leases:
+            await pool.release(lease)
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_launch_wakes_callers_waiting_on_it(self, launcher, launched):
+        attempts = []
+
+        async def failing_first_launcher(launch_args):
+            attempts.append(launch_args)
+            await asyncio.sleep(0)
+            if len(attempts) == 1:
+                raise RuntimeError("chromium crashed")
+            return await launcher(launch_args)
+
+        pool = BrowserPool(
+            max_browsers=1, max_contexts_per_browser=2, launcher=failing_first_launcher
+        )
+        first, second = await asyncio.gather(
+            pool.acquire(make_profile()),
+            pool.acquire(make_profile()),
+            return_exceptions=True,
+        )
+
+        assert isinstance(first, RuntimeError)
+        assert second.context.browser is launched[0]
+        assert len(attempts) == 2
+        await pool.release(second)
+        await pool.close()
+
+
+@pytest.mark.unit
+class TestSharedBrowserPool:
+    """The shared pool is per event loop and kept warm between users."""
+
+    def test_each_event_loop_gets_its_own_pool(self):
+        async def shared():
+            return browser_pool.get_browser_pool()
+
+        first = asyncio.run(shared())
+        second = asyncio.run(shared())
+
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_last_release_keeps_browsers_warm(self, launcher, launched):
+        pool = browser_pool.retain_browser_pool(launcher=launcher)
+        assert browser_pool.retain_browser_pool() is pool
+        async with pool.context(make_profile()):
+            pass
+
+        await browser_pool.release_browser_pool(pool)
+        await browser_pool.release_browser_pool(pool)
+        await asyncio.sleep(0)
+        assert not launched[0].closed
+
+        # The next agent reuses the warm browser instead of launching one
+        assert browser_pool.retain_browser_pool() is pool
+        async with pool.context(make_profile()):
+            pass
+        assert len(launched) == 1
+        await browser_pool.release_browser_pool(pool)
+        await browser_pool.close_browser_pool()
+        assert launched[0].closed
+
+    @pytest.mark.asyncio
+    async def test_idle_pool_closes_after_timeout(self, launcher, launched):
+        pool = browser_pool.retain_browser_pool(launcher=launcher)
+        async with pool.context(make_profile()):
+            pass
+
+        await browser_pool.release_browser_pool(pool, idle_timeout=0.05)
+        # Retaining again cancels the pending close
+        assert browser_pool.retain_browser_pool() is pool
+        await asyncio.sleep(0.1)
+        assert not launched[0].closed
+
+        await browser_pool.release_browser_pool(pool, idle_timeout=0.05)
+        await asyncio.sleep(0.1)
+        assert launched[0].closed
+        assert browser_pool.get_browser_pool() is not pool
+        await browser_pool.close_browser_pool()
+
+    def test_idle_pool_closes_when_the_loop_shuts_down(self, launcher, launched):
+        async def scrape():
+            pool = browser_pool.retain_browser_pool(launcher=launcher)
+            async with pool.context(make_profile()):
+                pass
+            await browser_pool.release_browser_pool(pool)
+
+        asyncio.run(scrape())
+
+        assert launched[0].closed
+
+    def test_pool_from_a_closed_loop_starts_over(self, launcher, launched):
+        pool = BrowserPool(launcher=launcher)
+
+        async def scrape():
+            async with pool.context(make_profile()):
+                pass
+
+        asyncio.run(scrape())
+        asyncio.run(scrape())
+
+        assert len(launched) == 2
+        assert pool.get_stats()["browsers"] == 1
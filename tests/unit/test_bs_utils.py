@@ -0,0 +1,84 @@
+"""
+Unit tests for parse-once HTML processing in bs_utils.
+"""
+
+import pytest
+from bs4 import BeautifulSoup
+
+from core.shared.bs_utils import HTMLDocument, extract_visible_text
+
+PAGE = """<!DOCTYPE html>
+<html><head>
+  <title>Event</title>
+  <meta property="og:image" content="/og.png">
+  <meta name="twitter:image" content="https://cdn.example.com/tw.png">
+  <style>.hidden { display: none }</style>
+</head><body>
+  <nav>Home | Events</nav>
+  <main>
+    <h1>Cardano Builders Night</h1>
+    <!-- promo -->
+    <p>Join us <b>in Berlin</b>.<script>track()</script> Doors at 7pm.</p>
+    <img data-src="/lazy.jpg" src="/placeholder.jpg">
+    <img srcset="/small.jpg 1x, /large.jpg 2x">
+    <img src="/spinner.gif">
+    <div class="ad">Buy now</div>
+    <form><input value="email"><button>Register</button></form>
+  </main>
+  <div style="background: url('/hero.jpg')">Footer</div>
+  <noscript><img src="/noscript.png"></noscript>
+</body></html>"""
+
+
+class TestHTMLDocument:
+    """Tests for HTMLDocument and extract_visible_text."""
+
+    @pytest.mark.unit
+    def test_single_walk_collects_text_images_and_meta(self):
+        document = HTMLDocument(PAGE, base_url="https://lu.ma/e/")
+
+        assert document.text() == (
+            "Home | Events Cardano Builders Night Join us in Berlin . Doors at 7pm. Buy now Footer"
+        )
+        assert document.meta["og:image"] == "/og.png"
+        assert document.image_urls() == [
+            "https://cdn.example.com/tw.png",
+            "https://lu.ma/hero.jpg",
+            "https://lu.ma/large.jpg",
+            "https://lu.ma/lazy.jpg",
+            "https://lu.ma/noscript.png",
+            "https://lu.ma/og.png",
+            "https://lu.ma/small.jpg",
+        ]
+
+    @pytest.mark.unit
+    def test_soup_input_matches_get_text_and_is_not_modified(self):
+        soup = BeautifulSoup(PAGE, "html.parser")
+        before = str(soup)
+
+        text = extract_visible_text(soup, remove_selectors=[".ad", "nav"])
+
+        assert str(soup) == before
+        assert text == "Cardano Builders Night Join us in Berlin . Doors at 7pm. Footer"
+        assert extract_visible_text(soup.find("p")) == "Join us in Berlin . Doors at 7pm."
+        assert extract_visible_text(soup.find("form")) == ""
+
+    @pytest.mark.unit
+    def test_selectors_on_parsed_document(self):
+        document = HTMLDocument(PAGE)
+
+        assert extract_visible_text(
+            document, main_content_selectors=["article", "main"], remove_selectors=[".ad"], separator="|"
+        ) == "Cardano Builders Night|Join us|in Berlin|.|Doors at 7pm."
+        # Raw HTML is parsed with lxml and matches the BeautifulSoup result
+        assert extract_visible_text(PAGE, main_content_selectors=["main"]) == extract_visible_text(
+            BeautifulSoup(PAGE, "lxml"), main_content_selectors=["main"]
+        )
+
+    @pytest.mark.unit
+    def test_empty_and_invalid_input(self):
+        assert extract_visible_text("") == ""
+        assert extract_visible_text(None) == ""
+        assert extract_visible_text(42) == ""
+        assert HTMLDocument("   ").image_urls() == []
+        assert HTMLDocument('<?xml version="1.0" encoding="utf-8"?><p>x</p>').text() == "x"
@@ -0,0 +1,145 @@
+"""
+Unit tests for the batched upsert path against a local PostgREST stand-in:
+multi-row chunks, id maps, source_urls merging and chunked link inserts.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from core.shared.database.utils import bulk_persist, bulk_upsert, insert_rows, upsert_row
+from core.shared.local_store import SQLiteEventStore
+from core.shared.postgrest import AsyncPostgrestClient, PostgrestError
+from tests.helpers.postgrest_stub import PostgrestStub
+
+
+def make_client(stub):
+    return AsyncPostgrestClient(stub.url, "test-key", backoff_base=0.01)
+
+
+@pytest.mark.unit
+class TestBulkUpsert:
+    """Tests for bulk_upsert, bulk_persist and chunked insert_rows."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_and_returns_id_per_conflict_key(self):
+        async with PostgrestStub() as stub:
+            client = make_client(stub)
+            rows = [{"name": f"Speaker {i}", "title": "Dev"} for i in range(25)]
+            rows.append({"name": "Speaker 3", "title": "CTO"})
+            rows.append({"title": "No name"})
+
+            ids = await bulk_upsert("speakers", rows, chunk_size=10, db=client)
+
+            assert len(ids) == 25
+            assert len(set(ids.values())) == 25
+            upserts = [entry for entry in stub.request_log if entry[0] == "POST"]
+            assert sorted(count for _, _, count in upserts) == [5, 10, 10]
+            stored = {row["name"]: row for row in stub.tables["speakers"]}
+            # Later rows for the same conflict key win
+            assert stored["Speaker 3"]["title"] == "CTO"
+            assert ids["Speaker 3"] == stored["Speaker 3"]["id"]
+
+    @pytest.mark.asyncio
+    async def test_source_urls_are_merged_not_overwritten(self):
+        async with PostgrestStub() as stub:
+            stub.seed("speakers", [{"name": "Alice", "source_urls": json.dumps(["https://a.example"])}])
+            client = make_client(stub)
+
+            await bulk_upsert(
+                "speakers",
+                [{"name": "Alice"}, {"name": "Bob", "source_urls": ["https://c.example"]}],
+                source_url="https://b.example",
+                db=client,
+            )
+            await upsert_row("speakers", {"name": "Alice"}, source_url="https://a.example", db=client)
+
+            stored = {row["name"]: json.loads(row["source_urls"]) for row in stub.tables["speakers"]}
+            assert stored["Alice"] == ["https://a.example", "https://b.example"]
+            assert stored["Bob"] == ["https://c.example", "https://b.example"]
+
+            # Tables without sources are left alone
+            await bulk_upsert("events", [{"name": "DeFi Day"}], source_url="https://b.example", db=client)
+            assert "source_urls" not in stub.tables["events"][0]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_source_url_merges_keep_every_url(self):
+        async with PostgrestStub() as stub:
+            client = make_client(stub)
+            urls = [f"https://{i}.example" for i in range(10)]
+
+            await asyncio.gather(
+                *(bulk_upsert("speakers", [{"name": "Alice"}], source_url=url, db=client) for url in urls)
+            )
+
+            assert sorted(json.loads(stub.tables["speakers"][0]["source_urls"])) == sorted(urls)
+
+    @pytest.mark.asyncio
+    async def test_backslashes_and_quotes_survive_the_in_filter(self):
+        store = SQLiteEventStore()
+        names = ["C:\\temp", 'The "Quoted" One', "Trailing\\"]
+        store.load("speakers", [{"name": name, "source_urls": json.dumps(["https://a.example"])} for name in names])
+
+        ids = await bulk_upsert("speakers", [{"name": name} for name in names], source_url="https://b.example", db=store)
+
+        assert set(ids) == set(names)
+        for row in await store.select("speakers"):
+            assert json.loads(row["source_urls"]) == ["https://a.example", "https://b.example"]
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_group_keeps_ids_of_groups_already_written(self):
+        class RejectingStore(SQLiteEventStore):
+            async def upsert(self, table, rows, **kwargs):
+                if any("website_url" in row for row in rows):
+                    raise PostgrestError("value too long", status_code=400)
+                return await super().upsert(table, rows, **kwargs)
+
+        store = RejectingStore()
+        ids = await bulk_upsert(
+            "organizations",
+            [{"name": "IOG", "description": "Engineering"}, {"name": "Emurgo", "website_url": "https://emurgo.io"}],
+            db=store,
+        )
+
+        assert list(ids) == ["IOG"]
+        assert [row["name"] for row in await store.select("organizations")] == ["IOG"]
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_rows_with_different_columns_do_not_null_each_other(self):
+        async with PostgrestStub() as stub:
+            stub.seed("organizations", [{"name": "IOG", "website_url": "https://iog.io"}])
+            client = make_client(stub)
+
+            ids = await bulk_upsert(
+                "organizations",
+                [{"name": "IOG", "description": "Engineering"}, {"name": "Emurgo", "website_url": "https://emurgo.io"}],
+                db=client,
+            )
+
+            assert set(ids) == {"IOG", "Emurgo"}
+            iog = next(row for row in stub.tables["organizations"] if row["name"] == "IOG")
+            assert iog["website_url"] == "https://iog.io" and iog["description"] == "Engineering"
+
+    @pytest.mark.asyncio
+    async def test_bulk_persist_groups_tables_and_links_in_chunks(self):
+        async with PostgrestStub() as stub:
+            client = make_client(stub)
+            entities = [("events", {"luma_url": "https://lu.ma/defi", "name": "DeFi Day"})]
+            entities += [("speakers", {"name": f"Speaker {i}"}) for i in range(20)]
+            entities += [("organizations", {"name": "IOG"}), ("organizations", {"name": "Emurgo"})]
+
+            ids = await bulk_persist(entities, conflict_columns={"events": "luma_url"}, db=client)
+
+            assert len(ids["speakers"]) == 20 and len(ids["organizations"]) == 2
+            event_id = ids["events"]["https://lu.ma/defi"]
+            links = [{"event_id": event_id, "speaker_id": speaker_id} for speaker_id in ids["speakers"].values()]
+            await insert_rows(links, "event_speakers", chunk_size=8, db=client)
+            # Re-inserting links skips the duplicates
+            await insert_rows(links, "event_speakers", chunk_size=8, db=client)
+
+            assert len(stub.tables["event_speakers"]) == 20
+            # Two source_urls reads, three upserts and six link inserts instead of one round trip per row
+            assert stub.requests == 11
@@ -0,0 +1,207 @@
+"""
+Unit tests for the bounded LRU/TTL cache: eviction, expiry,
+byte accounting, metrics and single-flight fetches.
+"""
+
+import pytest
+import asyncio
+
+from core.shared.cache import BoundedCache, estimate_size, get_cache_stats
+from core.shared.url_utils import URLDeduplicator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBoundedCache:
+    """Tests for BoundedCache."""
+
+    @pytest.mark.unit
+    def test_lru_eviction_keeps_recently_used(self):
+        cache = BoundedCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # a is now most recent
+        cache.set("c", 3)
+
+        assert "b" not in cache
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert cache.stats["evictions"] == 1
+
+    @pytest.mark.unit
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = BoundedCache(ttl_seconds=10, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl_seconds=100)
+
+        clock.now += 11
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        cache.set("c", 3)
+        clock.now += 20
+        assert cache.purge_expired() == 1
+        assert len(cache) == 1
+        assert cache.stats["expirations"] == 2
+
+    @pytest.mark.unit
+    def test_byte_budget(self):
+        cache = BoundedCache(max_entries=None, max_bytes=estimate_size("k0") + estimate_size("x" * 1000) * 3)
+        for i in range(10):
+            cache.set(f"k{i}", "x" * 1000)
+
+        assert len(cache) == 2
+        assert cache.bytes <= cache.max_bytes
+        cache.set("huge", "x" * 100_000)
+        assert "huge" not in cache and cache.stats["rejected"] == 1
+
+        cache.pop("k9")
+        cache.pop("k8")
+        assert cache.bytes == 0
+
+    @pytest.mark.unit
+    def test_metrics_and_registry(self):
+        cache = BoundedCache(name="test_metrics_cache")
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+
+        stats = get_cache_stats()["test_metrics_cache"]
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1 and stats["bytes"] > 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_single_flight(self):
+        cache = BoundedCache()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(10)))
+
+        assert results == ["value"] * 10
+        assert len(calls) == 1
+        assert cache.stats["coalesced"] == 9
+        assert await cache.get_or_fetch("k", fetch) == "value"
+        assert len(calls) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_single_flight_errors_are_shared_not_cached(self):
+        cache = BoundedCache()
+        attempts = []
+
+        async def failing():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(cache.get_or_fetch("k", failing) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+        assert len(attempts) == 1
+        assert "k" not in cache
+
+        async def ok():
+            return 42
+
+        assert await cache.get_or_fetch("k", ok) == 42
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_waiters_retry_when_fetcher_is_cancelled(self):
+        cache = BoundedCache()
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def fast():
+            return "fresh"
+
+        leader = asyncio.ensure_future(cache.get_or_fetch("k", slow))
+        await started.wait()
+        follower = asyncio.ensure_future(cache.get_or_fetch("k", fast))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "fresh"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fetch_invalidated_in_flight_is_not_stored(self):
+        cache = BoundedCache()
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow():
+            started.set()
+            await release.wait()
+            return "old"
+
+        leader = asyncio.ensure_future(cache.get_or_fetch("k", slow))
+        await started.wait()
+        follower = asyncio.ensure_future(cache.get_or_fetch("k", slow))
+        await asyncio.sleep(0)
+        assert cache.invalidate("k")
+        release.set()
+
+        # Callers still get the value they waited for, but it is not kept
+        assert await leader == await follower == "old"
+        assert "k" not in cache
+
+        async def fresh():
+            return "new"
+
+        assert await cache.get_or_fetch("k", fresh) == "new"
+        assert not cache.invalidate("other")
+
+    @pytest.mark.unit
+    def test_registry_exports_the_module_singletons(self):
+        from core.shared.url_utils import url_deduplicator, url_normalizer
+
+        # Instances created later keep their caches out of the registry
+        other = URLDeduplicator()
+        other.normalizer.redirect_cache.get("https://e.com/missing")
+
+        stats = get_cache_stats()
+        assert stats["url_redirects"] == url_normalizer.redirect_cache.get_stats()
+        assert stats["url_redirect_hops"] == url_normalizer.hop_cache.get_stats()
+        assert stats["url_dedup_mappings"] == url_deduplicator.url_mappings.get_stats()
+        assert stats["url_dedup_canonical"] == url_deduplicator.canonical_urls.get_stats()
+
+    @pytest.mark.unit
+    def test_duplicate_names_are_reported(self, caplog):
+        first = BoundedCache(name="test_duplicate_cache")
+        second = BoundedCache(name="test_duplicate_cache")
+
+        assert get_cache_stats()["test_duplicate_cache"]["name"] == "test_duplicate_cache"
+        assert "already registered" in caplog.text
+        del first, second
+
+    @pytest.mark.unit
+    def test_url_deduplicator_is_bounded(self):
+        dedup = URLDeduplicator(max_urls=3)
+        dedup.normalizer.get_canonical_url = lambda url: url.rstrip("/")
+
+        dedup.add_url("https://e.com/a")
+        dedup.add_url("https://e.com/a/")
+        for i in range(5):
+            dedup.add_url(f"https://e.com/{i}")
+
+        assert len(dedup.url_mappings) == 3
+        assert len(dedup.canonical_urls) == 3
+        assert dedup.get_url_variants("https://e.com/4") == {"https://e.com/4"}
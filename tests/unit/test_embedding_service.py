@@ -0,0 +1,144 @@
+"""
+Unit tests for the batched embedding service: micro-batching, coalescing,
+the persistent content-hash cache, bounded concurrency and failures.
+"""
+
+import pytest
+import asyncio
+
+from core.shared.embedding_service import (
+    EmbeddingBackend,
+    EmbeddingCache,
+    EmbeddingService,
+    FakeEmbeddingBackend,
+)
+
+
+class FailingBackend(EmbeddingBackend):
+    name = "failing"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def embed_batch(self, texts):
+        self.calls += 1
+        raise RuntimeError("quota exceeded")
+
+
+class ConcurrencyTrackingBackend(FakeEmbeddingBackend):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.active = 0
+        self.peak = 0
+
+    async def embed_batch(self, texts):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            return await super().embed_batch(texts)
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.unit
+class TestEmbeddingService:
+    """Tests for EmbeddingService, EmbeddingCache and FakeEmbeddingBackend."""
+
+    def test_fake_backend_is_deterministic(self):
+        backend = FakeEmbeddingBackend(dimension=64)
+        first = backend.embed_text("Cardano summit in Lisbon")
+        assert first == FakeEmbeddingBackend(dimension=64).embed_text("Cardano summit in Lisbon")
+        assert len(first) == 64
+        assert sum(x * x for x in first) == pytest.approx(1.0)
+        assert first != backend.embed_text("Ethereum meetup in Berlin")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_batch(self):
+        backend = FakeEmbeddingBackend(dimension=32)
+        service = EmbeddingService(backend, batch_window=0.01)
+
+        texts = [f"event {i}" for i in range(20)] + ["event 3", "event 3"]
+        results = await asyncio.gather(*(service.embed(text) for text in texts))
+
+        assert backend.batch_sizes == [20]
+        assert results[0] == backend.embed_text("event 0")
+        assert results[-1] == results[3]
+        assert service.stats["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_full_batches_flush_without_waiting(self):
+        backend = FakeEmbeddingBackend(dimension=16, max_batch_size=10)
+        service = EmbeddingService(backend, batch_window=10.0)
+
+        results = await asyncio.wait_for(
+            service.embed_many([f"talk {i}" for i in range(30)]), timeout=1
+        )
+        assert backend.batch_sizes == [10, 10, 10]
+        assert all(result is not None for result in results)
+        assert service.get_stats()["average_batch_size"] == 10
+
+    @pytest.mark.asyncio
+    async def test_cache_persists_across_services(self, tmp_path):
+        path = str(tmp_path / "cache" / "embeddings.sqlite")
+        backend = FakeEmbeddingBackend(dimension=16)
+        service = EmbeddingService(backend, cache=EmbeddingCache(path))
+        first = await service.embed_many(["keynote", "workshop", "", None])
+        assert first[2] is None and first[3] is None
+
+        reopened = EmbeddingService(backend, cache=EmbeddingCache(path))
+        second = await reopened.embed_many(["workshop", "keynote", "panel"])
+
+        assert backend.batch_sizes == [2, 1]
+        assert second[0] == pytest.approx(first[1], abs=1e-6)
+        assert reopened.stats["cache_hits"] == 2
+        assert len(reopened.cache) == 3
+
+        # A different model never reuses cached vectors
+        other = EmbeddingService(FakeEmbeddingBackend(dimension=8), cache=EmbeddingCache(path))
+        assert len(await other.embed("keynote")) == 8
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency(self):
+        backend = ConcurrencyTrackingBackend(dimension=8, latency=0.02, max_batch_size=5)
+        service = EmbeddingService(backend, max_concurrent_batches=2)
+
+        await service.embed_many([f"text {i}" for i in range(40)])
+        assert len(backend.batch_sizes) == 8
+        assert backend.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_return_none_and_are_not_cached(self):
+        cache = EmbeddingCache()
+        backend = FailingBackend()
+        service = EmbeddingService(backend, cache=cache)
+
+        assert await service.embed_many(["a", "b"]) == [None, None]
+        assert await service.embed("a") is None
+        assert backend.calls == 2
+        assert service.stats["failures"] == 2
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_coalesced_waiters(self):
+        backend = FakeEmbeddingBackend(dimension=8, latency=0.05)
+        service = EmbeddingService(backend, cache=EmbeddingCache())
+
+        impatient = asyncio.create_task(asyncio.wait_for(service.embed("shared talk"), timeout=0.01))
+        patient = asyncio.create_task(service.embed("shared talk"))
+
+        with pytest.raises(asyncio.TimeoutError):
+            await impatient
+        assert await patient == backend.embed_text("shared talk")
+        assert backend.batch_sizes == [1]
+
+    def test_backend_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            EmbeddingBackend()
+
+    def test_service_rebinds_to_new_event_loop(self):
+        backend = FakeEmbeddingBackend(dimension=8)
+        service = EmbeddingService(backend)
+
+        assert asyncio.run(service.embed("hello")) is not None
+        assert asyncio.run(service.embed("world")) is not None
+        assert backend.batch_sizes == [1, 1]
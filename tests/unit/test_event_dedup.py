@@ -0,0 +1,117 @@
+"""
+Unit tests for the MinHash/LSH near-duplicate event index.
+"""
+
+import pytest
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from core.shared.event_dedup import NearDuplicateIndex, event_key_fields
+
+START = datetime(2025, 7, 1, 18, 0, tzinfo=timezone.utc)
+WORDS = (
+    "blockchain defi summit hackathon workshop meetup builders night party founders "
+    "ethereum cardano zero knowledge rollup layer security design growth ai agents "
+    "demo day panel breakfast networking governance dao wallet protocol research"
+).split()
+
+
+def random_title(rng):
+    return " ".join(rng.sample(WORDS, 4)).title()
+
+
+@dataclass
+class Extracted:
+    """Minimal stand-in with the ExtractedEventData fields the index reads."""
+
+    url: str
+    title: str
+    start_date: Optional[datetime]
+    location: Dict[str, Any] = field(default_factory=dict)
+
+
+class TestNearDuplicateIndex:
+    """Tests for NearDuplicateIndex."""
+
+    @pytest.mark.unit
+    def test_cross_platform_listing_is_duplicate(self):
+        index = NearDuplicateIndex()
+        luma = Extracted("https://lu.ma/ethcc-party", "EthCC Builders Party 2025", START, {"name": "Palais Brongniart"})
+        eventbrite = Extracted(
+            "https://www.eventbrite.com/e/123",
+            "EthCC Builders Party 2025!",
+            START + timedelta(hours=5),
+            {"name": "Palais Brongniart, Paris"},
+        )
+
+        assert index.check_and_add(luma) is None
+        match = index.check_and_add(eventbrite)
+
+        assert match is not None and match.event_id == "https://lu.ma/ethcc-party"
+        assert match.similarity >= 0.7
+        assert len(index) == 1
+
+    @pytest.mark.unit
+    def test_different_date_or_title_is_not_duplicate(self):
+        index = NearDuplicateIndex()
+        index.add(Extracted("https://lu.ma/a", "Weekly Solidity Meetup", START))
+
+        assert index.query(Extracted("https://x/b", "Weekly Solidity Meetup", START + timedelta(days=7))) == []
+        assert index.query(Extracted("https://x/c", "Zero Knowledge Workshop", START)) == []
+        assert index.query(Extracted("https://x/d", "Weekly Solidity Meetup", START + timedelta(days=1)))
+
+    @pytest.mark.unit
+    def test_persists_and_accepts_incremental_inserts(self, tmp_path):
+        path = str(tmp_path / "dedup" / "events.sqlite")
+        index = NearDuplicateIndex(path)
+        assert index.add_many(
+            Extracted(f"https://lu.ma/e{i}", f"Event number {i} about topic {i * 7}", START) for i in range(50)
+        ) == 50
+        index.close()
+
+        reopened = NearDuplicateIndex(path)
+        assert len(reopened) == 50
+        assert reopened.check_and_add(Extracted("https://meetup.com/x", "Event number 7 about topic 49", START))
+        assert reopened.check_and_add(Extracted("https://meetup.com/new", "Completely new hackathon", START)) is None
+        assert len(reopened) == 51
+        reopened.close()
+
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(path, bands=10)
+
+    @pytest.mark.unit
+    def test_lookups_only_touch_candidates(self):
+        rng = random.Random(7)
+        events = [
+            Extracted(f"https://lu.ma/e{i}", random_title(rng), START + timedelta(days=i % 30))
+            for i in range(3000)
+        ]
+        index = NearDuplicateIndex()
+        index.add_many(events)
+
+        matches = index.query(Extracted("https://x", events[42].title, events[42].start_date))
+
+        assert matches[0].event_id == "https://lu.ma/e42"
+        # ~300 events share the date window; only a handful are compared
+        assert index.stats["candidates"] < 30
+
+    @pytest.mark.unit
+    def test_numbered_sessions_are_distinct(self):
+        index = NearDuplicateIndex()
+        index.add(Extracted("https://lu.ma/s1", "Cardano Builders Workshop Session 1", START))
+
+        assert index.query(Extracted("https://x/s2", "Cardano Builders Workshop Session 2", START)) == []
+        assert index.query(Extracted("https://x/s", "Cardano Builders Workshop Session", START))
+
+    @pytest.mark.unit
+    def test_event_dictionaries(self):
+        assert event_key_fields(
+            {"name": "Row", "start_time": "2025-07-01T18:00:00Z", "location_name": "Hall"}
+        ) == ("Row", START.date(), "Hall")
+
+        index = NearDuplicateIndex()
+        index.add({"url": "https://lu.ma/row", "title": "Devcon side event", "start_date": START.isoformat()})
+        assert index.query({"name": "Devcon side event", "start_time": "2025-07-01T09:00:00"})
+        assert index.add({"url": "https://lu.ma/empty", "title": ""}) is False
@@ -0,0 +1,201 @@
+"""
+Unit tests for the embedded SQLite event store: the database layer's
+date-range, speaker, keyword and upsert paths run against it unchanged,
+plus duplicate handling, persistence and mirroring from PostgREST.
+"""
+
+import sqlite3
+
+import pytest
+
+from core.shared import local_store
+from core.shared.database import client as db_client
+from core.shared.database import query_cache
+from core.shared.database.search import (
+    _sync_keyword_search_events,
+    get_events_by_date_basic,
+    get_speaker_by_name,
+    keyword_search_events,
+)
+from core.shared.database.utils import _sync_upsert, bulk_upsert, insert_rows
+from core.shared.local_store import SQLiteEventStore
+from core.shared.postgrest import AsyncPostgrestClient, PostgrestError
+from tests.helpers.postgrest_stub import PostgrestStub
+
+EVENTS = [
+    {"name": "DeFi Day", "description": "Lending protocols", "start_time_iso": "2025-04-28T08:00:00+00:00", "luma_url": "https://lu.ma/defi"},
+    # 01:30 in Dubai is still April 27 in UTC
+    {"name": "Early Breakfast", "description": "Coffee", "start_time_iso": "2025-04-28T01:30:00+04:00", "luma_url": "https://lu.ma/early"},
+    {"name": "Late Night Hack", "description": "DeFi hacking", "start_time_iso": "2025-04-28T23:00:00Z", "luma_url": "https://lu.ma/late"},
+    {"name": "NFT Night", "description": "Art and collectibles", "start_time_iso": "2025-04-29T14:00:00+00:00", "luma_url": "https://lu.ma/nft"},
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    query_cache.clear_query_caches()
+    yield
+    query_cache.clear_query_caches()
+
+
+@pytest.fixture
+def store():
+    store = SQLiteEventStore()
+    store.load("events", EVENTS, on_conflict="luma_url")
+    yield store
+    store.close()
+
+
+@pytest.mark.unit
+class TestSQLiteEventStore:
+    """Tests for SQLiteEventStore as a StorageBackend."""
+
+    @pytest.mark.asyncio
+    async def test_date_range_compares_utc_instants(self, store):
+        rows = await get_events_by_date_basic("2025-04-28", "UTC", db=store, use_cache=False)
+        assert [row["name"] for row in rows] == ["DeFi Day", "Late Night Hack"]
+
+        rows = await get_events_by_date_basic("2025-04-28", "Asia/Dubai", db=store, use_cache=False)
+        assert [row["name"] for row in rows] == ["Early Breakfast", "DeFi Day"]
+
+    @pytest.mark.asyncio
+    async def test_select_filters_order_and_columns(self, store):
+        rows = await store.select(
+            "events",
+            "name",
+            filters=[("luma_url", 'in.("https://lu.ma/defi","https://lu.ma/nft")'), ("name", "neq.NFT Night")],
+        )
+        assert rows == [{"name": "DeFi Day"}]
+
+        rows = await store.select("events", "id,name", order="start_time_iso.desc", limit=2)
+        assert [row["name"] for row in rows] == ["NFT Night", "Late Night Hack"]
+        assert (await store.select("events", filters={"id": f"eq.{rows[0]['id']}"}))[0]["name"] == "NFT Night"
+        assert await store.select("events", filters={"description": "is.null"}) == []
+
+    @pytest.mark.asyncio
+    async def test_keyword_search_matches_substrings_like_the_rpc(self, store):
+        names = [row["name"] for row in await keyword_search_events("defi", db=store)]
+        assert names == ["DeFi Day", "Late Night Hack"]
+        # The keyword is one substring, not a set of words
+        assert await keyword_search_events("defi night", db=store) == []
+        assert [row["name"] for row in await keyword_search_events("ECTIB", db=store)] == ["NFT Night"]
+        assert await keyword_search_events("", db=store) == []
+
+        # The index follows updates
+        await bulk_upsert("events", [{"luma_url": "https://lu.ma/nft", "description": "DeFi art"}], conflict_column="luma_url", db=store)
+        assert "NFT Night" in [row["name"] for row in await keyword_search_events("defi", db=store)]
+        assert await keyword_search_events("collectibles", db=store) == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fts5", [True, False])
+    async def test_keyword_search_has_rpc_parity(self, fts5, monkeypatch):
+        monkeypatch.setattr(local_store, "FTS5_AVAILABLE", local_store.FTS5_AVAILABLE and fts5)
+        events = EVENTS + [
+            {"name": "Blockchain Summit", "description": "De-Fi panels", "start_time_iso": "2025-05-01T09:00:00Z", "luma_url": "https://lu.ma/chain"},
+            {"name": "Café Über", "description": "100% \"quoted\" fun_run", "start_time_iso": "2025-05-02T09:00:00Z", "luma_url": "https://lu.ma/cafe"},
+        ]
+        keywords = ["chain", "CHAIN", "de-fi", "DeFi", "Night Hack", "ht", "e", "ÜBER", "100%", '"quoted"', "_run", "missing"]
+        store = SQLiteEventStore()
+        store.load("events", events)
+        async with PostgrestStub() as stub:
+            stub.seed("events", events)
+            remote = AsyncPostgrestClient(stub.url, "test-key")
+            for keyword in keywords:
+                expected = [row["name"] for row in await keyword_search_events(keyword, limit=3, db=remote)]
+                found = [row["name"] for row in await keyword_search_events(keyword, limit=3, db=store)]
+                assert found == expected, keyword
+            await remote.aclose()
+        assert [row["name"] for row in await keyword_search_events("chain", db=store)] == ["Blockchain Summit"]
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_word_index_from_older_files_is_rebuilt(self, tmp_path):
+        if not local_store.FTS5_AVAILABLE:
+            pytest.skip("SQLite has no FTS5 trigram tokenizer")
+        path = str(tmp_path / "events.sqlite")
+        SQLiteEventStore(path).load("events", EVENTS)
+        conn = sqlite3.connect(path)
+        conn.execute('DROP TABLE "events__fts"')
+        conn.execute('CREATE VIRTUAL TABLE "events__fts" USING fts5(name, description)')
+        conn.commit()
+        conn.close()
+
+        store = SQLiteEventStore(path)
+        assert [row["name"] for row in await keyword_search_events("ectib", db=store)] == ["NFT Night"]
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_merges_rows_and_source_urls(self, store):
+        first = await bulk_upsert("speakers", [{"name": "Alice", "title": "CTO"}], source_url="https://lu.ma/defi", db=store)
+        second = await bulk_upsert("speakers", [{"name": "Alice", "company": "Acme"}], source_url="https://lu.ma/nft", db=store)
+
+        assert first == second
+        speaker = await get_speaker_by_name("alice", db=store)
+        assert speaker["title"] == "CTO"
+        stored = (await store.select("speakers", filters={"name": "eq.Alice"}))[0]
+        assert stored["company"] == "Acme"
+        assert "https://lu.ma/defi" in stored["source_urls"] and "https://lu.ma/nft" in stored["source_urls"]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_links_are_skipped_or_rejected(self, store):
+        links = [{"event_id": 1, "speaker_id": 1}, {"event_id": 1, "speaker_id": 2}]
+        await insert_rows(links, "event_speakers", db=store)
+        await insert_rows(links + [{"event_id": 2, "speaker_id": 1}], "event_speakers", db=store)
+        assert store.count("event_speakers") == 3
+
+        with pytest.raises(PostgrestError) as excinfo:
+            await store.insert("event_speakers", [{"event_id": 3, "speaker_id": 3}, links[0]])
+        assert excinfo.value.code == "23505"
+        # The whole batch is rolled back, as in Postgres
+        assert store.count("event_speakers") == 3
+
+        with pytest.raises(PostgrestError) as excinfo:
+            await store.rpc("missing_function")
+        assert excinfo.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_file_store_persists_and_is_selected_by_env(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "events.sqlite")
+        SQLiteEventStore(path).load("events", EVENTS)
+
+        monkeypatch.setenv("LOCAL_EVENT_STORE_PATH", path)
+        db_client.set_async_db_client(None)
+        try:
+            store = db_client.get_async_db_client()
+            assert isinstance(store, SQLiteEventStore)
+            assert len(await get_events_by_date_basic("2025-04-29", "UTC")) == 1
+        finally:
+            db_client.set_async_db_client(None)
+
+    def test_sync_wrappers_use_the_given_backend(self, store):
+        assert [row["name"] for row in _sync_keyword_search_events(store, "nft")] == ["NFT Night"]
+        assert _sync_upsert(store, "speakers", {"name": "Dana"}) is not None
+        assert store.count("speakers") == 1
+
+        # Other clients are deprecated and fall back to the shared backend
+        db_client.set_async_db_client(store)
+        try:
+            with pytest.warns(DeprecationWarning, match="_sync_keyword_search_events"):
+                assert [row["name"] for row in _sync_keyword_search_events(object(), "nft")] == ["NFT Night"]
+        finally:
+            db_client.set_async_db_client(None)
+
+    @pytest.mark.asyncio
+    async def test_mirror_from_postgrest_pages_by_id(self):
+        async with PostgrestStub() as stub:
+            stub.seed("events", EVENTS)
+            stub.seed("event_speakers", [{"event_id": 1, "speaker_id": 1}])
+            remote = AsyncPostgrestClient(stub.url, "test-key")
+            store = SQLiteEventStore()
+
+            copied = await store.mirror_from(remote, tables=["events", "event_speakers"], page_size=3)
+            assert copied == {"events": 4, "event_speakers": 1}
+            assert sum(1 for method, table, _ in stub.request_log if table == "events") == 2
+
+            # Mirroring again refreshes rows in place
+            stub.tables["events"][0]["name"] = "DeFi Day 2"
+            await store.mirror_from(remote, tables=["events", "event_speakers"], page_size=3)
+            assert store.count("events") == 4 and store.count("event_speakers") == 1
+            first = (await store.select("events", filters={"id": f"eq.{stub.tables['events'][0]['id']}"}))[0]
+            assert first["name"] == "DeFi Day 2"
+            await remote.aclose()
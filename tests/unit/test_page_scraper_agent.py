@@ -0,0 +1,83 @@
+"""
+Unit tests for PageScraperAgent's scrape path with a fake browser pool:
+text and image extraction share one parse of the page.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from core.shared import bs_utils
+from examples import page_scraper_agent
+from examples.page_scraper_agent import PageScraperAgent
+
+PAGE = """<html><head><meta property="og:image" content="/og.png"><script>track()</script></head>
+<body><h1>Builders Night</h1><img src="/covers/1.jpg"><p style="background: url('/bg.webp')">Talks and demos</p></body></html>"""
+
+
+class FakePage:
+    url = "https://lu.ma/builders-night"
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def content(self):
+        return PAGE
+
+
+class FakePool:
+    def __init__(self):
+        self.released = []
+
+    async def acquire(self, profile):
+        return SimpleNamespace(context=SimpleNamespace(new_page=AsyncMock(return_value=FakePage())))
+
+    async def release(self, lease):
+        self.released.append(lease)
+
+
+@pytest.mark.unit
+class TestPageScraperAgent:
+    """Tests for PageScraperAgent.run_async."""
+
+    @pytest.mark.asyncio
+    async def test_scrape_parses_page_once_for_text_and_images(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        parses = []
+        parse_html = bs_utils._parse_html
+        monkeypatch.setattr(bs_utils, "_parse_html", lambda html: parses.append(1) or parse_html(html))
+
+        evasion_manager = Mock(
+            get_evasion_config=AsyncMock(return_value=SimpleNamespace(profile_name="test")),
+            apply_page_evasion=AsyncMock(),
+        )
+        monkeypatch.setattr(page_scraper_agent, "AntiBotEvasionManager", Mock(return_value=evasion_manager))
+        pool = FakePool()
+        agent = PageScraperAgent(browser_pool=pool)
+
+        result = await agent.run_async("https://lu.ma/e/123")
+
+        assert result["status"] == "Success"
+        assert result["text_content"] == "Builders Night Talks and demos"
+        assert result["image_urls"] == [
+            "https://lu.ma/bg.webp",
+            "https://lu.ma/covers/1.jpg",
+            "https://lu.ma/og.png",
+        ]
+        assert len(parses) == 1
+        assert len(pool.released) == 1
+
+    def test_reset_for_lease_keeps_pool_and_rebuilds_evasion(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        managers = []
+        monkeypatch.setattr(page_scraper_agent, "AntiBotEvasionManager", lambda **kwargs: managers.append(kwargs) or Mock())
+        pool = FakePool()
+        agent = PageScraperAgent(browser_pool=pool)
+
+        agent.reset_for_lease(name="Scraper 2", browser_pool=pool)
+
+        assert agent.name == "Scraper 2"
+        assert agent.browser_pool is pool
+        assert managers[1] == {"evasion_level": page_scraper_agent.EvasionLevel.STANDARD, "logger": agent.logger}
+        with pytest.raises(ValueError):
+            agent.reset_for_lease()
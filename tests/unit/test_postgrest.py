@@ -0,0 +1,143 @@
+"""
+Unit tests for the async PostgREST client against a local stand-in:
+CRUD and RPC calls, connection reuse, retries, error mapping, deadline
+propagation and the sync bridge.
+"""
+
+import pytest
+import asyncio
+import time
+
+from core.shared.postgrest import (
+    UNIQUE_VIOLATION,
+    AsyncPostgrestClient,
+    DeadlineExceeded,
+    PostgrestError,
+    StorageBackend,
+    deadline,
+    remaining_time,
+    run_sync,
+)
+from tests.helpers.postgrest_stub import PostgrestStub
+
+
+def make_client(stub, **kwargs):
+    kwargs.setdefault("backoff_base", 0.01)
+    return AsyncPostgrestClient(stub.url, "test-key", **kwargs)
+
+
+@pytest.mark.unit
+class TestAsyncPostgrestClient:
+    """Tests for AsyncPostgrestClient, deadline and run_sync."""
+
+    @pytest.mark.asyncio
+    async def test_crud_and_rpc_over_pooled_connections(self):
+        async with PostgrestStub() as stub:
+            stub.seed("events", [
+                {"name": "DeFi Day", "description": "lending", "start_time_iso": "2025-04-28T10:00:00+00:00"},
+                {"name": "NFT Night", "description": "art", "start_time_iso": "2025-04-29T18:00:00+00:00"},
+                {"name": "DeFi Summit", "description": "panels", "start_time_iso": "2025-04-30T09:00:00+00:00"},
+            ])
+            client = make_client(stub, max_connections=20, max_keepalive_connections=20)
+
+            rows = await client.select(
+                "events",
+                "id, name",
+                filters=[
+                    ("start_time_iso", "gte.2025-04-28T00:00:00+00:00"),
+                    ("start_time_iso", "lte.2025-04-29T23:59:59+00:00"),
+                ],
+                order="start_time_iso.desc",
+            )
+            assert rows == [{"id": 2, "name": "NFT Night"}, {"id": 1, "name": "DeFi Day"}]
+            assert await client.select("events", "id", filters={"id": "in.(1,3)"}) == [{"id": 1}, {"id": 3}]
+
+            matches = await client.rpc("keyword_search_events", {"keyword": "defi", "result_limit": 1})
+            assert [row["name"] for row in matches] == ["DeFi Day"]
+
+            upserted = await client.upsert("speakers", [{"name": "Alice", "title": "CTO"}], on_conflict="name")
+            again = await client.upsert("speakers", [{"name": "Alice", "title": "CEO"}], on_conflict="name")
+            assert upserted[0]["id"] == again[0]["id"] and again[0]["title"] == "CEO"
+
+            assert await client.insert("event_speakers", [{"event_id": 1, "speaker_id": 1}]) == []
+
+            # Keep-alive: sequential requests share one connection, concurrent ones stay within the pool
+            assert len(stub.peers) == 1
+            await asyncio.gather(*(client.select("events", "id") for _ in range(50)))
+            assert len(stub.peers) <= client.limits.max_connections
+            assert client.get_stats()["requests"] == stub.requests
+            await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_are_retried(self):
+        async with PostgrestStub(fail_first=2, fail_status=503) as stub:
+            client = make_client(stub)
+            assert await client.select("events") == []
+            assert client.stats["retries"] == 2
+
+        async with PostgrestStub(fail_first=5, fail_status=502) as stub:
+            client = make_client(stub, max_retries=1)
+            with pytest.raises(PostgrestError) as error:
+                await client.select("events")
+            assert error.value.status_code == 502
+            assert stub.requests == 2
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        async with PostgrestStub() as stub:
+            client = make_client(stub)
+            await client.insert("event_speakers", [{"event_id": 1, "speaker_id": 2}])
+            with pytest.raises(PostgrestError) as error:
+                await client.insert("event_speakers", [{"event_id": 1, "speaker_id": 2}])
+            assert error.value.code == UNIQUE_VIOLATION and error.value.status_code == 409
+            assert client.stats["retries"] == 0
+
+            # Duplicates can be skipped instead
+            await client.insert(
+                "event_speakers",
+                [{"event_id": 1, "speaker_id": 2}, {"event_id": 1, "speaker_id": 3}],
+                ignore_duplicates=True,
+            )
+            assert len(stub.tables["event_speakers"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_deadline_bounds_requests_and_retries(self):
+        async with PostgrestStub(latency=0.5) as stub:
+            client = make_client(stub, timeout=10)
+            start = time.monotonic()
+            with deadline(0.1):
+                assert 0 < remaining_time() <= 0.1
+                with deadline(5):
+                    # Inner deadlines never extend outer ones
+                    assert remaining_time() <= 0.1
+                with pytest.raises(DeadlineExceeded):
+                    await client.select("events")
+            assert time.monotonic() - start < 0.4
+            assert remaining_time() is None
+            assert client.stats["deadline_exceeded"] == 1
+
+    def test_run_sync_reuses_background_loop_and_carries_deadline(self):
+        stub = PostgrestStub()
+        with stub.serve_in_thread():
+            stub.seed("speakers", [{"name": "Bob"}])
+            client = make_client(stub)
+
+            for _ in range(5):
+                assert run_sync(client.select("speakers", "name")) == [{"name": "Bob"}]
+            assert client.get_stats()["event_loops"] == 1
+            assert len(stub.peers) == 1
+
+            stub.latency = 0.3
+            with deadline(0.05):
+                with pytest.raises(DeadlineExceeded):
+                    run_sync(client.select("speakers"))
+
+    def test_storage_backend_interface_is_abstract(self):
+        class SelectOnly(StorageBackend):
+            async def select(self, table, columns="*", filters=None, order=None, limit=None):
+                return []
+
+        with pytest.raises(TypeError):
+            StorageBackend()
+        with pytest.raises(TypeError, match="insert"):
+            SelectOnly()
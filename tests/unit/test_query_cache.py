@@ -0,0 +1,153 @@
+"""
+Unit tests for the read-through query caches: key normalization, single
+query per stampede, copies on read, invalidation from the upsert path and
+hit-rate export to the API metrics.
+"""
+
+import pytest
+import asyncio
+
+from api.utils import monitoring
+from core.shared.database import query_cache
+from core.shared.database.search import get_events_by_date_basic, get_speaker_by_name
+from core.shared.database.utils import bulk_upsert
+from core.shared.postgrest import AsyncPostgrestClient
+from tests.helpers.postgrest_stub import PostgrestStub
+
+EVENTS = [
+    {"name": "DeFi Day", "start_time_iso": "2025-04-28T08:00:00+00:00", "luma_url": "https://lu.ma/defi"},
+    {"name": "NFT Night", "start_time_iso": "2025-04-29T14:00:00+00:00", "luma_url": "https://lu.ma/nft"},
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    query_cache.clear_query_caches()
+    yield
+    query_cache.clear_query_caches()
+
+
+def reads(stub, table):
+    return sum(1 for method, name, _ in stub.request_log if method == "GET" and name == table)
+
+
+@pytest.mark.unit
+class TestQueryCache:
+    """Tests for the events-by-date and speaker caches."""
+
+    @pytest.mark.asyncio
+    async def test_date_spellings_share_one_query(self):
+        async with PostgrestStub() as stub:
+            stub.seed("events", EVENTS)
+            client = AsyncPostgrestClient(stub.url, "test-key")
+
+            results = await asyncio.gather(
+                *(get_events_by_date_basic(d, "UTC", db=client) for d in ["2025-04-28", "April 28 2025", "28th April 2025"] * 10)
+            )
+
+            assert all([row["name"] for row in rows] == ["DeFi Day"] for rows in results)
+            assert reads(stub, "events") == 1
+            # Callers get copies they can clean without touching the cache
+            results[0][0]["name"] = "changed"
+            assert (await get_events_by_date_basic("2025-04-28", "UTC", db=client))[0]["name"] == "DeFi Day"
+
+            # A different timezone is a different UTC range
+            await get_events_by_date_basic("2025-04-28", "Asia/Dubai", db=client)
+            assert reads(stub, "events") == 2
+
+    @pytest.mark.asyncio
+    async def test_speaker_names_are_normalized_and_misses_cached(self):
+        async with PostgrestStub() as stub:
+            stub.seed("speakers", [{"name": "Alice Smith", "title": "CTO"}])
+            client = AsyncPostgrestClient(stub.url, "test-key")
+
+            first = await get_speaker_by_name("Alice Smith", db=client)
+            again = await get_speaker_by_name("  alice   SMITH ", db=client)
+            assert first["title"] == again["title"] == "CTO"
+            assert await get_speaker_by_name("Nobody", db=client) is None
+            assert await get_speaker_by_name("nobody", db=client) is None
+            assert reads(stub, "speakers") == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self):
+        async with PostgrestStub(fail_first=1, fail_status=400) as stub:
+            stub.seed("speakers", [{"name": "Bob"}])
+            client = AsyncPostgrestClient(stub.url, "test-key")
+
+            assert await get_speaker_by_name("Bob", db=client) is None
+            assert (await get_speaker_by_name("Bob", db=client))["name"] == "Bob"
+
+    @pytest.mark.asyncio
+    async def test_upserts_invalidate_affected_entries(self):
+        async with PostgrestStub() as stub:
+            stub.seed("events", EVENTS)
+            client = AsyncPostgrestClient(stub.url, "test-key")
+            assert await get_speaker_by_name("Carol", db=client) is None
+            await get_events_by_date_basic("2025-04-28", "UTC", db=client)
+            await get_events_by_date_basic("2025-04-29", "UTC", db=client)
+
+            await bulk_upsert("speakers", [{"name": "Carol"}], db=client)
+            assert (await get_speaker_by_name("carol", db=client))["name"] == "Carol"
+
+            # Moving DeFi Day to the 29th drops both days; a new event on the 30th drops neither
+            await bulk_upsert(
+                "events",
+                [{"luma_url": "https://lu.ma/defi", "start_time_iso": "2025-04-29T09:00:00+00:00"}],
+                conflict_column="luma_url",
+                db=client,
+            )
+            assert await get_events_by_date_basic("2025-04-28", "UTC", db=client) == []
+            names = [row["name"] for row in await get_events_by_date_basic("2025-04-29", "UTC", db=client)]
+            assert names == ["DeFi Day", "NFT Night"]
+
+            await bulk_upsert(
+                "events",
+                [{"luma_url": "https://lu.ma/new", "name": "New", "start_time_iso": "2025-04-30T09:00:00+00:00"}],
+                conflict_column="luma_url",
+                db=client,
+            )
+            assert len(query_cache.events_by_date_cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_writes_during_a_fetch_are_not_cached(self):
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_miss():
+            started.set()
+            await release.wait()
+            return None
+
+        lookup = asyncio.ensure_future(query_cache.cached_speaker("Erin", slow_miss))
+        await started.wait()
+        query_cache.invalidate_rows("speakers", [{"name": "Erin"}], "name")
+        release.set()
+
+        assert await lookup is None
+        assert "erin" not in query_cache.speaker_cache
+
+        started.clear()
+        release.clear()
+
+        async def slow_events():
+            started.set()
+            await release.wait()
+            return []
+
+        key = query_cache.events_key("2025-04-28T00:00:00+00:00", "2025-04-28T23:59:59+00:00", "UTC")
+        lookup = asyncio.ensure_future(query_cache.cached_events_by_date(key, slow_events))
+        await started.wait()
+        query_cache.invalidate_rows("events", [{"luma_url": "https://lu.ma/x", "start_time_iso": "2025-04-28T12:00:00Z"}], "luma_url")
+        release.set()
+
+        assert await lookup == []
+        assert key not in query_cache.events_by_date_cache
+
+    def test_hit_rates_are_exported_to_api_metrics(self):
+        query_cache.speaker_cache.set("dave", None)
+        query_cache.speaker_cache.get("dave")
+
+        monitoring.track_cache_stats()
+
+        metrics = monitoring.metrics_store.get_metrics()
+        key = 'cache_hit_rate:{"cache": "db_speaker_by_name"}'
+        assert metrics[key]["value"] > 0
@@ -0,0 +1,214 @@
+"""
+Unit tests for the GCRA rate limiter, its in-memory and SQLite
+backends, and the RateLimiter / UserRateLimitManager wrappers.
+"""
+
+import pytest
+import asyncio
+import sqlite3
+import time
+
+from core.shared.rate_limit import (
+    GCRARateLimiter,
+    InMemoryRateLimitBackend,
+    RateLimiter,
+    SQLiteRateLimitBackend,
+    UserRateLimitManager,
+    domain_key,
+    user_key,
+)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.mark.unit
+class TestGCRARateLimiter:
+    """Core GCRA behaviour."""
+
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        limiter = GCRARateLimiter(max_calls=3, period_seconds=3, clock=clock)
+
+        assert [limiter.try_acquire("k")[0] for _ in range(3)] == [True, True, True]
+        allowed, retry_after = limiter.try_acquire("k")
+        assert not allowed
+        assert retry_after == pytest.approx(1.0)
+
+        clock.advance(1.0)
+        assert limiter.try_acquire("k")[0]
+        assert not limiter.try_acquire("k")[0]
+
+    def test_keys_are_independent(self):
+        clock = FakeClock()
+        limiter = GCRARateLimiter(max_calls=1, period_seconds=10, clock=clock)
+
+        assert limiter.try_acquire(domain_key("https://www.lu.ma/a"))[0]
+        assert not limiter.try_acquire(domain_key("https://lu.ma/b"))[0]
+        assert limiter.try_acquire(domain_key("https://meetup.com/c"))[0]
+
+    def test_remaining_and_retry_after(self):
+        clock = FakeClock()
+        limiter = GCRARateLimiter(max_calls=5, period_seconds=5, clock=clock)
+
+        assert limiter.get_remaining("k") == 5
+        for _ in range(5):
+            limiter.try_acquire("k")
+        assert limiter.get_remaining("k") == 0
+        assert limiter.get_retry_after("k") == pytest.approx(1.0)
+
+        clock.advance(2.0)
+        assert limiter.get_remaining("k") == 2
+        assert limiter.get_retry_after("k") == 0.0
+
+    def test_reserve_spaces_out_waiters(self):
+        clock = FakeClock()
+        limiter = GCRARateLimiter(max_calls=2, period_seconds=2, burst=1, clock=clock)
+
+        delays = [limiter.reserve("k") for _ in range(4)]
+        assert delays == pytest.approx([0.0, 1.0, 2.0, 3.0])
+
+    @pytest.mark.asyncio
+    async def test_acquire_sleeps_until_next_token(self):
+        limiter = GCRARateLimiter(max_calls=20, period_seconds=1, burst=1)
+
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire("k")
+        elapsed = time.monotonic() - start
+
+        assert 0.09 <= elapsed < 0.3
+
+
+@pytest.mark.unit
+class TestRateLimitBackends:
+    """Storage backends."""
+
+    def test_in_memory_evicts_least_recently_used(self):
+        clock = FakeClock()
+        backend = InMemoryRateLimitBackend(max_keys=2)
+        limiter = GCRARateLimiter(max_calls=2, period_seconds=60, backend=backend, clock=clock)
+
+        limiter.try_acquire("a")
+        limiter.try_acquire("b")
+        clock.advance(30)
+        limiter.try_acquire("a")  # "a" is used again, "b" has gone idle
+        limiter.try_acquire("c")
+
+        assert len(backend) == 2
+        assert backend.peek("b") is None
+        assert backend.evictions == 1
+
+    def test_in_memory_keeps_keys_still_inside_their_window(self):
+        clock = FakeClock()
+        backend = InMemoryRateLimitBackend(max_keys=2)
+        limiter = GCRARateLimiter(max_calls=1, period_seconds=60, backend=backend, clock=clock)
+
+        for key in ("a", "b", "c"):
+            assert limiter.try_acquire(key)[0]
+
+        # Evicting "a" would have reset its budget
+        assert len(backend) == 3
+        assert backend.evictions == 0
+        assert not limiter.try_acquire("a")[0]
+
+        # Idle keys go on the next sweep, once the store has doubled
+        clock.advance(60)
+        for key in ("d", "e", "f", "g"):
+            limiter.try_acquire(key)
+        assert len(backend) == 4
+        assert [backend.peek(key) for key in ("a", "b", "c")] == [None, None, None]
+        assert backend.evictions == 3
+
+    def test_sqlite_backend_shares_budget_across_limiters(self, tmp_path):
+        path = str(tmp_path / "limits.db")
+        first = GCRARateLimiter(3, 60, backend=SQLiteRateLimitBackend(path))
+        second = GCRARateLimiter(3, 60, backend=SQLiteRateLimitBackend(path))
+
+        results = [first.try_acquire("global")[0], second.try_acquire("global")[0]]
+        results += [first.try_acquire("global")[0], second.try_acquire("global")[0]]
+
+        assert results == [True, True, True, False]
+        first.backend.close()
+        second.backend.close()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_acquire_does_not_block_the_event_loop(self, tmp_path):
+        path = str(tmp_path / "limits.db")
+        backend = SQLiteRateLimitBackend(path, busy_timeout=5.0)
+        limiter = GCRARateLimiter(3, 60, backend=backend)
+
+        # Another process holds the write lock, so the update waits on busy_timeout
+        blocker = sqlite3.connect(path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        asyncio.get_running_loop().call_later(0.2, blocker.commit)
+        waited = await limiter.acquire("global")
+        ticker.cancel()
+
+        assert waited == 0
+        assert ticks > 5
+        blocker.close()
+        backend.close()
+
+
+@pytest.mark.unit
+class TestRateLimitWrappers:
+    """Backward-compatible wrappers."""
+
+    def test_rate_limiter_wrapper(self):
+        limiter = RateLimiter(max_calls=2, period_seconds=60)
+
+        assert limiter.is_allowed()
+        assert limiter.get_remaining_calls() == 1
+        assert limiter.is_allowed()
+        assert not limiter.is_allowed()
+        assert limiter.get_retry_after_seconds() > 0
+
+    def test_user_manager_overrides(self):
+        manager = UserRateLimitManager(default_max_calls=1, default_period_seconds=60)
+
+        assert manager.is_user_allowed("alice")
+        assert not manager.is_user_allowed("alice")
+        assert manager.is_user_allowed("bob")
+
+        manager.update_user_limit("alice", 5, 60)
+        assert manager.get_user_remaining_calls("alice") == 5
+        assert manager.is_user_allowed("alice")
+
+    def test_user_manager_overrides_use_the_shared_backend(self, tmp_path):
+        backend = SQLiteRateLimitBackend(str(tmp_path / "limits.db"))
+        manager = UserRateLimitManager(default_max_calls=1, default_period_seconds=60, backend=backend)
+        other = UserRateLimitManager(default_max_calls=1, default_period_seconds=60, backend=backend)
+
+        manager.update_user_limit("alice", 2, 60)
+        other.update_user_limit("alice", 2, 60)
+
+        assert manager.default_limiter.backend is backend
+        assert manager.user_overrides["alice"].backend is backend
+        results = [manager.is_user_allowed("alice"), other.is_user_allowed("alice"), manager.is_user_allowed("alice")]
+        assert results == [True, True, False]
+        backend.close()
+
+    def test_keys(self):
+        assert domain_key("https://WWW.Eventbrite.com/e/1") == "domain:eventbrite.com"
+        assert domain_key("") == "domain:unknown"
+        assert user_key("42") == "user:42"
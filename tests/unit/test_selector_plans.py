@@ -0,0 +1,177 @@
+"""
+Unit tests for compiled platform extraction plans: source short-circuiting,
+selector priority in grouped queries, plan caching and hot reload.
+"""
+
+import json
+
+import pytest
+from lxml.cssselect import CSSSelector
+
+from core.shared.bs_utils import HTMLDocument
+from core.shared.selector_plans import FieldPlan, _element_value, compile_plan
+from examples.text_extraction_agent import EnhancedTextExtractionAgent, RegionalSession
+
+JSON_LD = json.dumps(
+    {
+        "@context": "https://schema.org",
+        "@graph": [
+            {"@type": "Organization", "name": "Not the event"},
+            {
+                "@type": "MusicEvent",
+                "name": "Structured Title",
+                "startDate": "2025-06-01T19:00:00Z",
+                "location": {"@type": "Place", "address": {"streetAddress": "1 Main St"}},
+                "offers": [{"price": 25}],
+            },
+        ],
+    }
+)
+
+PAGE = f"""
+<html><head>
+  <title>Head Title</title>
+  <meta property="og:title" content="OG Title">
+  <meta property="og:description" content="OG description">
+  <script type="application/ld+json">{JSON_LD}</script>
+</head><body>
+  <h1>Heading Title</h1>
+  <div class="organizer">  Hosted   by Ada </div>
+</body></html>
+"""
+
+
+@pytest.fixture(scope="module")
+def agent():
+    return EnhancedTextExtractionAgent(region_manager=None)
+
+
+def naive_select(selectors, root):
+    """Reference: try each selector in turn, first non-empty match wins."""
+    for selector in selectors:
+        for element in CSSSelector(selector, translator="html")(root):
+            value = _element_value(element)
+            if value:
+                return value
+    return None
+
+
+@pytest.mark.unit
+class TestExtractionPlans:
+    """Tests for compile_plan and ExtractionPlan.execute."""
+
+    def test_sources_short_circuit_in_order(self, agent):
+        plan = agent.get_extraction_plan("generic")
+        matches = plan.execute(HTMLDocument(PAGE))
+
+        assert matches["title"].value == "Structured Title"
+        assert matches["title"].method == "json_ld"
+        assert matches["location"].value == "1 Main St"
+        assert matches["price"].value == "25"
+        assert matches["description"].method == "open_graph"
+        assert matches["organizer"].method == "css_selector"
+        assert "end_date" not in matches
+        assert matches["title"].confidence > matches["organizer"].confidence
+
+    def test_regex_fallback(self, agent):
+        plan = agent.get_extraction_plan("meetup")
+        matches = plan.execute('<p>x</p><script>var e = {"startDate": "2025-07-04"};</script>')
+
+        assert matches["start_date"].value == "2025-07-04"
+        assert matches["start_date"].method == "regex"
+
+    def test_grouped_query_keeps_selector_priority(self, agent):
+        html = """
+        <html><head><title>Head</title></head><body>
+          <nav><h1>Site name</h1></nav>
+          <div role="main"><span class="event-title"></span><h1>Main heading</h1></div>
+          <div class="event-title">Event title</div>
+          <div class="date">ignored</div><time class="date" datetime="2025-01-02">Jan 2</time>
+        </body></html>
+        """
+        for page in (html, PAGE):
+            root = HTMLDocument(page).root
+            for platform, plan in agent.extraction_plans.items():
+                walked = plan.selector_index.select(root)
+                for field_plan in plan.fields:
+                    expected = naive_select(field_plan.selectors, root)
+                    assert field_plan.select(root) == expected, (platform, field_plan.field_name)
+                    assert walked.get(field_plan.field_name) == expected, (platform, field_plan.field_name)
+
+        root = HTMLDocument(html).root
+        facebook = agent.get_extraction_plan("facebook").fields_by_name["title"]
+        assert facebook.select(root) == "Main heading"
+
+    def test_plans_are_cached_by_config_content(self, agent):
+        config = dict(agent.platform_configs["eventbrite"])
+        same = compile_plan("eventbrite", config, agent.extraction_patterns)
+        assert same is agent.get_extraction_plan("eventbrite")
+
+        config["title_selectors"] = [".headline"] + config["title_selectors"]
+        changed = compile_plan("eventbrite", config, agent.extraction_patterns)
+        assert changed is not same
+        assert changed.fields_by_name["title"].selectors[0] == ".headline"
+
+    def test_hot_reload(self):
+        agent = EnhancedTextExtractionAgent(region_manager=None)
+        luma_plan = agent.get_extraction_plan("luma")
+        assert luma_plan is agent.extraction_plans["lu.ma"]
+        html = '<h1 class="event-title">Old</h1><div class="headline">New</div>'
+        assert agent.extract_fields_from_html(html, "https://lu.ma/abc")["title"].processed_value == "Old"
+
+        configs = {name: dict(config) for name, config in agent.platform_configs.items()}
+        configs["lu.ma"]["title_selectors"] = [".headline"]
+        assert agent.reload_platform_configs(configs) == ["lu.ma"]
+        assert agent.extract_fields_from_html(html, "https://lu.ma/abc")["title"].processed_value == "New"
+
+        broken = {name: dict(config) for name, config in configs.items()}
+        broken["generic"]["title_selectors"] = ["h1[["]
+        with pytest.raises(ValueError):
+            agent.reload_platform_configs(broken)
+        assert agent.platform_configs is configs
+        assert agent.get_extraction_plan("generic") is not None
+
+    @pytest.mark.asyncio
+    async def test_fetched_pages_are_extracted_with_the_plan(self):
+        agent = EnhancedTextExtractionAgent(region_manager=None)
+        url = "https://example.com/events/1"
+
+        outcomes = [
+            outcome
+            async for outcome in agent.iter_extracted_events(
+                RegionalSession("us-east"), [url], pages={url: PAGE}
+            )
+        ]
+
+        event = outcomes[0].event_data
+        assert event.title == "Structured Title"
+        assert event.description == "OG description"
+        assert event.start_date.isoformat() == "2025-06-01T19:00:00+00:00"
+        assert event.location == {"name": "1 Main St"}
+        assert event.organizer == {"name": "Hosted   by Ada"}
+        assert event.metadata["extraction_method"] == "selector_plan"
+        assert event.field_extraction_results["title"].extraction_method == "json_ld"
+
+    def test_field_plan_cleans_through_agent(self, agent):
+        html = '<div class="description"> Tea &amp; <b>talks</b>\n  at   noon </div>'
+        results = agent.extract_fields_from_html(html, "https://example.com/e/1")
+
+        assert results["description"].raw_value == "Tea & talks\n  at   noon"
+        assert results["description"].processed_value == "Tea & talks at noon"
+        assert results["description"].extraction_method == "css_selector"
+        assert FieldPlan("title").select(HTMLDocument(PAGE).root) is None
+
+    def test_selector_index_matches_cssselect(self):
+        html = """
+        <div id="main" class="a b" lang="en-US"><p class="x">first</p><p>second</p></div>
+        <span data-kind="event card" title="Talk: intro">span</span>
+        <ul><li>one</li><li class="x">two</li></ul>
+        """
+        root = HTMLDocument(html).root
+        selectors = [
+            "#main p:not(.x)", "li:nth-child(2)", "[lang|=en] .x", "[data-kind~=card]",
+            "[title^=Talk]", "[title$=intro]", "div.a.b > p", "ul li + li", "p:first-child",
+        ]
+        for selector in selectors:
+            assert FieldPlan("title", [selector]).select(root) == naive_select([selector], root), selector
+        assert FieldPlan("title", selectors).select(root) == "second"
@@ -0,0 +1,56 @@
+"""
+Unit tests for MCP server import-time profiling.
+"""
+
+import sys
+import pytest
+from pathlib import Path
+
+# MCP server modules are imported from their own directory, as the servers do
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "mcp"))
+
+from startup_profile import parse_importtime, profile_imports
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | io
+import time:      1500 |       1500 |     bs4.element
+import time:       900 |       2400 |   bs4
+import time:       200 |       2600 | my_server
+"""
+
+
+class TestStartupProfile:
+    """Tests for -X importtime parsing and cold-start profiling."""
+
+    @pytest.mark.unit
+    def test_parse_importtime(self):
+        timings = parse_importtime(SAMPLE)
+
+        assert [t.module for t in timings] == ["_io", "io", "bs4.element", "bs4", "my_server"]
+        assert timings[1].self_us == 300 and timings[1].cumulative_us == 420
+        assert [t.depth for t in timings] == [1, 0, 2, 1, 0]
+
+    @pytest.mark.unit
+    def test_profile_imports_reports_heavy_modules(self, tmp_path):
+        (tmp_path / "examples").mkdir()
+        (tmp_path / "examples" / "__init__.py").write_text("")
+        (tmp_path / "examples" / "slow_agent.py").write_text("import json\n")
+        (tmp_path / "eager_server.py").write_text("import examples.slow_agent\n")
+        (tmp_path / "lazy_server.py").write_text("import importlib\n")
+
+        eager = profile_imports("eager_server", [str(tmp_path)], top_n=3)
+        lazy = profile_imports("lazy_server", [str(tmp_path)], top_n=3)
+
+        assert eager["success"] and lazy["success"]
+        assert "examples.slow_agent" in eager["heavy_modules_loaded"]
+        assert lazy["heavy_modules_loaded"] == []
+        assert len(eager["slowest_cumulative"]) == 3
+
+    @pytest.mark.unit
+    def test_profile_imports_reports_failures(self, tmp_path):
+        report = profile_imports("definitely_missing_module", [str(tmp_path)])
+
+        assert report["success"] is False
+        assert "ModuleNotFoundError" in report["error"]
@@ -0,0 +1,92 @@
+"""
+Unit tests for SteelBrowserClient connection pooling, retries
+and batch endpoints, run against a local stub server.
+"""
+
+import pytest
+import aiohttp
+
+from core.shared.web.browsers.steel_browser_client import SteelBrowserClient
+from tests.helpers.steel_browser_stub import SteelBrowserStub
+
+
+class TestSteelBrowserClient:
+    """Tests for the pooled Steel Browser client."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_session_uses_tuned_connector(self):
+        client = SteelBrowserClient(
+            "http://127.0.0.1:1/", max_connections=7, max_connections_per_host=3, dns_cache_ttl=60
+        )
+        await client._ensure_session()
+        try:
+            connector = client.session.connector
+            assert isinstance(connector, aiohttp.TCPConnector)
+            assert connector.limit == 7
+            assert connector.limit_per_host == 3
+            assert connector.use_dns_cache
+        finally:
+            await client.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_retries_server_errors_then_succeeds(self):
+        async with SteelBrowserStub(fail_first=2) as stub:
+            async with SteelBrowserClient(stub.url, max_retries=3, backoff_base=0.001) as client:
+                result = await client.navigate("https://example.com")
+
+        assert result["success"] is True
+        assert result["page_title"] == "Title of https://example.com"
+        assert client.stats["retries"] == 2
+        assert stub.requests == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        async with SteelBrowserStub(fail_first=10) as stub:
+            async with SteelBrowserClient(stub.url, max_retries=2, backoff_base=0.001) as client:
+                result = await client.extract_content("https://example.com")
+
+        assert result["success"] is False
+        assert result["error"].startswith("HTTP 503")
+        assert stub.requests == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        async with SteelBrowserStub(fail_first=1, fail_status=404) as stub:
+            async with SteelBrowserClient(stub.url, backoff_base=0.001) as client:
+                result = await client.navigate("https://example.com/missing")
+
+        assert result["success"] is False
+        assert client.stats["retries"] == 0
+        assert stub.requests == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_connection_errors_are_retried(self):
+        async with SteelBrowserStub() as stub:
+            url = stub.url
+        # Server is gone, every attempt fails to connect
+        async with SteelBrowserClient(url, max_retries=2, backoff_base=0.001) as client:
+            result = await client.navigate("https://example.com")
+
+        assert result["success"] is False
+        assert client.stats["retries"] == 2
+        assert client.stats["failures"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_batch_methods_preserve_order_and_reuse_connections(self):
+        urls = [f"https://example.com/event/{i}" for i in range(20)]
+        async with SteelBrowserStub(latency=0.005) as stub:
+            async with SteelBrowserClient(stub.url, max_connections_per_host=4) as client:
+                navigated = await client.navigate_many(urls)
+                extracted = await client.extract_many(urls, selectors={"title": "h1"}, max_concurrency=2)
+
+        assert [r["url"] for r in navigated] == urls
+        assert [r["url"] for r in extracted] == urls
+        assert extracted[0]["content"] == {"title": "title-value"}
+        # 40 requests served over at most the per-host connection limit
+        assert len(stub.peers) <= 4
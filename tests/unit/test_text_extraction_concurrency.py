@@ -0,0 +1,147 @@
+"""
+Unit tests for the concurrent multi-URL extraction mode of
+EnhancedTextExtractionAgent: bounded workers, per-platform caps,
+per-URL timeouts and latency statistics.
+"""
+
+import pytest
+import asyncio
+from types import SimpleNamespace
+
+from core.shared.write_behind import ResultJournal, WriteBehindBuffer
+from examples.text_extraction_agent import EnhancedTextExtractionAgent, _percentile
+
+
+@pytest.fixture
+def session():
+    return SimpleNamespace(region="us-central1")
+
+
+@pytest.fixture
+def agent():
+    return EnhancedTextExtractionAgent(region_manager=None, max_workers=8, url_timeout=0.2)
+
+
+@pytest.mark.unit
+class TestConcurrentExtraction:
+    """Bounded-concurrency extraction over many URLs."""
+
+    @pytest.mark.asyncio
+    async def test_stuck_url_times_out_without_stalling_batch(self, agent, session):
+        original = agent._extract_event_data
+
+        async def extract(session, url, region, html=None):
+            if "stuck" in url:
+                await asyncio.sleep(10)
+            return await original(session, url, region, html)
+
+        agent._extract_event_data = extract
+        urls = [f"https://www.meetup.com/group/events/{i}" for i in range(5)]
+        urls.append("https://example.com/stuck")
+
+        outcomes = [o async for o in agent.iter_extracted_events(session, urls)]
+
+        assert len(outcomes) == len(urls)
+        timed_out = [o for o in outcomes if o.timed_out]
+        assert [o.url for o in timed_out] == ["https://example.com/stuck"]
+        assert all(o.event_data for o in outcomes if not o.timed_out)
+
+    @pytest.mark.asyncio
+    async def test_platform_concurrency_cap(self, agent, session):
+        in_flight = {"current": 0, "peak": 0}
+
+        async def extract(session, url, region, html=None):
+            in_flight["current"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+            await asyncio.sleep(0.01)
+            in_flight["current"] -= 1
+            return None
+
+        agent._extract_event_data = extract
+        urls = [f"https://www.facebook.com/events/{i}" for i in range(10)]
+
+        outcomes = [o async for o in agent.iter_extracted_events(session, urls)]
+
+        assert len(outcomes) == 10
+        assert in_flight["peak"] == agent._get_platform_concurrency("facebook")
+
+    @pytest.mark.asyncio
+    async def test_busy_platform_does_not_block_others(self, session):
+        agent = EnhancedTextExtractionAgent(region_manager=None, max_workers=4, url_timeout=1)
+        release = asyncio.Event()
+        finished = []
+
+        async def extract(session, url, region, html=None):
+            if "facebook" in url:
+                await release.wait()
+            finished.append(url)
+            return None
+
+        agent._extract_event_data = extract
+        # Facebook URLs first, more than its cap, then pages on other hosts
+        urls = [f"https://www.facebook.com/events/{i}" for i in range(6)]
+        others = ["https://lu.ma/a", "https://example.com/a", "https://example.org/a"]
+
+        stream = agent.iter_extracted_events(session, urls + others)
+        outcomes = [await asyncio.wait_for(stream.__anext__(), timeout=1) for _ in others]
+        assert sorted(o.url for o in outcomes) == sorted(others)
+
+        release.set()
+        assert len([o async for o in stream]) == len(urls)
+
+    def test_generic_urls_are_capped_per_host(self, agent):
+        assert agent._concurrency_key("https://example.com/a", "generic") == "generic:example.com"
+        assert agent._concurrency_key("https://Example.org/b", "generic") == "generic:example.org"
+        assert agent._concurrency_key("https://lu.ma/x", "luma") == "luma"
+
+    @pytest.mark.asyncio
+    async def test_events_are_journaled_as_they_stream(self, session, tmp_path):
+        flushed = []
+
+        async def sink(records):
+            flushed.extend(records)
+
+        buffer = WriteBehindBuffer(ResultJournal(tmp_path, fsync=False), sink, flush_interval=0.01)
+        agent = EnhancedTextExtractionAgent(region_manager=None, result_buffer=buffer)
+        urls = [f"https://lu.ma/event-{i}" for i in range(5)]
+        task = SimpleNamespace(metadata={"discovered_links": urls})
+
+        async with buffer:
+            streamed = [event async for event in agent._stream_core_logic(task, session)]
+
+        assert sorted(e["url"] for e in flushed) == sorted(e["url"] for e in streamed) == sorted(urls)
+
+    def test_luma_uses_lu_ma_config(self, agent):
+        assert agent._get_platform_concurrency("luma") == (
+            agent.platform_configs["lu.ma"]["max_concurrency"]
+        )
+
+    def test_throughput_stats(self, agent):
+        stats = agent._update_throughput_stats(10, [0.1 * i for i in range(1, 21)], 2.0)
+
+        assert stats["events_per_second"] == 5.0
+        assert stats["latency_p50"] == pytest.approx(1.0)
+        assert stats["latency_p95"] == pytest.approx(1.9)
+        assert agent.extraction_stats["latency_p95"] == stats["latency_p95"]
+
+    def test_percentile_empty(self):
+        assert _percentile([], 95) == 0.0
+
+    def test_reset_for_lease_restores_constructor_state(self, agent):
+        agent.extracted_events["https://lu.ma/a"] = object()
+        agent.extraction_stats["total_processed"] = 3
+        agent.platform_configs["generic"]["title_selectors"] = ["h2"]
+        agent.reload_platform_configs()
+
+        agent.reset_for_lease(region_manager=None, max_workers=2)
+
+        fresh = EnhancedTextExtractionAgent(region_manager=None, max_workers=2)
+        assert (agent.max_workers, agent.url_timeout) == (2, fresh.url_timeout)
+        assert agent.extracted_events == {}
+        assert agent.extraction_stats == fresh.extraction_stats
+        assert agent.platform_configs == fresh.platform_configs
+        # Default plans come back from the plan cache
+        assert agent.extraction_plans["generic"] is fresh.extraction_plans["generic"]
+        with pytest.raises(ValueError):
+            agent.reset_for_lease(region_manager=object())
+
@@ -0,0 +1,73 @@
+"""
+Unit tests for the local token estimator: pre-tokenization, calibration
+against exact counts, error bounds and truncation.
+"""
+
+import pytest
+
+from core.shared.token_estimation import (
+    DEFAULT_RELATIVE_ERROR,
+    TokenEstimator,
+    content_hash,
+    raw_token_estimate,
+)
+
+SAMPLES = [
+    "Cardano Summit 2025 in Lisbon brings together builders, researchers and investors.",
+    "Join us for a hands-on workshop on smart contract auditing with Aiken and Plutus.",
+    "Speakers: Charles Hoskinson (IOG), Frederik Gregaard (Cardano Foundation).",
+    "Registration opens 09:00; keynote at 10:30, panels until 17:45.",
+    "東京でのブロックチェーンイベント",
+    "internationalization, decentralization and interoperability",
+]
+
+
+def api_like_count(text):
+    """Stand-in for the API: 1.3x the raw estimate, rounded, plus 2 special tokens"""
+    return round(raw_token_estimate(text) * 1.3) + 2
+
+
+@pytest.mark.unit
+class TestTokenEstimator:
+    """Tests for TokenEstimator."""
+
+    def test_raw_estimate_pieces(self):
+        assert raw_token_estimate("") == 0
+        assert raw_token_estimate("hello world") == 2
+        assert raw_token_estimate("Hello, world!") == 4
+        # Digits count one by one, long words split
+        assert raw_token_estimate("2025") == 4
+        assert raw_token_estimate("internationalization") == 1 + 4
+        assert raw_token_estimate("東京") == 2
+
+    def test_calibration_bounds_contain_exact_counts(self):
+        estimator = TokenEstimator.calibrate((text, api_like_count(text)) for text in SAMPLES)
+
+        assert estimator.samples == len(SAMPLES)
+        assert 1.3 <= estimator.scale <= 1.5  # the constant 2 tokens pull the fit up
+        assert estimator.relative_error < DEFAULT_RELATIVE_ERROR
+        for text in SAMPLES:
+            low, high = estimator.bounds(text)
+            assert low <= api_like_count(text) <= high
+
+        with pytest.raises(ValueError):
+            TokenEstimator.calibrate([("text", 0)])
+
+    def test_truncate(self):
+        estimator = TokenEstimator()
+        text = " ".join(f"word{i}" for i in range(100))
+
+        assert estimator.truncate("short text", 10) == "short text"
+        cut = estimator.truncate(text, 30)
+        assert text.startswith(cut) and estimator.estimate(cut) <= 30
+        assert estimator.estimate(cut) >= 28
+
+        safe = estimator.truncate(text, 30, conservative=True)
+        assert estimator.bounds(safe)[1] <= 30
+        assert len(safe) < len(cut)
+        assert estimator.truncate(text, 0) == ""
+
+    def test_content_hash(self):
+        assert content_hash("gemini", "text") == content_hash("gemini", "text")
+        assert content_hash("gemini", "text") != content_hash("other", "text")
+        assert len(content_hash("gemini", "x" * 100_000)) == 64
@@ -0,0 +1,133 @@
+"""
+Unit tests for token counting with the API mocked out: batch
+deduplication and concurrency, exact counts cached for limit checks, and
+the estimator fallback when the API fails.
+"""
+
+import pytest
+import asyncio
+
+from core.shared.ai import tokens
+from core.shared.token_estimation import TokenEstimator
+
+MODEL = "test-model"
+TEXT = " ".join(f"word{i}" for i in range(40))
+
+
+@pytest.fixture(autouse=True)
+def estimator():
+    previous = tokens.get_token_estimator()
+    estimator = TokenEstimator()
+    tokens.set_token_estimator(estimator)
+    tokens._token_count_cache.clear()
+    yield estimator
+    tokens.set_token_estimator(previous)
+    tokens._token_count_cache.clear()
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    """Replaces the API call; counts are remote["count"](text), len by default."""
+    calls = []
+    state = {"in_flight": 0, "peak": 0, "error": None, "count": len}
+
+    async def count(text, model):
+        calls.append(text)
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep(0.01)
+            if state["error"]:
+                raise state["error"]
+            return state["count"](text)
+        finally:
+            state["in_flight"] -= 1
+
+    monkeypatch.setattr(tokens, "_count_tokens_remote", count)
+    state["calls"] = calls
+    return state
+
+
+@pytest.mark.unit
+class TestTokenCounting:
+    """Tests for count_tokens_batch and the limit checks."""
+
+    @pytest.mark.asyncio
+    async def test_batch_counts_each_distinct_text_once(self, remote):
+        counts = await tokens.count_tokens_batch(["alpha", "beta", "alpha", "", None, "beta"], MODEL)
+
+        assert counts == [5, 4, 5, 0, 0, 4]
+        assert sorted(remote["calls"]) == ["alpha", "beta"]
+
+        # Counted texts come from the cache next time
+        assert await tokens.count_tokens_batch(["beta", "gamma"], MODEL) == [4, 5]
+        assert sorted(remote["calls"]) == ["alpha", "beta", "gamma"]
+
+    @pytest.mark.asyncio
+    async def test_batch_caps_requests_in_flight(self, remote):
+        texts = [f"text {i}" for i in range(20)]
+
+        counts = await tokens.count_tokens_batch(texts, MODEL, max_concurrency=3)
+
+        assert counts == [len(text) for text in texts]
+        assert remote["peak"] == 3
+
+    @pytest.mark.asyncio
+    async def test_limit_check_uses_cached_exact_count_near_the_limit(self, remote, estimator):
+        low, high = estimator.bounds(TEXT)
+        limit = estimator.estimate(TEXT)
+        assert low <= limit < high
+
+        # The estimate fits; without an exact count that decides
+        assert tokens.is_within_token_limit(TEXT, limit, model=MODEL)
+
+        remote["count"] = lambda text: high
+        await tokens.count_tokens(TEXT, MODEL)
+        assert not tokens.is_within_token_limit(TEXT, limit, model=MODEL)
+        assert tokens.is_within_token_limit(TEXT, limit, use_estimate=True, model=MODEL)
+        # Far from the limit the estimate alone decides
+        assert tokens.is_within_token_limit(TEXT, high, model=MODEL)
+
+    @pytest.mark.asyncio
+    async def test_async_limit_check_falls_back_to_estimate(self, remote, estimator):
+        low, high = estimator.bounds(TEXT)
+        limit = estimator.estimate(TEXT)
+
+        assert await tokens.is_within_token_limit_async(TEXT, high, MODEL)
+        assert not await tokens.is_within_token_limit_async(TEXT, low - 1, MODEL)
+        assert remote["calls"] == []
+
+        remote["count"] = lambda text: high
+        assert not await tokens.is_within_token_limit_async(TEXT, limit, MODEL)
+        assert remote["calls"] == [TEXT]
+
+        tokens._token_count_cache.clear()
+        remote["error"] = RuntimeError("quota exceeded")
+        assert await tokens.is_within_token_limit_async(TEXT, limit, MODEL)
+        assert len(remote["calls"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_async_truncate_falls_back_to_conservative_cut(self, remote, estimator):
+        text = " ".join(f"word{i}" for i in range(400))
+        limit = 100
+        remote["error"] = RuntimeError("quota exceeded")
+
+        truncated = await tokens.truncate_to_token_limit_async(text, limit, MODEL)
+
+        assert remote["calls"]
+        assert text.startswith(truncated)
+        assert estimator.bounds(truncated)[1] <= limit
+        assert truncated == tokens._break_at_word(text, estimator.truncate(text, limit, conservative=True))
+
+    @pytest.mark.asyncio
+    async def test_async_truncate_accepts_exact_count_within_limit(self, remote, estimator):
+        text = " ".join(f"word{i}" for i in range(400))
+        limit = 100
+        remote["count"] = estimator.estimate
+
+        truncated = await tokens.truncate_to_token_limit_async(text, limit, MODEL)
+
+        assert len(remote["calls"]) == 1
+        assert estimator.estimate(truncated) <= limit
+        # Longer than the cut made without an exact count
+        assert len(truncated) > len(estimator.truncate(text, limit, conservative=True))
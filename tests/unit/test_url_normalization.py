@@ -0,0 +1,71 @@
+"""
+Property test: the fast URL canonicalizer matches the original
+parse/unparse implementation on generated URLs.
+"""
+
+import pytest
+import itertools
+import random
+
+from core.shared.url_utils import URLNormalizer, _normalize_url, normalize_many
+from tests.helpers.url_reference import reference_normalize_url
+
+SCHEMES = ["http://", "HTTPS://", "https://", "ftp://", "", "//", "mailto:"]
+NETLOCS = ["Example.COM", "lu.ma", "a@B.com:8080", "[::1]", "", "münchen.de", "x_y~z.com", "h%41st"]
+PATHS = ["", "/", "/a/", "/A/b//", "/x;p", "/ü/é", "//", "/a%20b/", "/a b", "/[x]"]
+QUERIES = [
+    "",
+    "?",
+    "?utm_source=x",
+    "?a=1&b=&a=2",
+    "?Ref=1&id=3",
+    "?q=a+b%20c",
+    "?hsCtaTracking=1",
+    "?x=1;y=2",
+    "?UTM_Medium=z&k=v",
+]
+FRAGMENTS = ["", "#", "#top", "#a?b=1"]
+WRAPPERS = [("", ""), ("  ", " "), ("\t", "\n")]
+
+
+def generated_urls():
+    for scheme, netloc, path, query, fragment, (left, right) in itertools.product(
+        SCHEMES, NETLOCS, PATHS, QUERIES, FRAGMENTS, WRAPPERS
+    ):
+        yield f"{left}{scheme}{netloc}{path}{query}{fragment}{right}"
+
+
+def random_urls(count, seed=1234):
+    rng = random.Random(seed)
+    alphabet = "aAzZ09-._~%/?#&=;:@+ []ü\t"
+    for _ in range(count):
+        tail = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        yield rng.choice(SCHEMES) + rng.choice(NETLOCS) + tail
+
+
+class TestURLNormalization:
+    """Tests for the fast normalize_url and normalize_many."""
+
+    @pytest.mark.unit
+    def test_matches_reference_on_generated_urls(self):
+        normalizer = URLNormalizer()
+        mismatches = [
+            url for url in itertools.chain(generated_urls(), random_urls(20000))
+            if normalizer.normalize_url(url) != reference_normalize_url(url)
+        ]
+        assert mismatches == []
+
+    @pytest.mark.unit
+    def test_invalid_inputs(self):
+        normalizer = URLNormalizer()
+        for value in (None, "", 123):
+            assert normalizer.normalize_url(value) == reference_normalize_url(value)
+        assert normalizer.normalize_many(["", None, "HTTPS://Lu.ma/X/"]) == ["", "", "https://lu.ma/X"]
+
+    @pytest.mark.unit
+    def test_normalize_many_uses_memo(self):
+        _normalize_url.cache_clear()
+        urls = ["https://lu.ma/a/?utm_source=x#top"] * 100
+
+        assert normalize_many(urls) == ["https://lu.ma/a"] * 100
+        assert _normalize_url.cache_info().misses == 1
@@ -0,0 +1,108 @@
+"""
+Unit tests for async redirect resolution: hop memoization,
+loop detection, connection reuse and batch deduplication.
+"""
+
+import pytest
+import asyncio
+from aiohttp import web
+
+from core.shared.url_utils import URLDeduplicator, URLNormalizer
+
+REDIRECTS = {
+    "/a": "/b",
+    "/x": "/b",
+    "/b": "/c",
+    "/rel": "c",
+    "/loop1": "/loop2",
+    "/loop2": "/loop1",
+}
+
+
+class RedirectSite:
+    """Local site serving a fixed redirect graph."""
+
+    def __init__(self):
+        self.requests = []
+        self.peers = set()
+
+    async def handle(self, request):
+        self.requests.append(request.path)
+        self.peers.add(request.transport.get_extra_info("peername"))
+        await asyncio.sleep(0.01)
+        target = REDIRECTS.get(request.path)
+        if target:
+            raise web.HTTPFound(target)
+        return web.Response(text="ok")
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_route("*", "/{name}", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+
+class TestRedirectResolution:
+    """Tests for URLNormalizer.resolve_many and URLDeduplicator.add_urls."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_resolve_many_shares_hops(self):
+        async with RedirectSite() as site:
+            normalizer = URLNormalizer(per_host_limit=2)
+            results = await normalizer.resolve_many(
+                [f"{site.url}/a", f"{site.url}/x", f"{site.url}/a", f"{site.url}/rel"]
+            )
+
+        assert results[f"{site.url}/a"] == (f"{site.url}/c", [f"{site.url}/a", f"{site.url}/b"])
+        assert results[f"{site.url}/x"] == (f"{site.url}/c", [f"{site.url}/x", f"{site.url}/b"])
+        assert results[f"{site.url}/rel"][0] == f"{site.url}/c"
+        # /b and /c are shared by every chain and requested once each
+        assert sorted(site.requests) == ["/a", "/b", "/c", "/rel", "/x"]
+        assert len(site.peers) <= 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_loop_detection_and_memo(self):
+        async with RedirectSite() as site:
+            normalizer = URLNormalizer()
+            final, chain = (await normalizer.resolve_many([f"{site.url}/loop1"]))[f"{site.url}/loop1"]
+            again = await normalizer.resolve_many([f"{site.url}/loop1"])
+
+        assert final == f"{site.url}/loop2"
+        assert chain == [f"{site.url}/loop1"]
+        assert again[f"{site.url}/loop1"] == (final, [])
+        assert site.requests == ["/loop1", "/loop2"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unreachable_url_resolves_to_itself(self):
+        normalizer = URLNormalizer(timeout=2)
+        results = await normalizer.resolve_many(["http://127.0.0.1:9/gone/"])
+
+        assert results["http://127.0.0.1:9/gone/"] == ("http://127.0.0.1:9/gone", [])
+        assert "http://127.0.0.1:9/gone" not in normalizer.hop_cache
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_add_urls_batch(self):
+        async with RedirectSite() as site:
+            dedup = URLDeduplicator()
+            canonicals = await dedup.add_urls(
+                [f"{site.url}/a", f"{site.url}/x?utm_source=mail", f"{site.url}/c"]
+            )
+
+        assert canonicals == [f"{site.url}/c"] * 3
+        assert dedup.get_url_variants(f"{site.url}/a") == {
+            f"{site.url}/a",
+            f"{site.url}/x?utm_source=mail",
+            f"{site.url}/c",
+        }
+        assert dedup.is_duplicate(f"{site.url}/a", f"{site.url}/x?utm_source=mail")
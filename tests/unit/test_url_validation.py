@@ -0,0 +1,175 @@
+"""
+Unit tests for bulk URL validation: dedupe, per-host limits,
+HEAD/streamed-GET probing and the shared TTL cache.
+"""
+
+import pytest
+import asyncio
+from aiohttp import web
+
+from core.shared.cache import BoundedCache
+from core.shared.url_validation import EventValidator, URLValidator
+
+FILLER = b"<p>" + b"x" * 200_000 + b"</p>"
+
+
+class FakeSite:
+    """Local site with real, missing, soft-404 and HEAD-less pages."""
+
+    def __init__(self):
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _track(self, request):
+        self.requests.append((request.method, request.path))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+    async def page(self, request):
+        await self._track(request)
+        name = request.match_info["name"]
+        if name == "missing":
+            return web.Response(status=404)
+        if name == "no-head" and request.method == "HEAD":
+            return web.Response(status=405)
+        title = "Page Not Found · Luma" if name == "soft404" else f"Event {name}"
+        body = f"<html><head><title>{title}</title></head><body>".encode() + FILLER
+        return web.Response(body=body, content_type="text/html")
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_route("*", "/{name}", self.page)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+
+class ChunkedContent:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.consumed = 0
+
+    async def iter_chunked(self, size):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+
+class TestURLValidation:
+    """Tests for URLValidator and EventValidator bulk validation."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_streamed_get_stops_after_title(self):
+        content = ChunkedContent([b"<html><title>Real", b" Event</TITLE>", b"x" * 4096, b"y" * 4096])
+        response = type("Response", (), {"content": content, "charset": "utf-8"})()
+
+        validator = URLValidator(cache=BoundedCache())
+        text = await validator._read_until_title(response)
+
+        assert content.consumed == 2
+        assert validator.extract_title(text) == "Real Event"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_validate_url_exists_outcomes(self):
+        async with FakeSite() as site:
+            async with URLValidator(cache=BoundedCache()) as validator:
+                ok = await validator.validate_url_exists(f"{site.url}/a")
+                missing = await validator.validate_url_exists(f"{site.url}/missing")
+                soft404 = await validator.validate_url_exists(f"{site.url}/soft404")
+
+        assert ok == (True, "Event a", None)
+        assert missing == (False, None, "HTTP 404 Not Found")
+        assert soft404[0] is False and soft404[2] == "Title indicates error page"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_head_probe_falls_back_to_get(self):
+        async with FakeSite() as site:
+            async with URLValidator(cache=BoundedCache(), check_title=False) as validator:
+                assert await validator.validate_url_exists(f"{site.url}/a") == (True, None, None)
+                assert (await validator.validate_url_exists(f"{site.url}/missing"))[0] is False
+                assert await validator.validate_url_exists(f"{site.url}/no-head") == (True, None, None)
+
+        assert site.requests == [
+            ("HEAD", "/a"),
+            ("HEAD", "/missing"),
+            ("HEAD", "/no-head"),
+            ("GET", "/no-head"),
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_bulk_dedupes_and_limits_per_host(self):
+        cache = BoundedCache()
+        async with FakeSite() as site:
+            events = [
+                {"name": f"Event {i % 5}", "url": f"{site.url}/{i % 5}"} for i in range(20)
+            ] + [
+                {"name": "Gone", "url": f"{site.url}/missing"},
+                {"name": "No url"},
+                {"description": "Neither"},
+            ]
+            validator = EventValidator()
+            validator.url_validator = URLValidator(cache=cache, per_host_limit=2)
+
+            results = await validator.validate_bulk_events(events)
+
+        assert len(results) == len(events)
+        assert all(valid for valid, _ in results[:20])
+        assert results[20] == (False, ["Invalid URL: HTTP 404 Not Found"])
+        assert results[21] == (False, ["Missing event URL"])
+        assert results[22] == (False, ["Missing event URL", "Missing event name"])
+        assert len(site.requests) == 6
+        assert site.max_in_flight <= 2
+        assert len(cache) == 6
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_single_event_reports_every_missing_field(self):
+        async with URLValidator(cache=BoundedCache()) as validator:
+            assert await validator.validate_event_data({}) == (
+                False,
+                ["Missing event URL", "Missing event name"],
+            )
+            assert await validator.validate_event_data({"name": "No url"}) == (False, ["Missing event URL"])
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_head_only_results_do_not_skip_title_checks(self):
+        cache = BoundedCache()
+        async with FakeSite() as site:
+            url = f"{site.url}/soft404"
+            async with URLValidator(cache=cache, check_title=False) as validator:
+                assert await validator.validate_url_exists(url) == (True, None, None)
+            async with URLValidator(cache=cache) as validator:
+                assert (await validator.validate_url_exists(url))[0] is False
+                assert (await validator.validate_urls([url]))[url][0] is False
+
+        assert site.requests == [("HEAD", "/soft404"), ("GET", "/soft404")]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cache_is_shared_and_bounded(self):
+        assert URLValidator().validation_cache is URLValidator().validation_cache
+
+        cache = BoundedCache(max_entries=2, ttl_seconds=10)
+        for i in range(3):
+            cache.set(f"https://e.com/{i}", (True, None, None))
+        assert len(cache) == 2 and "https://e.com/0" not in cache
+
+        now = [1000.0]
+        cache.clock = lambda: now[0]
+        cache.set("https://e.com/ttl", (True, "t", None))
+        now[0] += 11
+        assert cache.get("https://e.com/ttl") is None
@@ -0,0 +1,135 @@
+"""
+Unit tests for batch validation in EnhancedValidationAgent.
+"""
+
+import pytest
+import copy
+import threading
+from datetime import datetime, timedelta
+
+from examples.validation_agent import EnhancedValidationAgent, PlatformValidator
+
+FUTURE = (datetime.now() + timedelta(days=10)).replace(microsecond=0)
+
+
+def sample_events():
+    """Events covering every rule, platform and error path."""
+    return [
+        {
+            "name": "AI Builders Meetup",
+            "url": "https://www.eventbrite.com/e/ai-builders-123",
+            "start_time": FUTURE.isoformat(),
+            "end_time": (FUTURE + timedelta(hours=3)).isoformat(),
+        },
+        {"name": "ab", "url": "meetup.com/group/events/1", "start_time": "not a date"},
+        {
+            "name": "Luma Night",
+            "url": "https://www.lu.ma/night",
+            "start_time": FUTURE.isoformat(),
+            "description": "short",
+        },
+        {"name": "x" * 400, "url": "https://example.com/e", "start_time": "2020-01-01"},
+        {
+            "name": "Backwards",
+            "url": "https://facebook.com/events/42",
+            "start_time": FUTURE.isoformat(),
+            "end_time": (FUTURE - timedelta(hours=1)).isoformat(),
+        },
+        {"url": "https://example.com/only-url"},
+        {"name": "Broken url", "url": None},
+        {"name": "Aware", "url": "https://example.com/a", "start_time": "2030-01-01T10:00:00Z"},
+    ]
+
+
+def comparable(result):
+    data = result.to_dict()
+    data["validation_metadata"].pop("validation_timestamp", None)
+    return data
+
+
+class TestValidationBatch:
+    """Tests for validate_batch and precompiled platform rules."""
+
+    @pytest.mark.unit
+    def test_platform_patterns_are_precompiled(self):
+        validator = PlatformValidator()
+
+        pattern = validator.get_compiled_pattern("luma", "url_pattern")
+        assert pattern.match("https://lu.ma/abc")
+        assert validator.get_compiled_pattern("unknown", "url_pattern") is None
+        assert validator.get_compiled_pattern("eventbrite", "price_pattern").match("$10.00")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("correction_mode", [True, False])
+    async def test_batch_matches_per_event_validation(self, correction_mode):
+        agent = EnhancedValidationAgent()
+        single_events = sample_events()
+        batch_events = copy.deepcopy(single_events)
+
+        expected = [
+            comparable(await agent.validate_event_data(event, "test", correction_mode))
+            for event in single_events
+        ]
+        actual = [
+            comparable(result)
+            for result in await agent.validate_batch(batch_events, "test", correction_mode, chunk_size=3)
+        ]
+
+        assert actual == expected
+        # Corrections are applied to the events in place, as in the single path
+        assert batch_events == single_events
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_batch_parses_each_distinct_date_once(self, monkeypatch):
+        agent = EnhancedValidationAgent()
+        calls = []
+        original = agent._parse_date
+
+        def counting_parse(value):
+            calls.append(value)
+            return original(value)
+
+        monkeypatch.setattr(agent, "_parse_date", counting_parse)
+        events = [
+            {"name": f"Event {i}", "url": f"https://example.com/{i}", "start_time": FUTURE.isoformat()}
+            for i in range(50)
+        ]
+
+        results = await agent.validate_batch(events, correction_mode=False)
+
+        assert all(r.is_valid for r in results)
+        assert len(calls) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_batch_checks_run_off_the_event_loop(self, monkeypatch):
+        agent = EnhancedValidationAgent()
+        threads = set()
+        original = agent._parse_date
+
+        def recording_parse(value):
+            threads.add(threading.get_ident())
+            return original(value)
+
+        monkeypatch.setattr(agent, "_parse_date", recording_parse)
+        events = [{"name": "Event", "url": "https://example.com/1", "start_time": FUTURE.isoformat()}]
+
+        await agent.validate_batch(events, correction_mode=False)
+
+        assert threads and threading.get_ident() not in threads
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_empty_batch(self):
+        assert await EnhancedValidationAgent().validate_batch([]) == []
+
+    @pytest.mark.unit
+    def test_reset_for_lease_replaces_config(self):
+        agent = EnhancedValidationAgent({"drop_invalid_items": True})
+
+        agent.reset_for_lease({"source_agent": "mcp"})
+        assert agent.config == {"source_agent": "mcp"}
+        agent.reset_for_lease()
+        assert agent.config == {}
@@ -0,0 +1,140 @@
+"""
+Unit tests for the local IVF vector index: exact and approximate search,
+incremental updates, persistence and reciprocal rank fusion.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from core.shared.vector_index import EXACT_SEARCH_MAX_ROWS, VectorIndex, reciprocal_rank_fusion
+
+DIMENSION = 32
+
+
+def clustered_vectors(rows, clusters=50, seed=3):
+    """Vectors scattered around random cluster centres, like topical embeddings"""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, DIMENSION))
+    labels = rng.integers(0, clusters, size=rows)
+    return (centres[labels] + 0.3 * rng.normal(size=(rows, DIMENSION))).astype(np.float32)
+
+
+def exact_top_k(vectors, query, k):
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.argsort(-(unit @ (query / np.linalg.norm(query))))[:k].tolist()
+
+
+@pytest.mark.unit
+class TestVectorIndex:
+    """Tests for VectorIndex and reciprocal_rank_fusion."""
+
+    def test_small_index_is_exact_and_updatable(self):
+        vectors = clustered_vectors(300)
+        index = VectorIndex(DIMENSION)
+        index.add_many([f"event-{i}" for i in range(300)], vectors)
+
+        results = index.search(vectors[5], k=5)
+        assert [r[0] for r in results] == [f"event-{i}" for i in exact_top_k(vectors, vectors[5], 5)]
+        assert results[0] == ("event-5", pytest.approx(1.0, abs=1e-5))
+
+        index.add("event-5", vectors[6])
+        assert index.search(vectors[6], k=2)[1][1] == pytest.approx(1.0, abs=1e-5)
+        assert index.remove("event-6") and not index.remove("event-6")
+        assert "event-6" not in index and len(index) == 299
+        assert index.search(vectors[6], k=1)[0][0] == "event-5"
+        assert index.search(vectors[6], k=10, min_score=0.999) == [("event-5", pytest.approx(1.0, abs=1e-5))]
+
+    def test_trained_index_recall(self):
+        rows = EXACT_SEARCH_MAX_ROWS + 2000
+        vectors = clustered_vectors(rows)
+        index = VectorIndex(DIMENSION, n_probe=8)
+        for start in range(0, rows, 1000):
+            index.add_many(list(range(start, min(start + 1000, rows))), vectors[start:start + 1000])
+
+        stats = index.get_stats()
+        assert stats["trainings"] == 1 and not stats["exact_search"]
+
+        rng = np.random.default_rng(0)
+        recall = []
+        for row in rng.choice(rows, 50, replace=False):
+            query = vectors[row] + 0.1 * rng.normal(size=DIMENSION).astype(np.float32)
+            found = [item_id for item_id, _ in index.search(query, k=10)]
+            recall.append(len(set(found) & set(exact_top_k(vectors, query, 10))) / 10)
+        assert np.mean(recall) >= 0.9
+
+        # Incremental adds after training land in the right list
+        index.add("new", vectors[0] * 2)
+        assert index.search(vectors[0], k=2)[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert "new" in [item_id for item_id, _ in index.search(vectors[0], k=2)]
+
+    @pytest.mark.parametrize("mmap_mode", ["r", "r+"])
+    def test_memmap_queries_are_not_modified(self, tmp_path, mmap_mode):
+        vectors = clustered_vectors(100)
+        index = VectorIndex(DIMENSION)
+        index.add_many([f"event-{i}" for i in range(100)], vectors)
+        path = str(tmp_path / "queries.npy")
+        np.save(path, vectors)
+        mapped = np.load(path, mmap_mode=mmap_mode)
+
+        assert index.search(mapped[5], k=1)[0][0] == "event-5"
+        del mapped
+
+        assert np.array_equal(np.load(path), vectors)
+
+    def test_persistence_and_reload(self, tmp_path):
+        path = str(tmp_path / "events")
+        vectors = clustered_vectors(EXACT_SEARCH_MAX_ROWS + 500)
+        index = VectorIndex(DIMENSION, path=path)
+        index.add_many([f"e{i}" for i in range(len(vectors))], vectors)
+        index.remove("e1")
+        index.save()
+        expected = index.search(vectors[2], k=10)
+
+        reloaded = VectorIndex(DIMENSION, path=path)
+        assert reloaded.get_stats()["memory_mapped"]
+        assert len(reloaded) == len(vectors) - 1 and "e1" not in reloaded
+        assert reloaded.search(vectors[2], k=10) == expected
+
+        reloaded.add("e1", vectors[1])
+        reloaded.remove("e3")
+        reloaded.save()
+        assert sorted(os.listdir(path)) == ["CURRENT", "v000002"]
+
+        again = VectorIndex(DIMENSION, path=path)
+        assert "e1" in again and "e3" not in again
+        assert again.search(vectors[1], k=1)[0][0] == "e1"
+        with pytest.raises(ValueError):
+            VectorIndex(DIMENSION + 1, path=path)
+
+    def test_compaction_after_deletes(self):
+        vectors = clustered_vectors(3000)
+        index = VectorIndex(DIMENSION)
+        index.add_many(list(range(3000)), vectors)
+        for i in range(2500):
+            index.remove(i)
+
+        assert index.get_stats()["compactions"] >= 1
+        assert len(index) == 500
+        assert index.search(vectors[2900], k=1)[0][0] == 2900
+
+    def test_invalid_input(self):
+        index = VectorIndex(DIMENSION)
+        with pytest.raises(ValueError):
+            index.add_many(["a", "b"], np.ones((1, DIMENSION)))
+        with pytest.raises(ValueError):
+            index.add("a", np.ones(DIMENSION * 2))
+        with pytest.raises(ValueError):
+            index.search(np.ones(DIMENSION + 1))
+        assert index.search(np.ones(DIMENSION)) == []
+
+    def test_reciprocal_rank_fusion(self):
+        keyword = ["a", "b", "c"]
+        vector = ["c", "d", "a"]
+        fused = reciprocal_rank_fusion([keyword, vector])
+
+        assert [item_id for item_id, _ in fused][:2] == ["a", "c"]
+        assert {item_id for item_id, _ in fused} == {"a", "b", "c", "d"}
+        weighted = reciprocal_rank_fusion([keyword, vector], weights=[0.0, 1.0])
+        assert weighted[0][0] == "c"
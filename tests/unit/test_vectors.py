@@ -0,0 +1,114 @@
+"""
+Unit tests for the numpy embedding matrix: batch normalization, top-k
+cosine search and memory-mapped loading.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from core.shared.vectors import EmbeddingMatrix, as_embedding_array, normalize_rows, top_k_similar
+
+
+def python_cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(7)
+    matrix = rng.normal(size=(500, 64)).astype(np.float32)
+    matrix[3] = 0.0
+    return matrix
+
+
+@pytest.mark.unit
+class TestEmbeddingMatrix:
+    """Tests for EmbeddingMatrix and the vector helpers."""
+
+    def test_normalize_rows_leaves_zero_rows_and_input(self, vectors):
+        normalized = normalize_rows(vectors)
+
+        norms = np.linalg.norm(normalized, axis=1)
+        assert np.allclose(np.delete(norms, 3), 1.0, atol=1e-5)
+        assert not normalized[3].any()
+        assert not np.allclose(np.linalg.norm(vectors, axis=1)[:3], 1.0)
+
+    @pytest.mark.parametrize("normalize", [True, False])
+    def test_top_k_matches_brute_force(self, vectors, normalize):
+        ids = [f"event-{i}" for i in range(len(vectors))]
+        matrix = EmbeddingMatrix.from_embeddings(vectors.tolist(), ids=ids, normalize=normalize)
+        query = vectors[10] + 0.1
+
+        expected = sorted(
+            ((ids[i], python_cosine(query.tolist(), row.tolist())) for i, row in enumerate(vectors)),
+            key=lambda item: -item[1],
+        )[:5]
+        results = matrix.top_k(query, k=5)
+
+        assert [r[0] for r in results] == [e[0] for e in expected]
+        assert np.allclose([r[1] for r in results], [e[1] for e in expected], atol=1e-5)
+        assert results[0][0] == "event-10"
+
+    def test_batch_search_and_limits(self, vectors):
+        matrix = EmbeddingMatrix.from_embeddings(vectors)
+        batch = matrix.top_k_batch(vectors[[1, 2]], k=3)
+
+        assert [b[0][0] for b in batch] == [1, 2]
+        assert batch[0][0][1] == pytest.approx(1.0, abs=1e-5)
+        assert len(matrix.top_k(vectors[1], k=10_000)) == len(vectors)
+        assert [i for i, _ in matrix.top_k(vectors[1], k=50, min_score=0.99)] == [1]
+        assert top_k_similar(vectors[4], vectors, k=1)[0][0] == 4
+
+    def test_caller_arrays_are_not_modified(self, vectors):
+        original = vectors.copy()
+        matrix = EmbeddingMatrix.from_embeddings(vectors)
+        query = vectors[5].copy()
+        matrix.similarities(query)
+
+        assert np.array_equal(vectors, original)
+        assert np.array_equal(query, original[5])
+
+    def test_memmaps_and_subclasses_are_not_modified(self, vectors, tmp_path):
+        class TaggedArray(np.ndarray):
+            pass
+
+        path = str(tmp_path / "raw.npy")
+        np.save(path, vectors)
+        mapped = np.load(path, mmap_mode="r+")
+        tagged = vectors.copy().view(TaggedArray)
+
+        matrix = EmbeddingMatrix.from_embeddings(mapped)
+        EmbeddingMatrix.from_embeddings(tagged)
+        matrix.similarities(tagged[:3])
+        matrix.similarities(mapped[5])
+        del mapped
+
+        assert np.array_equal(np.load(path), vectors)
+        assert np.array_equal(np.asarray(tagged), vectors)
+
+    def test_save_and_memory_mapped_load(self, vectors, tmp_path):
+        path = str(tmp_path / "events.npy")
+        EmbeddingMatrix.from_embeddings(vectors, ids=[f"e{i}" for i in range(len(vectors))]).save(path)
+
+        loaded = EmbeddingMatrix.load(path)
+        assert isinstance(loaded.vectors, np.memmap)
+        assert loaded.normalized
+        assert loaded.ids[7] == "e7"
+        assert loaded.top_k(vectors[7], k=1)[0][0] == "e7"
+
+        np.save(path, vectors)
+        raw = EmbeddingMatrix.load(path)
+        assert not raw.normalized and isinstance(raw.vectors, np.memmap)
+        assert raw.top_k(vectors[8], k=1)[0] == ("e8", pytest.approx(1.0, abs=1e-5))
+
+    def test_invalid_input(self, vectors):
+        with pytest.raises(ValueError):
+            as_embedding_array([[1.0, 2.0], [1.0]])
+        with pytest.raises(ValueError):
+            as_embedding_array([1.0, float("nan")])
+        with pytest.raises(ValueError):
+            EmbeddingMatrix.from_embeddings(vectors).top_k([1.0, 2.0])
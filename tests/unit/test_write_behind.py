@@ -0,0 +1,177 @@
+"""
+Unit tests for the write-behind buffer: journal durability and torn-record
+recovery, batched flushing, retries, crash resume, dead-lettering and
+back-pressure.
+"""
+
+import pytest
+import asyncio
+
+from core.shared.write_behind import ResultJournal, WriteBehindBuffer
+
+
+class RecordingSink:
+    """Sink that records batches and can fail or stall on demand."""
+
+    def __init__(self, fail_times=0, latency=0.0, reject=None):
+        self.batches = []
+        self.fail_times = fail_times
+        self.latency = latency
+        self.reject = reject
+        self.calls = 0
+
+    async def __call__(self, records):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.fail_times:
+            self.fail_times -= 1
+            raise ConnectionError("database unavailable")
+        if self.reject and any(self.reject(record) for record in records):
+            raise ValueError("invalid row")
+        self.batches.append(list(records))
+
+    @property
+    def records(self):
+        return [record for batch in self.batches for record in batch]
+
+
+def make_buffer(path, sink, **kwargs):
+    kwargs.setdefault("flush_interval", 0.01)
+    kwargs.setdefault("retry_base", 0.01)
+    return WriteBehindBuffer(ResultJournal(path, fsync=False), sink, **kwargs)
+
+
+@pytest.mark.unit
+class TestResultJournal:
+    """Tests for ResultJournal segments and checkpoints."""
+
+    def test_read_commit_and_reopen(self, tmp_path):
+        journal = ResultJournal(tmp_path, segment_bytes=64, fsync=False)
+        for i in range(10):
+            journal.append({"url": f"https://lu.ma/{i}", "title": f"Event {i}"})
+        assert journal.get_stats()["segments"] > 1
+
+        records, end = journal.read(max_records=4)
+        assert [r["title"] for r in records] == ["Event 0", "Event 1", "Event 2", "Event 3"]
+        journal.commit(end, len(records))
+        journal.close()
+
+        reopened = ResultJournal(tmp_path, segment_bytes=64, fsync=False)
+        assert reopened.pending == 6
+        records, _ = reopened.read(max_records=100)
+        assert [r["title"] for r in records] == [f"Event {i}" for i in range(4, 10)]
+
+    def test_torn_record_is_dropped_on_reopen(self, tmp_path):
+        journal = ResultJournal(tmp_path, fsync=False)
+        journal.append_many([{"n": 1}, {"n": 2}])
+        journal.close()
+        segment = next(tmp_path.glob("*.seg"))
+        data = segment.read_bytes()
+        segment.write_bytes(data[:-3])  # Crash mid-write of the second record
+
+        reopened = ResultJournal(tmp_path, fsync=False)
+        assert reopened.pending == 1
+        reopened.append({"n": 3})
+        records, _ = reopened.read()
+        assert records == [{"n": 1}, {"n": 3}]
+
+
+@pytest.mark.unit
+class TestWriteBehindBuffer:
+    """Tests for WriteBehindBuffer flushing, recovery and back-pressure."""
+
+    @pytest.mark.asyncio
+    async def test_flushes_in_batches_and_drains_on_close(self, tmp_path):
+        sink = RecordingSink()
+        async with make_buffer(tmp_path, sink, batch_size=10) as buffer:
+            for i in range(25):
+                await buffer.put({"n": i})
+
+        assert [r["n"] for r in sink.records] == list(range(25))
+        assert all(len(batch) <= 10 for batch in sink.batches)
+        assert buffer.pending == 0 and buffer.get_stats()["records_flushed"] == 25
+
+    @pytest.mark.asyncio
+    async def test_failed_batches_stay_journaled_and_are_retried(self, tmp_path):
+        sink = RecordingSink(fail_times=3)
+        async with make_buffer(tmp_path, sink, batch_size=5) as buffer:
+            await buffer.put_many([{"n": i} for i in range(5)])
+            await buffer.flush()
+
+        assert [r["n"] for r in sink.records] == list(range(5))
+        assert buffer.get_stats()["sink_failures"] == 3
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_checkpoint_after_crash(self, tmp_path):
+        sink = RecordingSink()
+        buffer = make_buffer(tmp_path, sink, batch_size=4)
+        await buffer.put_many([{"n": i} for i in range(4)])
+        await buffer.flush()
+        sink.fail_times = 1_000  # Database goes away
+        await buffer.put_many([{"n": i} for i in range(4, 10)])
+        await buffer.close(drain=False)  # Process dies with records unflushed
+
+        recovered = RecordingSink()
+        async with make_buffer(tmp_path, recovered, batch_size=4) as buffer:
+            assert buffer.pending == 6
+            await buffer.flush()
+
+        assert [r["n"] for r in sink.records] == [0, 1, 2, 3]
+        assert [r["n"] for r in recovered.records] == [4, 5, 6, 7, 8, 9]
+
+    @pytest.mark.asyncio
+    async def test_put_blocks_while_the_sink_falls_behind(self, tmp_path):
+        sink = RecordingSink(latency=0.05)
+        async with make_buffer(tmp_path, sink, batch_size=5, max_pending=10) as buffer:
+            peak = 0
+            for i in range(40):
+                await buffer.put({"n": i})
+                peak = max(peak, buffer.pending)
+
+        assert peak <= 10
+        assert buffer.get_stats()["backpressure_waits"] > 0
+        assert len(sink.records) == 40
+
+    @pytest.mark.asyncio
+    async def test_rejected_record_is_dead_lettered_without_stalling(self, tmp_path):
+        sink = RecordingSink(reject=lambda record: record["n"] == 3)
+        async with make_buffer(tmp_path, sink, batch_size=5, max_pending=5) as buffer:
+            for i in range(20):
+                await buffer.put({"n": i})
+            await asyncio.wait_for(buffer.flush(), timeout=2)
+
+        assert sorted(r["n"] for r in sink.records) == [i for i in range(20) if i != 3]
+        stats = buffer.get_stats()
+        assert stats["records_dead_lettered"] == 1 and stats["dead_letter_pending"] == 1
+        entries, _ = buffer.dead_letter.read()
+        assert entries[0]["record"] == {"n": 3}
+        assert entries[0]["error"] == "ValueError: invalid row"
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_are_capped_and_requeued(self, tmp_path):
+        sink = RecordingSink(fail_times=1_000)
+        async with make_buffer(tmp_path, sink, batch_size=4, max_attempts=3) as buffer:
+            await buffer.put_many([{"n": i} for i in range(4)])
+            await asyncio.wait_for(buffer.flush(), timeout=2)
+            assert sink.calls == 3  # The whole batch, no per-record retries
+            assert buffer.get_stats()["dead_letter_pending"] == 4
+
+            sink.fail_times = 0  # Database is back
+            assert await buffer.requeue_dead_letters() == 4
+            await buffer.flush()
+
+        assert [r["n"] for r in sink.records] == [0, 1, 2, 3]
+        assert buffer.dead_letter.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_and_close_honour_timeouts(self, tmp_path):
+        sink = RecordingSink(latency=10)
+        buffer = make_buffer(tmp_path, sink, batch_size=1)
+        await buffer.put({"n": 1})
+
+        with pytest.raises(asyncio.TimeoutError):
+            await buffer.flush(timeout=0.05)
+        await asyncio.wait_for(buffer.close(timeout=0.05), timeout=1)
+
+        assert ResultJournal(tmp_path, fsync=False).pending == 1
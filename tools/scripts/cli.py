@@ -11,76 +11,45 @@ import logging
 import sys
 import os
 from pathlib import Path
-from typing import Dict, Type, Any
-import importlib
-import inspect
+from typing import Any, Mapping, Optional, Type
 
 # Add the current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 # Import BaseAgent for type checking
 from core.agents.base import BaseAgent
+from core.shared.agent_index import AgentIndex, normalize_agent_name
 
 
 class AgentForge:
     """Main Agent Forge framework class for CLI operations."""
     
     def __init__(self):
-        self.agents: Dict[str, Type[BaseAgent]] = {}
+        self.agents: Mapping[str, Type[BaseAgent]] = {}
+        self.agent_index: Optional[AgentIndex] = None
         self.logger = logging.getLogger("agent_forge")
         self._discover_agents()
     
     def _discover_agents(self):
-        """Automatically discover and register agents from examples directory."""
-        examples_dir = Path(__file__).parent / "examples"
+        """Index agents in the examples directory without importing them."""
+        examples_dir = Path(__file__).resolve().parent.parent.parent / "examples"
         
         if not examples_dir.exists():
             self.logger.warning("Examples directory not found")
             return
         
-        # Scan for Python files in examples directory
-        for py_file in examples_dir.glob("*.py"):
-            if py_file.name.startswith("__"):
-                continue
-                
-            try:
-                self._load_agent_from_file(py_file)
-            except Exception as e:
-                self.logger.debug(f"Could not load agent from {py_file}: {e}")
-    
-    def _load_agent_from_file(self, py_file: Path):
-        """Load an agent class from a Python file."""
-        module_name = py_file.stem
-        
-        # Import the module
-        spec = importlib.util.spec_from_file_location(module_name, py_file)
-        if spec is None or spec.loader is None:
-            return
-            
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        
-        # Find agent classes in the module
-        for name, obj in inspect.getmembers(module, inspect.isclass):
-            if (issubclass(obj, BaseAgent) and 
-                obj != BaseAgent and 
-                obj.__module__ == module_name):
-                
-                # Create a CLI-friendly agent name
-                agent_name = self._class_name_to_cli_name(name)
-                self.agents[agent_name] = obj
-                self.logger.debug(f"Registered agent: {agent_name} -> {name}")
+        # Agent modules are scanned statically and only imported when run
+        self.agent_index = AgentIndex(
+            {"examples": examples_dir},
+            root_classes=["core.agents.base.BaseAgent", "core.agents.base.AsyncContextAgent"],
+        )
+        self.agents = self.agent_index.as_mapping()
+        for agent_name, entry in self.agent_index.entries.items():
+            self.logger.debug(f"Registered agent: {agent_name} -> {entry.class_name}")
     
     def _class_name_to_cli_name(self, class_name: str) -> str:
         """Convert CamelCase class name to CLI-friendly name."""
-        # Remove 'Agent' suffix if present
-        if class_name.endswith('Agent'):
-            class_name = class_name[:-5]
-        
-        # Convert CamelCase to snake_case
-        import re
-        cli_name = re.sub('([a-z0-9])([A-Z])', r'\1_\2', class_name).lower()
-        return cli_name
+        return normalize_agent_name(class_name)
     
     def list_agents(self):
         """List all available agents."""
@@ -89,11 +58,8 @@ class AgentForge:
             return
         
         print("Available agents:")
-        for agent_name, agent_class in sorted(self.agents.items()):
-            doc = agent_class.__doc__ or "No description available"
-            # Get first line of docstring
-            description = doc.split('\n')[0].strip()
-            print(f"  {agent_name:<20} - {description}")
+        for agent_name, entry in sorted(self.agent_index.entries.items()):
+            print(f"  {agent_name:<20} - {entry.description}")
     
     async def run_agent(self, agent_name: str, **kwargs) -> Any:
         """Run a specific agent with given parameters."""